@@ -0,0 +1,304 @@
+import adsk.core, adsk.fusion, traceback
+import math
+import os
+import time
+
+
+from ...lib import configUtils
+from ...lib import profilingUtils
+from ...lib import generationSessionUtils
+from ...lib import fusion360utils as futil
+from ... import config
+from ...lib.gridfinityUtils import batchManifest
+from ...lib.gridfinityUtils import componentReuseUtils
+from ...lib.gridfinityUtils import meshUtils
+from ...lib.gridfinityUtils.temporaryBRepUtils import createBox, difference, getManager, intersection
+from ...lib.gridfinityUtils.threeMfUtils import ThreeMfStreamWriter
+from ...lib.gridfinityUtils.baseplateGenerator import createGridfinityBaseplate
+from ...lib.gridfinityUtils.binGenerator import createGridfinityBin
+from ...lib.gridfinityUtils.directBodyGenerator import createGridfinityBaseplateDirect, createGridfinityBinDirect
+
+app = adsk.core.Application.get()
+ui = app.userInterface
+
+
+# *** The command identity information. ***
+CMD_ID = f'{config.COMPANY_NAME}_{config.ADDIN_NAME}_cmdBatchGenerate'
+CMD_NAME = 'Gridfinity batch'
+CMD_Description = 'Generate and export gridfinity bins and baseplates listed in a JSON or CSV manifest'
+
+# Specify that the command will be promoted to the panel.
+IS_PROMOTED = False
+
+WORKSPACE_ID = 'FusionSolidEnvironment'
+PANEL_ID = 'SolidCreatePanel'
+COMMAND_BESIDE_ID = 'ScriptsManagerCommand'
+
+# Resource location for command icons, here we assume a sub folder in this directory named "resources".
+ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources', '')
+
+CONFIG_FOLDER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'commandConfig')
+PROFILING_REPORT_PATH = os.path.join(CONFIG_FOLDER_PATH, "profiling_report.json")
+BATCH_REPORT_FILE_NAME = 'batch_report.json'
+
+# placed meshes by the bodies revision of their component, rows sharing a reused component tessellate it once
+componentMeshes: dict[str, list[tuple[meshUtils.TriangleMesh, tuple[float, float, float]]]] = {}
+
+# Local list of event handlers used to maintain a reference so
+# they are not released and garbage collected.
+local_handlers = []
+
+def getErrorMessage(text = "An unknown error occurred, please validate your inputs and try again"):
+    stackTrace = traceback.format_exc()
+    return f"{text}:<br>{stackTrace}"
+
+def showErrorInMessageBox(text = "An unknown error occurred, please validate your inputs and try again"):
+    if ui:
+        ui.messageBox(getErrorMessage(text), f"{CMD_NAME} Error")
+
+# Executed when add-in is run.
+def start():
+    futil.log(f'{CMD_NAME} Command Start Event')
+    try:
+        addinConfig = configUtils.readConfig(CONFIG_FOLDER_PATH)
+
+        # Create a command Definition.
+        cmd_def = ui.commandDefinitions.itemById(CMD_ID)
+        if not cmd_def:
+            cmd_def = ui.commandDefinitions.addButtonDefinition(CMD_ID, CMD_NAME, CMD_Description, ICON_FOLDER)
+
+            # Define an event handler for the command created event. It will be called when the button is clicked.
+            futil.add_handler(cmd_def.commandCreated, command_created)
+
+            # ******** Add a button into the UI so the user can run the command. ********
+            # Get the target workspace the button will be created in.
+            workspace = ui.workspaces.itemById(WORKSPACE_ID)
+
+            # Get the panel the button will be created in.
+            panel = workspace.toolbarPanels.itemById(PANEL_ID)
+
+            # Create the button command control in the UI after the specified existing command.
+            control = panel.controls.addCommand(cmd_def, COMMAND_BESIDE_ID, False)
+
+            # Specify if the command is promoted to the main toolbar.
+            control.isPromoted = addinConfig['UI'].getboolean('is_promoted', IS_PROMOTED)
+        ui.statusMessage = ""
+    except Exception as err:
+        futil.log(f'{CMD_NAME} Error occurred at the start, {err}, {getErrorMessage()}')
+        ui.statusMessage = f"{CMD_NAME} failed to initialize"
+        showErrorInMessageBox(f"{CMD_NAME} Critical error occurred at the start, the command will be unavailable, if the issue persists use <a href=\"https://github.com/Le0Michine/FusionGridfinityGenerator/issues/new\">this link</a> to report it")
+
+# Executed when add-in is stopped.
+def stop():
+    futil.log(f'{CMD_NAME} Command Stop Event')
+    # Get the various UI elements for this command
+    workspace = ui.workspaces.itemById(WORKSPACE_ID)
+    panel = workspace.toolbarPanels.itemById(PANEL_ID)
+    command_control: adsk.core.CommandControl = panel.controls.itemById(CMD_ID)
+    command_definition = ui.commandDefinitions.itemById(CMD_ID)
+
+    addinConfig = configUtils.readConfig(CONFIG_FOLDER_PATH)
+    addinConfig['UI']['is_promoted'] = 'yes' if command_control.isPromoted else 'no'
+    configUtils.writeConfig(addinConfig, CONFIG_FOLDER_PATH)
+
+    # Delete the button command control
+    if command_control:
+        command_control.deleteMe()
+
+    # Delete the command definition
+    if command_definition:
+        command_definition.deleteMe()
+
+# Function that is called when a user clicks the corresponding button in the UI.
+# The command has no inputs, so Fusion executes it right away and the manifest is picked in a file dialog.
+def command_created(args: adsk.core.CommandCreatedEventArgs):
+    futil.log(f'{CMD_NAME} Command Created Event')
+    futil.add_handler(args.command.execute, command_execute, local_handlers=local_handlers)
+    futil.add_handler(args.command.destroy, command_destroy, local_handlers=local_handlers)
+
+def command_execute(args: adsk.core.CommandEventArgs):
+    futil.log(f'{CMD_NAME} Command Execute Event')
+    manifestPath = selectManifest()
+    if manifestPath is None:
+        return
+    with profilingUtils.profile(f'{CMD_NAME} execute', PROFILING_REPORT_PATH):
+        generateBatch(args, manifestPath)
+
+def command_destroy(args: adsk.core.CommandEventArgs):
+    futil.log(f'{CMD_NAME} Command Destroy Event')
+    global local_handlers
+    local_handlers = []
+
+def selectManifest():
+    fileDialog = ui.createFileDialog()
+    fileDialog.title = 'Select gridfinity batch manifest'
+    fileDialog.filter = 'Batch manifest (*.json;*.csv);;All files (*.*)'
+    fileDialog.isMultiSelectEnabled = False
+    if fileDialog.showOpen() != adsk.core.DialogResults.DialogOK:
+        return None
+    return fileDialog.filename
+
+def exportComponent(design: adsk.fusion.Design, component: adsk.fusion.Component, exportFolder: str, item: batchManifest.BatchItem) -> list[str]:
+    formats = item.formats
+    exportManager = design.exportManager
+    exportedFiles: list[str] = []
+    # rows sharing a reused component still get their own files
+    basePath = os.path.join(exportFolder, batchManifest.getExportFileName(item.name))
+    if batchManifest.EXPORT_FORMAT_STEP in formats:
+        stepOptions = exportManager.createSTEPExportOptions(f'{basePath}.step', component)
+        exportManager.execute(stepOptions)
+        exportedFiles.append(f'{basePath}.step')
+    if batchManifest.EXPORT_FORMAT_STL in formats:
+        stlOptions = exportManager.createSTLExportOptions(component, f'{basePath}.stl')
+        stlOptions.meshRefinement = adsk.fusion.MeshRefinementSettings.MeshRefinementMedium
+        exportManager.execute(stlOptions)
+        exportedFiles.append(f'{basePath}.stl')
+    if batchManifest.EXPORT_FORMAT_3MF in formats:
+        exportedFiles.append(exportThreeMf(component, item, f'{basePath}.3mf'))
+    return exportedFiles
+
+def tessellateBody(body: adsk.fusion.BRepBody) -> meshUtils.TriangleMesh:
+    calculator = body.meshManager.createMeshCalculator()
+    calculator.setQuality(adsk.fusion.TriangleMeshQualityOptions.NormalQualityTriangleMesh)
+    bodyMesh = calculator.calculate()
+    coordinates = bodyMesh.nodeCoordinatesAsDouble
+    points = [tuple(coordinates[index:index + 3]) for index in range(0, len(coordinates), 3)]
+    indices = bodyMesh.nodeIndices
+    mesh = meshUtils.TriangleMesh()
+    for index in range(0, len(indices), 3):
+        mesh.addTriangle(points[indices[index]], points[indices[index + 1]], points[indices[index + 2]])
+    return mesh
+
+def getCellGrid(item: batchManifest.BatchItem) -> tuple[float, float, int, int, float, float] | None:
+    """
+    Base unit pattern of a part as (baseWidth, baseLength, countX, countY, xyClearance, cellTopZ),
+    cells are cut from the bodies below cellTopZ
+    """
+    if item.partType == batchManifest.PART_TYPE_BASEPLATE:
+        return (item.input.baseWidth, item.input.baseLength, int(item.input.baseplateWidth), int(item.input.baseplateLength), item.input.xyClearance, math.inf)
+    if not item.input.hasBase:
+        return None
+    binBodyInput = item.input.binBodyInput
+    return (binBodyInput.baseWidth, binBodyInput.baseLength, int(binBodyInput.binWidth), int(binBodyInput.binLength), binBodyInput.xyClearance, 0)
+
+def createPlacedMeshes(component: adsk.fusion.Component, item: batchManifest.BatchItem) -> list[tuple[meshUtils.TriangleMesh, tuple[float, float, float]]]:
+    bodies = [body for body in component.bRepBodies if body.isSolid]
+    grid = getCellGrid(item)
+    if grid is None:
+        return [(tessellateBody(body), (0, 0, 0)) for body in bodies]
+    [baseWidth, baseLength, countX, countY, xyClearance, cellTopZ] = grid
+    gridMaxX = countX * baseWidth - xyClearance * 2
+    gridMaxY = countY * baseLength - xyClearance * 2
+
+    placedMeshes = []
+    for body in bodies:
+        box = body.boundingBox
+        cellBottomZ = box.minPoint.z
+        bodyCellTopZ = min(cellTopZ, box.maxPoint.z)
+        if bodyCellTopZ <= cellBottomZ:
+            placedMeshes.append((tessellateBody(body), (0, 0, 0)))
+            continue
+        # cells of the pattern only differ by the outline sides they lie on, one cell of each kind is meshed
+        # and the others place that mesh by the pattern spacing
+        cellMeshes: dict[tuple[bool, bool, bool, bool], tuple[meshUtils.TriangleMesh, int, int]] = {}
+        for i in range(countX):
+            for j in range(countY):
+                cellKind = (i == 0, i == countX - 1, j == 0, j == countY - 1)
+                if not cellKind in cellMeshes:
+                    cellBody = intersection(getManager().copy(body), createBox(
+                        max(0, i * baseWidth - xyClearance),
+                        max(0, j * baseLength - xyClearance),
+                        cellBottomZ,
+                        min(gridMaxX, (i + 1) * baseWidth - xyClearance),
+                        min(gridMaxY, (j + 1) * baseLength - xyClearance),
+                        bodyCellTopZ,
+                    ))
+                    cellMeshes[cellKind] = (tessellateBody(cellBody), i, j)
+                [cellMesh, meshI, meshJ] = cellMeshes[cellKind]
+                placedMeshes.append((cellMesh, ((i - meshI) * baseWidth, (j - meshJ) * baseLength, 0)))
+        # bin body above the base, baseplate padding
+        restBody = difference(getManager().copy(body), createBox(0, 0, cellBottomZ, gridMaxX, gridMaxY, bodyCellTopZ))
+        if restBody.faces.count > 0:
+            placedMeshes.append((tessellateBody(restBody), (0, 0, 0)))
+    return placedMeshes
+
+def exportThreeMf(component: adsk.fusion.Component, item: batchManifest.BatchItem, path: str) -> str:
+    # cut from the generated component like the STL export, so every format holds the same part,
+    # the mesh of a base cell is stored once and placed for every cell of the pattern
+    revision = componentReuseUtils.getBodiesRevision(component)
+    if not revision in componentMeshes:
+        componentMeshes[revision] = createPlacedMeshes(component, item)
+    with ThreeMfStreamWriter(path, item.name) as writer:
+        for [mesh, offset] in componentMeshes[revision]:
+            writer.addMesh(mesh, offset)
+    return path
+
+def generatePart(design: adsk.fusion.Design, root: adsk.fusion.Component, item: batchManifest.BatchItem) -> adsk.fusion.Occurrence:
+    # parts without history are built from temporary BReps, direct designs have no timeline to hold features at all
+    isDirect = not item.hasHistory or design.designType != adsk.fusion.DesignTypes.ParametricDesignType
+    with generationSessionUtils.HiddenGenerationSession(design, item.name, f'{item.partType} direct' if isDirect else item.partType) as session:
+        fingerprint = componentReuseUtils.getFingerprint(item.input, not isDirect)
+        reusedOcc = componentReuseUtils.placeGeneratedComponent(design, fingerprint, root, name=item.name)
+        if reusedOcc is not None:
+            return reusedOcc
+        newCmpOcc = session.addOccurrence(root, item.name)
+        component: adsk.fusion.Component = newCmpOcc.component
+        if isDirect:
+            if item.partType == batchManifest.PART_TYPE_BASEPLATE:
+                body = createGridfinityBaseplateDirect(item.input, component, session.isParametric)
+            else:
+                body = createGridfinityBinDirect(item.input, component, session.isParametric)
+        elif item.partType == batchManifest.PART_TYPE_BASEPLATE:
+            body = createGridfinityBaseplate(item.input, component)
+        else:
+            body = createGridfinityBin(item.input, component)
+        if body is not None:
+            body.name = item.name
+        session.markGenerated(component, fingerprint)
+    return newCmpOcc
+
+def generateBatch(args: adsk.core.CommandEventArgs, manifestPath: str):
+    progressBar = ui.progressBar
+    try:
+        des = adsk.fusion.Design.cast(app.activeProduct)
+        root = adsk.fusion.Component.cast(des.rootComponent)
+
+        items = batchManifest.loadManifest(manifestPath)
+        exportFolder = os.path.join(os.path.dirname(manifestPath), f'{os.path.splitext(os.path.basename(manifestPath))[0]} export')
+        os.makedirs(exportFolder, exist_ok=True)
+        futil.log(f'{CMD_NAME} Generating {len(items)} parts from {manifestPath} into {exportFolder}')
+
+        componentMeshes.clear()
+        report = {'manifest': manifestPath, 'parts': []}
+        startTime = time.perf_counter()
+        progressBar.show(f'{CMD_NAME}: %v of %m parts', 0, len(items), False)
+        for index, item in enumerate(items):
+            progressBar.progressValue = index
+            # keep Fusion responsive between parts
+            adsk.doEvents()
+            itemStartTime = time.perf_counter()
+            try:
+                occurrence = generatePart(des, root, item)
+                exportedFiles = exportComponent(des, occurrence.component, exportFolder, item)
+                report['parts'].append({'name': item.name, 'files': exportedFiles, 'seconds': time.perf_counter() - itemStartTime})
+            except:
+                futil.log(f'{CMD_NAME} Failed to generate {item.name}:\n{traceback.format_exc()}')
+                report['parts'].append({'name': item.name, 'error': traceback.format_exc(), 'seconds': time.perf_counter() - itemStartTime})
+        progressBar.hide()
+        componentMeshes.clear()
+
+        report['seconds'] = time.perf_counter() - startTime
+        configUtils.dumpJsonConfig(os.path.join(exportFolder, BATCH_REPORT_FILE_NAME), report)
+        failedParts = [part['name'] for part in report['parts'] if 'error' in part]
+        summary = f'Generated {len(items) - len(failedParts)} of {len(items)} parts in {report["seconds"]:.1f}s, files are in {exportFolder}'
+        if len(failedParts) > 0:
+            summary += '<br>Failed: ' + ', '.join(failedParts) + f'<br>See {BATCH_REPORT_FILE_NAME} for details'
+        futil.log(f'{CMD_NAME} {summary}')
+        ui.messageBox(summary, CMD_NAME)
+    except Exception as err:
+        progressBar.hide()
+        args.executeFailed = True
+        args.executeFailedMessage = getErrorMessage()
+        futil.log(f'{CMD_NAME} Error occurred, {err}, {getErrorMessage()}')
+        return False
+    return True
@@ -4,14 +4,24 @@ import os
 
 
 from ...lib import configUtils
+from ...lib import profilingUtils
+from ...lib import generationSessionUtils
 from ...lib import fusion360utils as futil
 from ... import config
 from ...lib.gridfinityUtils.const import DIMENSION_DEFAULT_WIDTH_UNIT
 from ...lib.gridfinityUtils.baseplateGenerator import createGridfinityBaseplate
+from ...lib.gridfinityUtils.directBodyGenerator import createGridfinityBaseplateDirect, getLeftOutBaseplateFeatures
 from ...lib.gridfinityUtils.baseplateGeneratorInput import BaseplateGeneratorInput
 from ...lib.gridfinityUtils import const
+from ...lib.gridfinityUtils import customGraphicsUtils
+from ...lib.gridfinityUtils import componentReuseUtils
+from ...lib.gridfinityUtils import baseplateSplitUtils
+from ...lib.gridfinityUtils.meshPreviewGenerator import createGridfinityBaseplateMesh
+from ...lib.gridfinityUtils.meshUtils import TriangleMesh
 from .inputState import InputState
 from ...lib.ui.commandUiState import CommandUiState
+from ...lib.ui.previewCache import PreviewCache
+from ...lib.ui.previewScheduler import PreviewScheduler
 from ...lib.ui.unsupportedDesignTypeException import UnsupportedDesignTypeException
 
 app = adsk.core.Application.get()
@@ -24,6 +34,9 @@ CMD_NAME = 'Gridfinity baseplate'
 CMD_Description = 'Create gridfinity baseplate'
 
 uiState = CommandUiState(CMD_NAME)
+previewCache = PreviewCache(CMD_NAME)
+previewScheduler = PreviewScheduler(CMD_NAME, f'{CMD_ID}_previewSettled')
+
 # Specify that the command will be promoted to the panel.
 IS_PROMOTED = True
 
@@ -40,15 +53,18 @@ ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resource
 
 CONFIG_FOLDER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'commandConfig')
 UI_INPUT_DEFAULTS_CONFIG_PATH = os.path.join(CONFIG_FOLDER_PATH, "ui_input_defaults.json")
+PROFILING_REPORT_PATH = os.path.join(CONFIG_FOLDER_PATH, "profiling_report.json")
 
 # Local list of event handlers used to maintain a reference so
 # they are not released and garbage collected.
 local_handlers = []
+previewGraphics: adsk.fusion.CustomGraphicsGroup = None
 
 # Input groups
 INFO_GROUP = 'info_group'
 BASIC_SIZES_GROUP = 'basic_sizes'
 XY_DIMENSIONS_GROUP = 'xy_dimensions'
+PRINT_BED_GROUP = 'print_bed_group'
 PLATE_FEATURES_GROUP = 'plate_features'
 MAGNET_SOCKET_GROUP = 'magnet_cutout_group'
 SCREW_HOLE_GROUP = 'screw_hole_group'
@@ -63,6 +79,9 @@ BIN_XY_CLEARANCE_INPUT_ID = 'bin_xy_clearance'
 BASEPLATE_WIDTH_INPUT = 'plate_width'
 BASEPLATE_LENGTH_INPUT = 'plate_length'
 BASEPLATE_TYPE_DROPDOWN = 'plate_type_dropdown'
+BASEPLATE_SPLIT_TO_BED_INPUT = 'split_to_print_bed'
+BASEPLATE_BED_WIDTH_INPUT = 'print_bed_width'
+BASEPLATE_BED_LENGTH_INPUT = 'print_bed_length'
 
 BASEPLATE_TYPE_LIGHT = 'Light'
 BASEPLATE_TYPE_FULL = 'Full'
@@ -92,7 +111,16 @@ INPUT_CHANGES_RESET_TO_DEFAULTS = 'input_changes_button_reset_to_defaults'
 INPUT_CHANGES_RESET_TO_FACTORY = 'input_changes_button_factory_reset'
 
 SHOW_PREVIEW_INPUT = 'show_preview'
-
+SHOW_PREVIEW_MESH_INPUT = 'show_preview_mesh'
+PREVIEW_CACHE_IGNORE_KEYS = [
+    SHOW_PREVIEW_INPUT,
+    SHOW_PREVIEW_MESH_INPUT,
+    INPUT_CHANGES_SAVE_DEFAULTS,
+    INPUT_CHANGES_RESET_TO_DEFAULTS,
+    INPUT_CHANGES_RESET_TO_FACTORY,
+]
+
+INFO_TEXT_INPUT = 'info_text'
 INFO_TEXT = ("<b>Help:</b> Info for inputs can be found "
              "<a href=\"https://github.com/Le0Michine/FusionGridfinityGenerator/wiki/Baseplate-generator-options\">"
              "Here on our GitHub</a>.")
@@ -181,7 +209,7 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     infoGroup = inputs.addGroupCommandInput(INFO_GROUP, 'Info')
     infoGroup.isExpanded = uiState.getState(INFO_GROUP)
     uiState.registerCommandInput(infoGroup)
-    infoGroup.children.addTextBoxCommandInput("info_text", "Info", INFO_TEXT, 3, True)
+    infoGroup.children.addTextBoxCommandInput(INFO_TEXT_INPUT, "Info", INFO_TEXT, 3, True)
 
     basicSizesGroup = inputs.addGroupCommandInput(BASIC_SIZES_GROUP, 'Basic size')
     basicSizesGroup.isExpanded = uiState.getState(BASIC_SIZES_GROUP)
@@ -211,6 +239,21 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     baseplateLengthInput = mainDimensionsGroup.children.addIntegerSpinnerCommandInput(BASEPLATE_LENGTH_INPUT, 'Plate length, Y (u)', 1, 100, 1, uiState.getState(BASEPLATE_LENGTH_INPUT))
     uiState.registerCommandInput(baseplateLengthInput)
 
+    printBedGroup = inputs.addGroupCommandInput(PRINT_BED_GROUP, 'Print bed')
+    printBedGroup.isExpanded = uiState.getState(PRINT_BED_GROUP)
+    uiState.registerCommandInput(printBedGroup)
+    splitToBedInput = printBedGroup.children.addBoolValueInput(BASEPLATE_SPLIT_TO_BED_INPUT, 'Split into printable tiles', True, '', uiState.getState(BASEPLATE_SPLIT_TO_BED_INPUT))
+    splitToBedInput.tooltip = 'Identical tiles are generated once and placed as copies, connection holes are only added where tiles meet'
+    uiState.registerCommandInput(splitToBedInput)
+    bedWidthInput = printBedGroup.children.addValueInput(BASEPLATE_BED_WIDTH_INPUT, 'Bed width, X (mm)', defaultLengthUnits, adsk.core.ValueInput.createByReal(uiState.getState(BASEPLATE_BED_WIDTH_INPUT)))
+    bedWidthInput.minimumValue = 1
+    bedWidthInput.isMinimumInclusive = True
+    uiState.registerCommandInput(bedWidthInput)
+    bedLengthInput = printBedGroup.children.addValueInput(BASEPLATE_BED_LENGTH_INPUT, 'Bed length, Y (mm)', defaultLengthUnits, adsk.core.ValueInput.createByReal(uiState.getState(BASEPLATE_BED_LENGTH_INPUT)))
+    bedLengthInput.minimumValue = 1
+    bedLengthInput.isMinimumInclusive = True
+    uiState.registerCommandInput(bedLengthInput)
+
     plateFeaturesGroup = inputs.addGroupCommandInput(PLATE_FEATURES_GROUP, 'Features')
     plateFeaturesGroup.isExpanded = uiState.getState(PLATE_FEATURES_GROUP)
     uiState.registerCommandInput(plateFeaturesGroup)
@@ -320,12 +363,16 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     previewGroup.isExpanded = uiState.getState(PREVIEW_GROUP)
     showLivePreview = previewGroup.children.addBoolValueInput(SHOW_PREVIEW_INPUT, 'Show preview (slow)', True, '', uiState.getState(SHOW_PREVIEW_INPUT))
     uiState.registerCommandInput(showLivePreview)
+    showPreviewMesh = previewGroup.children.addBoolValueInput(SHOW_PREVIEW_MESH_INPUT, 'Mesh preview (fastest)', True, '', uiState.getState(SHOW_PREVIEW_MESH_INPUT))
+    showPreviewMesh.tooltip = 'Preview is drawn as a lightweight mesh without creating any timeline features'
+    uiState.registerCommandInput(showPreviewMesh)
 
     futil.add_handler(args.command.execute, command_execute, local_handlers=local_handlers)
     futil.add_handler(args.command.inputChanged, command_input_changed, local_handlers=local_handlers)
     futil.add_handler(args.command.executePreview, command_preview, local_handlers=local_handlers)
     futil.add_handler(args.command.validateInputs, command_validate_input, local_handlers=local_handlers)
     futil.add_handler(args.command.destroy, command_destroy, local_handlers=local_handlers)
+    previewScheduler.start(args.command, local_handlers)
 
 
 # This event handler is called when the user clicks the OK button in the command dialog or 
@@ -333,7 +380,9 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
 def command_execute(args: adsk.core.CommandEventArgs):
     # General logging for debug.
     futil.log(f'{CMD_NAME} Command Execute Event')
-    generateBaseplate(args)
+    clearPreviewGraphics()
+    with profilingUtils.profile(f'{CMD_NAME} execute', PROFILING_REPORT_PATH):
+        generateBaseplate(args)
 
 
 # This event handler is called when the command needs to compute a new preview in the graphics window.
@@ -343,9 +392,17 @@ def command_preview(args: adsk.core.CommandEventArgs):
     # Get a reference to command's inputs.
     inputs = args.command.commandInputs
     showPreview: adsk.core.BoolValueCommandInput = inputs.itemById(SHOW_PREVIEW_INPUT)
+    showPreviewMesh: adsk.core.BoolValueCommandInput = inputs.itemById(SHOW_PREVIEW_MESH_INPUT)
+    if not showPreview.value or not showPreviewMesh.value:
+        clearPreviewGraphics()
     if showPreview.value:
-        if INPUTS_VALID:
-            generateBaseplate(args)
+        if INPUTS_VALID and showPreviewMesh.value:
+            drawPreviewMesh(args)
+        elif INPUTS_VALID and previewScheduler.isPending:
+            futil.log(f'{CMD_NAME} Preview postponed until inputs settle')
+        elif INPUTS_VALID:
+            with profilingUtils.profile(f'{CMD_NAME} preview', PROFILING_REPORT_PATH):
+                generateBaseplate(args, True)
         else:
             args.executeFailed = True
             args.executeFailedMessage = "Some inputs are invalid, unable to generate preview"
@@ -356,6 +413,7 @@ def command_preview(args: adsk.core.CommandEventArgs):
 def command_input_changed(args: adsk.core.InputChangedEventArgs):
     changed_input = args.input
     global uiState
+    previewScheduler.inputChanged()
     if changed_input.id == INPUT_CHANGES_SAVE_DEFAULTS:
         saveUIInputsAsDefaults()
     elif changed_input.id == INPUT_CHANGES_RESET_TO_DEFAULTS:
@@ -397,7 +455,8 @@ def command_validate_input(args: adsk.core.ValidateInputsEventArgs):
         and (not inputsState.hasMagnetSockets or (inputsState.magnetSocketSize <= 1 and inputsState.magnetSocketSize > 0 and inputsState.magnetSocketDepth > 0)) \
         and (not inputsState.hasScrewHoles or (inputsState.screwHoleSize > 0 and inputsState.screwHoleSize <= 1 and inputsState.screwHeadSize > inputsState.screwHoleSize and inputsState.screwHeadSize <= 1.5)) \
         and (not inputsState.hasConnectionHoles or (inputsState.connectionHoleSize > 0 and inputsState.connectionHoleSize <= 0.5)) \
-        and (inputsState.extraBottomThickness > 0)
+        and (inputsState.extraBottomThickness > 0) \
+        and (not inputsState.splitToBed or (inputsState.bedWidth >= inputsState.baseWidth and inputsState.bedLength >= inputsState.baseLength))
 
 
     args.areInputsValid = INPUTS_VALID
@@ -406,64 +465,132 @@ def command_validate_input(args: adsk.core.ValidateInputsEventArgs):
 # This event handler is called when the command terminates.
 def command_destroy(args: adsk.core.CommandEventArgs):
     futil.log(f'{CMD_NAME} Command Destroy Event')
+    clearPreviewGraphics()
+    previewCache.clear()
+    previewScheduler.stop()
     global local_handlers
     local_handlers = []
     global uiState
 
 
-def generateBaseplate(args: adsk.core.CommandEventArgs):
+def getBaseplateGeneratorInput(inputsState: InputState) -> BaseplateGeneratorInput:
+    baseplateGeneratorInput = BaseplateGeneratorInput()
+
+    baseplateGeneratorInput.baseWidth = inputsState.baseWidth
+    baseplateGeneratorInput.baseLength = inputsState.baseLength
+    baseplateGeneratorInput.xyClearance = inputsState.xyClearance
+    baseplateGeneratorInput.baseplateWidth = inputsState.plateWidth
+    baseplateGeneratorInput.baseplateLength = inputsState.plateLength
+    baseplateGeneratorInput.hasExtendedBottom = not inputsState.plateType == BASEPLATE_TYPE_LIGHT
+    baseplateGeneratorInput.hasSkeletonizedBottom = inputsState.plateType == BASEPLATE_TYPE_SKELETONIZED
+    baseplateGeneratorInput.hasMagnetCutouts = inputsState.hasMagnetSockets
+    baseplateGeneratorInput.magnetCutoutsDiameter = inputsState.magnetSocketSize
+    baseplateGeneratorInput.magnetCutoutsDepth = inputsState.magnetSocketDepth
+    baseplateGeneratorInput.hasScrewHoles = inputsState.hasScrewHoles
+    baseplateGeneratorInput.screwHolesDiameter = inputsState.screwHoleSize
+    baseplateGeneratorInput.screwHeadCutoutDiameter = inputsState.screwHeadSize
+    baseplateGeneratorInput.hasPadding = inputsState.hasPadding
+    baseplateGeneratorInput.paddingLeft = inputsState.paddingLeft
+    baseplateGeneratorInput.paddingTop = inputsState.paddingTop
+    baseplateGeneratorInput.paddingRight = inputsState.paddingRight
+    baseplateGeneratorInput.paddingBottom = inputsState.paddingBottom
+    baseplateGeneratorInput.bottomExtensionHeight = inputsState.extraBottomThickness
+    baseplateGeneratorInput.binZClearance = inputsState.verticalClearance
+    baseplateGeneratorInput.hasConnectionHoles = inputsState.hasConnectionHoles
+    baseplateGeneratorInput.connectionScrewHolesDiameter = inputsState.connectionHoleSize
+    baseplateGeneratorInput.cornerFilletRadius = const.BIN_CORNER_FILLET_RADIUS
+    return baseplateGeneratorInput
+
+def clearPreviewGraphics():
+    global previewGraphics
+    try:
+        customGraphicsUtils.deleteGraphics(previewGraphics)
+    except:
+        futil.log(f'{CMD_NAME} Failed to remove preview graphics')
+    previewGraphics = None
+
+def drawPreviewMesh(args: adsk.core.CommandEventArgs):
+    global previewGraphics
+    try:
+        des = adsk.fusion.Design.cast(app.activeProduct)
+        previewKey = previewCache.computeKey(uiState, PREVIEW_CACHE_IGNORE_KEYS)
+        mesh = previewCache.get(previewKey)
+        if mesh is not None and previewGraphics is not None and previewGraphics.isValid:
+            return
+        if mesh is None:
+            inputsState = getInputsState()
+            baseplateGeneratorInput = getBaseplateGeneratorInput(inputsState)
+            if inputsState.splitToBed:
+                mesh = TriangleMesh()
+                for tile in baseplateSplitUtils.splitBaseplate(baseplateGeneratorInput, inputsState.bedWidth, inputsState.bedLength):
+                    mesh.addMesh(createGridfinityBaseplateMesh(tile.input), (tile.offsetX, tile.offsetY, 0))
+            else:
+                mesh = createGridfinityBaseplateMesh(baseplateGeneratorInput)
+            previewCache.store(previewKey, mesh)
+        clearPreviewGraphics()
+        previewGraphics = customGraphicsUtils.drawMesh(mesh, des.rootComponent)
+        futil.log(f'{CMD_NAME} Preview mesh drawn with {mesh.triangleCount} triangles')
+    except Exception as err:
+        args.executeFailed = True
+        args.executeFailedMessage = getErrorMessage()
+        futil.log(f'{CMD_NAME} Error occurred, {err}, {getErrorMessage()}')
+
+def showLeftOutFeatures(inputs: adsk.core.CommandInputs, features: list[str]):
+    infoText: adsk.core.TextBoxCommandInput = inputs.itemById(INFO_TEXT_INPUT)
+    if len(features) == 0:
+        infoText.formattedText = INFO_TEXT
+        infoText.numRows = 3
+        return
+    infoText.formattedText = '{}<br><b>Warning:</b> designs without history leave out {}, there is no preview and OK asks before building'.format(INFO_TEXT, ', '.join(features))
+    infoText.numRows = 5
+    inputs.itemById(INFO_GROUP).isExpanded = True
+
+def confirmLeftOutFeatures(features: list[str], partName: str) -> bool:
+    message = 'Designs without history leave out {}. Build the {} without them?'.format(', '.join(features), partName)
+    return ui.messageBox(message, CMD_NAME, adsk.core.MessageBoxButtonTypes.YesNoButtonType, adsk.core.MessageBoxIconTypes.WarningIconType) == adsk.core.DialogResults.DialogYes
+
+def generateBaseplate(args: adsk.core.CommandEventArgs, isPreview: bool = False):
     futil.log(f'{CMD_NAME} Generating baseplate')
     inputsState = getInputsState()
 
     try:
         des = adsk.fusion.Design.cast(app.activeProduct)
-        if des.designType == 0:
-            raise UnsupportedDesignTypeException('Timeline must be enabled for the generator to work, projects with disabled design history currently are not supported')
         root = adsk.fusion.Component.cast(des.rootComponent)
         baseplateName = 'Gridfinity baseplate {}x{}'.format(int(inputsState.plateLength), int(inputsState.plateWidth))
 
-        # create new component
-        newCmpOcc = adsk.fusion.Occurrences.cast(root.occurrences).addNewComponent(adsk.core.Matrix3D.create())
-
-        newCmpOcc.component.name = baseplateName
-        newCmpOcc.activate()
-        gridfinityBaseplateComponent: adsk.fusion.Component = newCmpOcc.component
-        baseplateGeneratorInput = BaseplateGeneratorInput()
-
-        baseplateGeneratorInput.baseWidth = inputsState.baseWidth
-        baseplateGeneratorInput.baseLength = inputsState.baseLength
-        baseplateGeneratorInput.xyClearance = inputsState.xyClearance
-        baseplateGeneratorInput.baseplateWidth = inputsState.plateWidth
-        baseplateGeneratorInput.baseplateLength = inputsState.plateLength
-        baseplateGeneratorInput.hasExtendedBottom = not inputsState.plateType == BASEPLATE_TYPE_LIGHT
-        baseplateGeneratorInput.hasSkeletonizedBottom = inputsState.plateType == BASEPLATE_TYPE_SKELETONIZED
-        baseplateGeneratorInput.hasMagnetCutouts = inputsState.hasMagnetSockets
-        baseplateGeneratorInput.magnetCutoutsDiameter = inputsState.magnetSocketSize
-        baseplateGeneratorInput.magnetCutoutsDepth = inputsState.magnetSocketDepth
-        baseplateGeneratorInput.hasScrewHoles = inputsState.hasScrewHoles
-        baseplateGeneratorInput.screwHolesDiameter = inputsState.screwHoleSize
-        baseplateGeneratorInput.screwHeadCutoutDiameter = inputsState.screwHeadSize
-        baseplateGeneratorInput.hasPadding = inputsState.hasPadding
-        baseplateGeneratorInput.paddingLeft = inputsState.paddingLeft
-        baseplateGeneratorInput.paddingTop = inputsState.paddingTop
-        baseplateGeneratorInput.paddingRight = inputsState.paddingRight
-        baseplateGeneratorInput.paddingBottom = inputsState.paddingBottom
-        baseplateGeneratorInput.bottomExtensionHeight = inputsState.extraBottomThickness
-        baseplateGeneratorInput.binZClearance = inputsState.verticalClearance
-        baseplateGeneratorInput.hasConnectionHoles = inputsState.hasConnectionHoles
-        baseplateGeneratorInput.connectionScrewHolesDiameter = inputsState.connectionHoleSize
-        baseplateGeneratorInput.cornerFilletRadius = const.BIN_CORNER_FILLET_RADIUS
-
-        baseplateBody = createGridfinityBaseplate(baseplateGeneratorInput, gridfinityBaseplateComponent)
-        baseplateBody.name = baseplateName
-
-        if des.designType == 1:
-            # group features in timeline
-            plateGroup = des.timeline.timelineGroups.add(newCmpOcc.timelineObject.index, newCmpOcc.timelineObject.index + gridfinityBaseplateComponent.features.count + gridfinityBaseplateComponent.constructionAxes.count + gridfinityBaseplateComponent.constructionPlanes.count + gridfinityBaseplateComponent.sketches.count)
-            plateGroup.name = baseplateName
+        baseplateGeneratorInput = getBaseplateGeneratorInput(inputsState)
+
+        if des.designType != adsk.fusion.DesignTypes.ParametricDesignType:
+            leftOutFeatures = getLeftOutBaseplateFeatures(baseplateGeneratorInput)
+            showLeftOutFeatures(args.command.commandInputs, leftOutFeatures)
+            # a direct design never gets a different part than the inputs ask for without the user agreeing to it
+            if len(leftOutFeatures) > 0 and isPreview:
+                return False
+            if len(leftOutFeatures) > 0 and not confirmLeftOutFeatures(leftOutFeatures, 'baseplate'):
+                raise UnsupportedDesignTypeException('Designs without history leave out ' + ', '.join(leftOutFeatures) + ', disable them or enable the design history to build this baseplate')
+
+        with generationSessionUtils.HiddenGenerationSession(des, baseplateName, 'baseplate') as session:
+            if inputsState.splitToBed:
+                generateBaseplateTiles(des, root, session, baseplateName, baseplateGeneratorInput, inputsState.bedWidth, inputsState.bedLength)
+                return
+
+            # identical baseplate already in the design, place another copy of it
+            baseplateFingerprint = componentReuseUtils.getFingerprint(baseplateGeneratorInput, session.isParametric)
+            if componentReuseUtils.placeGeneratedComponent(des, baseplateFingerprint, root, name=baseplateName) is not None:
+                return
+
+            # create new component
+            newCmpOcc = session.addOccurrence(root, baseplateName)
+            newCmpOcc.activate()
+            gridfinityBaseplateComponent: adsk.fusion.Component = newCmpOcc.component
+
+            baseplateBody = createBaseplateBody(session, baseplateGeneratorInput, gridfinityBaseplateComponent)
+            baseplateBody.name = baseplateName
+            session.markGenerated(gridfinityBaseplateComponent, baseplateFingerprint)
     except UnsupportedDesignTypeException as err:
         args.executeFailed = True
-        args.executeFailedMessage = 'Design type is unsupported. Projects with disabled design history are unsupported, please enable timeline feature to proceed.'
+        args.executeFailedMessage = str(err)
+        futil.log(f'{CMD_NAME} {err}')
         return False
     except Exception as err:
         args.executeFailed = True
@@ -471,11 +598,52 @@ def generateBaseplate(args: adsk.core.CommandEventArgs):
         futil.log(f'{CMD_NAME} Error occurred, {err}, {getErrorMessage()}')
         return False
 
+def createBaseplateBody(session: generationSessionUtils.HiddenGenerationSession, input: BaseplateGeneratorInput, targetComponent: adsk.fusion.Component) -> adsk.fusion.BRepBody:
+    if session.isParametric:
+        return createGridfinityBaseplate(input, targetComponent)
+    # direct designs have no timeline to hold features, the body is built from temporary BReps
+    return createGridfinityBaseplateDirect(input, targetComponent, False)
+
+def generateBaseplateTiles(
+    des: adsk.fusion.Design,
+    root: adsk.fusion.Component,
+    session: generationSessionUtils.HiddenGenerationSession,
+    baseplateName: str,
+    baseplateGeneratorInput: BaseplateGeneratorInput,
+    bedWidth: float,
+    bedLength: float,
+):
+    tiles = baseplateSplitUtils.splitBaseplate(baseplateGeneratorInput, bedWidth, bedLength)
+    futil.log(f'{CMD_NAME} Splitting {baseplateName} into {len(tiles)} tiles')
+    plateOcc = session.addOccurrence(root, f'{baseplateName} tiles')
+    plateComponent: adsk.fusion.Component = plateOcc.component
+
+    tileComponents: dict[str, adsk.fusion.Component] = {}
+    for tile in tiles:
+        tileName = 'Gridfinity baseplate tile {}x{}'.format(int(tile.input.baseplateLength), int(tile.input.baseplateWidth))
+        tileFingerprint = componentReuseUtils.getFingerprint(tile.input, session.isParametric)
+        transform = adsk.core.Matrix3D.create()
+        transform.translation = adsk.core.Vector3D.create(tile.offsetX, tile.offsetY, 0)
+        if tileFingerprint in tileComponents:
+            plateComponent.occurrences.addExistingComponent(tileComponents[tileFingerprint], transform)
+            continue
+        reusedOcc = componentReuseUtils.placeGeneratedComponent(des, tileFingerprint, plateComponent, transform, tileName)
+        if reusedOcc is not None:
+            tileComponents[tileFingerprint] = reusedOcc.component
+            continue
+        tileOcc = plateComponent.occurrences.addNewComponent(transform)
+        tileOcc.component.name = tileName
+        tileBody = createBaseplateBody(session, tile.input, tileOcc.component)
+        tileBody.name = tileName
+        session.markGenerated(tileOcc.component, tileFingerprint)
+        tileComponents[tileFingerprint] = tileOcc.component
+
 def initUiState():
     global uiState
     uiState.initValue(INFO_GROUP, True, adsk.core.GroupCommandInput.classType())
     uiState.initValue(BASIC_SIZES_GROUP, True, adsk.core.GroupCommandInput.classType())
     uiState.initValue(XY_DIMENSIONS_GROUP, True, adsk.core.GroupCommandInput.classType())
+    uiState.initValue(PRINT_BED_GROUP, False, adsk.core.GroupCommandInput.classType())
     uiState.initValue(PLATE_FEATURES_GROUP, True, adsk.core.GroupCommandInput.classType())
     uiState.initValue(MAGNET_SOCKET_GROUP, True, adsk.core.GroupCommandInput.classType())
     uiState.initValue(SCREW_HOLE_GROUP, True, adsk.core.GroupCommandInput.classType())
@@ -510,7 +678,11 @@ def initUiState():
     uiState.initValue(BASEPLATE_BIN_Z_CLEARANCE_INPUT, const.BASEPLATE_BIN_Z_CLEARANCE, adsk.core.ValueCommandInput.classType())
     uiState.initValue(BASEPLATE_HAS_CONNECTION_HOLE_INPUT, False, adsk.core.BoolValueCommandInput.classType())
     uiState.initValue(BASEPLATE_CONNECTION_HOLE_DIAMETER_INPUT, const.DIMENSION_PLATE_CONNECTION_SCREW_HOLE_DIAMETER, adsk.core.ValueCommandInput.classType())
+    uiState.initValue(BASEPLATE_SPLIT_TO_BED_INPUT, False, adsk.core.BoolValueCommandInput.classType())
+    uiState.initValue(BASEPLATE_BED_WIDTH_INPUT, const.DIMENSION_DEFAULT_PRINT_BED_SIZE, adsk.core.ValueCommandInput.classType())
+    uiState.initValue(BASEPLATE_BED_LENGTH_INPUT, const.DIMENSION_DEFAULT_PRINT_BED_SIZE, adsk.core.ValueCommandInput.classType())
     uiState.initValue(SHOW_PREVIEW_INPUT, False, adsk.core.BoolValueCommandInput.classType())
+    uiState.initValue(SHOW_PREVIEW_MESH_INPUT, True, adsk.core.BoolValueCommandInput.classType())
 
     recordedDefaults = configUtils.readJsonConfig(UI_INPUT_DEFAULTS_CONFIG_PATH)
     if recordedDefaults:
@@ -558,4 +730,7 @@ def getInputsState():
         uiState.getState(BASEPLATE_BIN_Z_CLEARANCE_INPUT),
         uiState.getState(BASEPLATE_HAS_CONNECTION_HOLE_INPUT),
         uiState.getState(BASEPLATE_CONNECTION_HOLE_DIAMETER_INPUT),
+        uiState.getState(BASEPLATE_SPLIT_TO_BED_INPUT),
+        uiState.getState(BASEPLATE_BED_WIDTH_INPUT),
+        uiState.getState(BASEPLATE_BED_LENGTH_INPUT),
     )
\ No newline at end of file
@@ -30,3 +30,7 @@ class InputState:
 
     hasConnectionHoles: bool
     connectionHoleSize: float
+
+    splitToBed: bool
+    bedWidth: float
+    bedLength: float
@@ -4,21 +4,24 @@ import math
 
 
 from ...lib import configUtils
+from ...lib import profilingUtils
+from ...lib import generationSessionUtils
 from ...lib import fusion360utils as futil
 from ... import config
-from ...lib.gridfinityUtils import combineUtils
 from ...lib.gridfinityUtils import geometryUtils
-from ...lib.gridfinityUtils import faceUtils
-from ...lib.gridfinityUtils import shellUtils
-from ...lib.gridfinityUtils import commonUtils
+from ...lib.gridfinityUtils import componentReuseUtils
 from ...lib.gridfinityUtils import const
-from ...lib.gridfinityUtils.baseGenerator import createSingleGridfinityBaseBody, createBaseBodyPattern, cutBaseClearance
+from ...lib.gridfinityUtils import customGraphicsUtils
 from ...lib.gridfinityUtils.baseGeneratorInput import BaseGeneratorInput
-from ...lib.gridfinityUtils.binBodyGenerator import createGridfinityBinBody, uniformCompartments
+from ...lib.gridfinityUtils.binBodyGenerator import uniformCompartments
 from ...lib.gridfinityUtils.binBodyGeneratorInput import BinBodyGeneratorInput, BinBodyCompartmentDefinition
-from ...lib.gridfinityUtils.binBodyTabGeneratorInput import BinBodyTabGeneratorInput
-from ...lib.gridfinityUtils.binBodyTabGenerator import createGridfinityBinBodyTab
+from ...lib.gridfinityUtils.binGenerator import createGridfinityBin
+from ...lib.gridfinityUtils.directBodyGenerator import createGridfinityBinDirect, getLeftOutBinFeatures
+from ...lib.gridfinityUtils.binGeneratorInput import BinGeneratorInput
+from ...lib.gridfinityUtils.meshPreviewGenerator import createGridfinityBinMesh
 from ...lib.ui.commandUiState import CommandUiState
+from ...lib.ui.previewCache import PreviewCache
+from ...lib.ui.previewScheduler import PreviewScheduler
 from ...lib.ui.unsupportedDesignTypeException import UnsupportedDesignTypeException
 
 app = adsk.core.Application.get()
@@ -34,6 +37,8 @@ commandUIState = CommandUiState(CMD_NAME)
 actualDimensionsTableUiState = CommandUiState(CMD_NAME)
 actualCompartmentDimensionsUiState = CommandUiState(CMD_NAME)
 commandCompartmentsTableUIState: list[CommandUiState] = []
+previewCache = PreviewCache(CMD_NAME)
+previewScheduler = PreviewScheduler(CMD_NAME, f'{CMD_ID}_previewSettled')
 
 # Specify that the command will be promoted to the panel.
 IS_PROMOTED = True
@@ -51,10 +56,12 @@ ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resource
 
 CONFIG_FOLDER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'commandConfig')
 UI_INPUT_DEFAULTS_CONFIG_PATH = os.path.join(CONFIG_FOLDER_PATH, "ui_input_defaults.json")
+PROFILING_REPORT_PATH = os.path.join(CONFIG_FOLDER_PATH, "profiling_report.json")
 
 # Local list of event handlers used to maintain a reference so
 # they are not released and garbage collected.
 local_handlers = []
+previewGraphics: adsk.fusion.CustomGraphicsGroup = None
 
 # Constants
 BIN_BASIC_SIZES_GROUP = "bin_basic_sizes_group"
@@ -82,6 +89,7 @@ BIN_REAL_DIMENSIONS_TABLE_TOTAL_LENGTH = "total_real_length"
 BIN_REAL_DIMENSIONS_TABLE_TOTAL_HEIGHT = "total_real_height"
 BIN_WALL_THICKNESS_INPUT_ID = 'bin_wall_thickness'
 BIN_GENERATE_BASE_INPUT_ID = 'bin_generate_base'
+BIN_BASE_FAST_PATTERN_INPUT_ID = 'bin_base_fast_pattern'
 BIN_GENERATE_BODY_INPUT_ID = 'bin_generate_body'
 BIN_SCREW_HOLES_INPUT_ID = 'bin_screw_holes'
 BIN_MAGNET_CUTOUTS_INPUT_ID = 'bin_magnet_cutouts'
@@ -136,7 +144,20 @@ PRESERVE_CHAGES_RADIO_GROUP_RESET = 'Reset inputs after creation'
 RESET_CHAGES_INPUT = 'reset_changes'
 SHOW_PREVIEW_INPUT = 'show_preview'
 SHOW_PREVIEW_MANUAL_INPUT = 'show_preview_manual'
-
+SHOW_PREVIEW_SIMPLIFIED_INPUT = 'show_preview_simplified'
+SHOW_PREVIEW_MESH_INPUT = 'show_preview_mesh'
+PREVIEW_CACHE_IGNORE_KEYS = [
+    SHOW_PREVIEW_INPUT,
+    SHOW_PREVIEW_MANUAL_INPUT,
+    SHOW_PREVIEW_SIMPLIFIED_INPUT,
+    SHOW_PREVIEW_MESH_INPUT,
+    INPUT_CHANGES_SAVE_DEFAULTS,
+    INPUT_CHANGES_RESET_TO_DEFAULTS,
+    INPUT_CHANGES_RESET_TO_FACTORY,
+    PRESERVE_CHAGES_RADIO_GROUP,
+]
+
+INFO_TEXT_INPUT = 'info_text'
 INFO_TEXT = ("<b>Help:</b> Info for inputs can be found "
              "<a href=\"https://github.com/Le0Michine/FusionGridfinityGenerator/wiki/Bin-generator-options\">"
              "Here on our GitHub</a>.")
@@ -201,6 +222,7 @@ def initDefaultUiState():
     commandUIState.initValue(BIN_TAB_FILLET_UNIFORM_INPUT_ID, const.BIN_TAB_DEFAULT_IS_FILLET_UNIFORM, adsk.core.BoolValueCommandInput.classType())
 
     commandUIState.initValue(BIN_GENERATE_BASE_INPUT_ID, True, adsk.core.BoolValueCommandInput.classType())
+    commandUIState.initValue(BIN_BASE_FAST_PATTERN_INPUT_ID, False, adsk.core.BoolValueCommandInput.classType())
     commandUIState.initValue(BIN_SCREW_HOLES_INPUT_ID, False, adsk.core.BoolValueCommandInput.classType())
     commandUIState.initValue(BIN_SCREW_DIAMETER_INPUT, const.DIMENSION_SCREW_HOLE_DIAMETER, adsk.core.ValueCommandInput.classType())
     commandUIState.initValue(BIN_SCREW_DIAMETER_INPUT, const.DIMENSION_SCREW_HOLE_DIAMETER, adsk.core.ValueCommandInput.classType())
@@ -535,7 +557,7 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     defaultLengthUnits = app.activeProduct.unitsManager.defaultLengthUnits
 
     infoGroup = inputs.addGroupCommandInput(INFO_GROUP, 'Info')
-    infoGroup.children.addTextBoxCommandInput("info_text", "Info", INFO_TEXT, 3, True)
+    infoGroup.children.addTextBoxCommandInput(INFO_TEXT_INPUT, "Info", INFO_TEXT, 3, True)
     infoGroup.isExpanded = commandUIState.getState(INFO_GROUP)
     commandUIState.registerCommandInput(infoGroup)
 
@@ -687,6 +709,9 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     commandUIState.registerCommandInput(baseFeaturesGroup)
     generateBaseCheckboxInput = baseFeaturesGroup.children.addBoolValueInput(BIN_GENERATE_BASE_INPUT_ID, 'Generate base', True, '', commandUIState.getState(BIN_GENERATE_BASE_INPUT_ID))
     commandUIState.registerCommandInput(generateBaseCheckboxInput)
+    fastBasePatternCheckboxInput = baseFeaturesGroup.children.addBoolValueInput(BIN_BASE_FAST_PATTERN_INPUT_ID, 'Fast base pattern (non-parametric copies)', True, '', commandUIState.getState(BIN_BASE_FAST_PATTERN_INPUT_ID))
+    fastBasePatternCheckboxInput.tooltip = 'Build a single base and add its copies as one base feature instead of a rectangular pattern'
+    commandUIState.registerCommandInput(fastBasePatternCheckboxInput)
     generateScrewHolesCheckboxInput = baseFeaturesGroup.children.addBoolValueInput(BIN_SCREW_HOLES_INPUT_ID, 'Add screw holes', True, '', commandUIState.getState(BIN_SCREW_HOLES_INPUT_ID))
     commandUIState.registerCommandInput(generateScrewHolesCheckboxInput)
     screwSizeInput = baseFeaturesGroup.children.addValueInput(BIN_SCREW_DIAMETER_INPUT, 'Screw hole diameter', defaultLengthUnits, adsk.core.ValueInput.createByReal(commandUIState.getState(BIN_SCREW_DIAMETER_INPUT)))
@@ -728,6 +753,12 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     showPreviewManual = previewGroup.children.addBoolValueInput(SHOW_PREVIEW_MANUAL_INPUT, 'Update preview once', False, '', False)
     showPreviewManual.isFullWidth = True
     commandUIState.registerCommandInput(showPreviewManual)
+    showPreviewSimplified = previewGroup.children.addBoolValueInput(SHOW_PREVIEW_SIMPLIFIED_INPUT, 'Simplified preview (fast)', True, '', True)
+    showPreviewSimplified.tooltip = 'Preview skips fillets, chamfers, magnet and screw cutouts, lip notches and tab fillets, full geometry is generated on OK'
+    commandUIState.registerCommandInput(showPreviewSimplified)
+    showPreviewMesh = previewGroup.children.addBoolValueInput(SHOW_PREVIEW_MESH_INPUT, 'Mesh preview (fastest)', True, '', True)
+    showPreviewMesh.tooltip = 'Preview is drawn as a lightweight mesh without creating any timeline features'
+    commandUIState.registerCommandInput(showPreviewMesh)
 
     refreshUi()
 
@@ -736,13 +767,16 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     futil.add_handler(args.command.executePreview, command_preview, local_handlers=local_handlers)
     futil.add_handler(args.command.validateInputs, command_validate_input, local_handlers=local_handlers)
     futil.add_handler(args.command.destroy, command_destroy, local_handlers=local_handlers)
+    previewScheduler.start(args.command, local_handlers)
 
 
 # This event handler is called when the user clicks the OK button in the command dialog or 
 # is immediately called after the created event not command inputs were created for the dialog.
 def command_execute(args: adsk.core.CommandEventArgs):
     futil.log(f'{CMD_NAME} Command Execute Event')
-    generateBin(args)
+    clearPreviewGraphics()
+    with profilingUtils.profile(f'{CMD_NAME} execute', PROFILING_REPORT_PATH):
+        generateBin(args)
 
 # This event handler is called when the command needs to compute a new preview in the graphics window.
 def command_preview(args: adsk.core.CommandEventArgs):
@@ -751,9 +785,24 @@ def command_preview(args: adsk.core.CommandEventArgs):
     if is_all_input_valid(inputs):
         showPreview: adsk.core.BoolValueCommandInput = inputs.itemById(SHOW_PREVIEW_INPUT)
         showPreviewManual: adsk.core.BoolValueCommandInput = inputs.itemById(SHOW_PREVIEW_MANUAL_INPUT)
+        showPreviewMesh: adsk.core.BoolValueCommandInput = inputs.itemById(SHOW_PREVIEW_MESH_INPUT)
+        showPreviewSimplified: adsk.core.BoolValueCommandInput = inputs.itemById(SHOW_PREVIEW_SIMPLIFIED_INPUT)
         if showPreview.value or showPreviewManual.value:
-            args.isValidResult = generateBin(args)
+            if showPreviewMesh.value:
+                drawPreviewMesh(args)
+            else:
+                clearPreviewGraphics()
+                if previewScheduler.isPending and not showPreviewManual.value:
+                    futil.log(f'{CMD_NAME} Preview postponed until inputs settle')
+                else:
+                    with profilingUtils.profile(f'{CMD_NAME} preview', PROFILING_REPORT_PATH):
+                        isGenerated = generateBin(args, True)
+                        # a simplified preview is never kept as the result, execute builds the full bin
+                        if not showPreviewSimplified.value:
+                            args.isValidResult = isGenerated
             showPreviewManual.value = False
+        else:
+            clearPreviewGraphics()
     else:
         args.executeFailed = True
         args.executeFailedMessage = "Some inputs are invalid, unable to generate preview"
@@ -774,6 +823,8 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
     inputs = args.inputs
     global commandUIState
     futil.log(f'{CMD_NAME} Input Changed Event fired from a change to {changed_input.id}')
+    if not changed_input.id == SHOW_PREVIEW_MANUAL_INPUT:
+        previewScheduler.inputChanged()
     if changed_input.id == INPUT_CHANGES_SAVE_DEFAULTS:
         saveUIInputsAsDefaults()
     elif changed_input.id == INPUT_CHANGES_RESET_TO_DEFAULTS:
@@ -840,6 +891,9 @@ def command_validate_input(args: adsk.core.ValidateInputsEventArgs):
 def command_destroy(args: adsk.core.CommandEventArgs):
     # General logging for debug.
     futil.log(f'{CMD_NAME} Command Destroy Event "{args.terminationReason}"')
+    clearPreviewGraphics()
+    previewCache.clear()
+    previewScheduler.stop()
     global local_handlers
     local_handlers = []
 
@@ -859,6 +913,7 @@ def onChangeValidate():
     global commandUIState
 
     generateBase: bool = commandUIState.getState(BIN_GENERATE_BASE_INPUT_ID)
+    commandUIState.getInput(BIN_BASE_FAST_PATTERN_INPUT_ID).isEnabled = generateBase
     commandUIState.getInput(BIN_SCREW_HOLES_INPUT_ID).isEnabled = generateBase
     commandUIState.getInput(BIN_MAGNET_CUTOUTS_INPUT_ID).isEnabled = generateBase
     commandUIState.getInput(BIN_MAGNET_CUTOUTS_TABS_INPUT_ID).isEnabled = generateBase
@@ -931,11 +986,13 @@ def onChangeValidate():
 
     showPreview: bool = commandUIState.getInput(SHOW_PREVIEW_INPUT).value
     commandUIState.getInput(SHOW_PREVIEW_MANUAL_INPUT).isVisible = not showPreview
+    showPreviewMesh: bool = commandUIState.getInput(SHOW_PREVIEW_MESH_INPUT).value
+    commandUIState.getInput(SHOW_PREVIEW_SIMPLIFIED_INPUT).isEnabled = not showPreviewMesh
 
 def saveUIInputsAsDefaults():
     futil.log(f'{CMD_NAME} Saving UI state to file')
     result = configUtils.dumpJsonConfig(UI_INPUT_DEFAULTS_CONFIG_PATH, {
-        'static_ui': commandUIState.toDict(ignoreKeys=[SHOW_PREVIEW_MANUAL_INPUT, SHOW_PREVIEW_INPUT]),
+        'static_ui': commandUIState.toDict(ignoreKeys=[SHOW_PREVIEW_MANUAL_INPUT, SHOW_PREVIEW_INPUT, SHOW_PREVIEW_SIMPLIFIED_INPUT, SHOW_PREVIEW_MESH_INPUT]),
         'compartments_table': [x.toDict() for x in commandCompartmentsTableUIState]
         })
     if result:
@@ -943,8 +1000,7 @@ def saveUIInputsAsDefaults():
     else:
         futil.log(f'{CMD_NAME} UI state failed to save')
 
-def generateBin(args: adsk.core.CommandEventArgs):
-    inputs = args.command.commandInputs
+def getBinBodyGeneratorInput(inputs: adsk.core.CommandInputs) -> BinBodyGeneratorInput:
     base_width_unit: adsk.core.ValueCommandInput = inputs.itemById(BIN_BASE_WIDTH_UNIT_INPUT_ID)
     base_length_unit: adsk.core.ValueCommandInput = inputs.itemById(BIN_BASE_LENGTH_UNIT_INPUT_ID)
     height_unit: adsk.core.ValueCommandInput = inputs.itemById(BIN_HEIGHT_UNIT_INPUT_ID)
@@ -953,14 +1009,6 @@ def generateBin(args: adsk.core.CommandEventArgs):
     bin_length: adsk.core.ValueCommandInput = inputs.itemById(BIN_LENGTH_INPUT_ID)
     bin_height: adsk.core.ValueCommandInput = inputs.itemById(BIN_HEIGHT_INPUT_ID)
     bin_wall_thickness: adsk.core.ValueCommandInput = inputs.itemById(BIN_WALL_THICKNESS_INPUT_ID)
-    bin_screw_holes: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_SCREW_HOLES_INPUT_ID)
-    bin_generate_base: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_GENERATE_BASE_INPUT_ID)
-    bin_generate_body: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_GENERATE_BODY_INPUT_ID)
-    bin_magnet_cutouts: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_MAGNET_CUTOUTS_INPUT_ID)
-    bin_screw_hole_diameter: adsk.core.ValueCommandInput = inputs.itemById(BIN_SCREW_DIAMETER_INPUT)
-    bin_magnet_cutouts_tabs: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_MAGNET_CUTOUTS_TABS_INPUT_ID)
-    bin_magnet_cutout_diameter: adsk.core.ValueCommandInput = inputs.itemById(BIN_MAGNET_DIAMETER_INPUT)
-    bin_magnet_cutout_depth: adsk.core.ValueCommandInput = inputs.itemById(BIN_MAGNET_HEIGHT_INPUT)
     with_lip: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_WITH_LIP_INPUT_ID)
     with_lip_notches: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_WITH_LIP_NOTCHES_INPUT_ID)
     has_scoop: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_HAS_SCOOP_INPUT_ID)
@@ -981,25 +1029,146 @@ def generateBin(args: adsk.core.CommandEventArgs):
     isSolid = binTypeDropdownInput.selectedItem.name == BIN_TYPE_SOLID
     isShelled = binTypeDropdownInput.selectedItem.name == BIN_TYPE_SHELLED
 
+    binBodyInput = BinBodyGeneratorInput()
+    binBodyInput.hasLip = with_lip.value
+    binBodyInput.hasLipNotches = with_lip_notches.value
+    binBodyInput.binWidth = bin_width.value
+    binBodyInput.binLength = bin_length.value
+    binBodyInput.binHeight = bin_height.value
+    binBodyInput.baseWidth = base_width_unit.value
+    binBodyInput.baseLength = base_length_unit.value
+    binBodyInput.heightUnit = height_unit.value
+    binBodyInput.xyClearance = xy_clearance.value
+    binBodyInput.binCornerFilletRadius = const.BIN_CORNER_FILLET_RADIUS - xy_clearance.value
+    binBodyInput.isSolid = isSolid or isShelled
+    binBodyInput.wallThickness = bin_wall_thickness.value
+    binBodyInput.hasScoop = has_scoop.value and isHollow
+    binBodyInput.scoopMaxRadius = binScoopMaxRadius.value
+    binBodyInput.hasTab = hasTabInput.value and isHollow
+    binBodyInput.tabLength = binTabLength.value
+    binBodyInput.tabWidth = binTabWidth.value
+    binBodyInput.tabPosition = binTabPosition.value
+    binBodyInput.tabOverhangAngle = binTabAngle.value
+    binBodyInput.tabMethod = tabMethod
+    binBodyInput.rootThickness = commandUIState.getState(BIN_TAB_ROOT_THICKNESS_INPUT_ID)
+    
+    isUniform = commandUIState.getState(BIN_TAB_UNIFORM_THICKNESS_INPUT_ID)
+    if isUniform:
+        binBodyInput.tipThickness = binBodyInput.rootThickness
+    else:
+        binBodyInput.tipThickness = commandUIState.getState(BIN_TAB_TIP_THICKNESS_INPUT_ID)
+
+    isFilletUniform = commandUIState.getState(BIN_TAB_FILLET_UNIFORM_INPUT_ID)
+    binBodyInput.tabFilletTop = commandUIState.getState(BIN_TAB_FILLET_TOP_INPUT_ID)
+    if isFilletUniform:
+        binBodyInput.tabFilletBottom = binBodyInput.tabFilletTop
+    else:
+        binBodyInput.tabFilletBottom = commandUIState.getState(BIN_TAB_FILLET_BOTTOM_INPUT_ID)
+    
+    binBodyInput.tabFilletBack = commandUIState.getState(BIN_TAB_FILLET_BACK_INPUT_ID)
+
+    binBodyInput.compartmentsByX = compartmentsX.value
+    binBodyInput.compartmentsByY = compartmentsY.value
+
+    if binCompartmentGridTypeDropdownInput.selectedItem.name == BIN_COMPARTMENTS_GRID_TYPE_UNIFORM:
+        binBodyInput.compartments = uniformCompartments(binBodyInput.compartmentsByX, binBodyInput.compartmentsByY)
+    else:
+        binBodyInput.compartments = []
+        for i in range(1, binCompartmentsTable.rowCount):
+            positionX: adsk.core.IntegerSpinnerCommandInput = binCompartmentsTable.getInputAtPosition(i, 0)
+            positionY: adsk.core.IntegerSpinnerCommandInput  = binCompartmentsTable.getInputAtPosition(i, 1)
+            width: adsk.core.IntegerSpinnerCommandInput = binCompartmentsTable.getInputAtPosition(i, 2)
+            length: adsk.core.IntegerSpinnerCommandInput = binCompartmentsTable.getInputAtPosition(i, 3)
+            depth: adsk.core.ValueCommandInput = binCompartmentsTable.getInputAtPosition(i, 4)
+            binBodyInput.compartments.append(BinBodyCompartmentDefinition(positionX.value, positionY.value, width.value, length.value, depth.value))
+    return binBodyInput
+
+def clearPreviewGraphics():
+    global previewGraphics
+    try:
+        customGraphicsUtils.deleteGraphics(previewGraphics)
+    except:
+        futil.log(f'{CMD_NAME} Failed to remove preview graphics')
+    previewGraphics = None
+
+def drawPreviewMesh(args: adsk.core.CommandEventArgs):
+    global previewGraphics
+    inputs = args.command.commandInputs
+    bin_generate_base: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_GENERATE_BASE_INPUT_ID)
+    bin_generate_body: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_GENERATE_BODY_INPUT_ID)
+    try:
+        des = adsk.fusion.Design.cast(app.activeProduct)
+        previewKey = previewCache.computeKey(
+            commandUIState,
+            PREVIEW_CACHE_IGNORE_KEYS,
+            [x.toDict() for x in commandCompartmentsTableUIState],
+        )
+        mesh = previewCache.get(previewKey)
+        if mesh is not None and previewGraphics is not None and previewGraphics.isValid:
+            return
+        if mesh is None:
+            mesh = createGridfinityBinMesh(
+                getBinBodyGeneratorInput(inputs),
+                bin_generate_base.value,
+                bin_generate_body.value,
+            )
+            previewCache.store(previewKey, mesh)
+        clearPreviewGraphics()
+        previewGraphics = customGraphicsUtils.drawMesh(mesh, des.rootComponent)
+        futil.log(f'{CMD_NAME} Preview mesh drawn with {mesh.triangleCount} triangles')
+    except Exception as err:
+        args.executeFailed = True
+        args.executeFailedMessage = getErrorMessage()
+        futil.log(f'{CMD_NAME} Error occurred, {err}, {getErrorMessage()}')
+
+def showLeftOutFeatures(inputs: adsk.core.CommandInputs, features: list[str]):
+    infoText: adsk.core.TextBoxCommandInput = inputs.itemById(INFO_TEXT_INPUT)
+    if len(features) == 0:
+        infoText.formattedText = INFO_TEXT
+        infoText.numRows = 3
+        return
+    infoText.formattedText = '{}<br><b>Warning:</b> designs without history leave out {}, there is no preview and OK asks before building'.format(INFO_TEXT, ', '.join(features))
+    infoText.numRows = 5
+    inputs.itemById(INFO_GROUP).isExpanded = True
+
+def confirmLeftOutFeatures(features: list[str], partName: str) -> bool:
+    message = 'Designs without history leave out {}. Build the {} without them?'.format(', '.join(features), partName)
+    return ui.messageBox(message, CMD_NAME, adsk.core.MessageBoxButtonTypes.YesNoButtonType, adsk.core.MessageBoxIconTypes.WarningIconType) == adsk.core.DialogResults.DialogYes
+
+def generateBin(args: adsk.core.CommandEventArgs, isPreview: bool = False):
+    inputs = args.command.commandInputs
+    base_width_unit: adsk.core.ValueCommandInput = inputs.itemById(BIN_BASE_WIDTH_UNIT_INPUT_ID)
+    base_length_unit: adsk.core.ValueCommandInput = inputs.itemById(BIN_BASE_LENGTH_UNIT_INPUT_ID)
+    xy_clearance: adsk.core.ValueCommandInput = inputs.itemById(BIN_XY_CLEARANCE_INPUT_ID)
+    bin_width: adsk.core.ValueCommandInput = inputs.itemById(BIN_WIDTH_INPUT_ID)
+    bin_length: adsk.core.ValueCommandInput = inputs.itemById(BIN_LENGTH_INPUT_ID)
+    bin_height: adsk.core.ValueCommandInput = inputs.itemById(BIN_HEIGHT_INPUT_ID)
+    bin_screw_holes: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_SCREW_HOLES_INPUT_ID)
+    bin_generate_base: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_GENERATE_BASE_INPUT_ID)
+    bin_base_fast_pattern: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_BASE_FAST_PATTERN_INPUT_ID)
+    bin_generate_body: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_GENERATE_BODY_INPUT_ID)
+    bin_magnet_cutouts: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_MAGNET_CUTOUTS_INPUT_ID)
+    bin_screw_hole_diameter: adsk.core.ValueCommandInput = inputs.itemById(BIN_SCREW_DIAMETER_INPUT)
+    bin_magnet_cutouts_tabs: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_MAGNET_CUTOUTS_TABS_INPUT_ID)
+    bin_magnet_cutout_diameter: adsk.core.ValueCommandInput = inputs.itemById(BIN_MAGNET_DIAMETER_INPUT)
+    bin_magnet_cutout_depth: adsk.core.ValueCommandInput = inputs.itemById(BIN_MAGNET_HEIGHT_INPUT)
+    hasTabInput: adsk.core.BoolValueCommandInput = inputs.itemById(BIN_HAS_TAB_INPUT_ID)
+    binTypeDropdownInput: adsk.core.DropDownCommandInput = inputs.itemById(BIN_TYPE_DROPDOWN_ID)
+    showPreviewSimplified: adsk.core.BoolValueCommandInput = inputs.itemById(SHOW_PREVIEW_SIMPLIFIED_INPUT)
+
+    isSimplified = isPreview and showPreviewSimplified.value
+    isShelled = binTypeDropdownInput.selectedItem.name == BIN_TYPE_SHELLED
+
     try:
         des = adsk.fusion.Design.cast(app.activeProduct)
-        if des.designType == 0:
-            raise UnsupportedDesignTypeException('Timeline must be enabled for the generator to work, projects with disabled design history currently are not supported')
         root = adsk.fusion.Component.cast(des.rootComponent)
         xyClearance = xy_clearance.value
         binName = 'Gridfinity bin {}x{}x{}'.format(int(bin_length.value), int(bin_width.value), int(bin_height.value))
 
-        # create new component
-        newCmpOcc = adsk.fusion.Occurrences.cast(root.occurrences).addNewComponent(adsk.core.Matrix3D.create())
-        newCmpOcc.component.name = binName
-        newCmpOcc.activate()
-        gridfinityBinComponent: adsk.fusion.Component = newCmpOcc.component
-        features: adsk.fusion.Features = gridfinityBinComponent.features
-
         # create base interface
         baseGeneratorInput = BaseGeneratorInput()
         baseGeneratorInput.originPoint = geometryUtils.createOffsetPoint(
-            gridfinityBinComponent.originConstructionPoint.geometry,
+            adsk.core.Point3D.create(0, 0, 0),
             byX=-xyClearance,
             byY=-xyClearance,
         )
@@ -1013,160 +1182,51 @@ def generateBin(args: adsk.core.CommandEventArgs):
         baseGeneratorInput.magnetCutoutsDiameter = bin_magnet_cutout_diameter.value
         baseGeneratorInput.magnetCutoutsDepth = bin_magnet_cutout_depth.value
 
-        baseBodies: list[adsk.fusion.BRepBody]
-        if bin_generate_base.value:
-            baseBodies = createBaseBodyPattern(
-                baseGeneratorInput,
-                bin_width.value,
-                bin_length.value,
-                gridfinityBinComponent,
-            )
-
         # create bin body
-        binBodyInput = BinBodyGeneratorInput()
-        binBodyInput.hasLip = with_lip.value
-        binBodyInput.hasLipNotches = with_lip_notches.value
-        binBodyInput.binWidth = bin_width.value
-        binBodyInput.binLength = bin_length.value
-        binBodyInput.binHeight = bin_height.value
-        binBodyInput.baseWidth = base_width_unit.value
-        binBodyInput.baseLength = base_length_unit.value
-        binBodyInput.heightUnit = height_unit.value
-        binBodyInput.xyClearance = xyClearance
-        binBodyInput.binCornerFilletRadius = const.BIN_CORNER_FILLET_RADIUS - xyClearance
-        binBodyInput.isSolid = isSolid or isShelled
-        binBodyInput.wallThickness = bin_wall_thickness.value
-        binBodyInput.hasScoop = has_scoop.value and isHollow
-        binBodyInput.scoopMaxRadius = binScoopMaxRadius.value
-        binBodyInput.hasTab = hasTabInput.value and isHollow
-        binBodyInput.tabLength = binTabLength.value
-        binBodyInput.tabWidth = binTabWidth.value
-        binBodyInput.tabPosition = binTabPosition.value
-        binBodyInput.tabOverhangAngle = binTabAngle.value
-        binBodyInput.tabMethod = tabMethod
-        binBodyInput.rootThickness = commandUIState.getState(BIN_TAB_ROOT_THICKNESS_INPUT_ID)
-        
-        isUniform = commandUIState.getState(BIN_TAB_UNIFORM_THICKNESS_INPUT_ID)
-        if isUniform:
-            binBodyInput.tipThickness = binBodyInput.rootThickness
-        else:
-            binBodyInput.tipThickness = commandUIState.getState(BIN_TAB_TIP_THICKNESS_INPUT_ID)
-
-        isFilletUniform = commandUIState.getState(BIN_TAB_FILLET_UNIFORM_INPUT_ID)
-        binBodyInput.tabFilletTop = commandUIState.getState(BIN_TAB_FILLET_TOP_INPUT_ID)
-        if isFilletUniform:
-            binBodyInput.tabFilletBottom = binBodyInput.tabFilletTop
-        else:
-            binBodyInput.tabFilletBottom = commandUIState.getState(BIN_TAB_FILLET_BOTTOM_INPUT_ID)
-        
-        binBodyInput.tabFilletBack = commandUIState.getState(BIN_TAB_FILLET_BACK_INPUT_ID)
-
-        binBodyInput.compartmentsByX = compartmentsX.value
-        binBodyInput.compartmentsByY = compartmentsY.value
-
-        if binCompartmentGridTypeDropdownInput.selectedItem.name == BIN_COMPARTMENTS_GRID_TYPE_UNIFORM:
-            binBodyInput.compartments = uniformCompartments(binBodyInput.compartmentsByX, binBodyInput.compartmentsByY)
-        else:
-            binBodyInput.compartments = []
-            for i in range(1, binCompartmentsTable.rowCount):
-                positionX: adsk.core.IntegerSpinnerCommandInput = binCompartmentsTable.getInputAtPosition(i, 0)
-                positionY: adsk.core.IntegerSpinnerCommandInput  = binCompartmentsTable.getInputAtPosition(i, 1)
-                width: adsk.core.IntegerSpinnerCommandInput = binCompartmentsTable.getInputAtPosition(i, 2)
-                length: adsk.core.IntegerSpinnerCommandInput = binCompartmentsTable.getInputAtPosition(i, 3)
-                depth: adsk.core.ValueCommandInput = binCompartmentsTable.getInputAtPosition(i, 4)
-                binBodyInput.compartments.append(BinBodyCompartmentDefinition(positionX.value, positionY.value, width.value, length.value, depth.value))
-
-        binBody: adsk.fusion.BRepBody
-
-        if bin_generate_body.value:
-            binBody = createGridfinityBinBody(
-                binBodyInput,
-                gridfinityBinComponent,
-            )
-        if bin_generate_body.value or bin_generate_base.value:
-            cutBaseClearance(
-                baseGeneratorInput,
-                bin_width.value,
-                bin_length.value,
-                gridfinityBinComponent,
-            )
-
-        # merge everything
-        if bin_generate_body.value and bin_generate_base.value:
-            toolBodies = commonUtils.objectCollectionFromList(baseBodies)
-            combineFeatures = gridfinityBinComponent.features.combineFeatures
-            combineFeatureInput = combineFeatures.createInput(binBody, toolBodies)
-            combineFeatures.add(combineFeatureInput)
-            gridfinityBinComponent.bRepBodies.item(0).name = binName
-
-        if isShelled and bin_generate_body.value:
-            # face.boundingBox.maxPoint.z ~ face.boundingBox.minPoint.z => face horizontal
-            # largest horizontal face
-            horizontalFaces = [face for face in binBody.faces if geometryUtils.isHorizontal(face)]
-            topFace = faceUtils.maxByArea(horizontalFaces)
-            topFaceMinPoint = topFace.boundingBox.minPoint
-            if binBodyInput.hasLip:
-                splitBodyFeatures = features.splitBodyFeatures
-                splitBodyInput = splitBodyFeatures.createInput(
-                    binBody,
-                    topFace,
-                    True
-                )
-                splitBodies = splitBodyFeatures.add(splitBodyInput)
-                bottomBody = min(splitBodies.bodies, key=lambda x: x.boundingBox.minPoint.z)
-                topBody = max(splitBodies.bodies, key=lambda x: x.boundingBox.minPoint.z)
-                horizontalFaces = [face for face in bottomBody.faces if geometryUtils.isHorizontal(face)]
-                topFace = faceUtils.maxByArea(horizontalFaces)
-                shellUtils.simpleShell([topFace], binBodyInput.wallThickness - xyClearance, gridfinityBinComponent)
-                toolBodies = adsk.core.ObjectCollection.create()
-                toolBodies.add(topBody)
-                combineAfterShellFeatureInput = combineFeatures.createInput(bottomBody, toolBodies)
-                combineFeatures.add(combineAfterShellFeatureInput)
-                binBody = gridfinityBinComponent.bRepBodies.item(0)
+        binBodyInput = getBinBodyGeneratorInput(inputs)
+        binBodyInput.isSimplified = isSimplified
+
+        binInput = BinGeneratorInput()
+        binInput.baseInput = baseGeneratorInput
+        binInput.binBodyInput = binBodyInput
+        binInput.hasBase = bin_generate_base.value
+        binInput.hasBody = bin_generate_body.value
+        binInput.isFastBasePattern = bin_base_fast_pattern.value
+        binInput.isShelled = isShelled
+        binInput.hasTab = hasTabInput.value
+
+        if des.designType != adsk.fusion.DesignTypes.ParametricDesignType:
+            leftOutFeatures = getLeftOutBinFeatures(binInput)
+            showLeftOutFeatures(inputs, leftOutFeatures)
+            # a direct design never gets a different part than the inputs ask for without the user agreeing to it
+            if len(leftOutFeatures) > 0 and isPreview:
+                return False
+            if len(leftOutFeatures) > 0 and not confirmLeftOutFeatures(leftOutFeatures, 'bin'):
+                raise UnsupportedDesignTypeException('Designs without history leave out ' + ', '.join(leftOutFeatures) + ', disable them or enable the design history to build this bin')
+
+        with generationSessionUtils.HiddenGenerationSession(des, binName, 'bin preview' if isPreview else 'bin') as session:
+            # identical bin already in the design, place another copy of it
+            binFingerprint = componentReuseUtils.getFingerprint(binInput, session.isParametric)
+            if componentReuseUtils.placeGeneratedComponent(des, binFingerprint, root, name=binName) is not None:
+                return True
+
+            # create new component
+            newCmpOcc = session.addOccurrence(root, binName)
+            newCmpOcc.activate()
+            gridfinityBinComponent: adsk.fusion.Component = newCmpOcc.component
+
+            if session.isParametric:
+                createGridfinityBin(binInput, gridfinityBinComponent)
             else:
-                shellUtils.simpleShell([topFace], binBodyInput.wallThickness - xyClearance, gridfinityBinComponent)
-            
-            if hasTabInput.value:
-                compartmentTabInput = BinBodyTabGeneratorInput()
-                tabOriginPoint = adsk.core.Point3D.create(
-                    binBodyInput.wallThickness + max(0, min(binBodyInput.tabPosition, binBodyInput.binWidth - binBodyInput.tabLength)) * binBodyInput.baseWidth,
-                    const.BIN_LIP_WALL_THICKNESS if binBodyInput.hasLip and binBodyInput.hasScoop else binBodyInput.wallThickness + binBodyInput.binLength * binBodyInput.baseLength - binBodyInput.wallThickness - binBodyInput.xyClearance * 2,
-                    (binBodyInput.binHeight - 1) * binBodyInput.heightUnit + max(0, binBodyInput.heightUnit - const.BIN_BASE_HEIGHT),
-                )
-                compartmentTabInput.origin = tabOriginPoint
-                compartmentTabInput.length = max(0, min(binBodyInput.tabLength, binBodyInput.binWidth)) * binBodyInput.baseWidth - binBodyInput.wallThickness * 2 - binBodyInput.xyClearance * 2
-                compartmentTabInput.width = binBodyInput.tabWidth
-                compartmentTabInput.overhangAngle = binBodyInput.tabOverhangAngle
-                compartmentTabInput.topClearance = const.BIN_TAB_TOP_CLEARANCE
-
-                # Populate new fields
-                compartmentTabInput.tabMethod = commandUIState.getState(BIN_TAB_METHOD_INPUT_ID)
-                compartmentTabInput.rootThickness = commandUIState.getState(BIN_TAB_ROOT_THICKNESS_INPUT_ID)
-                
-                isUniform = commandUIState.getState(BIN_TAB_UNIFORM_THICKNESS_INPUT_ID)
-                if isUniform:
-                    compartmentTabInput.tipThickness = compartmentTabInput.rootThickness
-                else:
-                    compartmentTabInput.tipThickness = commandUIState.getState(BIN_TAB_TIP_THICKNESS_INPUT_ID)
-
-                tabBody = createGridfinityBinBodyTab(compartmentTabInput, gridfinityBinComponent)
-                combineInput = combineFeatures.createInput(tabBody, commonUtils.objectCollectionFromList([binBody]))
-                combineInput.operation = adsk.fusion.FeatureOperations.CutFeatureOperation
-                combineInput.isKeepToolBodies = True
-                combineFeature = combineFeatures.add(combineInput)
-                tabBodies = [body for body in combineFeature.bodies if body.faces != binBody.faces]
-                tabMainBody = max([body for body in tabBodies], key=lambda x: x.edges.count)
-                bodiesToRemove = [body for body in tabBodies if body is not tabMainBody]
-                for body in bodiesToRemove:
-                    gridfinityBinComponent.features.removeFeatures.add(body)
-                combineUtils.joinBodies(binBody, commonUtils.objectCollectionFromList([tabMainBody]), gridfinityBinComponent)
-
-        # group features in timeline
-        binGroup = des.timeline.timelineGroups.add(newCmpOcc.timelineObject.index, newCmpOcc.timelineObject.index + gridfinityBinComponent.features.count + gridfinityBinComponent.constructionPlanes.count + gridfinityBinComponent.constructionAxes.count + gridfinityBinComponent.sketches.count)
-        binGroup.name = binName
+                # direct designs have no timeline to hold features, the bodies are built from temporary BReps
+                createGridfinityBinDirect(binInput, gridfinityBinComponent, False)
+            if bin_generate_body.value and bin_generate_base.value:
+                gridfinityBinComponent.bRepBodies.item(0).name = binName
+            session.markGenerated(gridfinityBinComponent, binFingerprint)
     except UnsupportedDesignTypeException as err:
         args.executeFailed = True
-        args.executeFailedMessage = 'Design type is unsupported. Projects with disabled design history are unsupported, please enable timeline feature to proceed.'
+        args.executeFailedMessage = str(err)
+        futil.log(f'{CMD_NAME} {err}')
         return False
     except Exception as err:
         args.executeFailed = True
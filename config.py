@@ -17,5 +17,30 @@ DEBUG = True
 ADDIN_NAME = 'GridfinityGenerator'
 COMPANY_NAME = 'LevMishin'
 
+# Folder for data generated at runtime that can be safely deleted, e.g. cached bodies
+CACHE_FOLDER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+
 # Palettes
-sample_palette_id = f'{COMPANY_NAME}_{ADDIN_NAME}_palette_id'
\ No newline at end of file
+sample_palette_id = f'{COMPANY_NAME}_{ADDIN_NAME}_palette_id'
+
+# Seconds without input changes before a timeline preview is generated, 0 disables the delay
+PREVIEW_QUIET_PERIOD = 0.4
+
+# Record timings of generator stages and feature calls into commandConfig/profiling_report.json
+PROFILING_ENABLED = False
+
+# Place another occurrence of an already generated component when a command runs with identical inputs,
+# components whose bodies were edited after generation are not reused
+REUSE_IDENTICAL_COMPONENTS = True
+
+# Baseplates with more cells than this are built from tiles of BASEPLATE_TILE_SIZE x BASEPLATE_TILE_SIZE cells,
+# one tile is cut and then patterned instead of cutting every bin socket from the whole plate. Tile size 1 disables it
+BASEPLATE_TILING_MIN_CELLS = 100
+BASEPLATE_TILE_SIZE = 4
+
+# Shuffled packing attempts per drawer when the largest first packing leaves some of the requested bins out
+DRAWER_PACKING_RESTARTS = 200
+
+# Keep the generated occurrence hidden while a command builds it. Builds with this off are recorded
+# as the baseline the hidden builds report their saved time against
+GENERATION_SESSION_HIDE_OCCURRENCES = True
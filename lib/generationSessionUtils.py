@@ -0,0 +1,111 @@
+import adsk.core, adsk.fusion, traceback
+import os
+import time
+
+from . import fusion360utils as futil
+from . import configUtils
+from .gridfinityUtils import componentReuseUtils, topologyUtils
+from .. import config
+
+BASELINE_PATH = os.path.join(config.CACHE_FOLDER_PATH, 'generation_baseline.json')
+
+class HiddenGenerationSession():
+    """
+    Wraps a full build: the occurrences created through the session stay hidden until the build is done, so the
+    viewport is drawn once instead of after every feature, and everything the build added to the timeline is
+    grouped under one name at the end. Fusion recomputes every feature as it is added, the Python API has no
+    design level compute deferral. State is restored on exit, also when the build fails.
+    """
+    def __init__(self, design: adsk.fusion.Design, name: str, label: str = 'build', isHidden: bool = None):
+        self.design = design
+        self.name = name
+        self.label = label
+        self.isHidden = config.GENERATION_SESSION_HIDE_OCCURRENCES if isHidden is None else isHidden
+        self.isParametric = design.designType == adsk.fusion.DesignTypes.ParametricDesignType
+        self.timelineStart = 0
+        self.timelineItems = 0
+        self.startTime = 0.0
+        self.elapsed = 0.0
+        self.hiddenOccurrences: list[adsk.fusion.Occurrence] = []
+        self.generatedComponents: list[tuple[adsk.fusion.Component, str]] = []
+
+    def __enter__(self) -> 'HiddenGenerationSession':
+        if self.isParametric:
+            self.timelineStart = self.design.timeline.count
+        self.startTime = time.perf_counter()
+        return self
+
+    def __exit__(self, excType, excValue, excTraceback):
+        try:
+            self.restore()
+            if excType is None:
+                self.markGeneratedComponents()
+            if excType is None and self.isParametric:
+                self.groupTimeline()
+        finally:
+            # indexed faces and edges are proxies of this build, previews get rolled back before the next one
+            topologyUtils.clearTopologyIndexes()
+            self.elapsed = time.perf_counter() - self.startTime
+        if excType is None:
+            self.report()
+        return False
+
+    def addOccurrence(self, parentComponent: adsk.fusion.Component, name: str, transform: adsk.core.Matrix3D = None) -> adsk.fusion.Occurrence:
+        occurrence = adsk.fusion.Occurrences.cast(parentComponent.occurrences).addNewComponent(adsk.core.Matrix3D.create() if transform is None else transform)
+        occurrence.component.name = name
+        if self.isHidden and occurrence.isLightBulbOn:
+            occurrence.isLightBulbOn = False
+            self.hiddenOccurrences.append(occurrence)
+        return occurrence
+
+    def markGenerated(self, component: adsk.fusion.Component, fingerprint: str):
+        self.generatedComponents.append((component, fingerprint))
+
+    def markGeneratedComponents(self):
+        # marked once the build is done, so the stored body revisions are the final ones
+        for [component, fingerprint] in self.generatedComponents:
+            componentReuseUtils.markGeneratedComponent(component, fingerprint)
+        self.generatedComponents = []
+
+    def restore(self):
+        failures = []
+        # only the occurrences this session hid, previews rolled back by Fusion are gone already
+        for occurrence in self.hiddenOccurrences:
+            try:
+                if occurrence.isValid:
+                    occurrence.isLightBulbOn = True
+            except:
+                failures.append(traceback.format_exc())
+        self.hiddenOccurrences = []
+        if self.isHidden:
+            # the whole build is drawn once instead of after every feature
+            adsk.core.Application.get().activeViewport.refresh()
+        for failure in failures:
+            futil.log(f'Failed to restore design state after {self.label}:\n{failure}')
+
+    def groupTimeline(self):
+        timeline = self.design.timeline
+        self.timelineItems = timeline.count - self.timelineStart
+        # a single placed copy has nothing to group
+        if self.timelineItems > 1:
+            group = timeline.timelineGroups.add(self.timelineStart, timeline.count - 1)
+            group.name = self.name
+
+    def report(self):
+        if self.timelineItems < 1:
+            return
+        secondsPerItem = self.elapsed / self.timelineItems
+        baselines = configUtils.readJsonConfig(BASELINE_PATH) or {}
+        if not self.isHidden:
+            baselines[self.label] = {'secondsPerItem': secondsPerItem, 'items': self.timelineItems}
+            os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+            configUtils.dumpJsonConfig(BASELINE_PATH, baselines)
+            futil.log(f'{self.name} built in {self.elapsed:.3f}s ({self.timelineItems} timeline items) with visible occurrences, recorded as the {self.label} baseline')
+            return
+        baseline = baselines.get(self.label)
+        if baseline is None:
+            futil.log(f'{self.name} built in {self.elapsed:.3f}s ({self.timelineItems} timeline items), no {self.label} baseline with visible occurrences to compare with')
+            return
+        # builds differ in size, the baseline is scaled by the number of timeline items
+        expected = baseline['secondsPerItem'] * self.timelineItems
+        futil.log(f'{self.name} built in {self.elapsed:.3f}s ({self.timelineItems} timeline items), {expected - self.elapsed:.3f}s saved by hiding the occurrences against the {self.label} baseline of {expected:.3f}s')
@@ -0,0 +1,58 @@
+import adsk.core, adsk.fusion, traceback
+import os
+
+from .baseGeneratorInput import BaseGeneratorInput
+from . import fingerprintUtils
+from ...lib import fusion360utils as futil
+from ... import config
+
+# bump to invalidate cached bodies after changes to the base geometry
+BASE_BODY_CACHE_VERSION = 1
+BASE_BODY_CACHE_FOLDER_PATH = os.path.join(config.CACHE_FOLDER_PATH, 'baseBodies')
+
+def getCacheKey(input: BaseGeneratorInput):
+    return fingerprintUtils.fingerprint({
+        'version': BASE_BODY_CACHE_VERSION,
+        'originPoint': input.originPoint,
+        'baseWidth': input.baseWidth,
+        'baseLength': input.baseLength,
+        'cornerFilletRadius': input.cornerFilletRadius,
+        'xyClearance': input.xyClearance,
+        'hasBottomChamfer': input.hasBottomChamfer,
+        'hasScrewHoles': input.hasScrewHoles,
+        'screwHolesDiameter': input.screwHolesDiameter,
+        'hasMagnetCutouts': input.hasMagnetCutouts,
+        'hasMagnetCutoutsTabs': input.hasMagnetCutoutsTabs,
+        'magnetCutoutsDiameter': input.magnetCutoutsDiameter,
+        'magnetCutoutsDepth': input.magnetCutoutsDepth,
+    })
+
+def getCachePath(input: BaseGeneratorInput):
+    return os.path.join(BASE_BODY_CACHE_FOLDER_PATH, f'{getCacheKey(input)}.smt')
+
+def hasBaseBody(input: BaseGeneratorInput):
+    return os.path.exists(getCachePath(input))
+
+def loadBaseBody(input: BaseGeneratorInput):
+    cachePath = getCachePath(input)
+    if not os.path.exists(cachePath):
+        return None
+    try:
+        bodies = adsk.fusion.TemporaryBRepManager.get().createFromFile(cachePath)
+        if bodies is None or bodies.count != 1:
+            futil.log(f'Ignoring invalid base body cache entry {cachePath}')
+            return None
+        return bodies.item(0)
+    except:
+        futil.log(f'Couldn\'t load base body from cache {cachePath}')
+        return None
+
+def storeBaseBody(input: BaseGeneratorInput, body: adsk.fusion.BRepBody):
+    cachePath = getCachePath(input)
+    try:
+        if not os.path.exists(BASE_BODY_CACHE_FOLDER_PATH):
+            os.makedirs(BASE_BODY_CACHE_FOLDER_PATH)
+        return adsk.fusion.TemporaryBRepManager.get().exportToFile([body], cachePath)
+    except Exception as err:
+        futil.log(f'Couldn\'t write base body to cache {cachePath}, error: {err}')
+        return False
@@ -3,7 +3,7 @@ import os
 
 from .sketchUtils import createRectangle
 from ...lib.gridfinityUtils.baseGeneratorInput import BaseGeneratorInput
-from . import sketchUtils, const, edgeUtils, commonUtils, combineUtils, faceUtils, extrudeUtils, shapeUtils, geometryUtils
+from . import sketchUtils, const, edgeUtils, commonUtils, combineUtils, faceUtils, extrudeUtils, shapeUtils, geometryUtils, baseBodyCache, topologyUtils
 from ...lib import fusion360utils as futil
 from ... import config
 
@@ -397,6 +397,46 @@ def createBaseBodyPattern(
     rectangularPattern = rectangularPatternFeatures.add(patternInput)
     return list(rectangularPattern.bodies) + [baseBody]
 
+def createBaseBodyPatternFromBRep(
+    baseConfiguration: BaseGeneratorInput,
+    basesXCount,
+    basesYCount,
+    targetComponent: adsk.fusion.Component,
+):
+    tempBrepManager = adsk.fusion.TemporaryBRepManager.get()
+    timelineBaseBodies: list[adsk.fusion.BRepBody] = []
+    cachedBaseBody = baseBodyCache.loadBaseBody(baseConfiguration)
+    if cachedBaseBody is None:
+        baseBody = createSingleGridfinityBaseBody(baseConfiguration, targetComponent)
+        baseBodyCache.storeBaseBody(baseConfiguration, baseBody)
+        timelineBaseBodies.append(baseBody)
+        cachedBaseBody = tempBrepManager.copy(baseBody)
+    else:
+        futil.log('Base body loaded from cache')
+
+    # copy finished base body instead of recomputing it for every pattern element
+    baseBodyCopies: list[adsk.fusion.BRepBody] = []
+    for i in range(int(basesXCount)):
+        for j in range(int(basesYCount)):
+            if i == 0 and j == 0 and len(timelineBaseBodies) > 0:
+                continue
+            baseBodyCopy = tempBrepManager.copy(cachedBaseBody)
+            transform = adsk.core.Matrix3D.create()
+            transform.translation = adsk.core.Vector3D.create(baseConfiguration.baseWidth * i, baseConfiguration.baseLength * j, 0)
+            tempBrepManager.transform(baseBodyCopy, transform)
+            baseBodyCopies.append(baseBodyCopy)
+
+    if len(baseBodyCopies) == 0:
+        return timelineBaseBodies
+
+    baseFeature = targetComponent.features.baseFeatures.add()
+    baseFeature.name = 'Base pattern'
+    baseFeature.startEdit()
+    for baseBodyCopy in baseBodyCopies:
+        targetComponent.bRepBodies.add(baseBodyCopy, baseFeature)
+    baseFeature.finishEdit()
+    return list(baseFeature.bodies) + timelineBaseBodies
+
 def cutBaseClearance(
     baseConfiguration: BaseGeneratorInput,
     basesXCount,
@@ -405,6 +445,30 @@ def cutBaseClearance(
 ):
     actual_base_width = baseConfiguration.baseWidth * basesXCount - baseConfiguration.xyClearance * 2
     actual_base_length = baseConfiguration.baseLength * basesYCount - baseConfiguration.xyClearance * 2
+    filletRadius = baseConfiguration.cornerFilletRadius - baseConfiguration.xyClearance
+    clearanceCutWidth = 1
+    clearanceCutHeight = 100
+
+    # only bodies reaching into the clearance ring are cut, bodies inside the footprint clear of its rounded corners can't be touched
+    innerMinX = baseConfiguration.originPoint.x + baseConfiguration.xyClearance
+    innerMinY = baseConfiguration.originPoint.y + baseConfiguration.xyClearance
+    innerMaxX = innerMinX + actual_base_width
+    innerMaxY = innerMinY + actual_base_length
+    bodies = list(targetComponent.bRepBodies)
+    bodyBoxes = topologyUtils.getBodyBoxTable(bodies)
+    participantRows = bodyBoxes.overlapping((
+        innerMinX - clearanceCutWidth, innerMinY - clearanceCutWidth, baseConfiguration.originPoint.z - clearanceCutHeight,
+        innerMaxX + clearanceCutWidth, innerMaxY + clearanceCutWidth, baseConfiguration.originPoint.z + clearanceCutHeight,
+    ))
+    participantBodies = [
+        bodies[row] for row in participantRows
+        if not bodyBoxes.isWithin(row, (innerMinX + filletRadius, innerMinY, -math.inf, innerMaxX - filletRadius, innerMaxY, math.inf))
+        and not bodyBoxes.isWithin(row, (innerMinX, innerMinY + filletRadius, -math.inf, innerMaxX, innerMaxY - filletRadius, math.inf))
+    ]
+    # an empty participant list would make the extrude cut every body in the component
+    if len(participantBodies) == 0:
+        return None
+
     features = targetComponent.features
     baseConstructionPlaneInput: adsk.fusion.ConstructionPlaneInput = targetComponent.constructionPlanes.createInput()
     baseConstructionPlaneInput.setByOffset(targetComponent.xYConstructionPlane, adsk.core.ValueInput.createByReal(baseConfiguration.originPoint.z))
@@ -427,7 +491,6 @@ def cutBaseClearance(
     sketchDimensions = baseClearanceCutSketch.sketchDimensions
 
     [side1, side2, side3, side4] = list(innerRectangle)
-    filletRadius = baseConfiguration.cornerFilletRadius - baseConfiguration.xyClearance
     fillet1 = sketchArcs.addFillet(side1, side1.endSketchPoint.geometry, side2, side2.startSketchPoint.geometry, filletRadius)
     fillet2 = sketchArcs.addFillet(side2, side2.endSketchPoint.geometry, side3, side3.startSketchPoint.geometry, filletRadius)
     fillet3 = sketchArcs.addFillet(side3, side3.endSketchPoint.geometry, side4, side4.startSketchPoint.geometry, filletRadius)
@@ -438,7 +501,7 @@ def cutBaseClearance(
     geometricConstraints.addEqual(fillet3, fillet4)
     sketchDimensions.addRadialDimension(fillet1, fillet1.startSketchPoint.geometry)
 
-    baseClearanceCutSketch.offset(commonUtils.objectCollectionFromList([fillet1, fillet2, fillet3, fillet4, side1, side2, side3, side4]), baseConfiguration.originPoint, 1)
+    baseClearanceCutSketch.offset(commonUtils.objectCollectionFromList([fillet1, fillet2, fillet3, fillet4, side1, side2, side3, side4]), baseConfiguration.originPoint, clearanceCutWidth)
 
     cuttingProfile = min(list(baseClearanceCutSketch.profiles), key=lambda x: x.boundingBox.minPoint.x)
     clearanceCutExtrudeInput = features.extrudeFeatures.createInput(
@@ -449,6 +512,7 @@ def cutBaseClearance(
         adsk.fusion.DistanceExtentDefinition.create(adsk.core.ValueInput.createByReal(100)),
         adsk.fusion.DistanceExtentDefinition.create(adsk.core.ValueInput.createByReal(100)),
     )
-    clearanceCutExtrudeInput.participantBodies = list(targetComponent.bRepBodies)
+    clearanceCutExtrudeInput.participantBodies = participantBodies
     clearanceCutExtrude = features.extrudeFeatures.add(clearanceCutExtrudeInput)
-    clearanceCutExtrude.name = "Base side clearance cut"
\ No newline at end of file
+    clearanceCutExtrude.name = "Base side clearance cut"
+    return clearanceCutExtrude
\ No newline at end of file
@@ -5,6 +5,7 @@ from .const import DIMENSION_MAGNET_CUTOUT_DEPTH, DIMENSION_MAGNET_CUTOUT_DIAMET
 class BaseGeneratorInput():
     def __init__(self):
         self.hasMagnetCutouts = False
+        self.hasMagnetCutoutsTabs = False
         self.hasScrewHoles = False
         self.hasBottomChamfer = True
         self.screwHolesDiameter = DIMENSION_SCREW_HOLE_DIAMETER
@@ -84,6 +85,14 @@ class BaseGeneratorInput():
     def hasMagnetCutouts(self, value: bool):
         self._hasMagnetCutouts = value
 
+    @property
+    def hasMagnetCutoutsTabs(self) -> bool:
+        return self._hasMagnetCutoutsTabs
+
+    @hasMagnetCutoutsTabs.setter
+    def hasMagnetCutoutsTabs(self, value: bool):
+        self._hasMagnetCutoutsTabs = value
+
     @property
     def magnetCutoutsDiameter(self) -> float:
         return self._magnetCutoutsDiameter
@@ -2,9 +2,15 @@ import math
 import adsk.core, adsk.fusion, traceback
 import os
 
-from . import const, commonUtils, filletUtils, combineUtils, faceUtils, extrudeUtils, sketchUtils, baseGenerator, patternUtils, shapeUtils, geometryUtils
+from . import const, commonUtils, filletUtils, combineUtils, faceUtils, extrudeUtils, sketchUtils, baseGenerator, patternUtils, shapeUtils, geometryUtils, topologyUtils
 from .baseGeneratorInput import BaseGeneratorInput
 from .baseplateGeneratorInput import BaseplateGeneratorInput
+from ... import config
+
+def getTileSize(input: BaseplateGeneratorInput) -> int:
+    if input.baseplateWidth * input.baseplateLength <= config.BASEPLATE_TILING_MIN_CELLS:
+        return 1
+    return int(min(config.BASEPLATE_TILE_SIZE, input.baseplateWidth, input.baseplateLength))
 
 def createGridfinityBaseplate(input: BaseplateGeneratorInput, targetComponent: adsk.fusion.Component):
     features = targetComponent.features
@@ -117,9 +123,9 @@ def createGridfinityBaseplate(input: BaseplateGeneratorInput, targetComponent: a
         )
         extraCutoutBodies.append(centerCutoutBody)
         if input.hasConnectionHoles:
-            connectionHoleFaceY = min([face for face in centerCutoutBody.faces if faceUtils.isYNormal(face)], key=lambda x: x.boundingBox.minPoint.y)
+            connectionHoleFaceY = topologyUtils.getExtremeFlatFace(centerCutoutBody, topologyUtils.FLAT_Y, topologyUtils.BOX_MIN_Y, False)
             connectionHoleYTool = createConnectionHoleTool(connectionHoleFaceY, input.connectionScrewHolesDiameter / 2, input.baseWidth / 2, targetComponent)
-            connectionHoleFaceX = min([face for face in centerCutoutBody.faces if faceUtils.isXNormal(face)], key=lambda x: x.boundingBox.minPoint.x)
+            connectionHoleFaceX = topologyUtils.getExtremeFlatFace(centerCutoutBody, topologyUtils.FLAT_X, topologyUtils.BOX_MIN_X, False)
             connectionHoleXTool = createConnectionHoleTool(connectionHoleFaceX, input.connectionScrewHolesDiameter / 2, input.baseWidth / 2, targetComponent)
 
     holeCuttingBodies: list[adsk.fusion.BRepBody] = []
@@ -181,24 +187,31 @@ def createGridfinityBaseplate(input: BaseplateGeneratorInput, targetComponent: a
             targetComponent,
         )
     
-    # replicate base in rectangular pattern
-    rectangularPatternFeatures: adsk.fusion.RectangularPatternFeatures = features.rectangularPatternFeatures
-    patternInputBodies = adsk.core.ObjectCollection.create()
-    patternInputBodies.add(baseBody)
-    patternInput = rectangularPatternFeatures.createInput(patternInputBodies,
-        targetComponent.xConstructionAxis,
-        adsk.core.ValueInput.createByReal(input.baseplateWidth),
-        adsk.core.ValueInput.createByReal(input.baseWidth),
-        adsk.fusion.PatternDistanceType.SpacingPatternDistanceType)
-    patternInput.directionTwoEntity = targetComponent.yConstructionAxis
-    patternInput.quantityTwo = adsk.core.ValueInput.createByReal(input.baseplateLength)
-    patternInput.distanceTwo = adsk.core.ValueInput.createByReal(input.baseLength)
-    rectangularPattern = rectangularPatternFeatures.add(patternInput)
-    cuttingTools = cuttingTools + list(rectangularPattern.bodies)
-
     # create baseplate body
     baseplateTrueWidth = input.baseplateWidth * input.baseWidth - input.xyClearance * 2
     baseplateTrueLength = input.baseplateLength * input.baseLength - input.xyClearance * 2
+
+    tileSize = getTileSize(input)
+    tiledSocketsBody = None
+    if tileSize > 1:
+        tiledSocketsBody = createTiledSocketsBody(input, baseBody, tileSize, baseplateTrueWidth, baseplateTrueLength, targetComponent)
+        cuttingTools = []
+    else:
+        # replicate base in rectangular pattern
+        rectangularPatternFeatures: adsk.fusion.RectangularPatternFeatures = features.rectangularPatternFeatures
+        patternInputBodies = adsk.core.ObjectCollection.create()
+        patternInputBodies.add(baseBody)
+        patternInput = rectangularPatternFeatures.createInput(patternInputBodies,
+            targetComponent.xConstructionAxis,
+            adsk.core.ValueInput.createByReal(input.baseplateWidth),
+            adsk.core.ValueInput.createByReal(input.baseWidth),
+            adsk.fusion.PatternDistanceType.SpacingPatternDistanceType)
+        patternInput.directionTwoEntity = targetComponent.yConstructionAxis
+        patternInput.quantityTwo = adsk.core.ValueInput.createByReal(input.baseplateLength)
+        patternInput.distanceTwo = adsk.core.ValueInput.createByReal(input.baseLength)
+        rectangularPattern = rectangularPatternFeatures.add(patternInput)
+        cuttingTools = cuttingTools + list(rectangularPattern.bodies)
+
     binInterfaceBody = shapeUtils.simpleBox(
         targetComponent.xYConstructionPlane,
         0,
@@ -209,7 +222,7 @@ def createGridfinityBaseplate(input: BaseplateGeneratorInput, targetComponent: a
         targetComponent,
     )
 
-    if input.binZClearance > 0:
+    if input.binZClearance > 0 and tiledSocketsBody is None:
         binZClearance = shapeUtils.simpleBox(
                 targetComponent.xYConstructionPlane,
                 0,
@@ -332,53 +345,194 @@ def createGridfinityBaseplate(input: BaseplateGeneratorInput, targetComponent: a
     bottomChamfer.name = "Bottom chamfer"
 
     if not connectionHoleYTool is None and not connectionHoleXTool is None:
-        holeToolsXFeature = patternUtils.recPattern(
-            commonUtils.objectCollectionFromList(connectionHoleXTool.bodies),
-            (targetComponent.xConstructionAxis, targetComponent.yConstructionAxis),
-            (input.baseWidth, input.baseLength),
-            (1, input.baseplateLength),
-            targetComponent
+        # tools are made for the left and bottom sides, mirrored to the right and top ones, then repeated along each side
+        connectionHoleXTools = createSideConnectionHoleTools(
+            list(connectionHoleXTool.bodies),
+            targetComponent.yZConstructionPlane,
+            input.baseplateWidth * input.baseWidth / 2 - input.xyClearance,
+            input.hasConnectionHolesLeft,
+            input.hasConnectionHolesRight,
+            targetComponent,
         )
-        connectionHoleXToolList = list(connectionHoleXTool.bodies) + list(holeToolsXFeature.bodies)
+        if len(connectionHoleXTools) > 0:
+            holeToolsXFeature = patternUtils.recPattern(
+                commonUtils.objectCollectionFromList(connectionHoleXTools),
+                (targetComponent.xConstructionAxis, targetComponent.yConstructionAxis),
+                (input.baseWidth, input.baseLength),
+                (1, input.baseplateLength),
+                targetComponent
+            )
+            cuttingTools = cuttingTools + connectionHoleXTools + list(holeToolsXFeature.bodies)
 
-        holeToolsYFeature = patternUtils.recPattern(
-            commonUtils.objectCollectionFromList(connectionHoleYTool.bodies),
-            (targetComponent.xConstructionAxis, targetComponent.yConstructionAxis),
-            (input.baseLength, input.baseLength),
-            (input.baseplateWidth, 1),
-            targetComponent
+        connectionHoleYTools = createSideConnectionHoleTools(
+            list(connectionHoleYTool.bodies),
+            targetComponent.xZConstructionPlane,
+            input.baseplateLength * input.baseLength / 2 - input.xyClearance,
+            input.hasConnectionHolesBottom,
+            input.hasConnectionHolesTop,
+            targetComponent,
         )
-        connectionHoleYToolList = list(connectionHoleYTool.bodies) + list(holeToolsYFeature.bodies)
-
-        constructionPlaneXZInput: adsk.fusion.ConstructionPlaneInput = targetComponent.constructionPlanes.createInput()
-        constructionPlaneXZInput.setByOffset(targetComponent.xZConstructionPlane, adsk.core.ValueInput.createByReal(input.baseplateLength * input.baseLength / 2 - input.xyClearance))
-        constructionPlaneXZ = targetComponent.constructionPlanes.add(constructionPlaneXZInput)
-        constructionPlaneXZ.isLightBulbOn = False
-
-        constructionPlaneYZInput: adsk.fusion.ConstructionPlaneInput = targetComponent.constructionPlanes.createInput()
-        constructionPlaneYZInput.setByOffset(targetComponent.yZConstructionPlane, adsk.core.ValueInput.createByReal(input.baseplateWidth * input.baseWidth / 2 - input.xyClearance))
-        constructionPlaneYZ = targetComponent.constructionPlanes.add(constructionPlaneYZInput)
-        constructionPlaneYZ.isLightBulbOn = False
+        if len(connectionHoleYTools) > 0:
+            holeToolsYFeature = patternUtils.recPattern(
+                commonUtils.objectCollectionFromList(connectionHoleYTools),
+                (targetComponent.xConstructionAxis, targetComponent.yConstructionAxis),
+                (input.baseWidth, input.baseLength),
+                (input.baseplateWidth, 1),
+                targetComponent
+            )
+            cuttingTools = cuttingTools + connectionHoleYTools + list(holeToolsYFeature.bodies)
 
-        mirrorConnectionHolesYZInput = features.mirrorFeatures.createInput(commonUtils.objectCollectionFromList(connectionHoleXToolList), constructionPlaneYZ)
-        mirrorConnectionHolesYZ = features.mirrorFeatures.add(mirrorConnectionHolesYZInput)
+    if not tiledSocketsBody is None:
+        # the plate outline keeps its fillets and chamfers, the sockets come from the tiles
+        tilesIntersect = combineUtils.intersectBody(
+            binInterfaceBody,
+            commonUtils.objectCollectionFromList([tiledSocketsBody]),
+            targetComponent,
+        )
+        tilesIntersect.name = "Intersect baseplate with tiles"
 
-        mirrorConnectionHolesXZInput = features.mirrorFeatures.createInput(commonUtils.objectCollectionFromList(connectionHoleYToolList), constructionPlaneXZ)
-        mirrorConnectionHolesXZ = features.mirrorFeatures.add(mirrorConnectionHolesXZInput)
+    # cut everything
+    if len(cuttingTools) > 0:
+        toolBodies = commonUtils.objectCollectionFromList(cuttingTools)
+        finalCut = combineUtils.cutBody(
+            binInterfaceBody,
+            toolBodies,
+            targetComponent,
+        )
+        finalCut.name = "Final baseplate cut"
 
-        cuttingTools = cuttingTools + list(mirrorConnectionHolesYZ.bodies) + list(mirrorConnectionHolesXZ.bodies) + connectionHoleYToolList + connectionHoleXToolList
+    return binInterfaceBody
 
+def createTiledSocketsBody(
+    input: BaseplateGeneratorInput,
+    baseBody: adsk.fusion.BRepBody,
+    tileSize: int,
+    baseplateTrueWidth: float,
+    baseplateTrueLength: float,
+    targetComponent: adsk.fusion.Component,
+):
+    """
+    Full height block with every bin socket and the bin z clearance cut out. A tile of tileSize x tileSize cells
+    is cut once and patterned over the plate, tiles end on the ridges between sockets so every socket
+    belongs to a single tile. Padding areas are solid, the result is meant to be intersected with the plate outline
+    """
+    plateHeight = const.BIN_BASE_HEIGHT + (input.bottomExtensionHeight if input.hasExtendedBottom else 0)
+    tileWidth = input.baseWidth * tileSize
+    tileLength = input.baseLength * tileSize
+    tileOrigin = geometryUtils.createOffsetPoint(
+        targetComponent.originConstructionPoint.geometry,
+        byX=-input.xyClearance,
+        byY=-input.xyClearance,
+    )
+    tileBody = shapeUtils.simpleBox(
+        targetComponent.xYConstructionPlane,
+        0,
+        tileWidth,
+        tileLength,
+        -plateHeight,
+        tileOrigin,
+        targetComponent,
+    )
+    tileBody.name = "Baseplate tile"
 
-    # cut everything
-    toolBodies = commonUtils.objectCollectionFromList(cuttingTools)
-    finalCut = combineUtils.cutBody(
-        binInterfaceBody,
-        toolBodies,
+    socketsPattern = patternUtils.recPattern(
+        commonUtils.objectCollectionFromList([baseBody]),
+        (targetComponent.xConstructionAxis, targetComponent.yConstructionAxis),
+        (input.baseWidth, input.baseLength),
+        (tileSize, tileSize),
         targetComponent,
     )
-    finalCut.name = "Final baseplate cut"
+    tileCuttingTools = [baseBody] + list(socketsPattern.bodies)
+    if input.binZClearance > 0:
+        tileZClearance = shapeUtils.simpleBox(
+            targetComponent.xYConstructionPlane,
+            0,
+            tileWidth,
+            tileLength,
+            -input.binZClearance,
+            tileOrigin,
+            targetComponent,
+        )
+        tileCuttingTools.append(tileZClearance)
+    tileCut = combineUtils.cutBody(
+        tileBody,
+        commonUtils.objectCollectionFromList(tileCuttingTools),
+        targetComponent,
+    )
+    tileCut.name = "Baseplate tile cut"
 
-    return binInterfaceBody
+    # tiles on the far edges stick out of the plate, the intersection with the outline trims them
+    tileCountX = math.ceil(input.baseplateWidth / tileSize)
+    tileCountY = math.ceil(input.baseplateLength / tileSize)
+    mergeTools: list[adsk.fusion.BRepBody] = []
+    if tileCountX > 1 or tileCountY > 1:
+        tilesPattern = patternUtils.recPattern(
+            commonUtils.objectCollectionFromList([tileBody]),
+            (targetComponent.xConstructionAxis, targetComponent.yConstructionAxis),
+            (tileWidth, tileLength),
+            (tileCountX, tileCountY),
+            targetComponent,
+        )
+        tilesPattern.name = "Baseplate tiles pattern"
+        mergeTools = mergeTools + list(tilesPattern.bodies)
+
+    if input.hasPadding:
+        paddingHeight = plateHeight - input.binZClearance
+        paddedWidth = baseplateTrueWidth + input.paddingLeft + input.paddingRight
+        paddedLength = baseplateTrueLength + input.paddingBottom + input.paddingTop
+        for [width, length, byX, byY] in [
+            (input.paddingLeft, paddedLength, -input.paddingLeft, -input.paddingBottom),
+            (paddedWidth, input.paddingTop, -input.paddingLeft, baseplateTrueLength),
+            (input.paddingRight, paddedLength, baseplateTrueWidth, -input.paddingBottom),
+            (paddedWidth, input.paddingBottom, -input.paddingLeft, -input.paddingBottom),
+        ]:
+            if width <= 0 or length <= 0:
+                continue
+            mergeTools.append(shapeUtils.simpleBox(
+                targetComponent.xYConstructionPlane,
+                -input.binZClearance,
+                width,
+                length,
+                -paddingHeight,
+                geometryUtils.createOffsetPoint(targetComponent.originConstructionPoint.geometry, byX=byX, byY=byY),
+                targetComponent,
+            ))
+
+    if len(mergeTools) > 0:
+        tilesJoin = combineUtils.joinBodies(
+            tileBody,
+            commonUtils.objectCollectionFromList(mergeTools),
+            targetComponent,
+        )
+        tilesJoin.name = "Join baseplate tiles"
+    return tileBody
+
+def createSideConnectionHoleTools(
+    toolBodies: list[adsk.fusion.BRepBody],
+    plane: adsk.fusion.ConstructionPlane,
+    mirrorOffset: float,
+    isNearSideNeeded: bool,
+    isFarSideNeeded: bool,
+    targetComponent: adsk.fusion.Component,
+) -> list[adsk.fusion.BRepBody]:
+    """
+    Connection hole tools for a pair of opposite sides, the near side tools are mirrored through the plate center
+    """
+    features = targetComponent.features
+    sideTools: list[adsk.fusion.BRepBody] = []
+    if isFarSideNeeded:
+        mirrorPlaneInput: adsk.fusion.ConstructionPlaneInput = targetComponent.constructionPlanes.createInput()
+        mirrorPlaneInput.setByOffset(plane, adsk.core.ValueInput.createByReal(mirrorOffset))
+        mirrorPlane = targetComponent.constructionPlanes.add(mirrorPlaneInput)
+        mirrorPlane.isLightBulbOn = False
+        mirrorInput = features.mirrorFeatures.createInput(commonUtils.objectCollectionFromList(toolBodies), mirrorPlane)
+        sideTools = sideTools + list(features.mirrorFeatures.add(mirrorInput).bodies)
+    if isNearSideNeeded:
+        sideTools = sideTools + toolBodies
+    else:
+        for body in toolBodies:
+            features.removeFeatures.add(body)
+    return sideTools
 
 def createConnectionHoleTool(connectionHoleFace: adsk.fusion.BRepFace, diameter: float, depth: float, targetComponent: adsk.fusion.Component):
     connectionHoleSketch: adsk.fusion.Sketch = targetComponent.sketches.add(connectionHoleFace)
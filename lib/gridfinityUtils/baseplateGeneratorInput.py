@@ -15,6 +15,10 @@ class BaseplateGeneratorInput():
         self.xyClearance = const.BIN_XY_CLEARANCE
         self.binZClearance = const.BASEPLATE_BIN_Z_CLEARANCE
         self.connectionScrewHolesDiameter = const.DIMENSION_PLATE_CONNECTION_SCREW_HOLE_DIAMETER
+        self.hasConnectionHolesLeft = True
+        self.hasConnectionHolesTop = True
+        self.hasConnectionHolesRight = True
+        self.hasConnectionHolesBottom = True
         self.cornerFilletRadius = const.BIN_CORNER_FILLET_RADIUS
 
     @property
@@ -161,6 +165,38 @@ class BaseplateGeneratorInput():
     def connectionScrewHolesDiameter(self, value: float):
         self._connectionScrewHolesDiameter = value
 
+    @property
+    def hasConnectionHolesLeft(self) -> bool:
+        return self._hasConnectionHolesLeft
+
+    @hasConnectionHolesLeft.setter
+    def hasConnectionHolesLeft(self, value: bool):
+        self._hasConnectionHolesLeft = value
+
+    @property
+    def hasConnectionHolesTop(self) -> bool:
+        return self._hasConnectionHolesTop
+
+    @hasConnectionHolesTop.setter
+    def hasConnectionHolesTop(self, value: bool):
+        self._hasConnectionHolesTop = value
+
+    @property
+    def hasConnectionHolesRight(self) -> bool:
+        return self._hasConnectionHolesRight
+
+    @hasConnectionHolesRight.setter
+    def hasConnectionHolesRight(self, value: bool):
+        self._hasConnectionHolesRight = value
+
+    @property
+    def hasConnectionHolesBottom(self) -> bool:
+        return self._hasConnectionHolesBottom
+
+    @hasConnectionHolesBottom.setter
+    def hasConnectionHolesBottom(self, value: bool):
+        self._hasConnectionHolesBottom = value
+
     @property
     def screwHolesDiameter(self) -> float:
         return self._screwHolesDiameter
@@ -0,0 +1,95 @@
+import copy
+import math
+
+from .baseplateGeneratorInput import BaseplateGeneratorInput
+
+class BaseplateTile():
+    def __init__(self, column: int, row: int, offsetX: float, offsetY: float, input: BaseplateGeneratorInput):
+        self.column = column
+        self.row = row
+        self.offsetX = offsetX
+        self.offsetY = offsetY
+        self.input = input
+
+def getCellCapacity(unit: float, xyClearance: float, padding: float, bedSize: float) -> int:
+    # a plate of n cells is n * unit - 2 * xyClearance long plus its padding
+    return int(math.floor((bedSize + xyClearance * 2 - padding) / unit + 1e-9))
+
+def splitCells(cells: int, unit: float, xyClearance: float, paddingStart: float, paddingEnd: float, bedSize: float) -> list[int]:
+    """
+    Splits a row of cells into the fewest pieces that fit the bed, inner pieces get the same size
+    and the sizes are kept as even as possible so that most tiles are copies of each other
+    """
+    if getCellCapacity(unit, xyClearance, paddingStart + paddingEnd, bedSize) >= cells:
+        return [cells]
+    startCapacity = getCellCapacity(unit, xyClearance, paddingStart, bedSize)
+    endCapacity = getCellCapacity(unit, xyClearance, paddingEnd, bedSize)
+    innerCapacity = getCellCapacity(unit, xyClearance, 0, bedSize)
+    # a single cell can't be split, it carries the padding of both sides
+    if min(startCapacity, endCapacity, innerCapacity) < 1 or cells <= 1:
+        raise ValueError(f'A single {unit * 10:.1f}mm cell with its padding does not fit on a {bedSize * 10:.1f}mm bed')
+
+    for count in range(2, cells + 1):
+        bestSizes = None
+        bestScore = None
+        for innerSize in (range(min(innerCapacity, cells), 0, -1) if count > 2 else [0]):
+            rest = cells - innerSize * (count - 2)
+            startSize = min(startCapacity, max(1, math.ceil(rest / 2)))
+            endSize = rest - startSize
+            if endSize > endCapacity:
+                startSize = rest - endCapacity
+                endSize = endCapacity
+            if endSize < 1 or startSize < 1 or startSize > startCapacity:
+                continue
+            sizes = [startSize] + [innerSize] * (count - 2) + [endSize]
+            score = (len(set(sizes)), max(sizes) - min(sizes))
+            if bestScore is None or score < bestScore:
+                bestSizes = sizes
+                bestScore = score
+        if bestSizes is not None:
+            return bestSizes
+    return [1] * cells
+
+def splitBaseplate(input: BaseplateGeneratorInput, bedWidth: float, bedLength: float) -> list[BaseplateTile]:
+    """
+    Partitions the plate into tiles fitting a bed of the given size, the outer tiles carry the padding
+    and connection holes are only kept on the sides where tiles meet
+    """
+    paddingLeft = input.paddingLeft if input.hasPadding else 0
+    paddingTop = input.paddingTop if input.hasPadding else 0
+    paddingRight = input.paddingRight if input.hasPadding else 0
+    paddingBottom = input.paddingBottom if input.hasPadding else 0
+    columns = splitCells(int(input.baseplateWidth), input.baseWidth, input.xyClearance, paddingLeft, paddingRight, bedWidth)
+    rows = splitCells(int(input.baseplateLength), input.baseLength, input.xyClearance, paddingBottom, paddingTop, bedLength)
+
+    tiles: list[BaseplateTile] = []
+    cellY = 0
+    for row, tileLength in enumerate(rows):
+        cellX = 0
+        for column, tileWidth in enumerate(columns):
+            isLeft = column == 0
+            isRight = column == len(columns) - 1
+            isBottom = row == 0
+            isTop = row == len(rows) - 1
+            tileInput = copy.copy(input)
+            tileInput.baseplateWidth = tileWidth
+            tileInput.baseplateLength = tileLength
+            tileInput.paddingLeft = paddingLeft if isLeft else 0
+            tileInput.paddingTop = paddingTop if isTop else 0
+            tileInput.paddingRight = paddingRight if isRight else 0
+            tileInput.paddingBottom = paddingBottom if isBottom else 0
+            tileInput.hasPadding = input.hasPadding and max(tileInput.paddingLeft, tileInput.paddingTop, tileInput.paddingRight, tileInput.paddingBottom) > 0
+            tileInput.hasConnectionHolesLeft = input.hasConnectionHolesLeft and not isLeft
+            tileInput.hasConnectionHolesTop = input.hasConnectionHolesTop and not isTop
+            tileInput.hasConnectionHolesRight = input.hasConnectionHolesRight and not isRight
+            tileInput.hasConnectionHolesBottom = input.hasConnectionHolesBottom and not isBottom
+            tileInput.hasConnectionHoles = input.hasConnectionHoles and (
+                tileInput.hasConnectionHolesLeft
+                or tileInput.hasConnectionHolesTop
+                or tileInput.hasConnectionHolesRight
+                or tileInput.hasConnectionHolesBottom
+            )
+            tiles.append(BaseplateTile(column, row, cellX * input.baseWidth, cellY * input.baseLength, tileInput))
+            cellX += tileWidth
+        cellY += tileLength
+    return tiles
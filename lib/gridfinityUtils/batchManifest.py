@@ -0,0 +1,297 @@
+import adsk.core, adsk.fusion, traceback
+import csv
+import json
+import math
+import os
+import re
+
+from . import const, drawerPackingUtils, geometryUtils
+from .baseGeneratorInput import BaseGeneratorInput
+from .baseplateGeneratorInput import BaseplateGeneratorInput
+from .binBodyGenerator import uniformCompartments
+from .binBodyGeneratorInput import BinBodyGeneratorInput
+from .binGeneratorInput import BinGeneratorInput
+
+PART_TYPE_BIN = 'bin'
+PART_TYPE_BASEPLATE = 'baseplate'
+
+BIN_TYPE_HOLLOW = 'hollow'
+BIN_TYPE_SHELLED = 'shelled'
+BIN_TYPE_SOLID = 'solid'
+
+BASEPLATE_TYPE_LIGHT = 'light'
+BASEPLATE_TYPE_FULL = 'full'
+BASEPLATE_TYPE_SKELETONIZED = 'skeletonized'
+
+EXPORT_FORMAT_STEP = 'step'
+EXPORT_FORMAT_STL = 'stl'
+EXPORT_FORMAT_3MF = '3mf'
+EXPORT_FORMATS = [EXPORT_FORMAT_STEP, EXPORT_FORMAT_STL, EXPORT_FORMAT_3MF]
+DEFAULT_EXPORT_FORMATS = [EXPORT_FORMAT_STEP, EXPORT_FORMAT_STL]
+
+# manifest lengths are in millimeters, generator inputs in centimeters
+MM = 0.1
+
+TRUE_VALUES = ['1', 'true', 'yes', 'y', 'x']
+FALSE_VALUES = ['', '0', 'false', 'no', 'n']
+
+class BatchItem():
+    def __init__(self, name: str, partType: str, input: BinGeneratorInput | BaseplateGeneratorInput, formats: list[str], hasHistory: bool = True):
+        self.name = name
+        self.partType = partType
+        self.input = input
+        self.formats = formats
+        # False builds the part as plain bodies without timeline features
+        self.hasHistory = hasHistory
+
+class ManifestRow():
+    def __init__(self, values: dict, rowNumber: int):
+        self.values = {str(key).strip(): value for key, value in values.items() if key is not None}
+        self.rowNumber = rowNumber
+
+    def has(self, key: str) -> bool:
+        value = self.values.get(key)
+        return value is not None and not (isinstance(value, str) and value.strip() == '')
+
+    def getNumber(self, key: str, default: float) -> float:
+        if not self.has(key):
+            return default
+        try:
+            return float(self.values[key])
+        except (TypeError, ValueError):
+            raise ValueError(f'Row {self.rowNumber}: "{key}" must be a number, got "{self.values[key]}"')
+
+    def getLength(self, key: str, default: float) -> float:
+        return self.getNumber(key, default / MM) * MM
+
+    def getInt(self, key: str, default: int) -> int:
+        return int(round(self.getNumber(key, default)))
+
+    def getBool(self, key: str, default: bool) -> bool:
+        if not self.has(key):
+            return default
+        value = self.values[key]
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in TRUE_VALUES:
+            return True
+        if text in FALSE_VALUES:
+            return False
+        raise ValueError(f'Row {self.rowNumber}: "{key}" must be true or false, got "{value}"')
+
+    def getChoice(self, key: str, choices: list[str], default: str) -> str:
+        if not self.has(key):
+            return default
+        value = str(self.values[key]).strip().lower()
+        if not value in choices:
+            raise ValueError(f'Row {self.rowNumber}: "{key}" must be one of {", ".join(choices)}, got "{self.values[key]}"')
+        return value
+
+    def getFormats(self) -> list[str]:
+        if not self.has('formats'):
+            return DEFAULT_EXPORT_FORMATS
+        value = self.values['formats']
+        formats = value if isinstance(value, list) else str(value).replace(';', ',').split(',')
+        formats = [str(item).strip().lower() for item in formats if str(item).strip() != '']
+        unknownFormats = [item for item in formats if not item in EXPORT_FORMATS]
+        if len(unknownFormats) > 0:
+            raise ValueError(f'Row {self.rowNumber}: unsupported export formats {", ".join(unknownFormats)}')
+        return formats
+
+def readRows(manifestPath: str) -> list[ManifestRow]:
+    if os.path.splitext(manifestPath)[1].lower() == '.csv':
+        with open(manifestPath, newline='') as manifestFile:
+            # row 1 is the header
+            return [ManifestRow(values, index + 2) for index, values in enumerate(csv.DictReader(manifestFile))]
+
+    with open(manifestPath) as manifestFile:
+        manifest = json.load(manifestFile)
+    if isinstance(manifest, list):
+        manifest = {'parts': manifest}
+    defaults = manifest.get('defaults', {})
+    parts = list(manifest.get('parts', []))
+    for index, drawer in enumerate(manifest.get('drawers', [])):
+        parts += getDrawerParts(ManifestRow({**defaults, **drawer}, len(parts) + 1), index + 1)
+    return [ManifestRow({**defaults, **values}, index + 1) for index, values in enumerate(parts)]
+
+def getBinSpec(values: dict, rowNumber: int) -> drawerPackingUtils.BinSpec:
+    row = ManifestRow(values, rowNumber)
+    return drawerPackingUtils.BinSpec(
+        row.getInt('width', 1),
+        row.getInt('length', 1),
+        row.getInt('count', 0) if row.has('count') else None,
+        {key: value for key, value in row.values.items() if not key in drawerPackingUtils.BIN_SPEC_KEYS},
+    )
+
+def getDrawerName(row: ManifestRow, drawerNumber: int) -> str:
+    return str(row.values['name']).strip() if row.has('name') else f'Drawer {drawerNumber}'
+
+def getDrawerPlan(row: ManifestRow, drawerNumber: int) -> drawerPackingUtils.DrawerPlan:
+    name = getDrawerName(row, drawerNumber)
+    if not row.has('width') or not row.has('length'):
+        raise ValueError(f'Row {row.rowNumber}: drawer "{name}" needs its inner "width" and "length"')
+    return drawerPackingUtils.planDrawer(
+        name,
+        row.getLength('width', 0),
+        row.getLength('length', 0),
+        [getBinSpec(values, row.rowNumber) for values in row.values.get('bins', [])],
+        row.getLength('baseWidth', const.DIMENSION_DEFAULT_WIDTH_UNIT),
+        row.getLength('baseLength', const.DIMENSION_DEFAULT_WIDTH_UNIT),
+        row.getLength('xyClearance', const.BIN_XY_CLEARANCE),
+        row.getLength('clearance', const.DRAWER_CLEARANCE),
+    )
+
+def getDrawerParts(row: ManifestRow, drawerNumber: int, plan: drawerPackingUtils.DrawerPlan = None) -> list[dict]:
+    """
+    Plans the bins of a drawer and turns the plan into manifest rows, one bin row per size with the amount
+    in its name and a baseplate padded to the drawer walls
+    """
+    plan = plan or getDrawerPlan(row, drawerNumber)
+    name = plan.name
+    if len(plan.unplaced) > 0:
+        unplacedSizes = ', '.join(f'{spec.length}x{spec.width}' for spec in plan.unplaced)
+        raise ValueError(f'Row {row.rowNumber}: drawer "{name}" has no room for bins {unplacedSizes}')
+
+    # drawer values other than its own keys apply to its bins and baseplate, like the grid unit or the export formats
+    sharedValues = {key: value for key, value in row.values.items() if not key in drawerPackingUtils.DRAWER_KEYS}
+    for key in ['baseWidth', 'baseLength', 'xyClearance']:
+        if row.has(key):
+            sharedValues[key] = row.values[key]
+    parts = []
+    for spec in plan.specs:
+        count = len([placement for placement in plan.placements if placement.spec is spec])
+        if count == 0:
+            continue
+        values = {**sharedValues, **spec.options, 'type': PART_TYPE_BIN, 'width': spec.width, 'length': spec.length}
+        height = ManifestRow(values, row.rowNumber).getInt('height', 5)
+        parts.append({**values, 'name': f'{name} bin {spec.length}x{spec.width}x{height} ({count} pcs)'})
+
+    baseplateValues = {**sharedValues, **row.values.get('baseplate', {}), 'type': PART_TYPE_BASEPLATE, 'width': plan.columns, 'length': plan.rows}
+    if row.getBool('padding', True):
+        baseplateValues.update({
+            'paddingLeft': round(plan.paddingX / MM, 3),
+            'paddingRight': round(plan.paddingX / MM, 3),
+            'paddingTop': round(plan.paddingY / MM, 3),
+            'paddingBottom': round(plan.paddingY / MM, 3),
+        })
+    parts.append({**baseplateValues, 'name': f'{name} baseplate {plan.rows}x{plan.columns}'})
+    return parts
+
+def getBinGeneratorInput(row: ManifestRow) -> BinGeneratorInput:
+    binType = row.getChoice('binType', [BIN_TYPE_HOLLOW, BIN_TYPE_SHELLED, BIN_TYPE_SOLID], BIN_TYPE_HOLLOW)
+    isHollow = binType == BIN_TYPE_HOLLOW
+    isShelled = binType == BIN_TYPE_SHELLED
+    xyClearance = row.getLength('xyClearance', const.BIN_XY_CLEARANCE)
+
+    binBodyInput = BinBodyGeneratorInput()
+    binBodyInput.binWidth = row.getInt('width', 2)
+    binBodyInput.binLength = row.getInt('length', 3)
+    binBodyInput.binHeight = row.getInt('height', 5)
+    binBodyInput.baseWidth = row.getLength('baseWidth', const.DIMENSION_DEFAULT_WIDTH_UNIT)
+    binBodyInput.baseLength = row.getLength('baseLength', const.DIMENSION_DEFAULT_WIDTH_UNIT)
+    binBodyInput.heightUnit = row.getLength('heightUnit', const.DIMENSION_DEFAULT_HEIGHT_UNIT)
+    binBodyInput.xyClearance = xyClearance
+    binBodyInput.binCornerFilletRadius = const.BIN_CORNER_FILLET_RADIUS - xyClearance
+    binBodyInput.isSolid = not isHollow
+    binBodyInput.wallThickness = row.getLength('wallThickness', const.BIN_WALL_THICKNESS)
+    binBodyInput.hasLip = row.getBool('lip', True)
+    binBodyInput.hasLipNotches = row.getBool('lipNotches', False)
+    binBodyInput.hasScoop = row.getBool('scoop', False) and isHollow
+    binBodyInput.scoopMaxRadius = row.getLength('scoopRadius', const.BIN_SCOOP_MAX_RADIUS)
+    hasTab = row.getBool('tab', False)
+    binBodyInput.hasTab = hasTab and isHollow
+    binBodyInput.tabLength = row.getNumber('tabLength', 1)
+    binBodyInput.tabWidth = row.getLength('tabWidth', const.BIN_TAB_WIDTH)
+    binBodyInput.tabPosition = row.getNumber('tabPosition', 0)
+    binBodyInput.tabOverhangAngle = math.radians(row.getNumber('tabAngle', const.BIN_TAB_OVERHANG_ANGLE))
+    binBodyInput.tabMethod = const.BIN_TAB_METHOD_ANGLE
+    binBodyInput.compartmentsByX = row.getInt('compartmentsX', 1)
+    binBodyInput.compartmentsByY = row.getInt('compartmentsY', 1)
+    binBodyInput.compartments = uniformCompartments(binBodyInput.compartmentsByX, binBodyInput.compartmentsByY)
+
+    baseInput = BaseGeneratorInput()
+    baseInput.originPoint = geometryUtils.createOffsetPoint(
+        adsk.core.Point3D.create(0, 0, 0),
+        byX=-xyClearance,
+        byY=-xyClearance,
+    )
+    baseInput.baseWidth = binBodyInput.baseWidth
+    baseInput.baseLength = binBodyInput.baseLength
+    baseInput.xyClearance = xyClearance
+    baseInput.hasScrewHoles = row.getBool('screwHoles', False) and not isShelled
+    baseInput.hasMagnetCutouts = row.getBool('magnets', False) and not isShelled
+    baseInput.hasMagnetCutoutsTabs = row.getBool('magnetTabs', False) and not isShelled
+    baseInput.screwHolesDiameter = row.getLength('screwDiameter', const.DIMENSION_SCREW_HOLE_DIAMETER)
+    baseInput.magnetCutoutsDiameter = row.getLength('magnetDiameter', const.DIMENSION_MAGNET_CUTOUT_DIAMETER)
+    baseInput.magnetCutoutsDepth = row.getLength('magnetDepth', const.DIMENSION_MAGNET_CUTOUT_DEPTH)
+
+    binInput = BinGeneratorInput()
+    binInput.binBodyInput = binBodyInput
+    binInput.baseInput = baseInput
+    binInput.hasBase = row.getBool('base', True)
+    binInput.hasBody = row.getBool('body', True)
+    # identical base units are generated once and copied, across rows too
+    binInput.isFastBasePattern = True
+    binInput.isShelled = isShelled
+    binInput.hasTab = hasTab
+    return binInput
+
+def getBaseplateGeneratorInput(row: ManifestRow) -> BaseplateGeneratorInput:
+    plateType = row.getChoice('plateType', [BASEPLATE_TYPE_LIGHT, BASEPLATE_TYPE_FULL, BASEPLATE_TYPE_SKELETONIZED], BASEPLATE_TYPE_LIGHT)
+    hasPadding = any(row.has(key) for key in ['paddingLeft', 'paddingTop', 'paddingRight', 'paddingBottom'])
+
+    baseplateInput = BaseplateGeneratorInput()
+    baseplateInput.baseWidth = row.getLength('baseWidth', const.DIMENSION_DEFAULT_WIDTH_UNIT)
+    baseplateInput.baseLength = row.getLength('baseLength', const.DIMENSION_DEFAULT_WIDTH_UNIT)
+    baseplateInput.xyClearance = row.getLength('xyClearance', const.BIN_XY_CLEARANCE)
+    baseplateInput.baseplateWidth = row.getInt('width', 2)
+    baseplateInput.baseplateLength = row.getInt('length', 3)
+    baseplateInput.hasExtendedBottom = not plateType == BASEPLATE_TYPE_LIGHT
+    baseplateInput.hasSkeletonizedBottom = plateType == BASEPLATE_TYPE_SKELETONIZED
+    baseplateInput.hasMagnetCutouts = row.getBool('magnets', True)
+    baseplateInput.magnetCutoutsDiameter = row.getLength('magnetDiameter', const.DIMENSION_MAGNET_CUTOUT_DIAMETER)
+    baseplateInput.magnetCutoutsDepth = row.getLength('magnetDepth', const.DIMENSION_MAGNET_CUTOUT_DEPTH)
+    baseplateInput.hasScrewHoles = row.getBool('screwHoles', True)
+    baseplateInput.screwHolesDiameter = row.getLength('screwDiameter', const.DIMENSION_PLATE_SCREW_HOLE_DIAMETER)
+    baseplateInput.screwHeadCutoutDiameter = row.getLength('screwHeadDiameter', const.DIMENSION_SCREW_HEAD_CUTOUT_DIAMETER)
+    baseplateInput.hasPadding = hasPadding
+    baseplateInput.paddingLeft = row.getLength('paddingLeft', 0)
+    baseplateInput.paddingTop = row.getLength('paddingTop', 0)
+    baseplateInput.paddingRight = row.getLength('paddingRight', 0)
+    baseplateInput.paddingBottom = row.getLength('paddingBottom', 0)
+    baseplateInput.bottomExtensionHeight = row.getLength('bottomThickness', const.BASEPLATE_EXTRA_HEIGHT)
+    baseplateInput.binZClearance = row.getLength('verticalClearance', const.BASEPLATE_BIN_Z_CLEARANCE)
+    baseplateInput.hasConnectionHoles = row.getBool('connectionHoles', False)
+    baseplateInput.connectionScrewHolesDiameter = row.getLength('connectionHoleDiameter', const.DIMENSION_PLATE_CONNECTION_SCREW_HOLE_DIAMETER)
+    baseplateInput.cornerFilletRadius = const.BIN_CORNER_FILLET_RADIUS
+    return baseplateInput
+
+def getDefaultName(row: ManifestRow, partType: str) -> str:
+    if partType == PART_TYPE_BASEPLATE:
+        return 'Gridfinity baseplate {}x{}'.format(row.getInt('length', 3), row.getInt('width', 2))
+    return 'Gridfinity bin {}x{}x{}'.format(row.getInt('length', 3), row.getInt('width', 2), row.getInt('height', 5))
+
+def getExportFileName(name: str) -> str:
+    return re.sub(r'[^\w\-. ]+', '_', name).strip()
+
+def loadManifest(manifestPath: str) -> list[BatchItem]:
+    """
+    Reads bin and baseplate specs from a JSON or CSV manifest, one part per row.
+    Lengths are in millimeters, sizes in grid units and angles in degrees, missing values use the command defaults.
+    """
+    items: list[BatchItem] = []
+    nameCounts: dict[str, int] = {}
+    for row in readRows(manifestPath):
+        partType = row.getChoice('type', [PART_TYPE_BIN, PART_TYPE_BASEPLATE], PART_TYPE_BIN)
+        name = str(row.values['name']).strip() if row.has('name') else getDefaultName(row, partType)
+        # names become export file names, keep them unique
+        nameCounts[name] = nameCounts.get(name, 0) + 1
+        if nameCounts[name] > 1:
+            name = f'{name} ({nameCounts[name]})'
+        if partType == PART_TYPE_BASEPLATE:
+            input = getBaseplateGeneratorInput(row)
+        else:
+            input = getBinGeneratorInput(row)
+        items.append(BatchItem(name, partType, input, row.getFormats(), row.getBool('history', True)))
+    return items
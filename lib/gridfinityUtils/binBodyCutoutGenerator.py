@@ -5,7 +5,7 @@ import math
 from ...lib.gridfinityUtils import geometryUtils
 from ...lib import fusion360utils as futil
 from ...lib.gridfinityUtils import filletUtils
-from . import const, combineUtils, faceUtils, commonUtils, sketchUtils, extrudeUtils, baseGenerator, edgeUtils
+from . import const, combineUtils, faceUtils, commonUtils, sketchUtils, extrudeUtils, baseGenerator, edgeUtils, topologyUtils
 from .baseGeneratorInput import BaseGeneratorInput
 from .binBodyCutoutGeneratorInput import BinBodyCutoutGeneratorInput
 from ... import config
@@ -16,9 +16,8 @@ ui = app.userInterface
 def getInnerCutoutScoopFace(
     innerCutout: adsk.fusion.BRepBody
     ) -> tuple[adsk.fusion.BRepFace, adsk.fusion.BRepFace]:
-    innerCutoutYNormalFaces = [face for face in innerCutout.faces if faceUtils.isYNormal(face)]
-    scoopFace = min(innerCutoutYNormalFaces, key=lambda x: x.boundingBox.minPoint.y)
-    oppositeFace = max(innerCutoutYNormalFaces, key=lambda x: x.boundingBox.minPoint.y)
+    scoopFace = topologyUtils.getExtremeFlatFace(innerCutout, topologyUtils.FLAT_Y, topologyUtils.BOX_MIN_Y, False)
+    oppositeFace = topologyUtils.getExtremeFlatFace(innerCutout, topologyUtils.FLAT_Y, topologyUtils.BOX_MIN_Y, True)
     return (scoopFace, oppositeFace)
 
 def createGridfinityBinBodyCutout(
@@ -53,6 +52,9 @@ def createGridfinityBinBodyCutout(
     innerCutoutBody = innerCutout.bodies.item(0)
     innerCutoutBody.name = 'Inner cutout'
 
+    if input.isSimplified:
+        return innerCutoutBody
+
     # scoop
     if input.hasScoop:
         [innerCutoutScoopFace, innerCutoputScoopOppositeFace] = getInnerCutoutScoopFace(innerCutoutBody)
@@ -11,6 +11,7 @@ class BinBodyCutoutGeneratorInput():
         self.tabLength = 1
         self.tabWidth = const.BIN_TAB_WIDTH
         self.hasBottomFillet = True
+        self.isSimplified = False
 
 
     @property
@@ -117,4 +118,10 @@ class BinBodyCutoutGeneratorInput():
     def tabOverhangAngle(self, value: float):
         self._tabOverhangAngle = value
 
-    
\ No newline at end of file
+    @property
+    def isSimplified(self) -> bool:
+        return self._isSimplified
+
+    @isSimplified.setter
+    def isSimplified(self, value: bool):
+        self._isSimplified = value
@@ -4,7 +4,7 @@ import math
 import copy
 
 from ...lib import fusion360utils as futil
-from . import const, combineUtils, faceUtils, commonUtils, sketchUtils, extrudeUtils, baseGenerator, edgeUtils, filletUtils, geometryUtils
+from . import const, combineUtils, faceUtils, commonUtils, sketchUtils, extrudeUtils, baseGenerator, edgeUtils, filletUtils, geometryUtils, patternUtils, compartmentUtils, topologyUtils
 from .binBodyCutoutGenerator import createGridfinityBinBodyCutout
 from .binBodyCutoutGeneratorInput import BinBodyCutoutGeneratorInput
 from .baseGeneratorInput import BaseGeneratorInput
@@ -25,6 +25,16 @@ def uniformCompartments(countX, countY):
             compartments.append(BinBodyCompartmentDefinition(i, j, 1, 1))
     return compartments
 
+def isUniformGrid(input: BinBodyGeneratorInput):
+    if len(input.compartments) != input.compartmentsByX * input.compartmentsByY:
+        return False
+    cells = set()
+    for compartment in input.compartments:
+        if compartment.width != 1 or compartment.length != 1 or compartment.depth != input.compartments[0].depth:
+            return False
+        cells.add((compartment.positionX, compartment.positionY))
+    return cells == set((i, j) for i in range(input.compartmentsByX) for j in range(input.compartmentsByY))
+
 def createGridfinityBinBody(
     input: BinBodyGeneratorInput,
     targetComponent: adsk.fusion.Component,
@@ -49,12 +59,13 @@ def createGridfinityBinBody(
     bodiesToSubtract: list[adsk.fusion.BRepBody] = []
 
     # round corners
-    filletUtils.filletEdgesByLength(
-        binBodyExtrude.faces,
-        input.binCornerFilletRadius,
-        binBodyTotalHeight,
-        targetComponent,
-    ).name = 'Bin body corner fillets'
+    if not input.isSimplified:
+        filletUtils.filletEdgesByLength(
+            binBodyExtrude.faces,
+            input.binCornerFilletRadius,
+            binBodyTotalHeight,
+            targetComponent,
+        ).name = 'Bin body corner fillets'
 
     if input.hasLip:
         lipOriginPoint = adsk.core.Point3D.create(
@@ -71,9 +82,10 @@ def createGridfinityBinBody(
         lipInput.xyClearance = input.xyClearance
         lipInput.binCornerFilletRadius = input.binCornerFilletRadius
         lipInput.origin = lipOriginPoint
+        lipInput.isSimplified = input.isSimplified
         lipBody = createGridfinityBinBodyLip(lipInput, targetComponent)
 
-        if input.wallThickness < const.BIN_LIP_WALL_THICKNESS:
+        if input.wallThickness < const.BIN_LIP_WALL_THICKNESS and not input.isSimplified:
             lipBottomChamferSize = max(const.BIN_BODY_CUTOUT_BOTTOM_FILLET_RADIUS, input.binCornerFilletRadius - input.wallThickness)
             lipBottomChamferExtrude = extrudeUtils.createBoxAtPoint(
                 actualBodyWidth - input.wallThickness * 2,
@@ -94,7 +106,7 @@ def createGridfinityBinBody(
                 targetComponent,
             )
             lipBottomChamferExtrudeTopFace = faceUtils.getTopFace(lipBottomChamferExtrude.bodies.item(0))
-            scoopSideEdge = min([edge for edge in lipBottomChamferExtrudeTopFace.edges if geometryUtils.isCollinearToX(edge)], key=lambda x: x.boundingBox.minPoint.y)
+            scoopSideEdge = topologyUtils.getExtremeFlatEdge([lipBottomChamferExtrudeTopFace], topologyUtils.FLAT_Y | topologyUtils.FLAT_Z, topologyUtils.BOX_MIN_Y, False)
 
             edgesToChamfer = list(scoopSideEdge.tangentiallyConnectedEdges)[3:] if input.hasScoop else scoopSideEdge.tangentiallyConnectedEdges
             chamferFeatures: adsk.fusion.ChamferFeatures = features.chamferFeatures
@@ -121,53 +133,132 @@ def createGridfinityBinBody(
         compartmentWidthUnit = (totalCompartmentsWidth - (input.compartmentsByX - 1) * input.wallThickness) / input.compartmentsByX
         compartmentLengthUnit = (totalCompartmentsLength - (input.compartmentsByY - 1) * input.wallThickness) / input.compartmentsByY
 
-        for compartment in input.compartments:
-            compartmentX = compartmentsMinX + compartment.positionX * (compartmentWidthUnit + input.wallThickness)
-            compartmentY = compartmentsMinY + compartment.positionY * (compartmentLengthUnit + input.wallThickness)
-            compartmentOriginPoint = adsk.core.Point3D.create(
-                compartmentX,
-                compartmentY,
-                binBodyTotalHeight
-            )
-            compartmentWidth = compartmentWidthUnit * compartment.width + (compartment.width - 1) * input.wallThickness
-            compartmentLength = compartmentLengthUnit * compartment.length + (compartment.length - 1) * input.wallThickness
-            compartmentDepth = min(binBodyTotalHeight - const.BIN_COMPARTMENT_BOTTOM_THICKNESS, compartment.depth)
-
-            compartmentTabInput = BinBodyTabGeneratorInput()
-            tabOriginPoint = adsk.core.Point3D.create(
-                compartmentOriginPoint.x + max(0, min(input.tabPosition, input.binWidth - input.tabLength)) * input.baseWidth,
-                compartmentOriginPoint.y + compartmentLength,
-                compartmentOriginPoint.z,
-            )
-            compartmentTabInput.origin = tabOriginPoint
-            compartmentTabInput.length = max(0, min(input.tabLength, input.binWidth)) * input.baseWidth
-            compartmentTabInput.width = input.tabWidth
-            compartmentTabInput.overhangAngle = input.tabOverhangAngle
-            compartmentTabInput.topClearance = const.BIN_TAB_TOP_CLEARANCE
-            compartmentTabInput.tabMethod = input.tabMethod
-            compartmentTabInput.rootThickness = input.rootThickness
-            compartmentTabInput.tipThickness = input.tipThickness
-            compartmentTabInput.tabFilletTop = input.tabFilletTop
-            compartmentTabInput.tabFilletBottom = input.tabFilletBottom
-            compartmentTabInput.tabFilletBack = input.tabFilletBack
-
-            [compartmentMerges, compartmentCuts] = createCompartment(
+        # per compartment tabs and scoops can't be shared between cells of a single cavity, and the divider walls
+        # don't get the inner fillets of separate cutouts, so the cavity is only used where fillets are skipped anyway
+        isWallGrid = input.isSimplified and isUniformGrid(input) and not input.hasTab and (not input.hasScoop or input.compartmentsByY == 1)
+
+        if isWallGrid:
+            [wallGridMerges, wallGridCuts] = createWallGridCompartments(
                 input.wallThickness,
-                compartmentOriginPoint,
-                compartmentWidth,
-                compartmentLength,
-                compartmentDepth,
+                adsk.core.Point3D.create(
+                    compartmentsMinX,
+                    compartmentsMinY,
+                    binBodyTotalHeight
+                ),
+                compartmentWidthUnit,
+                compartmentLengthUnit,
+                input.compartmentsByX,
+                input.compartmentsByY,
+                min(binBodyTotalHeight - const.BIN_COMPARTMENT_BOTTOM_THICKNESS, input.compartments[0].depth),
                 input.binCornerFilletRadius - input.wallThickness,
                 input.hasScoop,
                 input.scoopMaxRadius,
-                input.hasTab,
-                compartmentTabInput,
+                input.isSimplified,
                 targetComponent,
             )
-            bodiesToSubtract = bodiesToSubtract + compartmentCuts
-            bodiesToMerge = bodiesToMerge + compartmentMerges
+            bodiesToSubtract = bodiesToSubtract + wallGridCuts
+            bodiesToMerge = bodiesToMerge + wallGridMerges
+        else:
+            # tabs are placed relative to each compartment, so compartments with tabs are never merged. Merged groups
+            # get plain box divider walls without the compartment fillets, so only simplified builds merge,
+            # full builds keep separate filleted cutouts and identical ones are still built once and replicated
+            isSeparate = input.hasTab or not input.isSimplified
+            compartmentGroups = [[compartment] for compartment in input.compartments] if isSeparate else compartmentUtils.mergeCompartments(
+                input.compartments,
+                not input.hasScoop,
+            )
+            # identical compartments are built once and then replicated
+            compartmentInstances: dict[tuple, list[list[BinBodyCompartmentDefinition]]] = {}
+            for compartmentGroup in compartmentGroups:
+                compartmentInstances.setdefault(compartmentUtils.compartmentSignature(compartmentGroup), []).append(compartmentGroup)
+
+            for instances in compartmentInstances.values():
+                instancePositions = [(bounds.positionX, bounds.positionY) for bounds in [compartmentUtils.boundingCompartment(group) for group in instances]]
+                instancesLattice = compartmentUtils.positionsLattice(instancePositions)
+                compartmentGroup = instances[instancePositions.index(instancesLattice[0])] if instancesLattice else instances[0]
+                compartment = compartmentUtils.boundingCompartment(compartmentGroup)
+                compartmentX = compartmentsMinX + compartment.positionX * (compartmentWidthUnit + input.wallThickness)
+                compartmentY = compartmentsMinY + compartment.positionY * (compartmentLengthUnit + input.wallThickness)
+                compartmentOriginPoint = adsk.core.Point3D.create(
+                    compartmentX,
+                    compartmentY,
+                    binBodyTotalHeight
+                )
+                compartmentWidth = compartmentWidthUnit * compartment.width + (compartment.width - 1) * input.wallThickness
+                compartmentLength = compartmentLengthUnit * compartment.length + (compartment.length - 1) * input.wallThickness
+                compartmentDepth = min(binBodyTotalHeight - const.BIN_COMPARTMENT_BOTTOM_THICKNESS, compartment.depth)
+
+                compartmentTabInput = BinBodyTabGeneratorInput()
+                tabOriginPoint = adsk.core.Point3D.create(
+                    compartmentOriginPoint.x + max(0, min(input.tabPosition, input.binWidth - input.tabLength)) * input.baseWidth,
+                    compartmentOriginPoint.y + compartmentLength,
+                    compartmentOriginPoint.z,
+                )
+                compartmentTabInput.origin = tabOriginPoint
+                compartmentTabInput.length = max(0, min(input.tabLength, input.binWidth)) * input.baseWidth
+                compartmentTabInput.width = input.tabWidth
+                compartmentTabInput.overhangAngle = input.tabOverhangAngle
+                compartmentTabInput.topClearance = const.BIN_TAB_TOP_CLEARANCE
+                compartmentTabInput.tabMethod = input.tabMethod
+                compartmentTabInput.rootThickness = input.rootThickness
+                compartmentTabInput.tipThickness = input.tipThickness
+                compartmentTabInput.tabFilletTop = 0 if input.isSimplified else input.tabFilletTop
+                compartmentTabInput.tabFilletBottom = 0 if input.isSimplified else input.tabFilletBottom
+                compartmentTabInput.tabFilletBack = 0 if input.isSimplified else input.tabFilletBack
 
-        if len(input.compartments) > 1:
+                [compartmentMerges, compartmentCuts] = createCompartment(
+                    input.wallThickness,
+                    compartmentOriginPoint,
+                    compartmentWidth,
+                    compartmentLength,
+                    compartmentDepth,
+                    input.binCornerFilletRadius - input.wallThickness,
+                    input.hasScoop,
+                    input.scoopMaxRadius,
+                    input.hasTab,
+                    compartmentTabInput,
+                    input.isSimplified,
+                    targetComponent,
+                )
+                if len(compartmentGroup) > 1 and compartmentDepth > const.BIN_TAB_TOP_CLEARANCE:
+                    compartmentMerges = compartmentMerges + createDividerWalls(
+                        compartmentUtils.dividerWallSegments(compartmentGroup),
+                        adsk.core.Point3D.create(
+                            compartmentsMinX,
+                            compartmentsMinY,
+                            binBodyTotalHeight - compartmentDepth,
+                        ),
+                        compartmentWidthUnit,
+                        compartmentLengthUnit,
+                        input.wallThickness,
+                        compartmentDepth - const.BIN_TAB_TOP_CLEARANCE,
+                        targetComponent,
+                    )
+                bodiesToSubtract = bodiesToSubtract + compartmentCuts
+                bodiesToMerge = bodiesToMerge + compartmentMerges
+
+                if len(instances) == 1:
+                    continue
+                compartmentPitchX = compartmentWidthUnit + input.wallThickness
+                compartmentPitchY = compartmentLengthUnit + input.wallThickness
+                if instancesLattice:
+                    [_, [stepX, stepY], quantities] = instancesLattice
+                    distances = (stepX * compartmentPitchX, stepY * compartmentPitchY)
+                    bodiesToSubtract = bodiesToSubtract + patternBodies(compartmentCuts, distances, quantities, targetComponent)
+                    bodiesToMerge = bodiesToMerge + patternBodies(compartmentMerges, distances, quantities, targetComponent)
+                else:
+                    for [positionX, positionY] in instancePositions:
+                        if (positionX, positionY) == (compartment.positionX, compartment.positionY):
+                            continue
+                        offset = adsk.core.Vector3D.create(
+                            (positionX - compartment.positionX) * compartmentPitchX,
+                            (positionY - compartment.positionY) * compartmentPitchY,
+                            0,
+                        )
+                        bodiesToSubtract = bodiesToSubtract + copyBodiesWithOffset(compartmentCuts, offset, targetComponent)
+                        bodiesToMerge = bodiesToMerge + copyBodiesWithOffset(compartmentMerges, offset, targetComponent)
+
+        if len(input.compartments) > 1 and not isWallGrid:
             compartmentsTopClearance = createCompartmentCutout(
                 input.wallThickness,
                 adsk.core.Point3D.create(
@@ -182,6 +273,7 @@ def createGridfinityBinBody(
                 False,
                 0,
                 False,
+                input.isSimplified,
                 targetComponent,
             )
             bodiesToSubtract.append(compartmentsTopClearance)
@@ -212,6 +304,7 @@ def createCompartmentCutout(
         hasScoop: bool,
         scoopMaxRadius: float,
         hasBottomFillet: bool,
+        isSimplified: bool,
         targetComponent: adsk.fusion.Component,
     ) -> adsk.fusion.BRepBody:
 
@@ -225,9 +318,167 @@ def createCompartmentCutout(
     innerCutoutInput.scoopMaxRadius = scoopMaxRadius
     innerCutoutInput.filletRadius = innerCutoutFilletRadius
     innerCutoutInput.hasBottomFillet = hasBottomFillet
+    innerCutoutInput.isSimplified = isSimplified
 
     return createGridfinityBinBodyCutout(innerCutoutInput, targetComponent)
 
+def createWallGridCompartments(
+        wallThickness: float,
+        originPoint: adsk.core.Point3D,
+        compartmentWidth: float,
+        compartmentLength: float,
+        countX: int,
+        countY: int,
+        depth: float,
+        cornerFilletRadius: float,
+        hasScoop: bool,
+        scoopMaxRadius: float,
+        isSimplified: bool,
+        targetComponent: adsk.fusion.Component,
+    ) -> tuple[list[adsk.fusion.BRepBody], list[adsk.fusion.BRepBody]]:
+
+    bodiesToMerge: list[adsk.fusion.BRepBody] = []
+    bodiesToSubtract: list[adsk.fusion.BRepBody] = []
+    totalWidth = compartmentWidth * countX + wallThickness * (countX - 1)
+    totalLength = compartmentLength * countY + wallThickness * (countY - 1)
+
+    # single cavity for all compartments
+    cavityBody = createCompartmentCutout(
+        wallThickness,
+        originPoint,
+        totalWidth,
+        totalLength,
+        depth,
+        cornerFilletRadius,
+        hasScoop,
+        scoopMaxRadius,
+        True,
+        isSimplified,
+        targetComponent,
+    )
+    cavityBody.name = 'Compartments cavity'
+    bodiesToSubtract.append(cavityBody)
+
+    # divider walls stop below the top to keep clearance for stacked bins
+    wallHeight = depth - const.BIN_TAB_TOP_CLEARANCE
+    wallsBottomZ = originPoint.z - depth
+    # compartments shallower than the clearance have no walls left between them
+    if wallHeight <= 0:
+        return (bodiesToMerge, bodiesToSubtract)
+    if countX > 1:
+        dividerX = extrudeUtils.createBoxAtPoint(
+            wallThickness,
+            totalLength,
+            wallHeight,
+            targetComponent,
+            adsk.core.Point3D.create(originPoint.x + compartmentWidth, originPoint.y, wallsBottomZ),
+        )
+        dividerX.name = 'Divider wall along Y'
+        dividerXBody = dividerX.bodies.item(0)
+        bodiesToMerge.append(dividerXBody)
+        if countX > 2:
+            dividerXPattern = patternUtils.recPattern(
+                commonUtils.objectCollectionFromList([dividerXBody]),
+                (targetComponent.xConstructionAxis, targetComponent.yConstructionAxis),
+                (compartmentWidth + wallThickness, compartmentLength + wallThickness),
+                (countX - 1, 1),
+                targetComponent,
+            )
+            dividerXPattern.name = 'Divider walls along Y pattern'
+            bodiesToMerge = bodiesToMerge + list(dividerXPattern.bodies)
+    if countY > 1:
+        dividerY = extrudeUtils.createBoxAtPoint(
+            totalWidth,
+            wallThickness,
+            wallHeight,
+            targetComponent,
+            adsk.core.Point3D.create(originPoint.x, originPoint.y + compartmentLength, wallsBottomZ),
+        )
+        dividerY.name = 'Divider wall along X'
+        dividerYBody = dividerY.bodies.item(0)
+        bodiesToMerge.append(dividerYBody)
+        if countY > 2:
+            dividerYPattern = patternUtils.recPattern(
+                commonUtils.objectCollectionFromList([dividerYBody]),
+                (targetComponent.yConstructionAxis, targetComponent.xConstructionAxis),
+                (compartmentLength + wallThickness, compartmentWidth + wallThickness),
+                (countY - 1, 1),
+                targetComponent,
+            )
+            dividerYPattern.name = 'Divider walls along X pattern'
+            bodiesToMerge = bodiesToMerge + list(dividerYPattern.bodies)
+
+    return (bodiesToMerge, bodiesToSubtract)
+
+def createDividerWalls(
+        segments: list[tuple[int, int, int, int]],
+        gridOriginPoint: adsk.core.Point3D,
+        compartmentWidthUnit: float,
+        compartmentLengthUnit: float,
+        wallThickness: float,
+        height: float,
+        targetComponent: adsk.fusion.Component,
+    ) -> list[adsk.fusion.BRepBody]:
+
+    # even fine grid indices are compartment cells, odd ones are walls between them
+    def fineGridStart(index: int, unit: float):
+        return (index // 2) * (unit + wallThickness) + (unit if index % 2 == 1 else 0)
+
+    def fineGridEnd(index: int, unit: float):
+        return fineGridStart(index, unit) + (wallThickness if index % 2 == 1 else unit)
+
+    wallBodies: list[adsk.fusion.BRepBody] = []
+    for [x0, x1, y0, y1] in segments:
+        wallExtrude = extrudeUtils.createBoxAtPoint(
+            fineGridEnd(x1, compartmentWidthUnit) - fineGridStart(x0, compartmentWidthUnit),
+            fineGridEnd(y1, compartmentLengthUnit) - fineGridStart(y0, compartmentLengthUnit),
+            height,
+            targetComponent,
+            geometryUtils.createOffsetPoint(
+                gridOriginPoint,
+                byX=fineGridStart(x0, compartmentWidthUnit),
+                byY=fineGridStart(y0, compartmentLengthUnit),
+            ),
+        )
+        wallExtrude.name = 'Divider wall'
+        wallBodies.append(wallExtrude.bodies.item(0))
+    return wallBodies
+
+def patternBodies(
+        bodies: list[adsk.fusion.BRepBody],
+        distances: tuple[float, float],
+        quantities: tuple[int, int],
+        targetComponent: adsk.fusion.Component,
+    ) -> list[adsk.fusion.BRepBody]:
+    if len(bodies) == 0:
+        return []
+    bodiesPattern = patternUtils.recPattern(
+        commonUtils.objectCollectionFromList(bodies),
+        (targetComponent.xConstructionAxis, targetComponent.yConstructionAxis),
+        distances,
+        quantities,
+        targetComponent,
+    )
+    bodiesPattern.name = 'Compartments pattern'
+    return list(bodiesPattern.bodies)
+
+def copyBodiesWithOffset(
+        bodies: list[adsk.fusion.BRepBody],
+        offset: adsk.core.Vector3D,
+        targetComponent: adsk.fusion.Component,
+    ) -> list[adsk.fusion.BRepBody]:
+    if len(bodies) == 0:
+        return []
+    features: adsk.fusion.Features = targetComponent.features
+    copyFeature = features.copyPasteBodies.add(commonUtils.objectCollectionFromList(bodies))
+    copiedBodies = list(copyFeature.bodies)
+    moveInput = features.moveFeatures.createInput2(commonUtils.objectCollectionFromList(copiedBodies))
+    transform = adsk.core.Matrix3D.create()
+    transform.translation = offset
+    moveInput.defineAsFreeMove(transform)
+    features.moveFeatures.add(moveInput).name = 'Move compartment copy'
+    return copiedBodies
+
 def createCompartment(
         wallThickness: float,
         originPoint: adsk.core.Point3D,
@@ -239,6 +490,7 @@ def createCompartment(
         scoopMaxRadius: float,
         hasTab: bool,
         tabInput: BinBodyTabGeneratorInput,
+        isSimplified: bool,
         targetComponent: adsk.fusion.Component,
     ) -> tuple[list[adsk.fusion.BRepBody], list[adsk.fusion.BRepBody]]:
 
@@ -255,6 +507,7 @@ def createCompartment(
         hasScoop,
         scoopMaxRadius,
         True,
+        isSimplified,
         targetComponent,
     )
     bodiesToSubtract.append(innerCutoutBody)
@@ -73,6 +73,7 @@ class BinBodyGeneratorInput():
         self.compartmentsByX = 1
         self.compartmentsByY = 1
         self.binCornerFilletRadius = const.BIN_CORNER_FILLET_RADIUS
+        self.isSimplified = False
 
     @property
     def baseWidth(self) -> float:
@@ -249,3 +250,11 @@ class BinBodyGeneratorInput():
     @compartments.setter
     def compartments(self, value: list[BinBodyCompartmentDefinition]):
         self._compartments = value
+
+    @property
+    def isSimplified(self) -> bool:
+        return self._isSimplified
+
+    @isSimplified.setter
+    def isSimplified(self, value: bool):
+        self._isSimplified = value
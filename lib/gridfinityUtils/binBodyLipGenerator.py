@@ -3,7 +3,7 @@ import os
 import math
 
 from ...lib import fusion360utils as futil
-from . import const, combineUtils, faceUtils, commonUtils, sketchUtils, extrudeUtils, baseGenerator, edgeUtils, filletUtils, geometryUtils
+from . import const, combineUtils, faceUtils, commonUtils, sketchUtils, extrudeUtils, baseGenerator, edgeUtils, filletUtils, geometryUtils, topologyUtils
 from .baseGeneratorInput import BaseGeneratorInput
 from .binBodyLipGeneratorInput import BinBodyLipGeneratorInput
 
@@ -13,9 +13,8 @@ ui = app.userInterface
 def getInnerCutoutScoopFace(
     innerCutout: adsk.fusion.BRepBody
 ) -> tuple[adsk.fusion.BRepFace, adsk.fusion.BRepFace]:
-    innerCutoutYNormalFaces = [face for face in innerCutout.faces if faceUtils.isYNormal(face)]
-    scoopFace = min(innerCutoutYNormalFaces, key=lambda x: x.boundingBox.minPoint.y)
-    oppositeFace = max(innerCutoutYNormalFaces, key=lambda x: x.boundingBox.minPoint.y)
+    scoopFace = topologyUtils.getExtremeFlatFace(innerCutout, topologyUtils.FLAT_Y, topologyUtils.BOX_MIN_Y, False)
+    oppositeFace = topologyUtils.getExtremeFlatFace(innerCutout, topologyUtils.FLAT_Y, topologyUtils.BOX_MIN_Y, True)
     return (scoopFace, oppositeFace)
 
 def createGridfinityBinBodyLip(
@@ -39,6 +38,27 @@ def createGridfinityBinBodyLip(
 
     bodiesToSubtract: list[adsk.fusion.BRepBody] = []
 
+    # plain lip wall without the stacking profile
+    if input.isSimplified:
+        lipInnerCutout = extrudeUtils.createBoxAtPoint(
+            actualLipBodyWidth - input.wallThickness * 2,
+            actualLipBodyLength - input.wallThickness * 2,
+            lipBodyHeight,
+            targetComponent,
+            geometryUtils.createOffsetPoint(
+                input.origin,
+                byX=input.wallThickness,
+                byY=input.wallThickness,
+            ),
+        )
+        lipInnerCutout.name = 'Lip simplified cutout'
+        combineUtils.cutBody(
+            lipBody,
+            commonUtils.objectCollectionFromList(list(lipInnerCutout.bodies)),
+            targetComponent
+        )
+        return lipBody
+
     # round corners
     filletUtils.filletEdgesByLength(
         lipBodyExtrude.faces,
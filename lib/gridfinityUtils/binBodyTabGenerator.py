@@ -8,7 +8,7 @@ from .const import BIN_TAB_EDGE_FILLET_RADIUS
 from ...lib.gridfinityUtils import geometryUtils
 from ...lib import fusion360utils as futil
 from ...lib.gridfinityUtils import filletUtils
-from . import const, combineUtils, faceUtils, commonUtils, sketchUtils, extrudeUtils, baseGenerator, edgeUtils
+from . import const, combineUtils, faceUtils, commonUtils, sketchUtils, extrudeUtils, baseGenerator, edgeUtils, topologyUtils
 from .baseGeneratorInput import BaseGeneratorInput
 from .binBodyTabGeneratorInput import BinBodyTabGeneratorInput
 from ... import config
@@ -19,9 +19,8 @@ ui = app.userInterface
 def getInnerCutoutScoopFace(
     innerCutout: adsk.fusion.BRepBody
     ) -> tuple[adsk.fusion.BRepFace, adsk.fusion.BRepFace]:
-    innerCutoutYNormalFaces = [face for face in innerCutout.faces if faceUtils.isYNormal(face)]
-    scoopFace = min(innerCutoutYNormalFaces, key=lambda x: x.boundingBox.minPoint.y)
-    oppositeFace = max(innerCutoutYNormalFaces, key=lambda x: x.boundingBox.minPoint.y)
+    scoopFace = topologyUtils.getExtremeFlatFace(innerCutout, topologyUtils.FLAT_Y, topologyUtils.BOX_MIN_Y, False)
+    oppositeFace = topologyUtils.getExtremeFlatFace(innerCutout, topologyUtils.FLAT_Y, topologyUtils.BOX_MIN_Y, True)
     return (scoopFace, oppositeFace)
 
 def createGridfinityBinBodyTab(
@@ -169,17 +168,18 @@ def createGridfinityBinBodyTab(
 
     # Fillet both Top and Bottom edges.
     # We find all X-collinear edges.
-    x_edges = [edge for edge in tabBody.edges if geometryUtils.isCollinearToX(edge)]
+    tab_edges = topologyUtils.getTopologyIndex(tabBody).indexEdges()
+    x_edges = tab_edges.select(topologyUtils.FLAT_Y | topologyUtils.FLAT_Z)
     
     # Find the minimum Y (Front of the tab)
     if x_edges:
-        min_y = min(x_edges, key=lambda e: e.boundingBox.minPoint.y).boundingBox.minPoint.y
+        min_y = tab_edges.value(tab_edges.extreme(x_edges, topologyUtils.BOX_MIN_Y, False), topologyUtils.BOX_MIN_Y)
         # Select all edges at that min_y (within float tolerance)
-        front_edges = [edge for edge in x_edges if abs(edge.boundingBox.minPoint.y - min_y) < 0.001]
+        front_edges = [row for row in x_edges if abs(tab_edges.value(row, topologyUtils.BOX_MIN_Y) - min_y) < 0.001]
         
         if len(front_edges) >= 2:
             # Sort by Z (height) desc. Top edge is first.
-            front_edges_sorted = sorted(front_edges, key=lambda e: e.boundingBox.minPoint.z, reverse=True)
+            front_edges_sorted = [tab_edges.entities[row] for row in sorted(front_edges, key=lambda row: tab_edges.value(row, topologyUtils.BOX_MIN_Z), reverse=True)]
             top_edge = front_edges_sorted[0]
             bottom_edge = front_edges_sorted[1]
             
@@ -205,7 +205,7 @@ def createGridfinityBinBodyTab(
         elif len(front_edges) == 1:
              if input.tabFilletTop > 0.001:
                 fillet = filletUtils.createFillet(
-                    front_edges,
+                    [tab_edges.entities[row] for row in front_edges],
                     input.tabFilletTop,
                     False,
                     targetComponent
@@ -0,0 +1,125 @@
+import adsk.core, adsk.fusion, traceback
+
+from . import const, combineUtils, faceUtils, commonUtils, geometryUtils, shellUtils, shapeUtils, topologyUtils
+from .baseGenerator import createBaseBodyPattern, createBaseBodyPatternFromBRep, cutBaseClearance
+from .binBodyGenerator import createGridfinityBinBody
+from .binBodyTabGeneratorInput import BinBodyTabGeneratorInput
+from .binBodyTabGenerator import createGridfinityBinBodyTab
+from .binGeneratorInput import BinGeneratorInput
+
+def createGridfinityBin(
+    input: BinGeneratorInput,
+    targetComponent: adsk.fusion.Component,
+) -> adsk.fusion.BRepBody:
+    binBodyInput = input.binBodyInput
+    baseGeneratorInput = input.baseInput
+    isSimplified = binBodyInput.isSimplified
+    xyClearance = binBodyInput.xyClearance
+    features: adsk.fusion.Features = targetComponent.features
+    combineFeatures = features.combineFeatures
+
+    baseBodies: list[adsk.fusion.BRepBody] = []
+    if input.hasBase and isSimplified:
+        # plain envelope of the base, without profile and holes
+        baseEnvelopeBody = shapeUtils.simpleBox(
+            targetComponent.xYConstructionPlane,
+            0,
+            binBodyInput.binWidth * binBodyInput.baseWidth - xyClearance * 2,
+            binBodyInput.binLength * binBodyInput.baseLength - xyClearance * 2,
+            -const.BIN_BASE_HEIGHT,
+            targetComponent.originConstructionPoint.geometry,
+            targetComponent,
+        )
+        baseEnvelopeBody.name = 'Base envelope'
+        baseBodies = [baseEnvelopeBody]
+    elif input.hasBase and input.isFastBasePattern:
+        baseBodies = createBaseBodyPatternFromBRep(
+            baseGeneratorInput,
+            binBodyInput.binWidth,
+            binBodyInput.binLength,
+            targetComponent,
+        )
+    elif input.hasBase:
+        baseBodies = createBaseBodyPattern(
+            baseGeneratorInput,
+            binBodyInput.binWidth,
+            binBodyInput.binLength,
+            targetComponent,
+        )
+
+    binBody: adsk.fusion.BRepBody = None
+    if input.hasBody:
+        binBody = createGridfinityBinBody(
+            binBodyInput,
+            targetComponent,
+        )
+    if (input.hasBody or input.hasBase) and not isSimplified:
+        cutBaseClearance(
+            baseGeneratorInput,
+            binBodyInput.binWidth,
+            binBodyInput.binLength,
+            targetComponent,
+        )
+
+    # merge everything
+    if input.hasBody and input.hasBase:
+        toolBodies = commonUtils.objectCollectionFromList(baseBodies)
+        combineFeatureInput = combineFeatures.createInput(binBody, toolBodies)
+        combineFeatures.add(combineFeatureInput)
+
+    if input.isShelled and input.hasBody:
+        # face.boundingBox.maxPoint.z ~ face.boundingBox.minPoint.z => face horizontal
+        # largest horizontal face
+        horizontalFaces = topologyUtils.getFlatFaces(binBody, topologyUtils.FLAT_Z)
+        topFace = faceUtils.maxByArea(horizontalFaces)
+        if binBodyInput.hasLip:
+            splitBodyFeatures = features.splitBodyFeatures
+            splitBodyInput = splitBodyFeatures.createInput(
+                binBody,
+                topFace,
+                True
+            )
+            splitBodies = splitBodyFeatures.add(splitBodyInput)
+            bottomBody = min(splitBodies.bodies, key=lambda x: x.boundingBox.minPoint.z)
+            topBody = max(splitBodies.bodies, key=lambda x: x.boundingBox.minPoint.z)
+            horizontalFaces = topologyUtils.getFlatFaces(bottomBody, topologyUtils.FLAT_Z)
+            topFace = faceUtils.maxByArea(horizontalFaces)
+            shellUtils.simpleShell([topFace], binBodyInput.wallThickness - xyClearance, targetComponent)
+            toolBodies = adsk.core.ObjectCollection.create()
+            toolBodies.add(topBody)
+            combineAfterShellFeatureInput = combineFeatures.createInput(bottomBody, toolBodies)
+            combineFeatures.add(combineAfterShellFeatureInput)
+            binBody = targetComponent.bRepBodies.item(0)
+        else:
+            shellUtils.simpleShell([topFace], binBodyInput.wallThickness - xyClearance, targetComponent)
+
+        # the body generator only adds tabs to hollow bins, shelled ones get theirs after shelling
+        if input.hasTab:
+            compartmentTabInput = BinBodyTabGeneratorInput()
+            tabOriginPoint = adsk.core.Point3D.create(
+                binBodyInput.wallThickness + max(0, min(binBodyInput.tabPosition, binBodyInput.binWidth - binBodyInput.tabLength)) * binBodyInput.baseWidth,
+                const.BIN_LIP_WALL_THICKNESS if binBodyInput.hasLip and binBodyInput.hasScoop else binBodyInput.wallThickness + binBodyInput.binLength * binBodyInput.baseLength - binBodyInput.wallThickness - binBodyInput.xyClearance * 2,
+                (binBodyInput.binHeight - 1) * binBodyInput.heightUnit + max(0, binBodyInput.heightUnit - const.BIN_BASE_HEIGHT),
+            )
+            compartmentTabInput.origin = tabOriginPoint
+            compartmentTabInput.length = max(0, min(binBodyInput.tabLength, binBodyInput.binWidth)) * binBodyInput.baseWidth - binBodyInput.wallThickness * 2 - binBodyInput.xyClearance * 2
+            compartmentTabInput.width = binBodyInput.tabWidth
+            compartmentTabInput.overhangAngle = binBodyInput.tabOverhangAngle
+            compartmentTabInput.topClearance = const.BIN_TAB_TOP_CLEARANCE
+            compartmentTabInput.tabMethod = binBodyInput.tabMethod
+            compartmentTabInput.rootThickness = binBodyInput.rootThickness
+            compartmentTabInput.tipThickness = binBodyInput.tipThickness
+
+            tabBody = createGridfinityBinBodyTab(compartmentTabInput, targetComponent)
+            combineInput = combineFeatures.createInput(tabBody, commonUtils.objectCollectionFromList([binBody]))
+            combineInput.operation = adsk.fusion.FeatureOperations.CutFeatureOperation
+            combineInput.isKeepToolBodies = True
+            combineFeature = combineFeatures.add(combineInput)
+            tabBodies = [body for body in combineFeature.bodies if body.faces != binBody.faces]
+            tabMainBody = max([body for body in tabBodies], key=lambda x: x.edges.count)
+            bodiesToRemove = [body for body in tabBodies if body is not tabMainBody]
+            for body in bodiesToRemove:
+                features.removeFeatures.add(body)
+            combineUtils.joinBodies(binBody, commonUtils.objectCollectionFromList([tabMainBody]), targetComponent)
+
+    return binBody
@@ -0,0 +1,68 @@
+import adsk.core, adsk.fusion, traceback
+
+from .baseGeneratorInput import BaseGeneratorInput
+from .binBodyGeneratorInput import BinBodyGeneratorInput
+
+class BinGeneratorInput():
+    def __init__(self):
+        self.hasBase = True
+        self.hasBody = True
+        self.isFastBasePattern = False
+        self.isShelled = False
+        self.hasTab = False
+
+    @property
+    def baseInput(self) -> BaseGeneratorInput:
+        return self._baseInput
+
+    @baseInput.setter
+    def baseInput(self, value: BaseGeneratorInput):
+        self._baseInput = value
+
+    @property
+    def binBodyInput(self) -> BinBodyGeneratorInput:
+        return self._binBodyInput
+
+    @binBodyInput.setter
+    def binBodyInput(self, value: BinBodyGeneratorInput):
+        self._binBodyInput = value
+
+    @property
+    def hasBase(self) -> bool:
+        return self._hasBase
+
+    @hasBase.setter
+    def hasBase(self, value: bool):
+        self._hasBase = value
+
+    @property
+    def hasBody(self) -> bool:
+        return self._hasBody
+
+    @hasBody.setter
+    def hasBody(self, value: bool):
+        self._hasBody = value
+
+    @property
+    def isFastBasePattern(self) -> bool:
+        return self._isFastBasePattern
+
+    @isFastBasePattern.setter
+    def isFastBasePattern(self, value: bool):
+        self._isFastBasePattern = value
+
+    @property
+    def isShelled(self) -> bool:
+        return self._isShelled
+
+    @isShelled.setter
+    def isShelled(self, value: bool):
+        self._isShelled = value
+
+    @property
+    def hasTab(self) -> bool:
+        return self._hasTab
+
+    @hasTab.setter
+    def hasTab(self, value: bool):
+        self._hasTab = value
@@ -0,0 +1,157 @@
+import math
+
+from .binBodyGeneratorInput import BinBodyCompartmentDefinition
+
+def compartmentCells(compartment: BinBodyCompartmentDefinition):
+    return [
+        (x, y)
+        for x in range(int(compartment.positionX), int(compartment.positionX + compartment.width))
+        for y in range(int(compartment.positionY), int(compartment.positionY + compartment.length))
+    ]
+
+def boundingCompartment(compartments: list[BinBodyCompartmentDefinition]):
+    minX = min(compartment.positionX for compartment in compartments)
+    minY = min(compartment.positionY for compartment in compartments)
+    maxX = max(compartment.positionX + compartment.width for compartment in compartments)
+    maxY = max(compartment.positionY + compartment.length for compartment in compartments)
+    return BinBodyCompartmentDefinition(minX, minY, maxX - minX, maxY - minY, compartments[0].depth)
+
+def mergeCompartments(
+    compartments: list[BinBodyCompartmentDefinition],
+    canMergeAlongY: bool = True,
+) -> list[list[BinBodyCompartmentDefinition]]:
+    """
+    Greedily groups neighbouring compartments of equal depth into maximal rectangles.
+    Overlapping compartments are never merged. Without canMergeAlongY every group stays within one row span.
+    """
+    cellOwners: dict[tuple[int, int], list[int]] = {}
+    for i, compartment in enumerate(compartments):
+        for cell in compartmentCells(compartment):
+            cellOwners.setdefault(cell, []).append(i)
+    isMergeable = [all(len(cellOwners[cell]) == 1 for cell in compartmentCells(compartment)) for compartment in compartments]
+    isAssigned = [False] * len(compartments)
+
+    def closeRectangle(rectangle: tuple[int, int, int, int], depth: float):
+        [x0, y0, x1, y1] = rectangle
+        while True:
+            members = set()
+            for x in range(x0, x1):
+                for y in range(y0, y1):
+                    owners = cellOwners.get((x, y))
+                    if not owners:
+                        return None
+                    members.add(owners[0])
+            for member in members:
+                if isAssigned[member] or not isMergeable[member] or not math.isclose(compartments[member].depth, depth):
+                    return None
+            bounds = boundingCompartment([compartments[member] for member in members])
+            closedRectangle = (int(bounds.positionX), int(bounds.positionY), int(bounds.positionX + bounds.width), int(bounds.positionY + bounds.length))
+            # every member has to span the same rows, a shorter one would lose its own front wall and scoop
+            if not canMergeAlongY and any(
+                (int(compartments[member].positionY), int(compartments[member].positionY + compartments[member].length)) != (closedRectangle[1], closedRectangle[3])
+                for member in members
+            ):
+                return None
+            if closedRectangle == (x0, y0, x1, y1):
+                return (closedRectangle, members)
+            if not canMergeAlongY and (closedRectangle[1], closedRectangle[3]) != (y0, y1):
+                return None
+            [x0, y0, x1, y1] = closedRectangle
+
+    groups: list[list[BinBodyCompartmentDefinition]] = []
+    for i in sorted(range(len(compartments)), key=lambda i: (compartments[i].positionY, compartments[i].positionX)):
+        if isAssigned[i]:
+            continue
+        members = set([i])
+        if isMergeable[i]:
+            compartment = compartments[i]
+            rectangle = (
+                int(compartment.positionX),
+                int(compartment.positionY),
+                int(compartment.positionX + compartment.width),
+                int(compartment.positionY + compartment.length),
+            )
+            isGrowing = True
+            while isGrowing:
+                isGrowing = False
+                [x0, y0, x1, y1] = rectangle
+                candidates = [(x0, y0, x1 + 1, y1)] + ([(x0, y0, x1, y1 + 1)] if canMergeAlongY else [])
+                for candidate in candidates:
+                    closed = closeRectangle(candidate, compartment.depth)
+                    if closed is not None:
+                        [rectangle, members] = closed
+                        isGrowing = True
+                        break
+        for member in members:
+            isAssigned[member] = True
+        groups.append([compartments[member] for member in sorted(members)])
+    return groups
+
+def dividerWallSegments(compartments: list[BinBodyCompartmentDefinition]) -> list[tuple[int, int, int, int]]:
+    """
+    Walls separating compartments of a merged group as (x0, x1, y0, y1) inclusive ranges on a fine grid,
+    where even indices are compartment cells and odd indices are gaps between them.
+    """
+    cellOwners: dict[tuple[int, int], int] = {}
+    for i, compartment in enumerate(compartments):
+        for cell in compartmentCells(compartment):
+            cellOwners[cell] = i
+    bounds = boundingCompartment(compartments)
+    fineXRange = range(int(bounds.positionX) * 2, int(bounds.positionX + bounds.width) * 2 - 1)
+    fineYRange = range(int(bounds.positionY) * 2, int(bounds.positionY + bounds.length) * 2 - 1)
+
+    def isSolid(a: int, b: int):
+        cells = [(x, y) for x in set([a // 2, (a + 1) // 2]) for y in set([b // 2, (b + 1) // 2])]
+        return len(set(cellOwners.get(cell) for cell in cells)) > 1
+
+    def runs(indices: range, isSolidAt):
+        result = []
+        start = None
+        for index in list(indices) + [None]:
+            if index is not None and isSolidAt(index):
+                start = index if start is None else start
+            elif start is not None:
+                end = index - 1 if index is not None else indices[-1]
+                # a lone gap crossing is already covered by walls running in the other direction
+                if not (start == end and start % 2 == 1):
+                    result.append((start, end))
+                start = None
+        return result
+
+    segments: list[tuple[int, int, int, int]] = []
+    for a in fineXRange:
+        if a % 2 == 1:
+            segments = segments + [(a, a, start, end) for [start, end] in runs(fineYRange, lambda b: isSolid(a, b))]
+    for b in fineYRange:
+        if b % 2 == 1:
+            segments = segments + [(start, end, b, b) for [start, end] in runs(fineXRange, lambda a: isSolid(a, b))]
+    return segments
+
+def compartmentSignature(compartments: list[BinBodyCompartmentDefinition]):
+    """
+    Position independent description of a compartment or a merged group of compartments
+    """
+    bounds = boundingCompartment(compartments)
+    offsetX = int(bounds.positionX) * 2
+    offsetY = int(bounds.positionY) * 2
+    walls = tuple(sorted(
+        (x0 - offsetX, x1 - offsetX, y0 - offsetY, y1 - offsetY)
+        for [x0, x1, y0, y1] in dividerWallSegments(compartments)
+    )) if len(compartments) > 1 else ()
+    return (int(bounds.width), int(bounds.length), round(float(bounds.depth), 6), walls)
+
+def positionsLattice(positions: list[tuple[int, int]]):
+    """
+    Returns (origin, step, quantities) if positions fill a regular rectangular grid, None otherwise
+    """
+    xs = sorted(set(x for [x, _] in positions))
+    ys = sorted(set(y for [_, y] in positions))
+    if len(xs) * len(ys) != len(positions):
+        return None
+    steps = []
+    for values in [xs, ys]:
+        step = values[1] - values[0] if len(values) > 1 else 1
+        if any(values[i + 1] - values[i] != step for i in range(len(values) - 1)):
+            return None
+        steps.append(step)
+    return ((xs[0], ys[0]), (steps[0], steps[1]), (len(xs), len(ys)))
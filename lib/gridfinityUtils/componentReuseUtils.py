@@ -0,0 +1,65 @@
+import adsk.core, adsk.fusion, traceback
+
+from . import fingerprintUtils
+from ...lib import fusion360utils as futil
+from ... import config
+
+ATTRIBUTE_GROUP = f'{config.COMPANY_NAME}_{config.ADDIN_NAME}'
+FINGERPRINT_ATTRIBUTE = 'inputsFingerprint'
+BODIES_REVISION_ATTRIBUTE = 'bodiesRevision'
+# bump to stop reusing components generated before changes to the geometry
+GENERATOR_VERSION = 1
+
+def getFingerprint(input: any, hasHistory: bool = True) -> str:
+    # names are left out, rows made unique by name still share the component built for their inputs
+    key = {
+        'version': GENERATOR_VERSION,
+        'input': input,
+    }
+    # bodies built without history leave out scoops and fillets, they only match each other
+    if not hasHistory:
+        key['hasHistory'] = False
+    return fingerprintUtils.fingerprint(key)
+
+def getBodiesRevision(component: adsk.fusion.Component) -> str:
+    return ','.join(sorted(body.revisionId for body in component.bRepBodies))
+
+def isUnchanged(component: adsk.fusion.Component) -> bool:
+    # bodies edited after generation get new revisions, such a component is no longer the generated part
+    revisionAttribute = component.attributes.itemByName(ATTRIBUTE_GROUP, BODIES_REVISION_ATTRIBUTE)
+    return revisionAttribute is not None and revisionAttribute.value == getBodiesRevision(component)
+
+def findGeneratedComponent(design: adsk.fusion.Design, fingerprint: str) -> adsk.fusion.Component:
+    for attribute in design.findAttributes(ATTRIBUTE_GROUP, FINGERPRINT_ATTRIBUTE):
+        component = adsk.fusion.Component.cast(attribute.parent)
+        if attribute.value == fingerprint and component is not None and component.isValid and component.bRepBodies.count > 0 and isUnchanged(component):
+            return component
+    return None
+
+def markGeneratedComponent(component: adsk.fusion.Component, fingerprint: str):
+    component.attributes.add(ATTRIBUTE_GROUP, FINGERPRINT_ATTRIBUTE, fingerprint)
+    component.attributes.add(ATTRIBUTE_GROUP, BODIES_REVISION_ATTRIBUTE, getBodiesRevision(component))
+
+def placeGeneratedComponent(
+    design: adsk.fusion.Design,
+    fingerprint: str,
+    targetComponent: adsk.fusion.Component,
+    transform: adsk.core.Matrix3D = None,
+    name: str = None,
+) -> adsk.fusion.Occurrence:
+    """
+    Adds an occurrence of a previously generated component with the same fingerprint,
+    returns None when there is nothing to reuse
+    """
+    if not config.REUSE_IDENTICAL_COMPONENTS:
+        return None
+    try:
+        component = findGeneratedComponent(design, fingerprint)
+    except:
+        futil.log(f'Failed to look up generated components:\n{traceback.format_exc()}')
+        return None
+    if component is None:
+        return None
+    # occurrence names follow their component, a differently named part shows up as another copy of it
+    futil.log(f'Reusing generated component {component.name}' + (f' for {name}' if name is not None and name != component.name else ''))
+    return targetComponent.occurrences.addExistingComponent(component, transform or adsk.core.Matrix3D.create())
@@ -46,9 +46,12 @@ BIN_SCOOP_MAX_RADIUS = 2.5
 
 BASEPLATE_EXTRA_HEIGHT = 0.64
 BASEPLATE_BIN_Z_CLEARANCE = 0.05
+# total gap left between a baseplate and the drawer walls
+DRAWER_CLEARANCE = 0.05
 
 DIMENSION_DEFAULT_WIDTH_UNIT = 4.2
 DIMENSION_DEFAULT_HEIGHT_UNIT = 0.7
+DIMENSION_DEFAULT_PRINT_BED_SIZE = 22.0
 DIMENSION_SCREW_HOLES_OFFSET = 0.8
 DIMENSION_SCREW_HOLE_DIAMETER = 0.3
 DIMENSION_PLATE_CONNECTION_SCREW_HOLE_DIAMETER = 0.32
@@ -0,0 +1,27 @@
+import adsk.core, adsk.fusion, traceback
+
+from .meshUtils import TriangleMesh
+
+PREVIEW_MESH_COLOR = (122, 160, 196, 255)
+
+def drawMesh(
+    mesh: TriangleMesh,
+    targetComponent: adsk.fusion.Component,
+    color: tuple[int, int, int, int] = PREVIEW_MESH_COLOR,
+) -> adsk.fusion.CustomGraphicsGroup:
+    graphicsGroup = targetComponent.customGraphicsGroups.add()
+    [coordinates, indices, normals, normalIndices] = mesh.toArrays()
+    if len(indices) == 0:
+        return graphicsGroup
+    meshGraphics = graphicsGroup.addMesh(
+        adsk.fusion.CustomGraphicsCoordinates.create(coordinates),
+        indices,
+        normals,
+        normalIndices,
+    )
+    meshGraphics.color = adsk.fusion.CustomGraphicsSolidColorEffect.create(adsk.core.Color.create(*color))
+    return graphicsGroup
+
+def deleteGraphics(graphicsGroup: adsk.fusion.CustomGraphicsGroup):
+    if graphicsGroup is not None and graphicsGroup.isValid:
+        graphicsGroup.deleteMe()
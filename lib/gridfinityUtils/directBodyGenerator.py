@@ -0,0 +1,380 @@
+import adsk.core, adsk.fusion, traceback
+import math
+
+from . import const, compartmentUtils, fingerprintUtils, baseBodyCache
+from .temporaryBRepUtils import (
+    createBox,
+    createCylinder,
+    createPrismAlongX,
+    createProfileSolid,
+    createRevolvedProfile,
+    createRoundedPrism,
+    difference,
+    intersection,
+    translated,
+    union,
+    unionAll,
+)
+from .meshPreviewGenerator import BASE_PROFILE
+from .printMeshGenerator import baseplateHoleProfile, binBaseHoleProfile, getBaseplateCellKey, getBinBaseCellKey
+from .baseplateGeneratorInput import BaseplateGeneratorInput
+from .binBodyGeneratorInput import BinBodyGeneratorInput
+from .binGeneratorInput import BinGeneratorInput
+
+# Bins and baseplates built from temporary BRep primitives and booleans without any timeline features,
+# for direct designs and for parts that are only exported. The geometry matches the print meshes of
+# printMeshGenerator, the same features are left out: magnet tabs, hole grooves, scoops, fillets and
+# baseplate connection holes. Bin bases are copies of the cached full base body where one was stored
+# by a fast base pattern build, getLeftOutBinFeatures and getLeftOutBaseplateFeatures list what is missing.
+
+# cells reused between parts of the current session, placements are transformed copies so cached bodies never change
+BODY_CACHE_SIZE = 64
+bodyCache: dict[str, adsk.fusion.BRepBody] = {}
+
+def getCachedBody(key: dict, createBody) -> adsk.fusion.BRepBody:
+    cacheKey = fingerprintUtils.fingerprint(key)
+    body = bodyCache.get(cacheKey)
+    if body is None:
+        if len(bodyCache) >= BODY_CACHE_SIZE:
+            bodyCache.pop(next(iter(bodyCache)))
+        body = createBody()
+        bodyCache[cacheKey] = body
+    return body
+
+def createBinBaseCellBody(input: BinGeneratorInput) -> adsk.fusion.BRepBody:
+    binBodyInput = input.binBodyInput
+    xyClearance = binBodyInput.xyClearance
+    cellWidth = binBodyInput.baseWidth - xyClearance * 2
+    cellLength = binBodyInput.baseLength - xyClearance * 2
+    profile = [(max(0, inset - xyClearance) if z < 0 else 0, z) for [inset, z] in BASE_PROFILE]
+    profile.reverse()
+    body = createProfileSolid(0, 0, cellWidth, cellLength, binBodyInput.binCornerFilletRadius, profile)
+
+    holeOffset = const.DIMENSION_SCREW_HOLES_OFFSET - xyClearance
+    holeProfile = binBaseHoleProfile(input.baseInput, -const.BIN_BASE_HEIGHT, 0)
+    for [x, y] in [
+        (holeOffset, holeOffset),
+        (cellWidth - holeOffset, holeOffset),
+        (cellWidth - holeOffset, cellLength - holeOffset),
+        (holeOffset, cellLength - holeOffset),
+    ]:
+        hole = createRevolvedProfile(x, y, holeProfile)
+        if hole is not None:
+            difference(body, hole)
+    return body
+
+def createCachedBinBaseBody(input: BinGeneratorInput) -> adsk.fusion.BRepBody | None:
+    """
+    Full base from copies of the cached base body, trimmed to the bin outline like baseGenerator.cutBaseClearance
+    """
+    cachedBody = getCachedBody({'part': 'cachedBase', 'key': baseBodyCache.getCacheKey(input.baseInput)}, lambda: baseBodyCache.loadBaseBody(input.baseInput))
+    if cachedBody is None:
+        return None
+    binBodyInput = input.binBodyInput
+    body = unionAll([
+        translated(cachedBody, i * binBodyInput.baseWidth, j * binBodyInput.baseLength)
+        for i in range(int(binBodyInput.binWidth))
+        for j in range(int(binBodyInput.binLength))
+    ])
+    box = cachedBody.boundingBox
+    return intersection(body, createRoundedPrism(
+        0,
+        0,
+        binBodyInput.baseWidth * binBodyInput.binWidth - binBodyInput.xyClearance * 2,
+        binBodyInput.baseLength * binBodyInput.binLength - binBodyInput.xyClearance * 2,
+        (input.baseInput.cornerFilletRadius - binBodyInput.xyClearance,) * 4,
+        box.minPoint.z,
+        box.maxPoint.z,
+    ))
+
+def getLeftOutBinFeatures(input: BinGeneratorInput) -> list[str]:
+    """
+    Enabled options the bodies of createGridfinityBinDirect don't have
+    """
+    binBodyInput = input.binBodyInput
+    baseInput = input.baseInput
+    features: list[str] = []
+    if input.hasBase and not baseBodyCache.hasBaseBody(baseInput):
+        if baseInput.hasMagnetCutouts and baseInput.hasMagnetCutoutsTabs:
+            features.append('magnet tabs')
+        if baseInput.hasMagnetCutouts and baseInput.hasScrewHoles:
+            features.append('hole grooves')
+    if input.hasBody and binBodyInput.hasScoop and not binBodyInput.isSolid:
+        features.append('scoop')
+    if input.hasBody and not binBodyInput.isSolid:
+        features.append('compartment fillets')
+    if input.hasBody and binBodyInput.hasTab and max(binBodyInput.tabFilletTop, binBodyInput.tabFilletBottom, binBodyInput.tabFilletBack) > 0:
+        features.append('tab fillets')
+    if input.hasBody and binBodyInput.hasLip and binBodyInput.hasLipNotches:
+        features.append('lip notches')
+    if input.hasBody and input.isShelled:
+        features.append('shell')
+    return features
+
+def getLeftOutBaseplateFeatures(input: BaseplateGeneratorInput) -> list[str]:
+    return ['connection holes'] if input.hasConnectionHoles else []
+
+def createBinLipBody(input: BinBodyGeneratorInput, bottomZ: float) -> adsk.fusion.BRepBody:
+    actualBodyWidth = (input.baseWidth * input.binWidth) - input.xyClearance * 2.0
+    actualBodyLength = (input.baseLength * input.binLength) - input.xyClearance * 2.0
+    radius = input.binCornerFilletRadius
+    lipHeight = const.BIN_LIP_EXTRA_HEIGHT - const.BIN_LIP_TOP_RECESS_HEIGHT
+    lipChamferStart = const.BIN_BASE_HEIGHT - const.BIN_BASE_TOP_SECTION_HEIGH
+    lipTopInset = max(0, const.BIN_LIP_WALL_THICKNESS - (lipHeight - lipChamferStart))
+    body = createRoundedPrism(0, 0, actualBodyWidth, actualBodyLength, (radius,) * 4, bottomZ, bottomZ + lipHeight)
+    difference(body, createProfileSolid(0, 0, actualBodyWidth, actualBodyLength, radius, [
+        (const.BIN_LIP_WALL_THICKNESS, bottomZ),
+        (const.BIN_LIP_WALL_THICKNESS, bottomZ + lipChamferStart),
+        (lipTopInset, bottomZ + lipHeight),
+    ]))
+    return body
+
+def createBinBody(input: BinBodyGeneratorInput) -> adsk.fusion.BRepBody:
+    """
+    Bin walls, compartment floors, divider walls and label tabs as one body, without the lip
+    """
+    actualBodyWidth = (input.baseWidth * input.binWidth) - input.xyClearance * 2.0
+    actualBodyLength = (input.baseLength * input.binLength) - input.xyClearance * 2.0
+    binBodyTotalHeight = (input.binHeight - 1) * input.heightUnit + max(0, input.heightUnit - const.BIN_BASE_HEIGHT)
+    radius = input.binCornerFilletRadius
+    body = createRoundedPrism(0, 0, actualBodyWidth, actualBodyLength, (radius,) * 4, 0, binBodyTotalHeight)
+    if input.isSolid:
+        return body
+
+    compartmentsMinX = input.wallThickness
+    compartmentsMaxX = actualBodyWidth - input.wallThickness
+    compartmentsMinY = (const.BIN_LIP_WALL_THICKNESS - input.xyClearance) if input.hasLip and input.hasScoop else input.wallThickness
+    compartmentsMaxY = actualBodyLength - input.wallThickness
+    innerRadius = max(0, radius - input.wallThickness)
+
+    compartmentWidthUnit = (compartmentsMaxX - compartmentsMinX - (input.compartmentsByX - 1) * input.wallThickness) / input.compartmentsByX
+    compartmentLengthUnit = (compartmentsMaxY - compartmentsMinY - (input.compartmentsByY - 1) * input.wallThickness) / input.compartmentsByY
+    pitchX = compartmentWidthUnit + input.wallThickness
+    pitchY = compartmentLengthUnit + input.wallThickness
+
+    def compartmentDepth(compartment):
+        return min(binBodyTotalHeight - const.BIN_COMPARTMENT_BOTTOM_THICKNESS, compartment.depth)
+
+    maxDepth = max([compartmentDepth(compartment) for compartment in input.compartments] + [0])
+    floorHeight = binBodyTotalHeight - maxDepth
+    if maxDepth <= 0:
+        return body
+    # the cavity is cut to the deepest compartment, raised floors, uncovered cells and walls are added back
+    difference(body, createRoundedPrism(compartmentsMinX, compartmentsMinY, compartmentsMaxX, compartmentsMaxY, (innerRadius,) * 4, floorHeight, binBodyTotalHeight))
+
+    fills: list[adsk.fusion.BRepBody] = []
+    coveredCells = set()
+    for compartment in input.compartments:
+        coveredCells.update(compartmentUtils.compartmentCells(compartment))
+        floorRaise = maxDepth - compartmentDepth(compartment)
+        if floorRaise <= 0:
+            continue
+        minX = compartmentsMinX + compartment.positionX * pitchX
+        minY = compartmentsMinY + compartment.positionY * pitchY
+        fills.append(createBox(
+            minX,
+            minY,
+            floorHeight,
+            minX + compartmentWidthUnit * compartment.width + (compartment.width - 1) * input.wallThickness,
+            minY + compartmentLengthUnit * compartment.length + (compartment.length - 1) * input.wallThickness,
+            floorHeight + floorRaise,
+        ))
+    for i in range(input.compartmentsByX):
+        for j in range(input.compartmentsByY):
+            if not (i, j) in coveredCells:
+                minX = compartmentsMinX + i * pitchX
+                minY = compartmentsMinY + j * pitchY
+                fills.append(createBox(minX, minY, floorHeight, minX + compartmentWidthUnit, minY + compartmentLengthUnit, binBodyTotalHeight))
+
+    def fineGridStart(index: int, unit: float):
+        return (index // 2) * (unit + input.wallThickness) + (unit if index % 2 == 1 else 0)
+
+    def fineGridEnd(index: int, unit: float):
+        return fineGridStart(index, unit) + (input.wallThickness if index % 2 == 1 else unit)
+
+    # compartments shallower than the top clearance have no walls left between them
+    if len(input.compartments) > 1 and maxDepth > const.BIN_TAB_TOP_CLEARANCE:
+        for [x0, x1, y0, y1] in compartmentUtils.dividerWallSegments(input.compartments):
+            fills.append(createBox(
+                compartmentsMinX + fineGridStart(x0, compartmentWidthUnit),
+                compartmentsMinY + fineGridStart(y0, compartmentLengthUnit),
+                floorHeight,
+                compartmentsMinX + fineGridEnd(x1, compartmentWidthUnit),
+                compartmentsMinY + fineGridEnd(y1, compartmentLengthUnit),
+                binBodyTotalHeight - const.BIN_TAB_TOP_CLEARANCE,
+            ))
+
+    if input.hasTab:
+        for compartment in input.compartments:
+            compartmentX = compartmentsMinX + compartment.positionX * pitchX
+            compartmentWidth = compartmentWidthUnit * compartment.width + (compartment.width - 1) * input.wallThickness
+            tabBackY = compartmentsMinY + compartment.positionY * pitchY + compartmentLengthUnit * compartment.length + (compartment.length - 1) * input.wallThickness
+            tabTopZ = binBodyTotalHeight - const.BIN_TAB_TOP_CLEARANCE
+            tabStartX = compartmentX + max(0, min(input.tabPosition, input.binWidth - input.tabLength)) * input.baseWidth
+            tabEndX = min(compartmentX + compartmentWidth, tabStartX + max(0, min(input.tabLength, input.binWidth)) * input.baseWidth)
+            if tabEndX <= tabStartX:
+                continue
+            if input.tabMethod == const.BIN_TAB_METHOD_DIMENSIONS:
+                profile = [
+                    (tabBackY, tabTopZ - input.rootThickness),
+                    (tabBackY, tabTopZ),
+                    (tabBackY - input.tabWidth, tabTopZ),
+                    (tabBackY - input.tabWidth, tabTopZ - input.tipThickness),
+                ]
+            else:
+                profile = [
+                    (tabBackY, tabTopZ - input.tabWidth / math.tan(input.tabOverhangAngle)),
+                    (tabBackY, tabTopZ),
+                    (tabBackY - input.tabWidth, tabTopZ),
+                ]
+            fills.append(createPrismAlongX(tabStartX, tabEndX - tabStartX, profile))
+
+    fill = unionAll(fills)
+    if fill is not None:
+        union(body, fill)
+    return body
+
+def createGridfinityBinBodies(input: BinGeneratorInput) -> list[adsk.fusion.BRepBody]:
+    binBodyInput = input.binBodyInput
+    bodies: list[adsk.fusion.BRepBody] = []
+    cachedBaseBody = createCachedBinBaseBody(input) if input.hasBase else None
+    if cachedBaseBody is not None:
+        bodies.append(cachedBaseBody)
+    elif input.hasBase:
+        cellBody = getCachedBody(getBinBaseCellKey(input), lambda: createBinBaseCellBody(input))
+        bodies += [
+            translated(cellBody, i * binBodyInput.baseWidth, j * binBodyInput.baseLength)
+            for i in range(int(binBodyInput.binWidth))
+            for j in range(int(binBodyInput.binLength))
+        ]
+    if input.hasBody:
+        bodies.append(createBinBody(binBodyInput))
+        if binBodyInput.hasLip:
+            binBodyTotalHeight = (binBodyInput.binHeight - 1) * binBodyInput.heightUnit + max(0, binBodyInput.heightUnit - const.BIN_BASE_HEIGHT)
+            bodies.append(createBinLipBody(binBodyInput, binBodyTotalHeight))
+    # base cells, body and lip touch each other and merge into one solid
+    return [unionAll(bodies)] if len(bodies) > 0 else []
+
+def createBaseplateCellBody(
+    input: BaseplateGeneratorInput,
+    cellMinX: float,
+    cellMinY: float,
+    cellMaxX: float,
+    cellMaxY: float,
+    cornerRadii: tuple[float, float, float, float],
+) -> adsk.fusion.BRepBody:
+    """
+    Single bin socket with the bottom extension under it, coordinates are relative to the min corner of the socket cutout
+    """
+    xyClearance = input.xyClearance
+    topZ = -input.binZClearance
+    bottomZ = -const.BIN_BASE_HEIGHT
+    socketWidth = input.baseWidth + xyClearance * 2
+    socketLength = input.baseLength + xyClearance * 2
+
+    cutoutProfile = [(inset, z) for [inset, z] in BASE_PROFILE if z < topZ]
+    cutoutProfile.reverse()
+    cutoutProfile.append((-topZ, topZ))
+    body = createRoundedPrism(cellMinX, cellMinY, cellMaxX, cellMaxY, cornerRadii, bottomZ, topZ)
+    difference(body, createProfileSolid(0, 0, socketWidth, socketLength, input.cornerFilletRadius + xyClearance, cutoutProfile))
+
+    if not input.hasExtendedBottom:
+        return body
+
+    extensionBottomZ = bottomZ - input.bottomExtensionHeight
+    extension = createRoundedPrism(cellMinX, cellMinY, cellMaxX, cellMaxY, cornerRadii, extensionBottomZ, bottomZ)
+    holeMinX = const.DIMENSION_SCREW_HOLES_OFFSET + xyClearance
+    holeMinY = const.DIMENSION_SCREW_HOLES_OFFSET + xyClearance
+    holeMaxX = input.baseWidth - const.DIMENSION_SCREW_HOLES_OFFSET + xyClearance
+    holeMaxY = input.baseLength - const.DIMENSION_SCREW_HOLES_OFFSET + xyClearance
+    holeCenters = [(holeMinX, holeMinY), (holeMaxX, holeMinY), (holeMaxX, holeMaxY), (holeMinX, holeMaxY)]
+    holeProfile = baseplateHoleProfile(input, extensionBottomZ, bottomZ)
+    for [x, y] in holeCenters:
+        hole = createRevolvedProfile(x, y, holeProfile)
+        if hole is not None:
+            difference(extension, hole)
+
+    if input.hasSkeletonizedBottom:
+        # through cutout leaving a round pad around every hole, the same outline as printMeshGenerator.skeletonCutoutLoop
+        floorInset = const.BIN_BASE_TOP_SECTION_HEIGH + const.BIN_BASE_BOTTOM_SECTION_HEIGH
+        padRadius = max(input.magnetCutoutsDiameter, input.screwHeadCutoutDiameter) / 2 + 0.1
+        if holeMinX + padRadius < holeMaxX - padRadius and holeMinY + padRadius < holeMaxY - padRadius and floorInset < min(holeMinX, holeMinY):
+            cutout = createBox(floorInset, floorInset, extensionBottomZ, socketWidth - floorInset, socketLength - floorInset, bottomZ)
+            for [x, y] in holeCenters:
+                difference(cutout, createCylinder(x, y, extensionBottomZ, padRadius, bottomZ, padRadius))
+            difference(extension, cutout)
+    return union(body, extension)
+
+def createGridfinityBaseplateBodies(input: BaseplateGeneratorInput) -> list[adsk.fusion.BRepBody]:
+    xyClearance = input.xyClearance
+    baseplateTrueWidth = input.baseplateWidth * input.baseWidth - xyClearance * 2
+    baseplateTrueLength = input.baseplateLength * input.baseLength - xyClearance * 2
+    topZ = -input.binZClearance
+    bottomZ = -const.BIN_BASE_HEIGHT - (input.bottomExtensionHeight if input.hasExtendedBottom else 0)
+    paddingLeft = input.paddingLeft if input.hasPadding else 0
+    paddingRight = input.paddingRight if input.hasPadding else 0
+    paddingTop = input.paddingTop if input.hasPadding else 0
+    paddingBottom = input.paddingBottom if input.hasPadding else 0
+    outerCorners = [
+        (baseplateTrueWidth + paddingRight, -paddingBottom),
+        (baseplateTrueWidth + paddingRight, baseplateTrueLength + paddingTop),
+        (-paddingLeft, baseplateTrueLength + paddingTop),
+        (-paddingLeft, -paddingBottom),
+    ]
+    outerRadius = input.cornerFilletRadius - xyClearance
+
+    def cornerRadii(minX: float, minY: float, maxX: float, maxY: float) -> tuple[float, float, float, float]:
+        # only the corners of the whole plate are rounded
+        return tuple(
+            outerRadius if any(math.isclose(x, cornerX, abs_tol=1e-6) and math.isclose(y, cornerY, abs_tol=1e-6) for [cornerX, cornerY] in outerCorners) else 0
+            for [x, y] in [(maxX, minY), (maxX, maxY), (minX, maxY), (minX, minY)]
+        )
+
+    bodies: list[adsk.fusion.BRepBody] = []
+    for i in range(int(input.baseplateWidth)):
+        for j in range(int(input.baseplateLength)):
+            socketX = i * input.baseWidth - xyClearance * 2
+            socketY = j * input.baseLength - xyClearance * 2
+            cellMinX = max(0, i * input.baseWidth - xyClearance)
+            cellMinY = max(0, j * input.baseLength - xyClearance)
+            cellMaxX = min(baseplateTrueWidth, (i + 1) * input.baseWidth - xyClearance)
+            cellMaxY = min(baseplateTrueLength, (j + 1) * input.baseLength - xyClearance)
+            bounds = [cellMinX - socketX, cellMinY - socketY, cellMaxX - socketX, cellMaxY - socketY]
+            radii = cornerRadii(cellMinX, cellMinY, cellMaxX, cellMaxY)
+            cellBody = getCachedBody(getBaseplateCellKey(input, bounds, radii), lambda: createBaseplateCellBody(input, *bounds, radii))
+            bodies.append(translated(cellBody, socketX, socketY))
+
+    for [minX, minY, maxX, maxY] in [
+        (-paddingLeft, -paddingBottom, 0, baseplateTrueLength + paddingTop),
+        (baseplateTrueWidth, -paddingBottom, baseplateTrueWidth + paddingRight, baseplateTrueLength + paddingTop),
+        (0, -paddingBottom, baseplateTrueWidth, 0),
+        (0, baseplateTrueLength, baseplateTrueWidth, baseplateTrueLength + paddingTop),
+    ]:
+        if maxX - minX <= 0 or maxY - minY <= 0:
+            continue
+        bodies.append(createRoundedPrism(minX, minY, maxX, maxY, cornerRadii(minX, minY, maxX, maxY), bottomZ, topZ))
+    return [unionAll(bodies)]
+
+def addBodies(
+    bodies: list[adsk.fusion.BRepBody],
+    targetComponent: adsk.fusion.Component,
+    name: str,
+    isParametric: bool,
+) -> list[adsk.fusion.BRepBody]:
+    # parametric designs take bodies through a base feature, direct designs have no features to hold them
+    if not isParametric:
+        return [targetComponent.bRepBodies.add(body) for body in bodies]
+    baseFeature = targetComponent.features.baseFeatures.add()
+    baseFeature.name = name
+    baseFeature.startEdit()
+    for body in bodies:
+        targetComponent.bRepBodies.add(body, baseFeature)
+    baseFeature.finishEdit()
+    return list(baseFeature.bodies)
+
+def createGridfinityBinDirect(input: BinGeneratorInput, targetComponent: adsk.fusion.Component, isParametric: bool = True) -> adsk.fusion.BRepBody | None:
+    bodies = addBodies(createGridfinityBinBodies(input), targetComponent, 'Gridfinity bin', isParametric)
+    return bodies[0] if len(bodies) > 0 else None
+
+def createGridfinityBaseplateDirect(input: BaseplateGeneratorInput, targetComponent: adsk.fusion.Component, isParametric: bool = True) -> adsk.fusion.BRepBody:
+    return addBodies(createGridfinityBaseplateBodies(input), targetComponent, 'Gridfinity baseplate', isParametric)[0]
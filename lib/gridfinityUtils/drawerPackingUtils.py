@@ -0,0 +1,192 @@
+import math
+import random
+
+from ... import config
+from . import const
+
+# bin spec keys read by the planner, everything else is passed on to the manifest rows
+BIN_SPEC_KEYS = ['width', 'length', 'count']
+DRAWER_KEYS = ['name', 'width', 'length', 'bins', 'baseplate', 'clearance', 'baseWidth', 'baseLength', 'xyClearance', 'padding']
+
+class BinSpec():
+    def __init__(self, width: int, length: int, count: int | None, options: dict):
+        self.width = width
+        self.length = length
+        # None marks a filler size, placed as many times as it fits once the counted bins are in
+        self.count = count
+        self.options = options
+
+    @property
+    def area(self) -> int:
+        return self.width * self.length
+
+class BinPlacement():
+    def __init__(self, x: int, y: int, width: int, length: int, spec: BinSpec):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.length = length
+        self.spec = spec
+
+class DrawerPlan():
+    def __init__(self, name: str, columns: int, rows: int):
+        self.name = name
+        self.columns = columns
+        self.rows = rows
+        self.specs: list[BinSpec] = []
+        self.placements: list[BinPlacement] = []
+        self.unplaced: list[BinSpec] = []
+        self.paddingX = 0.0
+        self.paddingY = 0.0
+
+    @property
+    def coveredCells(self) -> int:
+        return sum(placement.width * placement.length for placement in self.placements)
+
+    @property
+    def coverage(self) -> float:
+        return self.coveredCells / max(1, self.columns * self.rows)
+
+    def layout(self) -> list[str]:
+        """
+        Text drawing of the grid, one line per row with the last row on top, each bin gets its own letter
+        """
+        cells = [['.'] * self.columns for _ in range(self.rows)]
+        for index, placement in enumerate(self.placements):
+            symbol = chr(ord('A') + index % 26) if index < 26 else chr(ord('a') + index % 26)
+            for y in range(placement.y, placement.y + placement.length):
+                for x in range(placement.x, placement.x + placement.width):
+                    cells[y][x] = symbol
+        return [''.join(row) for row in reversed(cells)]
+
+class OccupancyGrid():
+    """
+    Free cells as one bit mask per grid row, a bin fits where the masks of all the rows it covers are clear
+    """
+    def __init__(self, columns: int, rows: int):
+        self.columns = columns
+        self.rows = rows
+        self.masks = [0] * rows
+        self.fullMask = (1 << columns) - 1
+
+    def fits(self, x: int, y: int, width: int, length: int) -> bool:
+        if x + width > self.columns or y + length > self.rows:
+            return False
+        mask = ((1 << width) - 1) << x
+        return all(self.masks[row] & mask == 0 for row in range(y, y + length))
+
+    def occupy(self, x: int, y: int, width: int, length: int):
+        mask = ((1 << width) - 1) << x
+        for row in range(y, y + length):
+            self.masks[row] |= mask
+
+    def freeCells(self, columnMajor: bool):
+        if columnMajor:
+            for x in range(self.columns):
+                for y in range(self.rows):
+                    if not self.masks[y] >> x & 1:
+                        yield (x, y)
+            return
+        for y in range(self.rows):
+            if self.masks[y] == self.fullMask:
+                continue
+            for x in range(self.columns):
+                if not self.masks[y] >> x & 1:
+                    yield (x, y)
+
+def getOrientations(spec: BinSpec, rotateFirst: bool) -> list[tuple[int, int]]:
+    orientations = [(spec.width, spec.length)]
+    if spec.width != spec.length:
+        orientations.append((spec.length, spec.width))
+    return list(reversed(orientations)) if rotateFirst else orientations
+
+def placeFirstFit(grid: OccupancyGrid, spec: BinSpec, columnMajor: bool, rotateFirst: bool) -> BinPlacement | None:
+    orientations = getOrientations(spec, rotateFirst)
+    # the first free cell in scan order is the bottom left corner of every free area, bins only need to be tried there
+    for [x, y] in grid.freeCells(columnMajor):
+        for [width, length] in orientations:
+            if grid.fits(x, y, width, length):
+                grid.occupy(x, y, width, length)
+                return BinPlacement(x, y, width, length, spec)
+    return None
+
+def fillGaps(grid: OccupancyGrid, fillers: list[BinSpec], columnMajor: bool, rotateFirst: bool) -> list[BinPlacement]:
+    placements = []
+    for [x, y] in grid.freeCells(columnMajor):
+        for spec in fillers:
+            placement = next((
+                BinPlacement(x, y, width, length, spec)
+                for [width, length] in getOrientations(spec, rotateFirst)
+                if grid.fits(x, y, width, length)
+            ), None)
+            if placement is not None:
+                grid.occupy(x, y, placement.width, placement.length)
+                placements.append(placement)
+                break
+    return placements
+
+def packBins(columns: int, rows: int, counted: list[BinSpec], fillers: list[BinSpec], columnMajor: bool, rotations: list[bool], rotateFillers: bool) -> tuple[list[BinPlacement], list[BinSpec]]:
+    grid = OccupancyGrid(columns, rows)
+    placements = []
+    unplaced = []
+    for [spec, rotateFirst] in zip(counted, rotations):
+        placement = placeFirstFit(grid, spec, columnMajor, rotateFirst)
+        if placement is None:
+            unplaced.append(spec)
+            continue
+        placements.append(placement)
+    placements += fillGaps(grid, fillers, columnMajor, rotateFillers)
+    return (placements, unplaced)
+
+def getGridSize(drawerSize: float, unit: float, xyClearance: float, clearance: float) -> int:
+    # a plate of n cells is n * unit - 2 * xyClearance long
+    return max(0, int(math.floor((drawerSize - clearance + xyClearance * 2) / unit + 1e-9)))
+
+def planDrawer(name: str, drawerWidth: float, drawerLength: float, specs: list[BinSpec],
+        baseWidth: float = const.DIMENSION_DEFAULT_WIDTH_UNIT,
+        baseLength: float = const.DIMENSION_DEFAULT_WIDTH_UNIT,
+        xyClearance: float = const.BIN_XY_CLEARANCE,
+        clearance: float = const.DRAWER_CLEARANCE,
+    ) -> DrawerPlan:
+    """
+    Packs the bin mix into the largest grid fitting the drawer. Counted bins go in largest first at the first
+    free spot, filler sizes then take the remaining gaps. A few scan orders are tried, then shuffled orders
+    while some counted bins are left out, and the plan placing the most of them with the best coverage wins.
+    """
+    columns = getGridSize(drawerWidth, baseWidth, xyClearance, clearance)
+    rows = getGridSize(drawerLength, baseLength, xyClearance, clearance)
+    plan = DrawerPlan(name, columns, rows)
+    plan.specs = specs
+    if columns < 1 or rows < 1:
+        raise ValueError(f'Drawer "{name}" is smaller than a single {baseWidth * 10:.1f}x{baseLength * 10:.1f}mm grid cell')
+    plan.paddingX = max(0, drawerWidth - clearance - (columns * baseWidth - xyClearance * 2)) / 2
+    plan.paddingY = max(0, drawerLength - clearance - (rows * baseLength - xyClearance * 2)) / 2
+
+    # big bins first, small ones fill in around them
+    counted = sorted(
+        [spec for spec in specs if spec.count is not None for _ in range(spec.count)],
+        key=lambda spec: (-spec.area, -max(spec.width, spec.length)),
+    )
+    fillers = sorted([spec for spec in specs if spec.count is None], key=lambda spec: (-spec.area, -max(spec.width, spec.length)))
+    bestScore = None
+    def tryPacking(order: list[BinSpec], columnMajor: bool, rotations: list[bool], rotateFillers: bool):
+        nonlocal bestScore
+        [placements, unplaced] = packBins(columns, rows, order, fillers, columnMajor, rotations, rotateFillers)
+        score = (len(unplaced), -sum(placement.width * placement.length for placement in placements), len(placements))
+        if bestScore is None or score < bestScore:
+            bestScore = score
+            plan.placements = placements
+            plan.unplaced = unplaced
+
+    for columnMajor in [False, True]:
+        for rotateFirst in [False, True]:
+            tryPacking(counted, columnMajor, [rotateFirst] * len(counted), rotateFirst)
+    # tight mixes that don't fit largest first often fit in some other order, seeded so plans are repeatable
+    shuffle = random.Random(len(counted))
+    restarts = config.DRAWER_PACKING_RESTARTS if sum(spec.area for spec in counted) <= columns * rows else 0
+    for _ in range(restarts):
+        if len(plan.unplaced) == 0:
+            break
+        order = shuffle.sample(counted, len(counted))
+        tryPacking(order, shuffle.random() < 0.5, [shuffle.random() < 0.5 for _ in order], shuffle.random() < 0.5)
+    return plan
@@ -2,7 +2,7 @@ import adsk.core, adsk.fusion, traceback
 import os
 import math
 
-from . import const
+from . import const, topologyUtils
 
 def matches(edge1: adsk.fusion.BRepEdge, edge2: adsk.fusion.BRepEdge):
     [_, start1, end1] = edge1.evaluator.getEndPoints()
@@ -16,10 +16,11 @@ def selectEdgesByLength(
     filterEdgeTolerance: float,
     ):
     filteredEdges = adsk.core.ObjectCollection.create()
-    for face in faces:
-        for edge in face.edges:
-            if math.isclose(edge.length, filterEdgeLength, abs_tol=filterEdgeTolerance):
-                filteredEdges.add(edge)
+    for [index, bodyFaces] in topologyUtils.groupFacesByBody(faces):
+        edgeLengths = index.edgeLengths
+        for edgeIndex in index.getEdgeIndices(bodyFaces):
+            if math.isclose(edgeLengths[edgeIndex], filterEdgeLength, abs_tol=filterEdgeTolerance):
+                filteredEdges.add(index.edges.entities[edgeIndex])
     return filteredEdges
 
 def excludeEdges(edges: list[adsk.fusion.BRepEdge], toExclude: list[adsk.fusion.BRepEdge]):
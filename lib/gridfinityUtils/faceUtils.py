@@ -3,7 +3,7 @@ import adsk.core, adsk.fusion, traceback
 import os
 
 from .const import DEFAULT_FILTER_TOLERANCE
-from . import geometryUtils
+from . import geometryUtils, topologyUtils
 
 
 def minByArea(faces: adsk.fusion.BRepFaces):
@@ -23,21 +23,19 @@ def shortestEdge(face: adsk.fusion.BRepFace):
     return min(face.edges, key=lambda x: x.length)
 
 def isYNormal(face: adsk.fusion.BRepFace):
-    return math.isclose(face.boundingBox.minPoint.y, face.boundingBox.maxPoint.y, abs_tol=DEFAULT_FILTER_TOLERANCE)
+    return topologyUtils.getFlatAxes(face.boundingBox) & topologyUtils.FLAT_Y != 0
 
 def isXNormal(face: adsk.fusion.BRepFace):
-    return math.isclose(face.boundingBox.minPoint.x, face.boundingBox.maxPoint.x, abs_tol=DEFAULT_FILTER_TOLERANCE)
+    return topologyUtils.getFlatAxes(face.boundingBox) & topologyUtils.FLAT_X != 0
 
 def isZNormal(face: adsk.fusion.BRepFace):
-    return math.isclose(face.boundingBox.minPoint.z, face.boundingBox.maxPoint.z, abs_tol=DEFAULT_FILTER_TOLERANCE)
+    return topologyUtils.getFlatAxes(face.boundingBox) & topologyUtils.FLAT_Z != 0
 
 def getBottomFace(body: adsk.fusion.BRepBody):
-    horizontalFaces = [face for face in body.faces if isZNormal(face)]
-    return min(horizontalFaces, key=lambda x: x.boundingBox.minPoint.z)
+    return topologyUtils.getExtremeFlatFace(body, topologyUtils.FLAT_Z, topologyUtils.BOX_MIN_Z, False)
 
 def getTopFace(body: adsk.fusion.BRepBody):
-    horizontalFaces = [face for face in body.faces if isZNormal(face)]
-    return max(horizontalFaces, key=lambda x: x.boundingBox.minPoint.z)
+    return topologyUtils.getExtremeFlatFace(body, topologyUtils.FLAT_Z, topologyUtils.BOX_MIN_Z, True)
 
 def getTopHorizontalEdge(edges: adsk.fusion.BRepEdges):
     horizontalEdges = [edge for edge in edges if geometryUtils.isHorizontal(edge)]
@@ -51,8 +49,7 @@ def getVerticalEdges(
     faces: adsk.fusion.BRepFaces,
     ):
     filteredEdges: list[adsk.fusion.BRepEdge] = []
-    for face in faces:
-        for edge in face.edges:
-            if geometryUtils.isCollinearToZ(edge):
-                filteredEdges.append(edge)
+    for [index, bodyFaces] in topologyUtils.groupFacesByBody(faces):
+        for edgeIndex in index.edges.select(topologyUtils.FLAT_X | topologyUtils.FLAT_Y, index.getEdgeIndices(bodyFaces)):
+            filteredEdges.append(index.edges.entities[edgeIndex])
     return filteredEdges
@@ -0,0 +1,24 @@
+import hashlib
+import json
+
+FLOAT_PRECISION = 6
+
+def normalizeValue(value: any):
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return round(float(value), FLOAT_PRECISION)
+    if isinstance(value, dict):
+        return {str(key): normalizeValue(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalizeValue(item) for item in value]
+    if all(hasattr(value, axis) for axis in ('x', 'y', 'z')):
+        return [normalizeValue(value.x), normalizeValue(value.y), normalizeValue(value.z)]
+    if hasattr(value, '__dict__'):
+        # generator inputs keep their values in underscore prefixed fields behind properties
+        return {type(value).__name__: normalizeValue({key.lstrip('_'): item for key, item in vars(value).items()})}
+    return str(value)
+
+def fingerprint(values: dict) -> str:
+    serialized = json.dumps(normalizeValue(values), sort_keys=True)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
@@ -5,16 +5,23 @@ import os
 from .const import DEFAULT_FILTER_TOLERANCE
 
 def isHorizontal(entity: adsk.fusion.BRepEdge):
-    return math.isclose(entity.boundingBox.maxPoint.z, entity.boundingBox.minPoint.z, abs_tol=DEFAULT_FILTER_TOLERANCE)
+    box = entity.boundingBox
+    return math.isclose(box.maxPoint.z, box.minPoint.z, abs_tol=DEFAULT_FILTER_TOLERANCE)
 
 def isCollinearToZ(entity: adsk.fusion.BRepEdge):
-    return math.isclose(entity.boundingBox.maxPoint.x, entity.boundingBox.minPoint.x, abs_tol=DEFAULT_FILTER_TOLERANCE) and math.isclose(entity.boundingBox.maxPoint.y, entity.boundingBox.minPoint.y, abs_tol=DEFAULT_FILTER_TOLERANCE)
+    box = entity.boundingBox
+    [minPoint, maxPoint] = [box.minPoint, box.maxPoint]
+    return math.isclose(maxPoint.x, minPoint.x, abs_tol=DEFAULT_FILTER_TOLERANCE) and math.isclose(maxPoint.y, minPoint.y, abs_tol=DEFAULT_FILTER_TOLERANCE)
 
 def isCollinearToX(entity: adsk.fusion.BRepEdge):
-    return math.isclose(entity.boundingBox.maxPoint.z, entity.boundingBox.minPoint.z, abs_tol=DEFAULT_FILTER_TOLERANCE) and math.isclose(entity.boundingBox.maxPoint.y, entity.boundingBox.minPoint.y, abs_tol=DEFAULT_FILTER_TOLERANCE)
+    box = entity.boundingBox
+    [minPoint, maxPoint] = [box.minPoint, box.maxPoint]
+    return math.isclose(maxPoint.z, minPoint.z, abs_tol=DEFAULT_FILTER_TOLERANCE) and math.isclose(maxPoint.y, minPoint.y, abs_tol=DEFAULT_FILTER_TOLERANCE)
 
 def isCollinearToY(entity: adsk.fusion.BRepEdge):
-    return math.isclose(entity.boundingBox.maxPoint.z, entity.boundingBox.minPoint.z, abs_tol=DEFAULT_FILTER_TOLERANCE) and math.isclose(entity.boundingBox.maxPoint.x, entity.boundingBox.minPoint.x, abs_tol=DEFAULT_FILTER_TOLERANCE)
+    box = entity.boundingBox
+    [minPoint, maxPoint] = [box.minPoint, box.maxPoint]
+    return math.isclose(maxPoint.z, minPoint.z, abs_tol=DEFAULT_FILTER_TOLERANCE) and math.isclose(maxPoint.x, minPoint.x, abs_tol=DEFAULT_FILTER_TOLERANCE)
 
 def boundingBoxVolume(box: adsk.core.BoundingBox3D):
     dimensions = box.maxPoint.asVector()
@@ -0,0 +1,245 @@
+import adsk.core, adsk.fusion, traceback
+import math
+
+from . import const, compartmentUtils
+from .meshUtils import TriangleMesh, roundedRectangleLoop
+from .binBodyGeneratorInput import BinBodyGeneratorInput
+from .baseplateGeneratorInput import BaseplateGeneratorInput
+
+# (inset, z) pairs of the gridfinity base profile measured down from the top outline
+BASE_PROFILE = [
+    (0, 0),
+    (const.BIN_BASE_TOP_SECTION_HEIGH, -const.BIN_BASE_TOP_SECTION_HEIGH),
+    (const.BIN_BASE_TOP_SECTION_HEIGH, -const.BIN_BASE_TOP_SECTION_HEIGH - const.BIN_BASE_MID_SECTION_HEIGH),
+    (const.BIN_BASE_TOP_SECTION_HEIGH + const.BIN_BASE_BOTTOM_SECTION_HEIGH, -const.BIN_BASE_HEIGHT),
+]
+
+def profileLoops(
+    x: float,
+    y: float,
+    width: float,
+    length: float,
+    radius: float,
+    profile: list[tuple[float, float]],
+):
+    return [
+        roundedRectangleLoop(x + inset, y + inset, width - inset * 2, length - inset * 2, radius - inset, z)
+        for [inset, z] in profile
+    ]
+
+def clampedProfileLoops(
+    x: float,
+    y: float,
+    width: float,
+    length: float,
+    radius: float,
+    profile: list[tuple[float, float]],
+    bounds: tuple[float, float, float, float],
+):
+    """
+    profileLoops cut off along the (minX, minY, maxX, maxY) bounds, for cutouts reaching past the edge of their cell
+    """
+    [minX, minY, maxX, maxY] = bounds
+    loops = []
+    for [inset, z] in profile:
+        loopMinX = max(minX, x + inset)
+        loopMinY = max(minY, y + inset)
+        loopMaxX = min(maxX, x + width - inset)
+        loopMaxY = min(maxY, y + length - inset)
+        loops.append(roundedRectangleLoop(loopMinX, loopMinY, loopMaxX - loopMinX, loopMaxY - loopMinY, radius - inset, z))
+    return loops
+
+def createBinBaseMesh(input: BinBodyGeneratorInput) -> TriangleMesh:
+    mesh = TriangleMesh()
+    cellWidth = input.baseWidth - input.xyClearance * 2
+    cellLength = input.baseLength - input.xyClearance * 2
+    profile = [(max(0, inset - input.xyClearance) if z < 0 else 0, z) for [inset, z] in BASE_PROFILE]
+    cellLoops = profileLoops(0, 0, cellWidth, cellLength, input.binCornerFilletRadius, profile)
+    cellLoops.reverse()
+    for i in range(int(input.binWidth)):
+        for j in range(int(input.binLength)):
+            offsetX = i * input.baseWidth
+            offsetY = j * input.baseLength
+            mesh.addLoft([[(px + offsetX, py + offsetY, pz) for [px, py, pz] in loop] for loop in cellLoops])
+    return mesh
+
+def createBinLipMesh(input: BinBodyGeneratorInput, bottomZ: float) -> TriangleMesh:
+    mesh = TriangleMesh()
+    actualBodyWidth = (input.baseWidth * input.binWidth) - input.xyClearance * 2.0
+    actualBodyLength = (input.baseLength * input.binLength) - input.xyClearance * 2.0
+    radius = input.binCornerFilletRadius
+    lipHeight = const.BIN_LIP_EXTRA_HEIGHT - const.BIN_LIP_TOP_RECESS_HEIGHT
+    lipChamferStart = const.BIN_BASE_HEIGHT - const.BIN_BASE_TOP_SECTION_HEIGH
+    lipTopInset = max(0, const.BIN_LIP_WALL_THICKNESS - (lipHeight - lipChamferStart))
+    mesh.addTube(
+        [roundedRectangleLoop(0, 0, actualBodyWidth, actualBodyLength, radius, bottomZ + z) for z in [0, lipHeight]],
+        [
+            roundedRectangleLoop(inset, inset, actualBodyWidth - inset * 2, actualBodyLength - inset * 2, radius - inset, bottomZ + z)
+            for [inset, z] in [
+                (const.BIN_LIP_WALL_THICKNESS, 0),
+                (const.BIN_LIP_WALL_THICKNESS, lipChamferStart),
+                (lipTopInset, lipHeight),
+            ]
+        ],
+    )
+    return mesh
+
+def createBinBodyMesh(input: BinBodyGeneratorInput, includeLip: bool = True) -> TriangleMesh:
+    mesh = TriangleMesh()
+    actualBodyWidth = (input.baseWidth * input.binWidth) - input.xyClearance * 2.0
+    actualBodyLength = (input.baseLength * input.binLength) - input.xyClearance * 2.0
+    binBodyTotalHeight = (input.binHeight - 1) * input.heightUnit + max(0, input.heightUnit - const.BIN_BASE_HEIGHT)
+    radius = input.binCornerFilletRadius
+
+    if input.hasLip and includeLip:
+        mesh.extend(createBinLipMesh(input, binBodyTotalHeight))
+
+    if input.isSolid:
+        mesh.addBox(0, 0, 0, actualBodyWidth, actualBodyLength, binBodyTotalHeight, radius)
+        return mesh
+
+    compartmentsMinX = input.wallThickness
+    compartmentsMaxX = actualBodyWidth - input.wallThickness
+    compartmentsMinY = (const.BIN_LIP_WALL_THICKNESS - input.xyClearance) if input.hasLip and input.hasScoop else input.wallThickness
+    compartmentsMaxY = actualBodyLength - input.wallThickness
+    innerRadius = radius - input.wallThickness
+    mesh.addTube(
+        [roundedRectangleLoop(0, 0, actualBodyWidth, actualBodyLength, radius, z) for z in [0, binBodyTotalHeight]],
+        [roundedRectangleLoop(compartmentsMinX, compartmentsMinY, compartmentsMaxX - compartmentsMinX, compartmentsMaxY - compartmentsMinY, innerRadius, z) for z in [0, binBodyTotalHeight]],
+    )
+
+    compartmentWidthUnit = (compartmentsMaxX - compartmentsMinX - (input.compartmentsByX - 1) * input.wallThickness) / input.compartmentsByX
+    compartmentLengthUnit = (compartmentsMaxY - compartmentsMinY - (input.compartmentsByY - 1) * input.wallThickness) / input.compartmentsByY
+    pitchX = compartmentWidthUnit + input.wallThickness
+    pitchY = compartmentLengthUnit + input.wallThickness
+
+    def compartmentDepth(compartment):
+        return min(binBodyTotalHeight - const.BIN_COMPARTMENT_BOTTOM_THICKNESS, compartment.depth)
+
+    maxDepth = max([compartmentDepth(compartment) for compartment in input.compartments] + [0])
+    floorHeight = binBodyTotalHeight - maxDepth
+    mesh.addBox(0, 0, 0, actualBodyWidth, actualBodyLength, floorHeight, radius)
+
+    # shallower compartments sit on raised floors, uncovered cells stay solid
+    coveredCells = set()
+    for compartment in input.compartments:
+        coveredCells.update(compartmentUtils.compartmentCells(compartment))
+        mesh.addBox(
+            compartmentsMinX + compartment.positionX * pitchX,
+            compartmentsMinY + compartment.positionY * pitchY,
+            floorHeight,
+            compartmentWidthUnit * compartment.width + (compartment.width - 1) * input.wallThickness,
+            compartmentLengthUnit * compartment.length + (compartment.length - 1) * input.wallThickness,
+            maxDepth - compartmentDepth(compartment),
+        )
+    for i in range(input.compartmentsByX):
+        for j in range(input.compartmentsByY):
+            if not (i, j) in coveredCells:
+                mesh.addBox(compartmentsMinX + i * pitchX, compartmentsMinY + j * pitchY, floorHeight, compartmentWidthUnit, compartmentLengthUnit, maxDepth)
+
+    def fineGridStart(index: int, unit: float):
+        return (index // 2) * (unit + input.wallThickness) + (unit if index % 2 == 1 else 0)
+
+    def fineGridEnd(index: int, unit: float):
+        return fineGridStart(index, unit) + (input.wallThickness if index % 2 == 1 else unit)
+
+    if len(input.compartments) > 1:
+        for [x0, x1, y0, y1] in compartmentUtils.dividerWallSegments(input.compartments):
+            mesh.addBox(
+                compartmentsMinX + fineGridStart(x0, compartmentWidthUnit),
+                compartmentsMinY + fineGridStart(y0, compartmentLengthUnit),
+                floorHeight,
+                fineGridEnd(x1, compartmentWidthUnit) - fineGridStart(x0, compartmentWidthUnit),
+                fineGridEnd(y1, compartmentLengthUnit) - fineGridStart(y0, compartmentLengthUnit),
+                maxDepth - const.BIN_TAB_TOP_CLEARANCE,
+            )
+
+    if input.hasTab:
+        for compartment in input.compartments:
+            compartmentX = compartmentsMinX + compartment.positionX * pitchX
+            compartmentWidth = compartmentWidthUnit * compartment.width + (compartment.width - 1) * input.wallThickness
+            tabBackY = compartmentsMinY + compartment.positionY * pitchY + compartmentLengthUnit * compartment.length + (compartment.length - 1) * input.wallThickness
+            tabTopZ = binBodyTotalHeight - const.BIN_TAB_TOP_CLEARANCE
+            tabStartX = compartmentX + max(0, min(input.tabPosition, input.binWidth - input.tabLength)) * input.baseWidth
+            tabEndX = min(compartmentX + compartmentWidth, tabStartX + max(0, min(input.tabLength, input.binWidth)) * input.baseWidth)
+            if input.tabMethod == const.BIN_TAB_METHOD_DIMENSIONS:
+                profile = [
+                    (tabBackY, tabTopZ - input.rootThickness),
+                    (tabBackY, tabTopZ),
+                    (tabBackY - input.tabWidth, tabTopZ),
+                    (tabBackY - input.tabWidth, tabTopZ - input.tipThickness),
+                ]
+            else:
+                profile = [
+                    (tabBackY, tabTopZ - input.tabWidth / math.tan(input.tabOverhangAngle)),
+                    (tabBackY, tabTopZ),
+                    (tabBackY - input.tabWidth, tabTopZ),
+                ]
+            mesh.addPrismAlongX(tabStartX, tabEndX - tabStartX, profile)
+
+    return mesh
+
+def createGridfinityBinMesh(
+    input: BinBodyGeneratorInput,
+    hasBase: bool,
+    hasBody: bool,
+) -> TriangleMesh:
+    mesh = TriangleMesh()
+    if hasBase:
+        mesh.extend(createBinBaseMesh(input))
+    if hasBody:
+        mesh.extend(createBinBodyMesh(input))
+    return mesh
+
+def createGridfinityBaseplateMesh(input: BaseplateGeneratorInput) -> TriangleMesh:
+    mesh = TriangleMesh()
+    baseplateTrueWidth = input.baseplateWidth * input.baseWidth - input.xyClearance * 2
+    baseplateTrueLength = input.baseplateLength * input.baseLength - input.xyClearance * 2
+    topZ = -input.binZClearance
+    bottomZ = -const.BIN_BASE_HEIGHT
+
+    # bin sockets, the cutout outline is larger than the cell by the clearance on every side
+    cutoutProfile = [(inset, z) for [inset, z] in BASE_PROFILE if z < topZ]
+    cutoutProfile.reverse()
+    cutoutProfile.append((-topZ, topZ))
+    for i in range(int(input.baseplateWidth)):
+        for j in range(int(input.baseplateLength)):
+            cellMinX = max(0, i * input.baseWidth - input.xyClearance)
+            cellMinY = max(0, j * input.baseLength - input.xyClearance)
+            cellMaxX = min(baseplateTrueWidth, (i + 1) * input.baseWidth - input.xyClearance)
+            cellMaxY = min(baseplateTrueLength, (j + 1) * input.baseLength - input.xyClearance)
+            mesh.addTube(
+                [roundedRectangleLoop(cellMinX, cellMinY, cellMaxX - cellMinX, cellMaxY - cellMinY, 0, z) for z in [bottomZ, topZ]],
+                clampedProfileLoops(
+                    i * input.baseWidth - input.xyClearance * 2,
+                    j * input.baseLength - input.xyClearance * 2,
+                    input.baseWidth + input.xyClearance * 2,
+                    input.baseLength + input.xyClearance * 2,
+                    input.cornerFilletRadius + input.xyClearance,
+                    cutoutProfile,
+                    (cellMinX, cellMinY, cellMaxX, cellMaxY),
+                ),
+            )
+
+    paddingLeft = input.paddingLeft if input.hasPadding else 0
+    paddingRight = input.paddingRight if input.hasPadding else 0
+    paddingTop = input.paddingTop if input.hasPadding else 0
+    paddingBottom = input.paddingBottom if input.hasPadding else 0
+    totalWidth = baseplateTrueWidth + paddingLeft + paddingRight
+    totalLength = baseplateTrueLength + paddingTop + paddingBottom
+    mesh.addBox(-paddingLeft, -paddingBottom, bottomZ, paddingLeft, totalLength, topZ - bottomZ)
+    mesh.addBox(baseplateTrueWidth, -paddingBottom, bottomZ, paddingRight, totalLength, topZ - bottomZ)
+    mesh.addBox(0, -paddingBottom, bottomZ, baseplateTrueWidth, paddingBottom, topZ - bottomZ)
+    mesh.addBox(0, baseplateTrueLength, bottomZ, baseplateTrueWidth, paddingTop, topZ - bottomZ)
+
+    if input.hasExtendedBottom:
+        mesh.addBox(
+            -paddingLeft,
+            -paddingBottom,
+            bottomZ - input.bottomExtensionHeight,
+            totalWidth,
+            totalLength,
+            input.bottomExtensionHeight,
+            input.cornerFilletRadius - input.xyClearance,
+        )
+    return mesh
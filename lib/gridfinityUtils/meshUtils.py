@@ -0,0 +1,368 @@
+import collections
+import math
+
+CORNER_SEGMENTS = 4
+HOLE_SEGMENTS = 32
+MIN_LOOP_RADIUS = 0.0001
+MIN_TRIANGLE_AREA = 1e-12
+
+def roundedRectangleLoop(
+    x: float,
+    y: float,
+    width: float,
+    length: float,
+    radius: float | tuple[float, float, float, float],
+    z: float,
+    segments: int = CORNER_SEGMENTS,
+) -> list[tuple[float, float, float]]:
+    """
+    Counter clockwise (looking from +Z) outline of a rounded rectangle with its min corner at (x, y).
+    Always has 4 * (segments + 1) points, so loops of different sizes can be connected with strips.
+    Radius can be given per corner, in (+X -Y, +X +Y, -X +Y, -X -Y) order.
+    """
+    radii = radius if isinstance(radius, tuple) else (radius,) * 4
+    radii = [max(MIN_LOOP_RADIUS, min(cornerRadius, width / 2, length / 2)) for cornerRadius in radii]
+    corners = [
+        (x + width - radii[0], y + radii[0], -90),
+        (x + width - radii[1], y + length - radii[1], 0),
+        (x + radii[2], y + length - radii[2], 90),
+        (x + radii[3], y + radii[3], 180),
+    ]
+    loop = []
+    for [[centerX, centerY, startAngle], cornerRadius] in zip(corners, radii):
+        for i in range(segments + 1):
+            angle = math.radians(startAngle + 90 * i / segments)
+            loop.append((centerX + cornerRadius * math.cos(angle), centerY + cornerRadius * math.sin(angle), z))
+    return loop
+
+def circleLoop(
+    centerX: float,
+    centerY: float,
+    radius: float,
+    z: float,
+    segments: int = HOLE_SEGMENTS,
+) -> list[tuple[float, float, float]]:
+    return [
+        (centerX + radius * math.cos(2 * math.pi * i / segments), centerY + radius * math.sin(2 * math.pi * i / segments), z)
+        for i in range(segments)
+    ]
+
+def arcPoints(
+    centerX: float,
+    centerY: float,
+    radius: float,
+    startAngle: float,
+    endAngle: float,
+    z: float,
+    segments: int = CORNER_SEGMENTS,
+) -> list[tuple[float, float, float]]:
+    """
+    Points along an arc including both ends, angles are in degrees
+    """
+    return [
+        (
+            centerX + radius * math.cos(math.radians(startAngle + (endAngle - startAngle) * i / segments)),
+            centerY + radius * math.sin(math.radians(startAngle + (endAngle - startAngle) * i / segments)),
+            z,
+        )
+        for i in range(segments + 1)
+    ]
+
+def signedArea(points: list) -> float:
+    return sum(points[i - 1][0] * points[i][1] - points[i][0] * points[i - 1][1] for i in range(len(points))) / 2
+
+def cross(origin, a, b) -> float:
+    return (a[0] - origin[0]) * (b[1] - origin[1]) - (a[1] - origin[1]) * (b[0] - origin[0])
+
+def segmentsCross(a, b, c, d) -> bool:
+    # touching at the ends doesn't count
+    return (
+        ((cross(c, d, a) > 0) != (cross(c, d, b) > 0)) and cross(c, d, a) != 0 and cross(c, d, b) != 0
+        and ((cross(a, b, c) > 0) != (cross(a, b, d) > 0)) and cross(a, b, c) != 0 and cross(a, b, d) != 0
+    )
+
+def isOnSegment(a, b, point) -> bool:
+    if abs(cross(a, b, point)) > MIN_TRIANGLE_AREA:
+        return False
+    return min(a[0], b[0]) <= point[0] <= max(a[0], b[0]) and min(a[1], b[1]) <= point[1] <= max(a[1], b[1])
+
+def isInTriangle(a, b, c, point) -> bool:
+    return cross(a, b, point) >= 0 and cross(b, c, point) >= 0 and cross(c, a, point) >= 0
+
+def triangulatePolygon(loop: list, holes: list[list]) -> list[tuple[int, int, int]]:
+    """
+    Ear clipping triangulation of a simple polygon with holes, only X and Y of the points are used.
+    Returns counter clockwise triangles as indices into the outer loop followed by all the hole loops.
+    """
+    points = [(point[0], point[1]) for point in loop]
+    polygon = list(range(len(loop)))
+    if signedArea(points) < 0:
+        polygon.reverse()
+    holeIndices: list[list[int]] = []
+    for hole in holes:
+        indices = list(range(len(points), len(points) + len(hole)))
+        points += [(point[0], point[1]) for point in hole]
+        if signedArea([points[i] for i in indices]) > 0:
+            indices.reverse()
+        holeIndices.append(indices)
+
+    # cut each hole open with a bridge to a visible vertex, rightmost holes go first
+    holeIndices.sort(key=lambda indices: max(points[i][0] for i in indices), reverse=True)
+    for holeIndex, hole in enumerate(holeIndices):
+        start = max(range(len(hole)), key=lambda i: points[hole[i]][0])
+        holeStart = points[hole[start]]
+        edges = [(polygon[i - 1], polygon[i]) for i in range(len(polygon))]
+        vertices = set(polygon)
+        for otherHole in holeIndices[holeIndex:]:
+            edges += [(otherHole[i - 1], otherHole[i]) for i in range(len(otherHole))]
+            vertices.update(otherHole)
+        usage = collections.Counter(polygon)
+        candidates = sorted(
+            [i for i in range(len(polygon)) if usage[polygon[i]] == 1],
+            key=lambda i: (points[polygon[i]][0] - holeStart[0]) ** 2 + (points[polygon[i]][1] - holeStart[1]) ** 2,
+        )
+        bridge = None
+        for candidate in candidates:
+            target = points[polygon[candidate]]
+            isBlocked = any(
+                segmentsCross(holeStart, target, points[edgeStart], points[edgeEnd])
+                for [edgeStart, edgeEnd] in edges
+            ) or any(
+                isOnSegment(holeStart, target, points[index])
+                for index in vertices
+                if points[index] != holeStart and points[index] != target
+            )
+            if not isBlocked:
+                bridge = candidate
+                break
+        if bridge is None:
+            raise ValueError('Failed to connect a hole to the outline, holes must be inside of the outline and must not overlap')
+        polygon = polygon[:bridge + 1] + hole[start:] + hole[:start + 1] + polygon[bridge:]
+
+    def isReflex(position: int) -> bool:
+        count = len(polygon)
+        return cross(points[polygon[position - 1]], points[polygon[position]], points[polygon[(position + 1) % count]]) <= MIN_TRIANGLE_AREA
+
+    # only reflex vertices can be inside of an ear
+    reflexFlags = [isReflex(position) for position in range(len(polygon))]
+    triangles: list[tuple[int, int, int]] = []
+    index = 0
+    attempts = 0
+    while len(polygon) > 3:
+        count = len(polygon)
+        index = index % count
+        [a, b, c] = [polygon[index - 1], polygon[index], polygon[(index + 1) % count]]
+        corners = (points[a], points[b], points[c])
+        minX = min(point[0] for point in corners)
+        maxX = max(point[0] for point in corners)
+        minY = min(point[1] for point in corners)
+        maxY = max(point[1] for point in corners)
+        isEar = not reflexFlags[index] and not any(
+            isInTriangle(*corners, points[other])
+            for other, isOtherReflex in zip(polygon, reflexFlags)
+            if isOtherReflex and minX <= points[other][0] <= maxX and minY <= points[other][1] <= maxY and not points[other] in corners
+        )
+        # numerically degenerate leftovers are clipped anyway, so every edge still gets a triangle
+        if isEar or attempts >= count:
+            triangles.append((a, b, c))
+            del polygon[index]
+            del reflexFlags[index]
+            index = index - 1 if index > 0 else len(polygon) - 1
+            reflexFlags[index] = isReflex(index)
+            reflexFlags[(index + 1) % len(polygon)] = isReflex((index + 1) % len(polygon))
+            attempts = 0
+        else:
+            index += 1
+            attempts += 1
+    triangles.append(tuple(polygon))
+    return triangles
+
+class TriangleMesh():
+    def __init__(self):
+        self.triangles: list[tuple[tuple[float, float, float], tuple[float, float, float], tuple[float, float, float]]] = []
+        # (outer, inner) loops sharing a cap, only kept to check that every inner loop stays inside its outer loop
+        self.nestedLoops: list[tuple[list, list]] = []
+
+    @property
+    def triangleCount(self) -> int:
+        return len(self.triangles)
+
+    def addTriangle(self, a, b, c):
+        self.triangles.append((tuple(a), tuple(b), tuple(c)))
+
+    def addQuad(self, a, b, c, d):
+        self.addTriangle(a, b, c)
+        self.addTriangle(a, c, d)
+
+    def addStrip(self, loopA: list, loopB: list):
+        # faces point to the right of the loop direction when walking from loopA to loopB
+        count = len(loopA)
+        for i in range(count):
+            j = (i + 1) % count
+            self.addQuad(loopA[i], loopA[j], loopB[j], loopB[i])
+
+    def addCap(self, loop: list, isReversed: bool = False):
+        center = tuple(sum(point[axis] for point in loop) / len(loop) for axis in range(3))
+        count = len(loop)
+        for i in range(count):
+            j = (i + 1) % count
+            if isReversed:
+                self.addTriangle(center, loop[j], loop[i])
+            else:
+                self.addTriangle(center, loop[i], loop[j])
+
+    def addCapWithHoles(self, loop: list, holes: list[list], isReversed: bool = False):
+        """
+        Flat cap facing +Z (or -Z when reversed), holes have to be inside of the loop
+        """
+        if len(holes) == 0:
+            self.addCap(loop, isReversed)
+            return
+        self.nestedLoops.extend((loop, hole) for hole in holes)
+        points = list(loop)
+        for hole in holes:
+            points += hole
+        for [a, b, c] in triangulatePolygon(loop, holes):
+            if isReversed:
+                self.addTriangle(points[a], points[c], points[b])
+            else:
+                self.addTriangle(points[a], points[b], points[c])
+
+    def addLoft(self, loops: list[list], hasStartCap: bool = True, hasEndCap: bool = True):
+        """
+        Closed solid through convex loops ordered along the loft direction
+        """
+        for i in range(len(loops) - 1):
+            self.addStrip(loops[i], loops[i + 1])
+        if hasStartCap:
+            self.addCap(loops[0], True)
+        if hasEndCap:
+            self.addCap(loops[-1])
+
+    def addLoftWithHoles(self, loops: list[list], holes: list[list[list]]):
+        """
+        Closed solid through loops ordered bottom to top with vertical holes inside of it.
+        Every hole is a list of loops ordered bottom to top, its ends are capped unless they reach the bottom or the top of the solid.
+        """
+        for i in range(len(loops) - 1):
+            self.addStrip(loops[i], loops[i + 1])
+        bottomZ = loops[0][0][2]
+        topZ = loops[-1][0][2]
+        bottomHoles = []
+        topHoles = []
+        for hole in holes:
+            for i in range(len(hole) - 1):
+                self.addStrip(hole[i + 1], hole[i])
+            if math.isclose(hole[0][0][2], bottomZ, abs_tol=MIN_LOOP_RADIUS):
+                bottomHoles.append(hole[0])
+            else:
+                self.addCap(hole[0])
+            if math.isclose(hole[-1][0][2], topZ, abs_tol=MIN_LOOP_RADIUS):
+                topHoles.append(hole[-1])
+            else:
+                self.addCap(hole[-1], True)
+        self.addCapWithHoles(loops[0], bottomHoles, True)
+        self.addCapWithHoles(loops[-1], topHoles)
+
+    def addTube(self, outerLoops: list[list], innerLoops: list[list]):
+        """
+        Hollow solid between outer and inner loops, both ordered bottom to top
+        """
+        for i in range(len(outerLoops) - 1):
+            self.addStrip(outerLoops[i], outerLoops[i + 1])
+        for i in range(len(innerLoops) - 1):
+            self.addStrip(innerLoops[i + 1], innerLoops[i])
+        self.addStrip(outerLoops[-1], innerLoops[-1])
+        self.addStrip(innerLoops[0], outerLoops[0])
+        self.nestedLoops.extend([(outerLoops[0], innerLoops[0]), (outerLoops[-1], innerLoops[-1])])
+
+    def addBox(self, x: float, y: float, z: float, width: float, length: float, height: float, radius: float = 0):
+        if width <= 0 or length <= 0 or height <= 0:
+            return
+        self.addLoft([
+            roundedRectangleLoop(x, y, width, length, radius, z, 1 if radius <= 0 else CORNER_SEGMENTS),
+            roundedRectangleLoop(x, y, width, length, radius, z + height, 1 if radius <= 0 else CORNER_SEGMENTS),
+        ])
+
+    def addPrismAlongX(self, x: float, length: float, profile: list[tuple[float, float]]):
+        """
+        Extrudes a convex (y, z) profile, counter clockwise looking from +X, along the X axis
+        """
+        if length <= 0:
+            return
+        self.addLoft([
+            [(x, y, z) for [y, z] in profile],
+            [(x + length, y, z) for [y, z] in profile],
+        ])
+
+    def extend(self, other: 'TriangleMesh'):
+        self.triangles = self.triangles + other.triangles
+        self.nestedLoops = self.nestedLoops + other.nestedLoops
+
+    def addMesh(self, mesh: 'TriangleMesh', offset: tuple[float, float, float] = (0, 0, 0)):
+        self.triangles.extend(mesh.translated(*offset).triangles if any(offset) else mesh.triangles)
+        # moving both loops of a pair keeps their nesting, they are checked where they were built
+        self.nestedLoops.extend(mesh.nestedLoops)
+
+    def translated(self, x: float, y: float, z: float = 0) -> 'TriangleMesh':
+        mesh = TriangleMesh()
+        # points are shared between triangles, move each of them once
+        movedPoints = {}
+        for triangle in self.triangles:
+            for point in triangle:
+                if not point in movedPoints:
+                    movedPoints[point] = (point[0] + x, point[1] + y, point[2] + z)
+        mesh.triangles = [(movedPoints[a], movedPoints[b], movedPoints[c]) for [a, b, c] in self.triangles]
+        return mesh
+
+    def openEdgeCount(self) -> int:
+        """
+        Edges without a matching edge going the opposite way, 0 means every shell of the mesh is closed and consistently oriented
+        """
+        edges = collections.Counter()
+        for [a, b, c] in self.triangles:
+            edges.update([(a, b), (b, c), (c, a)])
+        return sum(max(0, count - edges.get((end, start), 0)) for [start, end], count in edges.items())
+
+    def escapedPointCount(self, tolerance: float = 1e-6) -> int:
+        """
+        Points of inner loops lying outside of their convex outer loop, such a cap or tube intersects itself
+        """
+        count = 0
+        for [outerLoop, innerLoop] in self.nestedLoops:
+            orientation = 1 if signedArea(outerLoop) >= 0 else -1
+            edges = [(outerLoop[i], outerLoop[(i + 1) % len(outerLoop)]) for i in range(len(outerLoop))]
+            for point in innerLoop:
+                if any(cross(start, end, point) * orientation < -tolerance for [start, end] in edges if start[:2] != end[:2]):
+                    count += 1
+        return count
+
+    def toArrays(self) -> tuple[list[float], list[int], list[float], list[int]]:
+        """
+        Flat shaded arrays in the layout expected by CustomGraphicsGroup.addMesh:
+        (coordinates, coordinate indices, normal vectors, normal indices)
+        """
+        coordinates: list[float] = []
+        normals: list[float] = []
+        indices: list[int] = []
+        normalIndices: list[int] = []
+        for [a, b, c] in self.triangles:
+            normal = triangleNormal(a, b, c)
+            if normal is None:
+                continue
+            vertexIndex = len(coordinates) // 3
+            coordinates.extend(a + b + c)
+            indices.extend([vertexIndex, vertexIndex + 1, vertexIndex + 2])
+            normalIndex = len(normals) // 3
+            normals.extend(normal)
+            normalIndices.extend([normalIndex] * 3)
+        return (coordinates, indices, normals, normalIndices)
+
+def triangleNormal(a, b, c):
+    ux, uy, uz = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+    vx, vy, vz = c[0] - a[0], c[1] - a[1], c[2] - a[2]
+    nx, ny, nz = uy * vz - uz * vy, uz * vx - ux * vz, ux * vy - uy * vx
+    size = math.sqrt(nx * nx + ny * ny + nz * nz)
+    if size < 1e-12:
+        return None
+    return (nx / size, ny / size, nz / size)
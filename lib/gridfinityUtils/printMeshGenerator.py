@@ -0,0 +1,307 @@
+import adsk.core, adsk.fusion, traceback
+import math
+
+from . import const, fingerprintUtils
+from .meshUtils import TriangleMesh, roundedRectangleLoop, circleLoop, arcPoints
+from .meshPreviewGenerator import BASE_PROFILE, profileLoops, clampedProfileLoops, createBinBodyMesh, createBinLipMesh
+from .baseGeneratorInput import BaseGeneratorInput
+from .baseplateGeneratorInput import BaseplateGeneratorInput
+from .binGeneratorInput import BinGeneratorInput
+
+# Watertight triangle meshes for printing, built without Fusion. Every part is a set of closed shells
+# which slicers merge together, features without a meaningful effect on the print are left out:
+# magnet tabs, magnet/screw hole grooves, scoops, fillets and baseplate connection holes.
+# Parts are handed over one sub-mesh at a time to a target with an addMesh(mesh, offset) method: a TriangleMesh
+# collecting them or one of the stream writers, repeated sub-meshes are the same cached object every time.
+
+# meshes reused between parts of the current process, every worker of a parallel export keeps its own
+MESH_CACHE_SIZE = 256
+meshCache: dict[str, TriangleMesh] = {}
+
+def getCachedMesh(key: dict, createMesh) -> TriangleMesh:
+    cacheKey = fingerprintUtils.fingerprint(key)
+    mesh = meshCache.get(cacheKey)
+    if mesh is None:
+        if len(meshCache) >= MESH_CACHE_SIZE:
+            meshCache.pop(next(iter(meshCache)))
+        mesh = createMesh()
+        meshCache[cacheKey] = mesh
+    return mesh
+
+def holeLoops(centerX: float, centerY: float, profile: list[tuple[float, float]]) -> list[list]:
+    """
+    Loops of a round hole through its (radius, z) profile ordered bottom to top
+    """
+    points = []
+    for point in profile:
+        if len(points) == 0 or not (math.isclose(point[0], points[-1][0]) and math.isclose(point[1], points[-1][1])):
+            points.append(point)
+    return [circleLoop(centerX, centerY, radius, z) for [radius, z] in points]
+
+def binBaseHoleProfile(input: BaseGeneratorInput, bottomZ: float, topZ: float) -> list[tuple[float, float]]:
+    magnetRadius = input.magnetCutoutsDiameter / 2
+    screwRadius = input.screwHolesDiameter / 2
+    magnetTopZ = min(topZ, bottomZ + input.magnetCutoutsDepth)
+    if input.hasMagnetCutouts and input.hasScrewHoles and magnetRadius > screwRadius and magnetTopZ < topZ:
+        return [(magnetRadius, bottomZ), (magnetRadius, magnetTopZ), (screwRadius, magnetTopZ), (screwRadius, topZ)]
+    if input.hasScrewHoles:
+        radius = max(screwRadius, magnetRadius) if input.hasMagnetCutouts else screwRadius
+        return [(radius, bottomZ), (radius, topZ)]
+    if input.hasMagnetCutouts:
+        return [(magnetRadius, bottomZ), (magnetRadius, magnetTopZ)]
+    return []
+
+def createBinBaseCellMesh(input: BinGeneratorInput) -> TriangleMesh:
+    binBodyInput = input.binBodyInput
+    baseInput = input.baseInput
+    xyClearance = binBodyInput.xyClearance
+    cellWidth = binBodyInput.baseWidth - xyClearance * 2
+    cellLength = binBodyInput.baseLength - xyClearance * 2
+    profile = [(max(0, inset - xyClearance) if z < 0 else 0, z) for [inset, z] in BASE_PROFILE]
+    profile.reverse()
+    loops = profileLoops(0, 0, cellWidth, cellLength, binBodyInput.binCornerFilletRadius, profile)
+
+    # holes are patterned around the cell center, offset is measured from the cell edge before the clearance cut
+    holeOffset = const.DIMENSION_SCREW_HOLES_OFFSET - xyClearance
+    holeCenters = [
+        (holeOffset, holeOffset),
+        (cellWidth - holeOffset, holeOffset),
+        (cellWidth - holeOffset, cellLength - holeOffset),
+        (holeOffset, cellLength - holeOffset),
+    ]
+    holeProfile = binBaseHoleProfile(baseInput, -const.BIN_BASE_HEIGHT, 0)
+    holes = [holeLoops(x, y, holeProfile) for [x, y] in holeCenters]
+    mesh = TriangleMesh()
+    mesh.addLoftWithHoles(loops, [hole for hole in holes if len(hole) > 0])
+    return mesh
+
+def getBinBaseCellKey(input: BinGeneratorInput) -> dict:
+    binBodyInput = input.binBodyInput
+    baseInput = input.baseInput
+    return {
+        'part': 'binBaseCell',
+        'baseWidth': binBodyInput.baseWidth,
+        'baseLength': binBodyInput.baseLength,
+        'xyClearance': binBodyInput.xyClearance,
+        'binCornerFilletRadius': binBodyInput.binCornerFilletRadius,
+        'hasScrewHoles': baseInput.hasScrewHoles,
+        'screwHolesDiameter': baseInput.screwHolesDiameter,
+        'hasMagnetCutouts': baseInput.hasMagnetCutouts,
+        'magnetCutoutsDiameter': baseInput.magnetCutoutsDiameter,
+        'magnetCutoutsDepth': baseInput.magnetCutoutsDepth,
+    }
+
+def getBinLipKey(input: BinGeneratorInput) -> dict:
+    binBodyInput = input.binBodyInput
+    return {
+        'part': 'binLip',
+        'baseWidth': binBodyInput.baseWidth,
+        'baseLength': binBodyInput.baseLength,
+        'binWidth': binBodyInput.binWidth,
+        'binLength': binBodyInput.binLength,
+        'xyClearance': binBodyInput.xyClearance,
+        'binCornerFilletRadius': binBodyInput.binCornerFilletRadius,
+    }
+
+def addGridfinityBinPrintMesh(input: BinGeneratorInput, targetMesh: TriangleMesh):
+    binBodyInput = input.binBodyInput
+    if input.hasBase:
+        cellMesh = getCachedMesh(getBinBaseCellKey(input), lambda: createBinBaseCellMesh(input))
+        for i in range(int(binBodyInput.binWidth)):
+            for j in range(int(binBodyInput.binLength)):
+                targetMesh.addMesh(cellMesh, (i * binBodyInput.baseWidth, j * binBodyInput.baseLength, 0))
+    if input.hasBody:
+        targetMesh.addMesh(createBinBodyMesh(binBodyInput, includeLip=False))
+        if binBodyInput.hasLip:
+            # lip only depends on the footprint, bins of different heights share it
+            binBodyTotalHeight = (binBodyInput.binHeight - 1) * binBodyInput.heightUnit + max(0, binBodyInput.heightUnit - const.BIN_BASE_HEIGHT)
+            lipMesh = getCachedMesh(getBinLipKey(input), lambda: createBinLipMesh(binBodyInput, 0))
+            targetMesh.addMesh(lipMesh, (0, 0, binBodyTotalHeight))
+
+def createGridfinityBinPrintMesh(input: BinGeneratorInput) -> TriangleMesh:
+    mesh = TriangleMesh()
+    addGridfinityBinPrintMesh(input, mesh)
+    return mesh
+
+def baseplateHoleProfile(input: BaseplateGeneratorInput, bottomZ: float, topZ: float) -> list[tuple[float, float]]:
+    """
+    Screw holes go through the bottom extension with a countersink at the bottom, magnet sockets are open at the top
+    """
+    profile = []
+    screwRadius = input.screwHolesDiameter / 2
+    magnetRadius = input.magnetCutoutsDiameter / 2
+    if input.hasScrewHoles:
+        headRadius = input.screwHeadCutoutDiameter / 2
+        headHeight = const.DIMENSION_SCREW_HEAD_CUTOUT_OFFSET_HEIGHT + max(0, headRadius - screwRadius)
+        if headRadius > screwRadius and headHeight < topZ - bottomZ:
+            profile += [
+                (headRadius, bottomZ),
+                (headRadius, bottomZ + const.DIMENSION_SCREW_HEAD_CUTOUT_OFFSET_HEIGHT),
+                (screwRadius, bottomZ + headHeight),
+            ]
+        else:
+            profile.append((screwRadius, bottomZ))
+    if input.hasMagnetCutouts:
+        magnetRadius = max(magnetRadius, screwRadius if input.hasScrewHoles else 0)
+        magnetBottomZ = max(topZ - input.magnetCutoutsDepth, profile[-1][1] if len(profile) > 0 else bottomZ)
+        if len(profile) > 0:
+            profile.append((screwRadius, magnetBottomZ))
+        profile += [(magnetRadius, magnetBottomZ), (magnetRadius, topZ)]
+    elif len(profile) > 0:
+        profile.append((screwRadius, topZ))
+    return profile
+
+def skeletonCutoutLoop(input: BaseplateGeneratorInput, holeCenters: list[float], floorMin: float, floorMaxX: float, floorMaxY: float, z: float) -> list:
+    """
+    Outline of the through cutout under a bin socket, it leaves a pad around each hole
+    """
+    [holeMinX, holeMaxX, holeMinY, holeMaxY] = holeCenters
+    padRadius = max(input.magnetCutoutsDiameter, input.screwHeadCutoutDiameter) / 2 + 0.1
+    if holeMinX + padRadius >= holeMaxX - padRadius or holeMinY + padRadius >= holeMaxY - padRadius or floorMin >= min(holeMinX, holeMinY):
+        return []
+    return (
+        [(holeMinX + padRadius, floorMin, z), (holeMaxX - padRadius, floorMin, z)]
+        + arcPoints(holeMaxX, holeMinY, padRadius, 180, 90, z)
+        + [(floorMaxX, holeMinY + padRadius, z), (floorMaxX, holeMaxY - padRadius, z)]
+        + arcPoints(holeMaxX, holeMaxY, padRadius, 270, 180, z)
+        + [(holeMaxX - padRadius, floorMaxY, z), (holeMinX + padRadius, floorMaxY, z)]
+        + arcPoints(holeMinX, holeMaxY, padRadius, 360, 270, z)
+        + [(floorMin, holeMaxY - padRadius, z), (floorMin, holeMinY + padRadius, z)]
+        + arcPoints(holeMinX, holeMinY, padRadius, 90, 0, z)
+    )
+
+def createBaseplateCellMesh(
+    input: BaseplateGeneratorInput,
+    cellMinX: float,
+    cellMinY: float,
+    cellMaxX: float,
+    cellMaxY: float,
+    cornerRadii: tuple[float, float, float, float],
+) -> TriangleMesh:
+    """
+    Single bin socket with the bottom extension under it, coordinates are relative to the min corner of the socket cutout
+    """
+    mesh = TriangleMesh()
+    xyClearance = input.xyClearance
+    topZ = -input.binZClearance
+    bottomZ = -const.BIN_BASE_HEIGHT
+    cellWidth = cellMaxX - cellMinX
+    cellLength = cellMaxY - cellMinY
+    socketWidth = input.baseWidth + xyClearance * 2
+    socketLength = input.baseLength + xyClearance * 2
+
+    cutoutProfile = [(inset, z) for [inset, z] in BASE_PROFILE if z < topZ]
+    cutoutProfile.reverse()
+    cutoutProfile.append((-topZ, topZ))
+    mesh.addTube(
+        [roundedRectangleLoop(cellMinX, cellMinY, cellWidth, cellLength, cornerRadii, z) for z in [bottomZ, topZ]],
+        # with a vertical clearance below the xy clearance the socket top reaches past the cell, it is cut off there
+        clampedProfileLoops(0, 0, socketWidth, socketLength, input.cornerFilletRadius + xyClearance, cutoutProfile, (cellMinX, cellMinY, cellMaxX, cellMaxY)),
+    )
+
+    if not input.hasExtendedBottom:
+        return mesh
+
+    extensionBottomZ = bottomZ - input.bottomExtensionHeight
+    holeMinX = const.DIMENSION_SCREW_HOLES_OFFSET + xyClearance
+    holeMinY = const.DIMENSION_SCREW_HOLES_OFFSET + xyClearance
+    holeMaxX = input.baseWidth - const.DIMENSION_SCREW_HOLES_OFFSET + xyClearance
+    holeMaxY = input.baseLength - const.DIMENSION_SCREW_HOLES_OFFSET + xyClearance
+    holeProfile = baseplateHoleProfile(input, extensionBottomZ, bottomZ)
+    holes = [
+        holeLoops(x, y, holeProfile)
+        for [x, y] in [(holeMinX, holeMinY), (holeMaxX, holeMinY), (holeMaxX, holeMaxY), (holeMinX, holeMaxY)]
+    ]
+    if input.hasSkeletonizedBottom:
+        floorInset = const.BIN_BASE_TOP_SECTION_HEIGH + const.BIN_BASE_BOTTOM_SECTION_HEIGH
+        holes.append([
+            skeletonCutoutLoop(input, [holeMinX, holeMaxX, holeMinY, holeMaxY], floorInset, socketWidth - floorInset, socketLength - floorInset, z)
+            for z in [extensionBottomZ, bottomZ]
+        ])
+    mesh.addLoftWithHoles(
+        [roundedRectangleLoop(cellMinX, cellMinY, cellWidth, cellLength, cornerRadii, z) for z in [extensionBottomZ, bottomZ]],
+        [hole for hole in holes if len(hole) > 0 and len(hole[0]) > 0],
+    )
+    return mesh
+
+def getBaseplateCellKey(input: BaseplateGeneratorInput, bounds: list[float], cornerRadii: tuple[float, float, float, float]) -> dict:
+    return {
+        'part': 'baseplateCell',
+        'bounds': bounds,
+        'cornerRadii': cornerRadii,
+        'baseWidth': input.baseWidth,
+        'baseLength': input.baseLength,
+        'xyClearance': input.xyClearance,
+        'binZClearance': input.binZClearance,
+        'cornerFilletRadius': input.cornerFilletRadius,
+        'hasExtendedBottom': input.hasExtendedBottom,
+        'bottomExtensionHeight': input.bottomExtensionHeight,
+        'hasSkeletonizedBottom': input.hasSkeletonizedBottom,
+        'hasScrewHoles': input.hasScrewHoles,
+        'screwHolesDiameter': input.screwHolesDiameter,
+        'screwHeadCutoutDiameter': input.screwHeadCutoutDiameter,
+        'hasMagnetCutouts': input.hasMagnetCutouts,
+        'magnetCutoutsDiameter': input.magnetCutoutsDiameter,
+        'magnetCutoutsDepth': input.magnetCutoutsDepth,
+    }
+
+def addGridfinityBaseplatePrintMesh(input: BaseplateGeneratorInput, targetMesh: TriangleMesh):
+    xyClearance = input.xyClearance
+    baseplateTrueWidth = input.baseplateWidth * input.baseWidth - xyClearance * 2
+    baseplateTrueLength = input.baseplateLength * input.baseLength - xyClearance * 2
+    topZ = -input.binZClearance
+    bottomZ = -const.BIN_BASE_HEIGHT - (input.bottomExtensionHeight if input.hasExtendedBottom else 0)
+    paddingLeft = input.paddingLeft if input.hasPadding else 0
+    paddingRight = input.paddingRight if input.hasPadding else 0
+    paddingTop = input.paddingTop if input.hasPadding else 0
+    paddingBottom = input.paddingBottom if input.hasPadding else 0
+    outerCorners = [
+        (baseplateTrueWidth + paddingRight, -paddingBottom),
+        (baseplateTrueWidth + paddingRight, baseplateTrueLength + paddingTop),
+        (-paddingLeft, baseplateTrueLength + paddingTop),
+        (-paddingLeft, -paddingBottom),
+    ]
+    outerRadius = input.cornerFilletRadius - xyClearance
+
+    def cornerRadii(minX: float, minY: float, maxX: float, maxY: float) -> tuple[float, float, float, float]:
+        # only the corners of the whole plate are rounded
+        return tuple(
+            outerRadius if any(math.isclose(x, cornerX, abs_tol=1e-6) and math.isclose(y, cornerY, abs_tol=1e-6) for [cornerX, cornerY] in outerCorners) else 0
+            for [x, y] in [(maxX, minY), (maxX, maxY), (minX, maxY), (minX, minY)]
+        )
+
+    # edge cells are narrower, corner cells are rounded, the rest are copies of the same mesh
+    for i in range(int(input.baseplateWidth)):
+        for j in range(int(input.baseplateLength)):
+            socketX = i * input.baseWidth - xyClearance * 2
+            socketY = j * input.baseLength - xyClearance * 2
+            cellMinX = max(0, i * input.baseWidth - xyClearance)
+            cellMinY = max(0, j * input.baseLength - xyClearance)
+            cellMaxX = min(baseplateTrueWidth, (i + 1) * input.baseWidth - xyClearance)
+            cellMaxY = min(baseplateTrueLength, (j + 1) * input.baseLength - xyClearance)
+            bounds = [cellMinX - socketX, cellMinY - socketY, cellMaxX - socketX, cellMaxY - socketY]
+            radii = cornerRadii(cellMinX, cellMinY, cellMaxX, cellMaxY)
+            cellMesh = getCachedMesh(
+                getBaseplateCellKey(input, bounds, radii),
+                lambda: createBaseplateCellMesh(input, *bounds, radii),
+            )
+            targetMesh.addMesh(cellMesh, (socketX, socketY, 0))
+
+    paddingMesh = TriangleMesh()
+
+    for [minX, minY, maxX, maxY] in [
+        (-paddingLeft, -paddingBottom, 0, baseplateTrueLength + paddingTop),
+        (baseplateTrueWidth, -paddingBottom, baseplateTrueWidth + paddingRight, baseplateTrueLength + paddingTop),
+        (0, -paddingBottom, baseplateTrueWidth, 0),
+        (0, baseplateTrueLength, baseplateTrueWidth, baseplateTrueLength + paddingTop),
+    ]:
+        if maxX - minX <= 0 or maxY - minY <= 0:
+            continue
+        radii = cornerRadii(minX, minY, maxX, maxY)
+        paddingMesh.addLoft([roundedRectangleLoop(minX, minY, maxX - minX, maxY - minY, radii, z) for z in [bottomZ, topZ]])
+    targetMesh.addMesh(paddingMesh)
+
+def createGridfinityBaseplatePrintMesh(input: BaseplateGeneratorInput) -> TriangleMesh:
+    mesh = TriangleMesh()
+    addGridfinityBaseplatePrintMesh(input, mesh)
+    return mesh
@@ -0,0 +1,92 @@
+import itertools
+import math
+import mmap
+import struct
+
+from .meshUtils import TriangleMesh
+
+try:
+    import numpy
+except ImportError:
+    # Fusion's bundled python has no numpy, the plain python writer is used there
+    numpy = None
+
+# STL has no units, slicers read it as millimeters while generator inputs are in centimeters
+STL_SCALE = 10.0
+STL_HEADER_SIZE = 80
+STL_TRIANGLE_FORMAT = struct.Struct('<12fH')
+
+def stlHeader(name: str) -> bytes:
+    # binary files must not start with "solid", some readers would take them for ascii STL
+    if name.lower().startswith('solid'):
+        name = f'_{name}'
+    header = name.encode('ascii', 'replace')[:STL_HEADER_SIZE]
+    return header.ljust(STL_HEADER_SIZE, b' ')
+
+def triangleRecords(mesh: TriangleMesh, scale: float, offset: tuple[float, float, float] = (0, 0, 0)) -> bytes:
+    [offsetX, offsetY, offsetZ] = offset
+    if numpy is not None:
+        coordinates = itertools.chain.from_iterable(itertools.chain.from_iterable(mesh.triangles))
+        vertices = numpy.fromiter(coordinates, dtype=numpy.float64, count=mesh.triangleCount * 9).reshape(-1, 3, 3)
+        vertices = (vertices + numpy.array(offset, dtype=numpy.float64)) * scale
+        normals = numpy.cross(vertices[:, 1] - vertices[:, 0], vertices[:, 2] - vertices[:, 0])
+        lengths = numpy.linalg.norm(normals, axis=1, keepdims=True)
+        normals = numpy.divide(normals, lengths, out=numpy.zeros_like(normals), where=lengths > 0)
+        records = numpy.zeros(len(vertices), dtype=[('normal', '<f4', (3,)), ('vertices', '<f4', (3, 3)), ('attributes', '<u2')])
+        records['normal'] = normals
+        records['vertices'] = vertices
+        return records.tobytes()
+
+    chunks = []
+    for [a, b, c] in mesh.triangles:
+        ux, uy, uz = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+        vx, vy, vz = c[0] - a[0], c[1] - a[1], c[2] - a[2]
+        nx, ny, nz = uy * vz - uz * vy, uz * vx - ux * vz, ux * vy - uy * vx
+        length = math.sqrt(nx * nx + ny * ny + nz * nz)
+        if length > 0:
+            nx, ny, nz = nx / length, ny / length, nz / length
+        chunks.append(STL_TRIANGLE_FORMAT.pack(
+            nx, ny, nz,
+            (a[0] + offsetX) * scale, (a[1] + offsetY) * scale, (a[2] + offsetZ) * scale,
+            (b[0] + offsetX) * scale, (b[1] + offsetY) * scale, (b[2] + offsetZ) * scale,
+            (c[0] + offsetX) * scale, (c[1] + offsetY) * scale, (c[2] + offsetZ) * scale,
+            0,
+        ))
+    return b''.join(chunks)
+
+class StlStreamWriter():
+    """
+    Binary STL writer taking the part one sub-mesh at a time, records go to the file right away
+    and the triangle count in the header is filled in on close
+    """
+    def __init__(self, path: str, name: str = '', scale: float = STL_SCALE):
+        self.scale = scale
+        self.triangleCount = 0
+        self.file = open(path, 'w+b')
+        self.file.write(stlHeader(name))
+        self.file.write(struct.pack('<I', 0))
+
+    def addMesh(self, mesh: TriangleMesh, offset: tuple[float, float, float] = (0, 0, 0)):
+        self.file.write(triangleRecords(mesh, self.scale, offset))
+        self.triangleCount += mesh.triangleCount
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.flush()
+        with mmap.mmap(self.file.fileno(), STL_HEADER_SIZE + 4) as header:
+            header[STL_HEADER_SIZE:] = struct.pack('<I', self.triangleCount)
+        self.file.close()
+
+    def __enter__(self) -> 'StlStreamWriter':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def writeBinaryStl(mesh: TriangleMesh, path: str, name: str = '', scale: float = STL_SCALE):
+    """
+    Writes the mesh as binary STL in millimeters, degenerate triangles are kept so closed shells stay closed
+    """
+    with StlStreamWriter(path, name, scale) as writer:
+        writer.addMesh(mesh)
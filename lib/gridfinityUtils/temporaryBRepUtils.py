@@ -0,0 +1,192 @@
+import adsk.core, adsk.fusion, traceback
+import math
+
+# Solids built directly with the temporary BRep manager, nothing is added to the design or its timeline.
+# Rounded outlines follow meshPreviewGenerator.profileLoops: insetting an outline keeps its corner centers
+# and shrinks the corner radius by the inset.
+
+def getManager() -> adsk.fusion.TemporaryBRepManager:
+    return adsk.fusion.TemporaryBRepManager.get()
+
+def union(targetBody: adsk.fusion.BRepBody, toolBody: adsk.fusion.BRepBody) -> adsk.fusion.BRepBody:
+    getManager().booleanOperation(targetBody, toolBody, adsk.fusion.BooleanTypes.UnionBooleanType)
+    return targetBody
+
+def difference(targetBody: adsk.fusion.BRepBody, toolBody: adsk.fusion.BRepBody) -> adsk.fusion.BRepBody:
+    getManager().booleanOperation(targetBody, toolBody, adsk.fusion.BooleanTypes.DifferenceBooleanType)
+    return targetBody
+
+def intersection(targetBody: adsk.fusion.BRepBody, toolBody: adsk.fusion.BRepBody) -> adsk.fusion.BRepBody:
+    getManager().booleanOperation(targetBody, toolBody, adsk.fusion.BooleanTypes.IntersectionBooleanType)
+    return targetBody
+
+def unionAll(bodies: list[adsk.fusion.BRepBody]) -> adsk.fusion.BRepBody | None:
+    bodies = [body for body in bodies if body is not None]
+    if len(bodies) == 0:
+        return None
+    # merged in pairs, every boolean joins bodies of similar size instead of growing one body a piece at a time
+    while len(bodies) > 1:
+        bodies = [union(bodies[index], bodies[index + 1]) if index + 1 < len(bodies) else bodies[index] for index in range(0, len(bodies), 2)]
+    return bodies[0]
+
+def translated(body: adsk.fusion.BRepBody, x: float, y: float, z: float = 0) -> adsk.fusion.BRepBody:
+    bodyCopy = getManager().copy(body)
+    transform = adsk.core.Matrix3D.create()
+    transform.translation = adsk.core.Vector3D.create(x, y, z)
+    getManager().transform(bodyCopy, transform)
+    return bodyCopy
+
+def createBox(minX: float, minY: float, minZ: float, maxX: float, maxY: float, maxZ: float) -> adsk.fusion.BRepBody:
+    box = adsk.core.OrientedBoundingBox3D.create(
+        adsk.core.Point3D.create((minX + maxX) / 2, (minY + maxY) / 2, (minZ + maxZ) / 2),
+        adsk.core.Vector3D.create(1, 0, 0),
+        adsk.core.Vector3D.create(0, 1, 0),
+        maxX - minX,
+        maxY - minY,
+        maxZ - minZ,
+    )
+    return getManager().createBox(box)
+
+def createCylinder(x: float, y: float, bottomZ: float, bottomRadius: float, topZ: float, topRadius: float) -> adsk.fusion.BRepBody:
+    return getManager().createCylinderOrCone(
+        adsk.core.Point3D.create(x, y, bottomZ),
+        bottomRadius,
+        adsk.core.Point3D.create(x, y, topZ),
+        topRadius,
+    )
+
+def createHalfSpace(point: tuple[float, float, float], normal: tuple[float, float, float], alongDirection: tuple[float, float, float], size: float) -> adsk.fusion.BRepBody:
+    """
+    Box of the given size lying behind the plane through the point, the normal points away from it
+    """
+    normalVector = adsk.core.Vector3D.create(*normal)
+    normalVector.normalize()
+    center = adsk.core.Point3D.create(*point)
+    offset = normalVector.copy()
+    offset.scaleBy(-size / 2)
+    center.translateBy(offset)
+    box = adsk.core.OrientedBoundingBox3D.create(center, normalVector, adsk.core.Vector3D.create(*alongDirection), size, size, size)
+    return getManager().createBox(box)
+
+def createRoundedPrism(
+    minX: float,
+    minY: float,
+    maxX: float,
+    maxY: float,
+    cornerRadii: tuple[float, float, float, float],
+    bottomZ: float,
+    topZ: float,
+) -> adsk.fusion.BRepBody:
+    """
+    Upright prism over a rectangle, corner radii are ordered like meshUtils.roundedRectangleLoop:
+    (maxX, minY), (maxX, maxY), (minX, maxY), (minX, minY)
+    """
+    body = createBox(minX, minY, bottomZ, maxX, maxY, topZ)
+    for [radius, cornerX, cornerY, directionX, directionY] in zip(
+        cornerRadii,
+        [maxX, maxX, minX, minX],
+        [minY, maxY, maxY, minY],
+        [-1, -1, 1, 1],
+        [1, -1, -1, 1],
+    ):
+        if radius <= 0:
+            continue
+        centerX = cornerX + directionX * radius
+        centerY = cornerY + directionY * radius
+        difference(body, createBox(min(cornerX, centerX), min(cornerY, centerY), bottomZ, max(cornerX, centerX), max(cornerY, centerY), topZ))
+        union(body, createCylinder(centerX, centerY, bottomZ, radius, topZ, radius))
+    return body
+
+def createRoundedFrustum(
+    minX: float,
+    minY: float,
+    maxX: float,
+    maxY: float,
+    radius: float,
+    bottomZ: float,
+    bottomInset: float,
+    topZ: float,
+    topInset: float,
+) -> adsk.fusion.BRepBody:
+    """
+    Solid between the outline inset by bottomInset at bottomZ and by topInset at topZ. Every corner is a cone
+    around the fixed corner center, the sides between them are boxes cut by slanted half spaces.
+    """
+    bottomRadius = max(0, radius - bottomInset)
+    topRadius = max(0, radius - topInset)
+    centerMinX = minX + radius
+    centerMinY = minY + radius
+    centerMaxX = maxX - radius
+    centerMaxY = maxY - radius
+    height = topZ - bottomZ
+    outerRadius = max(bottomRadius, topRadius)
+    halfSpaceSize = (max(maxX - minX, maxY - minY) + height) * 4
+
+    body = createBox(centerMinX, centerMinY, bottomZ, centerMaxX, centerMaxY, topZ)
+    if outerRadius <= 0:
+        return body
+    for [centerX, centerY] in [(centerMaxX, centerMinY), (centerMaxX, centerMaxY), (centerMinX, centerMaxY), (centerMinX, centerMinY)]:
+        union(body, createCylinder(centerX, centerY, bottomZ, bottomRadius, topZ, topRadius))
+
+    # side slabs reach out to the larger radius, the slanted side is cut where the radii differ
+    slope = (topRadius - bottomRadius) / height
+    sides = [
+        (centerMaxX, centerMinY, centerMaxX + outerRadius, centerMaxY, (1, 0), (0, 1, 0)),
+        (centerMinX - outerRadius, centerMinY, centerMinX, centerMaxY, (-1, 0), (0, 1, 0)),
+        (centerMinX, centerMaxY, centerMaxX, centerMaxY + outerRadius, (0, 1), (1, 0, 0)),
+        (centerMinX, centerMinY - outerRadius, centerMaxX, centerMinY, (0, -1), (1, 0, 0)),
+    ]
+    for [sideMinX, sideMinY, sideMaxX, sideMaxY, [directionX, directionY], alongDirection] in sides:
+        side = createBox(sideMinX, sideMinY, bottomZ, sideMaxX, sideMaxY, topZ)
+        if not math.isclose(bottomRadius, topRadius):
+            anchorX = (centerMaxX if directionX > 0 else centerMinX) + directionX * bottomRadius
+            anchorY = (centerMaxY if directionY > 0 else centerMinY) + directionY * bottomRadius
+            intersection(side, createHalfSpace((anchorX, anchorY, bottomZ), (directionX, directionY, -slope), alongDirection, halfSpaceSize))
+        union(body, side)
+    return body
+
+def createProfileSolid(
+    minX: float,
+    minY: float,
+    maxX: float,
+    maxY: float,
+    radius: float,
+    profile: list[tuple[float, float]],
+) -> adsk.fusion.BRepBody | None:
+    """
+    Stack of frustums through the (inset, z) pairs of a profile ordered bottom to top
+    """
+    sections = [
+        createRoundedFrustum(minX, minY, maxX, maxY, radius, bottomZ, bottomInset, topZ, topInset)
+        for [[bottomInset, bottomZ], [topInset, topZ]] in zip(profile, profile[1:])
+        if topZ > bottomZ
+    ]
+    return unionAll(sections)
+
+def createRevolvedProfile(x: float, y: float, profile: list[tuple[float, float]]) -> adsk.fusion.BRepBody | None:
+    """
+    Round hole tool through the (radius, z) pairs of a profile ordered bottom to top
+    """
+    return unionAll([
+        createCylinder(x, y, bottomZ, bottomRadius, topZ, topRadius)
+        for [[bottomRadius, bottomZ], [topRadius, topZ]] in zip(profile, profile[1:])
+        if topZ > bottomZ and max(bottomRadius, topRadius) > 0
+    ])
+
+def createPrismAlongX(x: float, length: float, profile: list[tuple[float, float]]) -> adsk.fusion.BRepBody:
+    """
+    Prism over a convex (y, z) polygon, its box cut by a half space for every edge of the polygon
+    """
+    ys = [y for [y, z] in profile]
+    zs = [z for [y, z] in profile]
+    body = createBox(x, min(ys), min(zs), x + length, max(ys), max(zs))
+    halfSpaceSize = (max(ys) - min(ys) + max(zs) - min(zs) + length) * 4
+    orientation = math.copysign(1, sum(ay * bz - by * az for [[ay, az], [by, bz]] in zip(profile, profile[1:] + profile[:1])))
+    for [[ay, az], [by, bz]] in zip(profile, profile[1:] + profile[:1]):
+        normalY = (bz - az) * orientation
+        normalZ = -(by - ay) * orientation
+        # edges along the box sides cut nothing
+        if math.isclose(normalY, 0, abs_tol=1e-9) or math.isclose(normalZ, 0, abs_tol=1e-9):
+            continue
+        intersection(body, createHalfSpace((x, ay, az), (0, normalY, normalZ), (1, 0, 0), halfSpaceSize))
+    return body
@@ -0,0 +1,116 @@
+import weakref
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+from .meshUtils import TriangleMesh
+from .stlUtils import STL_SCALE
+
+THREE_MF_MODEL_PATH = '3D/3dmodel.model'
+THREE_MF_CORE_NAMESPACE = 'http://schemas.microsoft.com/3dmanufacturing/core/2015/02'
+THREE_MF_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+    '</Types>\n'
+)
+THREE_MF_RELATIONSHIPS = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Target="/{THREE_MF_MODEL_PATH}" Id="rel0" Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+    '</Relationships>\n'
+)
+# vertices and triangles are written in chunks of this many lines
+THREE_MF_CHUNK_SIZE = 4096
+
+def formatNumber(value: float) -> str:
+    return format(value, '.9g')
+
+def formatTransform(offset: tuple[float, float, float]) -> str:
+    return ' '.join(['1', '0', '0', '0', '1', '0', '0', '0', '1'] + [formatNumber(value) for value in offset])
+
+class ThreeMfStreamWriter():
+    """
+    3MF writer taking the part one sub-mesh at a time. Every distinct sub-mesh becomes a resource object
+    written as soon as it arrives, the part is a single object made of components placing those resources,
+    so repeated base cells are stored once however many times they are used
+    """
+    def __init__(self, path: str, name: str = '', scale: float = STL_SCALE):
+        self.scale = scale
+        self.triangleCount = 0
+        self.name = name
+        self.archive = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED)
+        self.archive.writestr('[Content_Types].xml', THREE_MF_CONTENT_TYPES)
+        self.archive.writestr('_rels/.rels', THREE_MF_RELATIONSHIPS)
+        self.model = self.archive.open(THREE_MF_MODEL_PATH, 'w')
+        # meshes are tracked by identity without keeping them alive, callers share repeated ones through a cache
+        self.objects: dict[int, tuple[weakref.ref, int]] = {}
+        self.components: list[tuple[int, tuple[float, float, float]]] = []
+        self.nextObjectId = 1
+        self.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<model unit="millimeter" xml:lang="en-US" xmlns={quoteattr(THREE_MF_CORE_NAMESPACE)}>\n'
+            f'<metadata name="Title">{escape(name)}</metadata>\n'
+            '<resources>\n'
+        )
+
+    def write(self, text: str):
+        self.model.write(text.encode('utf-8'))
+
+    def writeMeshObject(self, mesh: TriangleMesh) -> int:
+        objectId = self.nextObjectId
+        self.nextObjectId += 1
+        self.write(f'<object id="{objectId}" type="model"><mesh><vertices>\n')
+        vertexIndices = {}
+        lines = []
+        for triangle in mesh.triangles:
+            for point in triangle:
+                if not point in vertexIndices:
+                    vertexIndices[point] = len(vertexIndices)
+                    [x, y, z] = point
+                    lines.append(f'<vertex x="{formatNumber(x * self.scale)}" y="{formatNumber(y * self.scale)}" z="{formatNumber(z * self.scale)}"/>\n')
+                    if len(lines) >= THREE_MF_CHUNK_SIZE:
+                        self.write(''.join(lines))
+                        lines = []
+        self.write(''.join(lines))
+        self.write('</vertices><triangles>\n')
+        lines = []
+        for [a, b, c] in mesh.triangles:
+            lines.append(f'<triangle v1="{vertexIndices[a]}" v2="{vertexIndices[b]}" v3="{vertexIndices[c]}"/>\n')
+            if len(lines) >= THREE_MF_CHUNK_SIZE:
+                self.write(''.join(lines))
+                lines = []
+        self.write(''.join(lines))
+        self.write('</triangles></mesh></object>\n')
+        return objectId
+
+    def addMesh(self, mesh: TriangleMesh, offset: tuple[float, float, float] = (0, 0, 0)):
+        if mesh.triangleCount == 0:
+            return
+        entry = self.objects.get(id(mesh))
+        if entry is None or entry[0]() is not mesh:
+            entry = (weakref.ref(mesh), self.writeMeshObject(mesh))
+            self.objects[id(mesh)] = entry
+        self.components.append((entry[1], tuple(value * self.scale for value in offset)))
+        self.triangleCount += mesh.triangleCount
+
+    def close(self):
+        if self.model is None:
+            return
+        partObjectId = self.nextObjectId
+        self.write(f'<object id="{partObjectId}" type="model" name={quoteattr(self.name)}><components>\n')
+        self.write(''.join(
+            f'<component objectid="{objectId}" transform="{formatTransform(offset)}"/>\n'
+            for [objectId, offset] in self.components
+        ))
+        self.write('</components></object>\n</resources>\n')
+        self.write(f'<build><item objectid="{partObjectId}"/></build>\n</model>\n')
+        self.model.close()
+        self.model = None
+        self.archive.close()
+
+    def __enter__(self) -> 'ThreeMfStreamWriter':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
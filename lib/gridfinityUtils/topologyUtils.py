@@ -0,0 +1,243 @@
+import adsk.core, adsk.fusion, traceback
+from array import array
+
+from .const import DEFAULT_FILTER_TOLERANCE
+
+try:
+    import numpy
+except ImportError:
+    # Fusion's bundled python has no numpy, the arrays are scanned with plain python there
+    numpy = None
+
+# bits of the flat axes masks, a face flat along Z is horizontal and an edge flat along X and Y is vertical
+FLAT_X = 1
+FLAT_Y = 2
+FLAT_Z = 4
+
+# columns of the box arrays
+BOX_MIN_X = 0
+BOX_MIN_Y = 1
+BOX_MIN_Z = 2
+BOX_MAX_X = 3
+BOX_MAX_Y = 4
+BOX_MAX_Z = 5
+
+# indexes of the most recently queried bodies are kept, generators mostly query the body they have just built
+TOPOLOGY_INDEX_CACHE_SIZE = 32
+
+def getFlatAxes(box: adsk.core.BoundingBox3D) -> int:
+    minPoint = box.minPoint
+    maxPoint = box.maxPoint
+    return ((FLAT_X if abs(maxPoint.x - minPoint.x) <= DEFAULT_FILTER_TOLERANCE else 0)
+        | (FLAT_Y if abs(maxPoint.y - minPoint.y) <= DEFAULT_FILTER_TOLERANCE else 0)
+        | (FLAT_Z if abs(maxPoint.z - minPoint.z) <= DEFAULT_FILTER_TOLERANCE else 0))
+
+def appendBox(boxes: array, box: adsk.core.BoundingBox3D):
+    minPoint = box.minPoint
+    maxPoint = box.maxPoint
+    boxes.extend((minPoint.x, minPoint.y, minPoint.z, maxPoint.x, maxPoint.y, maxPoint.z))
+
+class BoxTable():
+    """
+    Entities with their bounding boxes as rows of six coordinates (min xyz, max xyz) in one flat array,
+    the (N, 6) numpy matrix and the flat axes of the rows are computed for all rows at once
+    """
+    def __init__(self):
+        self.entities = []
+        self.boxes = array('d')
+        self.indexById: dict[int, int] = {}
+        self._matrix = None
+        self._flatAxes = None
+
+    def add(self, entity, entityId: int = None) -> int:
+        # bodies have no temp id, callers give them a key of their own
+        entityId = entity.tempId if entityId is None else entityId
+        entityIndex = self.indexById.get(entityId)
+        if entityIndex is None:
+            entityIndex = len(self.entities)
+            appendBox(self.boxes, entity.boundingBox)
+            self.entities.append(entity)
+            self.indexById[entityId] = entityIndex
+            self._matrix = None
+            self._flatAxes = None
+        return entityIndex
+
+    @property
+    def matrix(self):
+        if self._matrix is None and numpy is not None:
+            # a copy, a view would keep the array from growing
+            self._matrix = numpy.array(self.boxes, dtype=numpy.float64).reshape(-1, 6)
+        return self._matrix
+
+    @property
+    def flatAxes(self):
+        if self._flatAxes is None:
+            if numpy is not None:
+                flat = numpy.abs(self.matrix[:, 3:] - self.matrix[:, :3]) <= DEFAULT_FILTER_TOLERANCE
+                self._flatAxes = flat @ numpy.array([FLAT_X, FLAT_Y, FLAT_Z])
+            else:
+                boxes = self.boxes
+                self._flatAxes = array('B', [
+                    (FLAT_X if abs(boxes[row + 3] - boxes[row]) <= DEFAULT_FILTER_TOLERANCE else 0)
+                    | (FLAT_Y if abs(boxes[row + 4] - boxes[row + 1]) <= DEFAULT_FILTER_TOLERANCE else 0)
+                    | (FLAT_Z if abs(boxes[row + 5] - boxes[row + 2]) <= DEFAULT_FILTER_TOLERANCE else 0)
+                    for row in range(0, len(boxes), 6)
+                ])
+        return self._flatAxes
+
+    def select(self, flatAxes: int, rows: list[int] = None) -> list[int]:
+        """
+        Rows flat along all of the given axes, optionally only among the given rows
+        """
+        if numpy is not None:
+            candidates = numpy.arange(len(self.entities)) if rows is None else numpy.asarray(rows, dtype=numpy.intp)
+            return candidates[self.flatAxes[candidates] & flatAxes == flatAxes].tolist()
+        allFlatAxes = self.flatAxes
+        return [row for row in (range(len(self.entities)) if rows is None else rows) if allFlatAxes[row] & flatAxes == flatAxes]
+
+    def extreme(self, rows: list[int], column: int, largest: bool) -> int | None:
+        if len(rows) == 0:
+            return None
+        if numpy is not None:
+            values = self.matrix[numpy.asarray(rows, dtype=numpy.intp), column]
+            return rows[int(numpy.argmax(values) if largest else numpy.argmin(values))]
+        boxes = self.boxes
+        return (max if largest else min)(rows, key=lambda row: boxes[row * 6 + column])
+
+    def value(self, row: int, column: int) -> float:
+        return self.boxes[row * 6 + column]
+
+    def overlapping(self, box: tuple[float, float, float, float, float, float]) -> list[int]:
+        """
+        Rows whose boxes overlap or touch the given (min xyz, max xyz) box
+        """
+        tolerance = DEFAULT_FILTER_TOLERANCE
+        if numpy is not None:
+            bounds = numpy.asarray(box, dtype=numpy.float64)
+            matrix = self.matrix
+            mask = numpy.all(matrix[:, :3] <= bounds[3:] + tolerance, axis=1) & numpy.all(matrix[:, 3:] >= bounds[:3] - tolerance, axis=1)
+            return numpy.flatnonzero(mask).tolist()
+        boxes = self.boxes
+        return [
+            row for row in range(len(self.entities))
+            if all(boxes[row * 6 + axis] <= box[axis + 3] + tolerance and boxes[row * 6 + axis + 3] >= box[axis] - tolerance for axis in range(3))
+        ]
+
+    def isWithin(self, row: int, box: tuple[float, float, float, float, float, float]) -> bool:
+        offset = row * 6
+        return all(self.boxes[offset + axis] >= box[axis] and self.boxes[offset + axis + 3] <= box[axis + 3] for axis in range(3))
+
+def getBodyBoxTable(bodies: list[adsk.fusion.BRepBody]) -> BoxTable:
+    bodyBoxes = BoxTable()
+    for [index, body] in enumerate(bodies):
+        bodyBoxes.add(body, index)
+    return bodyBoxes
+
+class BodyTopologyIndex():
+    """
+    Snapshot of a body revision. Faces are read on the first face query, edges as the faces listing them
+    are first queried or all at once for body wide edge queries, every edge is read from the API once
+    however many faces share it.
+    """
+    def __init__(self, body: adsk.fusion.BRepBody):
+        self.body = body
+        self.faces = BoxTable()
+        self.edges = BoxTable()
+        self.edgeLengths = array('d')
+        self.faceEdgeIndices: dict[int, array] = {}
+        self.hasAllFaces = False
+        self.hasAllEdges = False
+
+    def isValid(self) -> bool:
+        # rolled back or recomputed topology invalidates all of its entities at once, one of each kind is enough to tell
+        return self.body.isValid and all(table.entities[0].isValid for table in [self.faces, self.edges] if len(table.entities) > 0)
+
+    def indexFaces(self) -> BoxTable:
+        if not self.hasAllFaces:
+            for face in self.body.faces:
+                self.faces.add(face)
+            self.hasAllFaces = True
+        return self.faces
+
+    def indexEdge(self, edge: adsk.fusion.BRepEdge) -> int:
+        edgeCount = len(self.edges.entities)
+        edgeIndex = self.edges.add(edge)
+        if edgeIndex == edgeCount:
+            self.edgeLengths.append(edge.length)
+        return edgeIndex
+
+    def indexEdges(self) -> BoxTable:
+        if not self.hasAllEdges:
+            for edge in self.body.edges:
+                self.indexEdge(edge)
+            self.hasAllEdges = True
+        return self.edges
+
+    def getFaceEdgeIndices(self, face: adsk.fusion.BRepFace) -> array:
+        faceId = face.tempId
+        edgeIndices = self.faceEdgeIndices.get(faceId)
+        if edgeIndices is None:
+            edgeIndices = array('l', [self.indexEdge(edge) for edge in face.edges])
+            self.faceEdgeIndices[faceId] = edgeIndices
+        return edgeIndices
+
+    def getEdgeIndices(self, faces: list[adsk.fusion.BRepFace]) -> list[int]:
+        # edges shared by two of the faces are listed once
+        return list(dict.fromkeys(index for face in faces for index in self.getFaceEdgeIndices(face)))
+
+topologyIndexCache: dict[tuple[str, str], BodyTopologyIndex] = {}
+
+def getTopologyIndex(body: adsk.fusion.BRepBody) -> BodyTopologyIndex:
+    # any change to the body gives it a new revision id, so an index never outlives the topology it describes
+    key = (body.entityToken, body.revisionId)
+    index = topologyIndexCache.pop(key, None)
+    if index is not None and not index.isValid():
+        index = None
+    if index is None:
+        index = BodyTopologyIndex(body)
+        if len(topologyIndexCache) >= TOPOLOGY_INDEX_CACHE_SIZE:
+            del topologyIndexCache[next(iter(topologyIndexCache))]
+    topologyIndexCache[key] = index
+    return index
+
+def clearTopologyIndexes():
+    topologyIndexCache.clear()
+
+def groupFacesByBody(faces: adsk.fusion.BRepFaces) -> list[tuple[BodyTopologyIndex, list[adsk.fusion.BRepFace]]]:
+    groups: dict[int, tuple[BodyTopologyIndex, list[adsk.fusion.BRepFace]]] = {}
+    for face in faces:
+        index = getTopologyIndex(face.body)
+        groups.setdefault(id(index), (index, []))[1].append(face)
+    return list(groups.values())
+
+def getFlatFaces(body: adsk.fusion.BRepBody, flatAxes: int) -> list[adsk.fusion.BRepFace]:
+    faces = getTopologyIndex(body).indexFaces()
+    return [faces.entities[row] for row in faces.select(flatAxes)]
+
+def getExtremeFlatFace(body: adsk.fusion.BRepBody, flatAxes: int, column: int, largest: bool) -> adsk.fusion.BRepFace:
+    faces = getTopologyIndex(body).indexFaces()
+    row = faces.extreme(faces.select(flatAxes), column, largest)
+    if row is None:
+        raise ValueError(f'{body.name} has no face flat along axes {flatAxes}')
+    return faces.entities[row]
+
+def getFlatEdges(body: adsk.fusion.BRepBody, flatAxes: int) -> list[adsk.fusion.BRepEdge]:
+    edges = getTopologyIndex(body).indexEdges()
+    return [edges.entities[row] for row in edges.select(flatAxes)]
+
+def getExtremeFlatEdge(faces: adsk.fusion.BRepFaces, flatAxes: int, column: int, largest: bool) -> adsk.fusion.BRepEdge:
+    """
+    Edge of the faces flat along all of the given axes with the smallest or largest box coordinate in the column
+    """
+    best = None
+    for [index, bodyFaces] in groupFacesByBody(faces):
+        edges = index.edges
+        row = edges.extreme(edges.select(flatAxes, index.getEdgeIndices(bodyFaces)), column, largest)
+        if row is None:
+            continue
+        value = edges.value(row, column)
+        if best is None or (value > best[0] if largest else value < best[0]):
+            best = (value, edges.entities[row])
+    if best is None:
+        raise ValueError(f'No edge flat along axes {flatAxes}')
+    return best[1]
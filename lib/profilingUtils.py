@@ -0,0 +1,182 @@
+import adsk.core, adsk.fusion, traceback
+import contextlib
+import functools
+import os
+import sys
+import time
+
+from . import fusion360utils as futil
+from . import configUtils
+from .. import config
+from .gridfinityUtils import extrudeUtils, filletUtils, combineUtils, patternUtils, shapeUtils, sketchUtils
+from .gridfinityUtils import baseGenerator, baseplateGenerator, binGenerator, binBodyGenerator, binBodyLipGenerator, binBodyCutoutGenerator, binBodyTabGenerator
+
+HELPER_MODULES = [extrudeUtils, filletUtils, combineUtils, patternUtils, shapeUtils, sketchUtils]
+
+# generator entry points, time spent inside them is attributed to their stage
+STAGE_FUNCTIONS = [
+    (baseGenerator, 'createSingleGridfinityBaseBody', 'base'),
+    (baseGenerator, 'createBaseBodyPattern', 'base pattern'),
+    (baseGenerator, 'createBaseBodyPatternFromBRep', 'base pattern'),
+    (baseGenerator, 'cutBaseClearance', 'base clearance'),
+    (binBodyGenerator, 'createGridfinityBinBody', 'body'),
+    (binBodyGenerator, 'createWallGridCompartments', 'compartments'),
+    (binBodyGenerator, 'createCompartment', 'compartments'),
+    (binBodyGenerator, 'createDividerWalls', 'compartments'),
+    (binBodyLipGenerator, 'createGridfinityBinBodyLip', 'lip'),
+    (binBodyCutoutGenerator, 'createGridfinityBinBodyCutout', 'cutout'),
+    (binBodyTabGenerator, 'createGridfinityBinBodyTab', 'tab'),
+    (baseplateGenerator, 'createGridfinityBaseplate', 'baseplate'),
+    (binGenerator, 'createGridfinityBin', 'bin'),
+]
+
+FEATURE_COLLECTIONS = [
+    'ExtrudeFeatures',
+    'FilletFeatures',
+    'ChamferFeatures',
+    'CombineFeatures',
+    'RectangularPatternFeatures',
+    'CircularPatternFeatures',
+    'ShellFeatures',
+    'SplitBodyFeatures',
+    'MoveFeatures',
+    'CopyPasteBodies',
+    'RemoveFeatures',
+    'BaseFeatures',
+]
+FEATURE_METHODS = ['add', 'addSimple']
+
+ROOT_PACKAGE = __name__.rsplit('.', 2)[0]
+
+class ProfilerState():
+    def __init__(self):
+        self.records: dict[tuple[str, str], list[float]] = {}
+        self.stageTimes: dict[str, float] = {}
+        self.stageStack: list[str] = []
+        self.childTimeStack: list[float] = []
+        self.patches: list[tuple[object, str, object]] = []
+
+state = ProfilerState()
+
+def isActive() -> bool:
+    return len(state.patches) > 0
+
+def record(name: str, elapsed: float, selfElapsed: float):
+    key = (state.stageStack[-1] if len(state.stageStack) > 0 else 'command', name)
+    entry = state.records.setdefault(key, [0, 0.0, 0.0])
+    entry[0] += 1
+    entry[1] += elapsed
+    entry[2] += selfElapsed
+
+def timed(name: str, function, stageName: str = None):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if stageName is not None:
+            state.stageStack.append(stageName)
+        state.childTimeStack.append(0.0)
+        startTime = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - startTime
+            childTime = state.childTimeStack.pop()
+            if len(state.childTimeStack) > 0:
+                state.childTimeStack[-1] += elapsed
+            record(name, elapsed, elapsed - childTime)
+            if stageName is not None:
+                state.stageStack.pop()
+                # nested calls of the same stage are already included in the outer one
+                if not stageName in state.stageStack:
+                    state.stageTimes[stageName] = state.stageTimes.get(stageName, 0.0) + elapsed
+    wrapper.profilerOriginal = function
+    return wrapper
+
+def patchAttribute(owner: object, attributeName: str, replacement: object):
+    state.patches.append((owner, attributeName, getattr(owner, attributeName)))
+    setattr(owner, attributeName, replacement)
+
+def patchFunction(module, functionName: str, stageName: str = None):
+    original = getattr(module, functionName)
+    wrapper = timed(f'{module.__name__.rsplit(".", 1)[-1]}.{functionName}', original, stageName)
+    # functions imported by name keep a reference to the original, replace those too
+    for loadedModule in list(sys.modules.values()):
+        if loadedModule is None or not getattr(loadedModule, '__name__', '').startswith(ROOT_PACKAGE):
+            continue
+        for attributeName, value in list(vars(loadedModule).items()):
+            if value is original:
+                patchAttribute(loadedModule, attributeName, wrapper)
+
+def install():
+    if isActive():
+        return
+    for [module, functionName, stageName] in STAGE_FUNCTIONS:
+        patchFunction(module, functionName, stageName)
+    for module in HELPER_MODULES:
+        for functionName, value in list(vars(module).items()):
+            if callable(value) and getattr(value, '__module__', None) == module.__name__ and not functionName.startswith('_'):
+                patchFunction(module, functionName)
+    for collectionName in FEATURE_COLLECTIONS:
+        collectionClass = getattr(adsk.fusion, collectionName, None)
+        if collectionClass is None:
+            continue
+        for methodName in FEATURE_METHODS:
+            method = collectionClass.__dict__.get(methodName)
+            if method is not None:
+                patchAttribute(collectionClass, methodName, timed(f'features.{collectionName}.{methodName}', method))
+
+def uninstall():
+    for [owner, attributeName, original] in reversed(state.patches):
+        setattr(owner, attributeName, original)
+    state.patches = []
+
+def reset():
+    state.records = {}
+    state.stageTimes = {}
+    state.stageStack = []
+    state.childTimeStack = []
+
+def buildReport(label: str, totalTime: float) -> dict:
+    stages = {}
+    for [[stageName, name], [count, elapsed, selfElapsed]] in state.records.items():
+        stage = stages.setdefault(stageName, {'seconds': state.stageTimes.get(stageName, totalTime if stageName == 'command' else 0.0), 'calls': {}})
+        stage['calls'][name] = {'count': count, 'seconds': elapsed, 'selfSeconds': selfElapsed}
+    hotspots = sorted(
+        [{'stage': stageName, 'name': name, 'count': count, 'selfSeconds': selfElapsed} for [[stageName, name], [count, elapsed, selfElapsed]] in state.records.items()],
+        key=lambda entry: entry['selfSeconds'],
+        reverse=True,
+    )
+    return {
+        'label': label,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'fusionVersion': adsk.core.Application.get().version,
+        'totalSeconds': totalTime,
+        'stages': stages,
+        'hotspots': hotspots[:20],
+    }
+
+@contextlib.contextmanager
+def profile(label: str, reportPath: str, isEnabled: bool = None):
+    """
+    Times generator stages, utility helpers and feature creation calls made inside the block
+    and writes the summary to reportPath. Does nothing unless enabled in config.
+    """
+    if isEnabled is None:
+        isEnabled = config.PROFILING_ENABLED
+    if not isEnabled or isActive():
+        yield
+        return
+    reset()
+    install()
+    startTime = time.perf_counter()
+    try:
+        yield
+    finally:
+        totalTime = time.perf_counter() - startTime
+        uninstall()
+        try:
+            os.makedirs(os.path.dirname(reportPath), exist_ok=True)
+            configUtils.dumpJsonConfig(reportPath, buildReport(label, totalTime))
+            futil.log(f'{label} took {totalTime:.3f}s, profiling report written to {reportPath}')
+        except:
+            futil.log(f'Failed to write profiling report:\n{traceback.format_exc()}')
+        reset()
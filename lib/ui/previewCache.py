@@ -0,0 +1,32 @@
+import adsk.core, adsk.fusion, traceback
+from ...lib import fusion360utils as futil
+from ..gridfinityUtils import fingerprintUtils
+from .commandUiState import CommandUiState
+
+class PreviewCache():
+    def __init__(self, commandName: str):
+        self.commandName = commandName
+        self.clear()
+
+    def clear(self):
+        self.key: str = None
+        self.result: any = None
+
+    def computeKey(self, uiState: CommandUiState, ignoreKeys: list[str] = [], extraState: any = None) -> str:
+        # expanding or collapsing groups never changes geometry
+        geometryState = {
+            inputId: state.value
+            for inputId, state in uiState.inputState.items()
+            if not inputId in ignoreKeys and not state.type == adsk.core.GroupCommandInput.classType()
+        }
+        return fingerprintUtils.fingerprint({'inputs': geometryState, 'extra': extraState})
+
+    def get(self, key: str):
+        if key == self.key:
+            futil.log(f'{self.commandName} Reusing cached preview {key[:12]}')
+            return self.result
+        return None
+
+    def store(self, key: str, result: any):
+        self.key = key
+        self.result = result
@@ -0,0 +1,67 @@
+import adsk.core, adsk.fusion, traceback
+import threading
+from ...lib import fusion360utils as futil
+from ... import config
+
+app = adsk.core.Application.get()
+
+class PreviewScheduler():
+    """
+    Coalesces bursts of input changes (e.g. dragging a spinner) so the expensive preview is only
+    generated once the inputs stop changing for the quiet period.
+    The timer runs on a worker thread and hands control back to the main thread through a custom event.
+    """
+    def __init__(self, commandName: str, eventId: str, quietPeriod: float = config.PREVIEW_QUIET_PERIOD):
+        self.commandName = commandName
+        self.eventId = eventId
+        self.quietPeriod = quietPeriod
+        self.command: adsk.core.Command = None
+        self.timer: threading.Timer = None
+        self.isPending = False
+        self.lock = threading.Lock()
+
+    def start(self, command: adsk.core.Command, local_handlers: list):
+        self.stop()
+        self.command = command
+        customEvent = app.registerCustomEvent(self.eventId)
+        futil.add_handler(customEvent, self.onQuietPeriodElapsed, local_handlers=local_handlers)
+
+    def stop(self):
+        with self.lock:
+            self.cancelTimer()
+            self.isPending = False
+            self.command = None
+        try:
+            app.unregisterCustomEvent(self.eventId)
+        except:
+            pass
+
+    def inputChanged(self):
+        if self.quietPeriod <= 0 or self.command is None:
+            return
+        with self.lock:
+            self.cancelTimer()
+            self.isPending = True
+            self.timer = threading.Timer(self.quietPeriod, self.fireEvent)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def cancelTimer(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def fireEvent(self):
+        try:
+            app.fireCustomEvent(self.eventId, '')
+        except:
+            futil.log(f'{self.commandName} Failed to fire preview event:\n{traceback.format_exc()}')
+
+    def onQuietPeriodElapsed(self, args: adsk.core.CustomEventArgs):
+        with self.lock:
+            if not self.isPending or self.command is None:
+                return
+            self.isPending = False
+            self.timer = None
+        futil.log(f'{self.commandName} Inputs settled, updating preview')
+        self.command.doExecutePreview()
@@ -0,0 +1,359 @@
+"""
+Runs the geometry generators against the recording adsk stand-in and reports how many sketches,
+features, combine operations and topology queries each case needs, plus the Python side time.
+Exits with a non-zero status when a count grows past the budget stored in featureBudgets.json,
+or when one of the geometry checks fails.
+
+    python tools/benchmark.py [--filter baseplate] [--repeat 3] [--update-budgets]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import traceback
+
+import bootstrap
+
+bootstrap.install()
+
+import adsk.core, adsk.fusion
+from adsk.recording import recorder
+
+const = bootstrap.importModule('lib.gridfinityUtils.const')
+baseBodyCache = bootstrap.importModule('lib.gridfinityUtils.baseBodyCache')
+baseGenerator = bootstrap.importModule('lib.gridfinityUtils.baseGenerator')
+baseplateGenerator = bootstrap.importModule('lib.gridfinityUtils.baseplateGenerator')
+compartmentUtils = bootstrap.importModule('lib.gridfinityUtils.compartmentUtils')
+binBodyGenerator = bootstrap.importModule('lib.gridfinityUtils.binBodyGenerator')
+binBodyLipGenerator = bootstrap.importModule('lib.gridfinityUtils.binBodyLipGenerator')
+directBodyGenerator = bootstrap.importModule('lib.gridfinityUtils.directBodyGenerator')
+from GridfinityGenerator.lib.gridfinityUtils.baseGeneratorInput import BaseGeneratorInput
+from GridfinityGenerator.lib.gridfinityUtils.baseplateGeneratorInput import BaseplateGeneratorInput
+from GridfinityGenerator.lib.gridfinityUtils.binBodyGeneratorInput import BinBodyGeneratorInput, BinBodyCompartmentDefinition
+from GridfinityGenerator.lib.gridfinityUtils.binBodyLipGeneratorInput import BinBodyLipGeneratorInput
+from GridfinityGenerator.lib.gridfinityUtils.binGeneratorInput import BinGeneratorInput
+
+BUDGETS_FILE_PATH = os.path.join(bootstrap.TOOLS_FOLDER_PATH, 'featureBudgets.json')
+BUDGET_CATEGORIES = ['sketches', 'sketchCurves', 'features', 'combine', 'topologyQueries', 'constructionGeometry', 'temporaryBRep']
+
+class BenchmarkCase():
+    def __init__(self, name: str, run, prepare=None):
+        self.name = name
+        self.run = run
+        # runs before the counts are reset, in its own component and with the same cache folder
+        self.prepare = prepare
+
+def binBodyInput(binWidth: int, binLength: int, binHeight: int) -> BinBodyGeneratorInput:
+    input = BinBodyGeneratorInput()
+    input.baseWidth = const.DIMENSION_DEFAULT_WIDTH_UNIT
+    input.baseLength = const.DIMENSION_DEFAULT_WIDTH_UNIT
+    input.heightUnit = const.DIMENSION_DEFAULT_HEIGHT_UNIT
+    input.xyClearance = const.BIN_XY_CLEARANCE
+    input.binWidth = binWidth
+    input.binLength = binLength
+    input.binHeight = binHeight
+    input.binCornerFilletRadius = const.BIN_CORNER_FILLET_RADIUS - const.BIN_XY_CLEARANCE
+    input.hasTab = False
+    input.tabWidth = binWidth
+    input.compartmentsByX = 1
+    input.compartmentsByY = 1
+    input.compartments = binBodyGenerator.uniformCompartments(1, 1)
+    return input
+
+def plainBin(binWidth: int, binLength: int, binHeight: int):
+    return lambda component: binBodyGenerator.createGridfinityBinBody(binBodyInput(binWidth, binLength, binHeight), component)
+
+def featuredBin(binWidth: int, binLength: int, binHeight: int):
+    def run(component: adsk.fusion.Component):
+        input = binBodyInput(binWidth, binLength, binHeight)
+        input.hasLip = True
+        input.hasLipNotches = True
+        input.hasScoop = True
+        input.hasTab = True
+        return binBodyGenerator.createGridfinityBinBody(input, component)
+    return run
+
+def compartmentBin(binWidth: int, binLength: int, binHeight: int, isUniform: bool, isSimplified: bool = False):
+    def run(component: adsk.fusion.Component):
+        input = binBodyInput(binWidth, binLength, binHeight)
+        input.isSimplified = isSimplified
+        input.compartmentsByX = binWidth
+        input.compartmentsByY = binLength
+        if isUniform:
+            input.compartments = binBodyGenerator.uniformCompartments(binWidth, binLength)
+        else:
+            input.compartments = [
+                BinBodyCompartmentDefinition(0, 0, binWidth, 1),
+                BinBodyCompartmentDefinition(0, 1, 1, binLength - 1, input.heightUnit * 2),
+                BinBodyCompartmentDefinition(1, 1, binWidth - 1, binLength - 1),
+            ]
+        return binBodyGenerator.createGridfinityBinBody(input, component)
+    return run
+
+def basePatternInput(component: adsk.fusion.Component) -> BaseGeneratorInput:
+    input = BaseGeneratorInput()
+    input.originPoint = component.originConstructionPoint.geometry
+    input.baseWidth = const.DIMENSION_DEFAULT_WIDTH_UNIT
+    input.baseLength = const.DIMENSION_DEFAULT_WIDTH_UNIT
+    input.xyClearance = const.BIN_XY_CLEARANCE
+    input.hasScrewHoles = True
+    input.hasMagnetCutouts = True
+    return input
+
+def basePattern(basesX: int, basesY: int):
+    return lambda component: baseGenerator.createBaseBodyPattern(basePatternInput(component), basesX, basesY, component)
+
+def fastBasePattern(basesX: int, basesY: int):
+    return lambda component: baseGenerator.createBaseBodyPatternFromBRep(basePatternInput(component), basesX, basesY, component)
+
+def baseplateInput(plateWidth: int, plateLength: int, isSkeletonized: bool, hasConnectionHoles: bool) -> BaseplateGeneratorInput:
+    input = BaseplateGeneratorInput()
+    input.baseWidth = const.DIMENSION_DEFAULT_WIDTH_UNIT
+    input.baseLength = const.DIMENSION_DEFAULT_WIDTH_UNIT
+    input.baseplateWidth = plateWidth
+    input.baseplateLength = plateLength
+    input.hasExtendedBottom = isSkeletonized
+    input.hasSkeletonizedBottom = isSkeletonized
+    input.hasMagnetCutouts = isSkeletonized
+    input.hasScrewHoles = isSkeletonized
+    input.hasPadding = False
+    input.paddingLeft = 0
+    input.paddingTop = 0
+    input.paddingRight = 0
+    input.paddingBottom = 0
+    input.hasConnectionHoles = hasConnectionHoles
+    return input
+
+def baseplate(plateWidth: int, plateLength: int, isSkeletonized: bool, hasConnectionHoles: bool):
+    return lambda component: baseplateGenerator.createGridfinityBaseplate(baseplateInput(plateWidth, plateLength, isSkeletonized, hasConnectionHoles), component)
+
+def binLip(binWidth: int, binLength: int, hasLipNotches: bool):
+    def run(component: adsk.fusion.Component):
+        input = BinBodyLipGeneratorInput()
+        input.baseWidth = const.DIMENSION_DEFAULT_WIDTH_UNIT
+        input.baseLength = const.DIMENSION_DEFAULT_WIDTH_UNIT
+        input.binWidth = binWidth
+        input.binLength = binLength
+        input.xyClearance = const.BIN_XY_CLEARANCE
+        input.binCornerFilletRadius = const.BIN_CORNER_FILLET_RADIUS - const.BIN_XY_CLEARANCE
+        input.hasLipNotches = hasLipNotches
+        input.origin = adsk.core.Point3D.create(0, 0, 0)
+        return binBodyLipGenerator.createGridfinityBinBodyLip(input, component)
+    return run
+
+def directBin(binWidth: int, binLength: int, binHeight: int):
+    def run(component: adsk.fusion.Component):
+        input = BinGeneratorInput()
+        input.baseInput = BaseGeneratorInput()
+        input.baseInput.originPoint = adsk.core.Point3D.create(-const.BIN_XY_CLEARANCE, -const.BIN_XY_CLEARANCE, 0)
+        input.baseInput.baseWidth = const.DIMENSION_DEFAULT_WIDTH_UNIT
+        input.baseInput.baseLength = const.DIMENSION_DEFAULT_WIDTH_UNIT
+        input.baseInput.xyClearance = const.BIN_XY_CLEARANCE
+        input.baseInput.hasScrewHoles = True
+        input.baseInput.hasMagnetCutouts = True
+        input.binBodyInput = binBodyInput(binWidth, binLength, binHeight)
+        input.binBodyInput.hasLip = True
+        input.binBodyInput.hasTab = True
+        return directBodyGenerator.createGridfinityBinDirect(input, component)
+    return run
+
+def directBaseplate(plateWidth: int, plateLength: int):
+    return lambda component: directBodyGenerator.createGridfinityBaseplateDirect(baseplateInput(plateWidth, plateLength, True, True), component)
+
+CASES = [
+    BenchmarkCase('binBody/plain/1x1x3', plainBin(1, 1, 3)),
+    BenchmarkCase('binBody/plain/2x3x6', plainBin(2, 3, 6)),
+    BenchmarkCase('binBody/plain/6x6x6', plainBin(6, 6, 6)),
+    BenchmarkCase('binBody/lipScoopTab/1x1x3', featuredBin(1, 1, 3)),
+    BenchmarkCase('binBody/lipScoopTab/3x2x6', featuredBin(3, 2, 6)),
+    BenchmarkCase('binBody/compartments/uniform/3x3x6', compartmentBin(3, 3, 6, True)),
+    BenchmarkCase('binBody/compartments/uniform/simplified/3x3x6', compartmentBin(3, 3, 6, True, True)),
+    BenchmarkCase('binBody/compartments/custom/3x3x6', compartmentBin(3, 3, 6, False)),
+    BenchmarkCase('basePattern/1x1', basePattern(1, 1)),
+    BenchmarkCase('basePattern/3x3', basePattern(3, 3)),
+    BenchmarkCase('basePattern/8x8', basePattern(8, 8)),
+    BenchmarkCase('basePattern/fast/cold/3x3', fastBasePattern(3, 3)),
+    BenchmarkCase('basePattern/fast/cold/8x8', fastBasePattern(8, 8)),
+    BenchmarkCase('basePattern/fast/warm/3x3', fastBasePattern(3, 3), fastBasePattern(1, 1)),
+    BenchmarkCase('basePattern/fast/warm/8x8', fastBasePattern(8, 8), fastBasePattern(1, 1)),
+    BenchmarkCase('baseplate/light/2x2', baseplate(2, 2, False, False)),
+    BenchmarkCase('baseplate/skeletonized/2x2', baseplate(2, 2, True, True)),
+    BenchmarkCase('baseplate/skeletonized/6x6', baseplate(6, 6, True, True)),
+    BenchmarkCase('baseplate/skeletonized/10x10', baseplate(10, 10, True, True)),
+    BenchmarkCase('baseplate/skeletonized/20x20', baseplate(20, 20, True, True)),
+    BenchmarkCase('binLip/2x2', binLip(2, 2, False)),
+    BenchmarkCase('binLip/notches/4x3', binLip(4, 3, True)),
+    BenchmarkCase('direct/bin/3x2x6', directBin(3, 2, 6)),
+    BenchmarkCase('direct/baseplate/skeletonized/6x6', directBaseplate(6, 6)),
+]
+
+class Check():
+    def __init__(self, name: str, run):
+        self.name = name
+        self.run = run
+
+def checkScoopMergeKeepsRows():
+    # the two right compartments share the rows of the tall left one, but neither spans both of them
+    compartments = [
+        BinBodyCompartmentDefinition(0, 0, 1, 2),
+        BinBodyCompartmentDefinition(1, 0, 1, 1),
+        BinBodyCompartmentDefinition(1, 1, 1, 1),
+    ]
+    groups = compartmentUtils.mergeCompartments(compartments, False)
+    spans = sorted([(compartment.positionX, compartment.positionY, compartment.width, compartment.length) for compartment in group] for group in groups)
+    assert spans == [[(0, 0, 1, 2)], [(1, 0, 1, 1)], [(1, 1, 1, 1)]], f'unexpected groups {spans}'
+
+def checkMergeAlongRows():
+    compartments = [
+        BinBodyCompartmentDefinition(0, 0, 1, 1),
+        BinBodyCompartmentDefinition(1, 0, 1, 1),
+        BinBodyCompartmentDefinition(0, 1, 2, 1),
+    ]
+    groups = compartmentUtils.mergeCompartments(compartments, False)
+    assert sorted(len(group) for group in groups) == [1, 2], f'unexpected group sizes {[len(group) for group in groups]}'
+
+def checkMergedCompartmentsKeepFillets():
+    # divider walls of merged groups are plain boxes, full builds have to get the fillets of separate compartment cutouts
+    def build(isUniform: bool) -> tuple[int, int]:
+        dividerWallCalls = []
+        createDividerWalls = binBodyGenerator.createDividerWalls
+        binBodyGenerator.createDividerWalls = lambda *args: dividerWallCalls.append(args) or createDividerWalls(*args)
+        recorder.reset()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                compartmentBin(3, 3, 6, isUniform)(adsk.fusion.Component('Check'))
+        finally:
+            binBodyGenerator.createDividerWalls = createDividerWalls
+        return (recorder.snapshot()['features'].get('FilletFeatures.add', 0), len(dividerWallCalls))
+
+    merged = [build(isUniform) for isUniform in [True, False]]
+    mergeCompartments = compartmentUtils.mergeCompartments
+    compartmentUtils.mergeCompartments = lambda compartments, canMergeAlongY = True: [[compartment] for compartment in compartments]
+    try:
+        separate = [build(isUniform) for isUniform in [True, False]]
+    finally:
+        compartmentUtils.mergeCompartments = mergeCompartments
+    assert merged == separate, f'(fillet features, divider wall groups) {merged} differ from separate compartments {separate}'
+
+def checkWarmBaseCacheBuildsNoBase():
+    # a cache hit only adds the copies as one base feature, nothing of the base unit itself is rebuilt
+    with tempfile.TemporaryDirectory() as cacheFolder:
+        baseBodyCache.BASE_BODY_CACHE_FOLDER_PATH = cacheFolder
+        with contextlib.redirect_stdout(io.StringIO()):
+            fastBasePattern(1, 1)(adsk.fusion.Component('Cold'))
+            recorder.reset()
+            fastBasePattern(3, 3)(adsk.fusion.Component('Warm'))
+    operations = recorder.snapshot()
+    baseBuildingFeatures = {name: count for [name, count] in operations.get('features', {}).items() if name != 'BaseFeatures.add'}
+    assert baseBuildingFeatures == {}, f'warm cache run built base features {baseBuildingFeatures}'
+    assert recorder.total('sketches') == 0, f'warm cache run added {recorder.total("sketches")} sketches'
+    assert operations.get('temporaryBRep', {}).get('createFromFile', 0) == 1, 'warm cache run didn\'t load the cached base body'
+
+CHECKS = [
+    Check('compartments/scoopMergeKeepsRows', checkScoopMergeKeepsRows),
+    Check('compartments/mergeAlongRows', checkMergeAlongRows),
+    Check('compartments/mergedCompartmentsKeepFillets', checkMergedCompartmentsKeepFillets),
+    Check('basePattern/warmCacheBuildsNoBase', checkWarmBaseCacheBuildsNoBase),
+]
+
+def runCase(case: BenchmarkCase, repeat: int) -> dict:
+    bestTime = None
+    counts = None
+    for _ in range(repeat):
+        # every run starts from an empty component and a cold base body cache
+        with tempfile.TemporaryDirectory() as cacheFolder:
+            baseBodyCache.BASE_BODY_CACHE_FOLDER_PATH = cacheFolder
+            directBodyGenerator.bodyCache.clear()
+            if case.prepare is not None:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    case.prepare(adsk.fusion.Component('Prepare'))
+            component = adsk.fusion.Component('Benchmark')
+            recorder.reset()
+            log = io.StringIO()
+            startTime = time.perf_counter()
+            with contextlib.redirect_stdout(log):
+                case.run(component)
+            elapsed = time.perf_counter() - startTime
+        bestTime = elapsed if bestTime is None else min(bestTime, elapsed)
+        counts = recorder.totals()
+    return {'counts': counts, 'milliseconds': bestTime * 1000, 'operations': recorder.snapshot()}
+
+def loadBudgets() -> dict:
+    if not os.path.exists(BUDGETS_FILE_PATH):
+        return {}
+    with open(BUDGETS_FILE_PATH) as file:
+        return json.load(file)
+
+def writeBudgets(results: dict):
+    budgets = loadBudgets()
+    for caseName, result in results.items():
+        budgets[caseName] = {category: result['counts'].get(category, 0) for category in BUDGET_CATEGORIES}
+    with open(BUDGETS_FILE_PATH, 'w') as file:
+        json.dump(dict(sorted(budgets.items())), file, indent=4)
+        file.write('\n')
+
+def printTable(results: dict, budgets: dict):
+    columns = BUDGET_CATEGORIES + ['unmodeled']
+    nameWidth = max(len(name) for name in results.keys())
+    print(' '.join([f'{"case":<{nameWidth}}'] + [f'{column[:12]:>12}' for column in columns] + [f'{"ms":>9}']))
+    for caseName, result in results.items():
+        cells = []
+        for column in columns:
+            count = result['counts'].get(column, 0)
+            budget = budgets.get(caseName, {}).get(column)
+            marker = '!' if budget is not None and count > budget else ' '
+            cells.append(f'{count:>11}{marker}')
+        print(' '.join([f'{caseName:<{nameWidth}}'] + cells + [f'{result["milliseconds"]:>9.1f}']))
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', default='', help='only run cases whose name contains this text')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per case, the fastest one is reported')
+    parser.add_argument('--update-budgets', action='store_true', help='store the current counts as the new budgets')
+    parser.add_argument('--json', help='also write the full results, including per operation counts, to this file')
+    arguments = parser.parse_args()
+
+    results = {}
+    failures = []
+    for check in [check for check in CHECKS if arguments.filter in check.name]:
+        try:
+            check.run()
+        except:
+            failures.append(f'{check.name} check failed:\n{traceback.format_exc()}')
+    for case in [case for case in CASES if arguments.filter in case.name]:
+        try:
+            results[case.name] = runCase(case, max(1, arguments.repeat))
+        except:
+            failures.append(f'{case.name} failed to generate:\n{traceback.format_exc()}')
+
+    budgets = loadBudgets()
+    if len(results) > 0:
+        printTable(results, budgets)
+    if arguments.json:
+        with open(arguments.json, 'w') as file:
+            json.dump(results, file, indent=4)
+
+    if arguments.update_budgets:
+        writeBudgets(results)
+        print(f'Budgets written to {BUDGETS_FILE_PATH}')
+    else:
+        for caseName, result in results.items():
+            if not caseName in budgets:
+                print(f'{caseName} has no budget yet, run with --update-budgets to record it')
+                continue
+            for category in BUDGET_CATEGORIES:
+                count = result['counts'].get(category, 0)
+                budget = budgets[caseName].get(category, 0)
+                if count > budget:
+                    failures.append(f'{caseName}: {category} went up from {budget} to {count}')
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if len(failures) > 0 else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
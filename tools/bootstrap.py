@@ -0,0 +1,26 @@
+import importlib
+import os
+import sys
+import types
+
+TOOLS_FOLDER_PATH = os.path.dirname(os.path.abspath(__file__))
+REPO_FOLDER_PATH = os.path.dirname(TOOLS_FOLDER_PATH)
+STUBS_FOLDER_PATH = os.path.join(TOOLS_FOLDER_PATH, 'stubs')
+PACKAGE_NAME = 'GridfinityGenerator'
+
+def install():
+    """
+    Makes the add-in importable outside of Fusion: the recording adsk stand-in goes first on the path
+    and the repository is registered as the GridfinityGenerator package so relative imports resolve
+    """
+    if not STUBS_FOLDER_PATH in sys.path:
+        sys.path.insert(0, STUBS_FOLDER_PATH)
+    if not PACKAGE_NAME in sys.modules:
+        package = types.ModuleType(PACKAGE_NAME)
+        package.__path__ = [REPO_FOLDER_PATH]
+        package.__file__ = os.path.join(REPO_FOLDER_PATH, '__init__.py')
+        sys.modules[PACKAGE_NAME] = package
+
+def importModule(name: str):
+    install()
+    return importlib.import_module(f'{PACKAGE_NAME}.{name}')
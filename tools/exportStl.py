@@ -0,0 +1,133 @@
+"""
+Writes a binary STL or a 3MF for every part of a batch manifest without Fusion. Meshes come from the plain
+python mesher in printMeshGenerator, so they are ready to slice but lack the cosmetic features of the CAD model.
+Parts are spread over worker processes, each of them reuses base cell and lip meshes between its parts.
+Files are streamed one sub-mesh at a time, 3MF files store repeated base cells once.
+
+    python tools/exportStl.py parts.json [--output stl] [--format 3mf] [--jobs 8] [--check]
+"""
+import argparse
+import concurrent.futures
+import os
+import sys
+import time
+import traceback
+
+import bootstrap
+
+batchManifest = bootstrap.importModule('lib.gridfinityUtils.batchManifest')
+printMeshGenerator = bootstrap.importModule('lib.gridfinityUtils.printMeshGenerator')
+stlUtils = bootstrap.importModule('lib.gridfinityUtils.stlUtils')
+threeMfUtils = bootstrap.importModule('lib.gridfinityUtils.threeMfUtils')
+
+WRITERS = {
+    'stl': stlUtils.StlStreamWriter,
+    '3mf': threeMfUtils.ThreeMfStreamWriter,
+}
+
+# state of the current worker process, set once by initWorker so parts are sent as plain indices
+workerItems = []
+workerOutputFolder = ''
+workerFormat = 'stl'
+workerCheck = False
+
+def initWorker(manifestPath: str, outputFolder: str, format: str, check: bool):
+    global workerItems, workerOutputFolder, workerFormat, workerCheck
+    workerItems = batchManifest.loadManifest(manifestPath)
+    workerOutputFolder = outputFolder
+    workerFormat = format
+    workerCheck = check
+
+class CheckedWriter():
+    """
+    Passes sub-meshes on to the writer and checks every distinct one: each of them is a set of closed shells,
+    and no inner loop of a cap or tube reaches outside of its outer loop
+    """
+    def __init__(self, writer):
+        self.writer = writer
+        self.checkedMeshes = {}
+        self.openEdges = 0
+        self.escapedPoints = 0
+
+    def addMesh(self, mesh, offset=(0, 0, 0)):
+        if not id(mesh) in self.checkedMeshes:
+            self.checkedMeshes[id(mesh)] = mesh
+            self.openEdges += mesh.openEdgeCount()
+            self.escapedPoints += mesh.escapedPointCount()
+        self.writer.addMesh(mesh, offset)
+
+def addMesh(item, targetMesh):
+    if item.partType == batchManifest.PART_TYPE_BASEPLATE:
+        printMeshGenerator.addGridfinityBaseplatePrintMesh(item.input, targetMesh)
+    else:
+        printMeshGenerator.addGridfinityBinPrintMesh(item.input, targetMesh)
+
+def exportItem(index: int) -> dict:
+    item = workerItems[index]
+    startTime = time.perf_counter()
+    try:
+        path = os.path.join(workerOutputFolder, f'{batchManifest.getExportFileName(item.name)}.{workerFormat}')
+        with WRITERS[workerFormat](path, item.name) as writer:
+            targetMesh = CheckedWriter(writer) if workerCheck else writer
+            addMesh(item, targetMesh)
+        result = {
+            'name': item.name,
+            'triangles': writer.triangleCount,
+            'openEdges': targetMesh.openEdges if workerCheck else 0,
+            'escapedPoints': targetMesh.escapedPoints if workerCheck else 0,
+        }
+    except:
+        result = {'name': item.name, 'error': traceback.format_exc()}
+    result['seconds'] = time.perf_counter() - startTime
+    return result
+
+def exportItems(itemCount: int, jobs: int, initArgs: tuple):
+    if jobs <= 1:
+        initWorker(*initArgs)
+        for index in range(itemCount):
+            yield exportItem(index)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, initializer=initWorker, initargs=initArgs) as executor:
+        # small chunks keep the workers busy until the end, the order of the parts doesn't matter
+        chunkSize = max(1, min(16, itemCount // (jobs * 8)))
+        yield from executor.map(exportItem, range(itemCount), chunksize=chunkSize)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('manifest', help='JSON or CSV manifest, the same format as the Gridfinity batch command uses')
+    parser.add_argument('--output', help='folder for the exported files, defaults to "<manifest name> <format>" next to the manifest')
+    parser.add_argument('--format', choices=list(WRITERS), default='stl', help='file format, 3mf stores repeated base cells once')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='worker processes, defaults to the number of cores')
+    parser.add_argument('--check', action='store_true', help='fail when a mesh has open or inconsistently oriented edges, or intersects itself where an inner loop leaves its outer loop')
+    parser.add_argument('--quiet', action='store_true', help='only print the summary')
+    arguments = parser.parse_args()
+
+    manifestPath = os.path.abspath(arguments.manifest)
+    outputFolder = arguments.output or os.path.join(os.path.dirname(manifestPath), f'{os.path.splitext(os.path.basename(manifestPath))[0]} {arguments.format}')
+    os.makedirs(outputFolder, exist_ok=True)
+    itemCount = len(batchManifest.loadManifest(manifestPath))
+    jobs = max(1, min(arguments.jobs, itemCount))
+
+    failures = []
+    triangleCount = 0
+    startTime = time.perf_counter()
+    for result in exportItems(itemCount, jobs, (manifestPath, outputFolder, arguments.format, arguments.check)):
+        if 'error' in result:
+            failures.append(f'{result["name"]} failed to generate:\n{result["error"]}')
+            continue
+        if result['openEdges'] > 0:
+            failures.append(f'{result["name"]}: {result["openEdges"]} open edges')
+        if result['escapedPoints'] > 0:
+            failures.append(f'{result["name"]}: {result["escapedPoints"]} inner loop points outside of their outer loop')
+        triangleCount += result['triangles']
+        if not arguments.quiet:
+            print(f'{result["name"]:<40} {result["triangles"]:>9} triangles {result["seconds"] * 1000:>9.1f} ms')
+    seconds = time.perf_counter() - startTime
+    print(f'{itemCount - len(failures)} of {itemCount} parts, {triangleCount} triangles in {seconds:.2f}s with {jobs} jobs: {itemCount / max(seconds, 1e-9):.1f} parts/s, files are in {outputFolder}')
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if len(failures) > 0 else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Plans the bin layout of every drawer in a manifest without Fusion. Prints the grid of each drawer with its coverage
+and can write the planned bins and baseplates as a plain batch manifest.
+
+    python tools/planDrawers.py drawers.json [--output parts.json] [--quiet]
+"""
+import argparse
+import json
+import sys
+import time
+
+import bootstrap
+
+batchManifest = bootstrap.importModule('lib.gridfinityUtils.batchManifest')
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('manifest', help='JSON manifest with a "drawers" list, the same format as the Gridfinity batch command uses')
+    parser.add_argument('--output', help='write the planned parts to this JSON manifest')
+    parser.add_argument('--quiet', action='store_true', help='only print the summary')
+    arguments = parser.parse_args()
+
+    with open(arguments.manifest) as manifestFile:
+        manifest = json.load(manifestFile)
+    defaults = manifest.get('defaults', {})
+    parts = list(manifest.get('parts', []))
+
+    failures = []
+    coveredCells = 0
+    totalCells = 0
+    startTime = time.perf_counter()
+    drawers = manifest.get('drawers', [])
+    for index, drawer in enumerate(drawers):
+        row = batchManifest.ManifestRow({**defaults, **drawer}, len(parts) + 1)
+        try:
+            plan = batchManifest.getDrawerPlan(row, index + 1)
+            parts += batchManifest.getDrawerParts(row, index + 1, plan)
+        except ValueError as err:
+            failures.append(str(err))
+            continue
+        coveredCells += plan.coveredCells
+        totalCells += plan.columns * plan.rows
+        if not arguments.quiet:
+            print(f'{plan.name}: {plan.columns}x{plan.rows} grid, {len(plan.placements)} bins, {plan.coverage * 100:.1f}% covered, padding {plan.paddingX * 10:.1f}x{plan.paddingY * 10:.1f}mm')
+            for line in plan.layout():
+                print(f'    {line}')
+    seconds = time.perf_counter() - startTime
+    print(f'{len(drawers) - len(failures)} of {len(drawers)} drawers planned in {seconds:.2f}s, {coveredCells} of {totalCells} cells covered')
+
+    if arguments.output:
+        with open(arguments.output, 'w') as outputFile:
+            json.dump({'defaults': defaults, 'parts': parts}, outputFile, indent=4)
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if len(failures) > 0 else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
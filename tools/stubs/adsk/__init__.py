@@ -0,0 +1,3 @@
+# Recording stand-in for the Fusion 360 API, lets generator code run on any machine with plain python.
+# Geometry is approximated with axis aligned boxes, which is enough for the topology queries the generators make.
+from .recording import recorder
@@ -0,0 +1,400 @@
+import math
+import re
+
+from .recording import recorder, Unmodeled
+
+class _PlaceholderType(type):
+    def __getattr__(cls, name: str):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        # enum members compare by name
+        return f'{cls.__name__}.{name}'
+
+def placeholderClass(name: str):
+    return _PlaceholderType(name, (), {})
+
+def __getattr__(name: str):
+    # type hints and enums that the stub doesn't model
+    if name.startswith('__'):
+        raise AttributeError(name)
+    placeholder = placeholderClass(name)
+    globals()[name] = placeholder
+    return placeholder
+
+class Base():
+    pass
+
+class Vector3D(Base):
+    def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0):
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    @staticmethod
+    def create(x: float = 0.0, y: float = 0.0, z: float = 0.0):
+        return Vector3D(x, y, z)
+
+    @property
+    def length(self) -> float:
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def add(self, other: 'Vector3D'):
+        self.x += other.x
+        self.y += other.y
+        self.z += other.z
+        return True
+
+    def subtract(self, other: 'Vector3D'):
+        self.x -= other.x
+        self.y -= other.y
+        self.z -= other.z
+        return True
+
+    def scaleBy(self, scale: float):
+        self.x *= scale
+        self.y *= scale
+        self.z *= scale
+        return True
+
+    def normalize(self):
+        length = self.length
+        if length > 0:
+            self.scaleBy(1 / length)
+        return True
+
+    def dotProduct(self, other: 'Vector3D') -> float:
+        return self.x * other.x + self.y * other.y + self.z * other.z
+
+    def crossProduct(self, other: 'Vector3D') -> 'Vector3D':
+        return Vector3D(
+            self.y * other.z - self.z * other.y,
+            self.z * other.x - self.x * other.z,
+            self.x * other.y - self.y * other.x,
+        )
+
+    def transformBy(self, matrix: 'Matrix3D'):
+        [self.x, self.y, self.z] = matrix.transformVector(self.asArray())
+        return True
+
+    def isEqualTo(self, other: 'Vector3D') -> bool:
+        return self.asArray() == other.asArray()
+
+    def copy(self) -> 'Vector3D':
+        return Vector3D(self.x, self.y, self.z)
+
+    def asArray(self) -> list[float]:
+        return [self.x, self.y, self.z]
+
+    def asPoint(self) -> 'Point3D':
+        return Point3D(self.x, self.y, self.z)
+
+class Point3D(Base):
+    def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0):
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    @staticmethod
+    def create(x: float = 0.0, y: float = 0.0, z: float = 0.0):
+        return Point3D(x, y, z)
+
+    def distanceTo(self, other: 'Point3D') -> float:
+        return math.sqrt((self.x - other.x) ** 2 + (self.y - other.y) ** 2 + (self.z - other.z) ** 2)
+
+    def isEqualTo(self, other: 'Point3D') -> bool:
+        return self.isEqualToByTolerance(other, 1e-10)
+
+    def isEqualToByTolerance(self, other: 'Point3D', tolerance: float) -> bool:
+        return self.distanceTo(other) <= tolerance
+
+    def translateBy(self, vector: Vector3D):
+        self.x += vector.x
+        self.y += vector.y
+        self.z += vector.z
+        return True
+
+    def transformBy(self, matrix: 'Matrix3D'):
+        [self.x, self.y, self.z] = matrix.transformPoint(self.asArray())
+        return True
+
+    def vectorTo(self, other: 'Point3D') -> Vector3D:
+        return Vector3D(other.x - self.x, other.y - self.y, other.z - self.z)
+
+    def setWithArray(self, coordinates: list[float]):
+        [self.x, self.y, self.z] = [float(value) for value in coordinates]
+        return True
+
+    def copy(self) -> 'Point3D':
+        return Point3D(self.x, self.y, self.z)
+
+    def asArray(self) -> list[float]:
+        return [self.x, self.y, self.z]
+
+    def asVector(self) -> Vector3D:
+        return Vector3D(self.x, self.y, self.z)
+
+class Matrix3D(Base):
+    def __init__(self):
+        self.setToIdentity()
+
+    @staticmethod
+    def create():
+        return Matrix3D()
+
+    def setToIdentity(self):
+        self.rows = [[1.0 if i == j else 0.0 for j in range(4)] for i in range(4)]
+        return True
+
+    @property
+    def translation(self) -> Vector3D:
+        return Vector3D(self.rows[0][3], self.rows[1][3], self.rows[2][3])
+
+    @translation.setter
+    def translation(self, value: Vector3D):
+        [self.rows[0][3], self.rows[1][3], self.rows[2][3]] = value.asArray()
+
+    def setToRotation(self, angle: float, axis: Vector3D, origin: Point3D):
+        direction = axis.copy()
+        direction.normalize()
+        [x, y, z] = direction.asArray()
+        cos = math.cos(angle)
+        sin = math.sin(angle)
+        rotation = [
+            [cos + x * x * (1 - cos), x * y * (1 - cos) - z * sin, x * z * (1 - cos) + y * sin],
+            [y * x * (1 - cos) + z * sin, cos + y * y * (1 - cos), y * z * (1 - cos) - x * sin],
+            [z * x * (1 - cos) - y * sin, z * y * (1 - cos) + x * sin, cos + z * z * (1 - cos)],
+        ]
+        center = origin.asArray()
+        self.setToIdentity()
+        for i in range(3):
+            self.rows[i][0:3] = rotation[i]
+            self.rows[i][3] = center[i] - sum(rotation[i][j] * center[j] for j in range(3))
+        return True
+
+    def transformBy(self, matrix: 'Matrix3D'):
+        self.rows = [[sum(matrix.rows[i][k] * self.rows[k][j] for k in range(4)) for j in range(4)] for i in range(4)]
+        return True
+
+    def transformPoint(self, coordinates: list[float]) -> list[float]:
+        return [sum(self.rows[i][j] * coordinates[j] for j in range(3)) + self.rows[i][3] for i in range(3)]
+
+    def transformVector(self, coordinates: list[float]) -> list[float]:
+        return [sum(self.rows[i][j] * coordinates[j] for j in range(3)) for i in range(3)]
+
+    def copy(self) -> 'Matrix3D':
+        matrix = Matrix3D()
+        matrix.rows = [list(row) for row in self.rows]
+        return matrix
+
+    def asArray(self) -> list[float]:
+        return [value for row in self.rows for value in row]
+
+class BoundingBox3D(Base):
+    def __init__(self, minPoint: Point3D, maxPoint: Point3D):
+        self.minPoint = minPoint.copy()
+        self.maxPoint = maxPoint.copy()
+
+    @staticmethod
+    def create(minPoint: Point3D, maxPoint: Point3D):
+        return BoundingBox3D(minPoint, maxPoint)
+
+    @staticmethod
+    def fromPoints(points: list[Point3D]) -> 'BoundingBox3D':
+        return BoundingBox3D(
+            Point3D(min(p.x for p in points), min(p.y for p in points), min(p.z for p in points)),
+            Point3D(max(p.x for p in points), max(p.y for p in points), max(p.z for p in points)),
+        )
+
+    def corners(self) -> list[Point3D]:
+        return [
+            Point3D(x, y, z)
+            for x in [self.minPoint.x, self.maxPoint.x]
+            for y in [self.minPoint.y, self.maxPoint.y]
+            for z in [self.minPoint.z, self.maxPoint.z]
+        ]
+
+    def expand(self, point: Point3D):
+        combined = BoundingBox3D.fromPoints([self.minPoint, self.maxPoint, point])
+        self.minPoint = combined.minPoint
+        self.maxPoint = combined.maxPoint
+        return True
+
+    def combine(self, other: 'BoundingBox3D'):
+        self.expand(other.minPoint)
+        self.expand(other.maxPoint)
+        return True
+
+    def contains(self, point: Point3D) -> bool:
+        return all(low <= value <= high for [low, value, high] in zip(self.minPoint.asArray(), point.asArray(), self.maxPoint.asArray()))
+
+    def intersects(self, other: 'BoundingBox3D') -> bool:
+        return all(
+            lowA <= highB and lowB <= highA
+            for [lowA, highA, lowB, highB] in zip(self.minPoint.asArray(), self.maxPoint.asArray(), other.minPoint.asArray(), other.maxPoint.asArray())
+        )
+
+    def copy(self) -> 'BoundingBox3D':
+        return BoundingBox3D(self.minPoint, self.maxPoint)
+
+class Plane(Base):
+    def __init__(self, origin: Point3D, uDirection: Vector3D, vDirection: Vector3D):
+        self.origin = origin.copy()
+        self.uDirection = uDirection.copy()
+        self.vDirection = vDirection.copy()
+
+    @property
+    def normal(self) -> Vector3D:
+        return self.uDirection.crossProduct(self.vDirection)
+
+    def offset(self, distance: float) -> 'Plane':
+        shift = self.normal
+        shift.scaleBy(distance)
+        origin = self.origin.copy()
+        origin.translateBy(shift)
+        return Plane(origin, self.uDirection, self.vDirection)
+
+    def copy(self) -> 'Plane':
+        return Plane(self.origin, self.uDirection, self.vDirection)
+
+class ValueInput(Base):
+    UNIT_SCALES = {'mm': 0.1, 'cm': 1.0, 'm': 100.0, 'in': 2.54, 'deg': math.pi / 180, 'rad': 1.0}
+
+    def __init__(self, realValue: float, stringValue: str = ''):
+        self.realValue = realValue
+        self.stringValue = stringValue
+
+    @staticmethod
+    def createByReal(value: float):
+        return ValueInput(float(value))
+
+    @staticmethod
+    def createByString(expression: str):
+        match = re.fullmatch(r'\s*([-+]?[0-9]*\.?[0-9]+)\s*([a-z]*)\s*', expression)
+        value = float(match.group(1)) * ValueInput.UNIT_SCALES.get(match.group(2), 1.0) if match else 0.0
+        return ValueInput(value, expression)
+
+    @property
+    def valueType(self):
+        return 'ValueTypes.StringValueType' if self.stringValue else 'ValueTypes.RealValueType'
+
+class ObjectCollection(Base):
+    def __init__(self, items: list = None):
+        self._items = list(items) if items is not None else []
+
+    @staticmethod
+    def create():
+        return ObjectCollection()
+
+    @property
+    def count(self) -> int:
+        return len(self._items)
+
+    def item(self, index: int):
+        return self._items[index] if 0 <= index < len(self._items) else None
+
+    def add(self, item) -> bool:
+        self._items.append(item)
+        return True
+
+    def removeByItem(self, item) -> bool:
+        if item in self._items:
+            self._items.remove(item)
+            return True
+        return False
+
+    def removeByIndex(self, index: int) -> bool:
+        del self._items[index]
+        return True
+
+    def contains(self, item) -> bool:
+        return item in self._items
+
+    def find(self, item, startIndex: int = 0) -> int:
+        return self._items.index(item, startIndex) if item in self._items[startIndex:] else -1
+
+    def clear(self):
+        self._items = []
+        return True
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+class Color(Base):
+    def __init__(self, red: int, green: int, blue: int, opacity: int):
+        [self.red, self.green, self.blue, self.opacity] = [red, green, blue, opacity]
+
+    @staticmethod
+    def create(red: int, green: int, blue: int, opacity: int):
+        return Color(red, green, blue, opacity)
+
+class UserInterface(Base):
+    def messageBox(self, text: str, *args, **kwargs):
+        recorder.record('ui', 'messageBox')
+        print(text)
+        return 0
+
+    def __getattr__(self, name: str):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        recorder.record('unmodeled', f'UserInterface.{name}')
+        return Unmodeled(f'UserInterface.{name}')
+
+class Application(Base):
+    _instance: 'Application' = None
+
+    def __init__(self):
+        self.userInterface = UserInterface()
+        self.activeProduct = None
+        self.version = 'stub'
+
+    @staticmethod
+    def get() -> 'Application':
+        if Application._instance is None:
+            Application._instance = Application()
+        return Application._instance
+
+    def log(self, message: str, level=None, logType=None):
+        return True
+
+    def __getattr__(self, name: str):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        recorder.record('unmodeled', f'Application.{name}')
+        return Unmodeled(f'Application.{name}')
+
+class OrientedBoundingBox3D(Base):
+    def __init__(self, centerPoint: Point3D, lengthDirection: Vector3D, widthDirection: Vector3D, length: float, width: float, height: float):
+        self.centerPoint = centerPoint.copy()
+        self.lengthDirection = lengthDirection.copy()
+        self.widthDirection = widthDirection.copy()
+        self.length = length
+        self.width = width
+        self.height = height
+
+    @staticmethod
+    def create(centerPoint: Point3D, lengthDirection: Vector3D, widthDirection: Vector3D, length: float, width: float, height: float):
+        return OrientedBoundingBox3D(centerPoint, lengthDirection, widthDirection, length, width, height)
+
+    @property
+    def heightDirection(self) -> Vector3D:
+        return self.lengthDirection.crossProduct(self.widthDirection)
+
+    def toBoundingBox(self) -> BoundingBox3D:
+        directions = [self.lengthDirection, self.widthDirection, self.heightDirection]
+        sizes = [self.length, self.width, self.height]
+        points = []
+        for signs in [(a, b, c) for a in (-1, 1) for b in (-1, 1) for c in (-1, 1)]:
+            point = self.centerPoint.copy()
+            for [sign, direction, size] in zip(signs, directions, sizes):
+                offset = direction.copy()
+                offset.normalize()
+                offset.scaleBy(sign * size / 2)
+                point.translateBy(offset)
+            points.append(point)
+        return BoundingBox3D.fromPoints(points)
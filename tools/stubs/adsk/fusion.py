@@ -0,0 +1,1441 @@
+import json
+import math
+
+from . import core
+from .core import Point3D, Vector3D, BoundingBox3D, ObjectCollection, ValueInput, placeholderClass
+from .recording import recorder, Unmodeled
+
+POINT_TOLERANCE = 1e-6
+
+def __getattr__(name: str):
+    # type hints and enums that the stub doesn't model
+    if name.startswith('__'):
+        raise AttributeError(name)
+    placeholder = placeholderClass(name)
+    globals()[name] = placeholder
+    return placeholder
+
+def realValue(value) -> float:
+    if isinstance(value, ValueInput):
+        return value.realValue
+    if isinstance(value, ModelParameter):
+        return value.value
+    return float(value)
+
+def asList(entities) -> list:
+    if entities is None:
+        return []
+    if isinstance(entities, (list, tuple, ObjectCollection)):
+        return list(entities)
+    return [entities]
+
+def dominantAxis(vector: Vector3D) -> tuple[int, int]:
+    coordinates = vector.asArray()
+    axis = max(range(3), key=lambda i: abs(coordinates[i]))
+    return (axis, 1 if coordinates[axis] >= 0 else -1)
+
+def boxFromBounds(lows: list[float], highs: list[float]) -> BoundingBox3D:
+    return BoundingBox3D(Point3D(*[min(a, b) for [a, b] in zip(lows, highs)]), Point3D(*[max(a, b) for [a, b] in zip(lows, highs)]))
+
+def unionBoxes(boxes: list[BoundingBox3D]) -> BoundingBox3D:
+    return BoundingBox3D.fromPoints([point for box in boxes for point in [box.minPoint, box.maxPoint]])
+
+def intersectBoxes(a: BoundingBox3D, b: BoundingBox3D) -> BoundingBox3D:
+    lows = [max(i, j) for [i, j] in zip(a.minPoint.asArray(), b.minPoint.asArray())]
+    highs = [min(i, j) for [i, j] in zip(a.maxPoint.asArray(), b.maxPoint.asArray())]
+    if any(low > high for [low, high] in zip(lows, highs)):
+        return None
+    return boxFromBounds(lows, highs)
+
+def transformBox(box: BoundingBox3D, transform: core.Matrix3D) -> BoundingBox3D:
+    return BoundingBox3D.fromPoints([Point3D(*transform.transformPoint(corner.asArray())) for corner in box.corners()])
+
+def mirrorBox(box: BoundingBox3D, plane: core.Plane) -> BoundingBox3D:
+    normal = plane.normal
+    normal.normalize()
+    points = []
+    for corner in box.corners():
+        distance = plane.origin.vectorTo(corner).dotProduct(normal)
+        shift = normal.copy()
+        shift.scaleBy(-2 * distance)
+        corner.translateBy(shift)
+        points.append(corner)
+    return BoundingBox3D.fromPoints(points)
+
+def pointGeometry(point) -> Point3D:
+    if isinstance(point, SketchPoint):
+        return point.worldGeometry
+    if isinstance(point, (ConstructionPoint, BRepVertex)):
+        return point.geometry.copy()
+    return point.copy()
+
+def planeOf(entity) -> core.Plane:
+    if isinstance(entity, (ConstructionPlane, BRepFace)):
+        return entity.geometry
+    if isinstance(entity, Profile):
+        return entity.parentSketch.plane.copy()
+    if isinstance(entity, core.Plane):
+        return entity.copy()
+    recorder.record('unmodeled', f'planeOf.{type(entity).__name__}')
+    return core.Plane(Point3D(), Vector3D(1, 0, 0), Vector3D(0, 1, 0))
+
+class ModelParameter():
+    def __init__(self, value: float):
+        self.value = value
+
+    @property
+    def expression(self) -> str:
+        return f'{self.value} cm'
+
+class Entity(core.Base):
+    _nextTempId = 1
+
+    def __init__(self, name: str = ''):
+        self.tempId = Entity._nextTempId
+        Entity._nextTempId += 1
+        self.name = name
+        self.isLightBulbOn = True
+        self.isValid = True
+
+    @staticmethod
+    def cast(entity):
+        return entity
+
+    @property
+    def entityToken(self) -> str:
+        return f'{type(self).__name__}/{self.tempId}'
+
+    def deleteMe(self):
+        recorder.record('deletions', type(self).__name__)
+        self.isValid = False
+        return True
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        recorder.record('unmodeled', f'{type(self).__name__}.{name}')
+        return Unmodeled(f'{type(self).__name__}.{name}')
+
+# construction geometry
+
+class ConstructionPoint(Entity):
+    def __init__(self, geometry: Point3D):
+        super().__init__()
+        self.geometry = geometry.copy()
+
+class ConstructionPlane(Entity):
+    def __init__(self, plane: core.Plane, component: 'Component' = None):
+        super().__init__()
+        self._plane = plane.copy()
+        self.parent = component
+
+    @property
+    def geometry(self) -> core.Plane:
+        return self._plane.copy()
+
+class ConstructionPlaneInput(Entity):
+    def __init__(self):
+        super().__init__()
+        self._plane: core.Plane = None
+
+    def setByOffset(self, planarEntity, offset):
+        self._plane = planeOf(planarEntity).offset(realValue(offset))
+        return True
+
+    def setByPlane(self, plane: core.Plane):
+        self._plane = plane.copy()
+        return True
+
+class ConstructionPlanes(Entity):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+        self._items: list[ConstructionPlane] = []
+
+    def createInput(self, occurrenceForCreation=None) -> ConstructionPlaneInput:
+        return ConstructionPlaneInput()
+
+    def add(self, input: ConstructionPlaneInput) -> ConstructionPlane:
+        recorder.record('constructionGeometry', 'ConstructionPlanes.add')
+        plane = ConstructionPlane(input._plane if input._plane is not None else self._component.xYConstructionPlane.geometry, self._component)
+        self._items.append(plane)
+        return plane
+
+    @property
+    def count(self) -> int:
+        return len(self._items)
+
+    def item(self, index: int):
+        return self._items[index]
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+class AxisGeometry():
+    def __init__(self, origin: Point3D, direction: Vector3D):
+        self.origin = origin.copy()
+        self.direction = direction.copy()
+
+class ConstructionAxis(Entity):
+    def __init__(self, origin: Point3D, direction: Vector3D):
+        super().__init__()
+        self._axis = AxisGeometry(origin, direction)
+
+    @property
+    def geometry(self) -> AxisGeometry:
+        return AxisGeometry(self._axis.origin, self._axis.direction)
+
+class ConstructionAxisInput(Entity):
+    def __init__(self):
+        super().__init__()
+        self._axis = AxisGeometry(Point3D(), Vector3D(0, 0, 1))
+
+    def setByTwoPlanes(self, planarEntityOne, planarEntityTwo):
+        planes = [planeOf(planarEntityOne), planeOf(planarEntityTwo)]
+        normals = [plane.normal for plane in planes]
+        direction = normals[0].crossProduct(normals[1])
+        # point on both planes closest to the model origin
+        rows = [normals[0].asArray(), normals[1].asArray(), direction.asArray()]
+        values = [planes[0].origin.asVector().dotProduct(normals[0]), planes[1].origin.asVector().dotProduct(normals[1]), 0]
+        determinant = self.determinant(rows)
+        if abs(determinant) < 1e-12:
+            return False
+        coordinates = []
+        for i in range(3):
+            replaced = [list(row) for row in rows]
+            for j in range(3):
+                replaced[j][i] = values[j]
+            coordinates.append(self.determinant(replaced) / determinant)
+        self._axis = AxisGeometry(Point3D(*coordinates), direction)
+        return True
+
+    def setByNormalToFaceAtPoint(self, face, point):
+        self._axis = AxisGeometry(pointGeometry(point), planeOf(face).normal)
+        return True
+
+    def setByLine(self, line):
+        self._axis = AxisGeometry(line.origin, line.direction)
+        return True
+
+    def setByEdge(self, edge: 'BRepEdge'):
+        self._axis = AxisGeometry(edge.startVertex.geometry, edge.startVertex.geometry.vectorTo(edge.endVertex.geometry))
+        return True
+
+    @staticmethod
+    def determinant(rows: list[list[float]]) -> float:
+        [[a, b, c], [d, e, f], [g, h, i]] = rows
+        return a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+
+class ConstructionAxes(Entity):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._items: list[ConstructionAxis] = []
+
+    def createInput(self, occurrenceForCreation=None) -> ConstructionAxisInput:
+        return ConstructionAxisInput()
+
+    def add(self, input: ConstructionAxisInput) -> ConstructionAxis:
+        recorder.record('constructionGeometry', 'ConstructionAxes.add')
+        axis = ConstructionAxis(input._axis.origin, input._axis.direction)
+        self._items.append(axis)
+        return axis
+
+# sketches
+
+class SketchPoint(Entity):
+    def __init__(self, sketch: 'Sketch', geometry: Point3D):
+        super().__init__()
+        self.parentSketch = sketch
+        self.geometry = Point3D(geometry.x, geometry.y, 0)
+        self.isFixed = False
+
+    @property
+    def worldGeometry(self) -> Point3D:
+        return self.parentSketch.sketchToModelSpace(self.geometry)
+
+class SketchCurve(Entity):
+    def __init__(self, sketch: 'Sketch'):
+        super().__init__()
+        self.parentSketch = sketch
+        self.isConstruction = False
+        self.isFixed = False
+
+    def sketchPoints(self) -> list[SketchPoint]:
+        return []
+
+    def samplePoints(self) -> list[Point3D]:
+        return [point.geometry for point in self.sketchPoints()]
+
+    @property
+    def boundingBox(self) -> BoundingBox3D:
+        return BoundingBox3D.fromPoints([self.parentSketch.sketchToModelSpace(point) for point in self.samplePoints()])
+
+    def deleteMe(self):
+        if self in self.parentSketch._curves:
+            self.parentSketch._curves.remove(self)
+        return super().deleteMe()
+
+class SketchLine(SketchCurve):
+    def __init__(self, sketch: 'Sketch', startSketchPoint: SketchPoint, endSketchPoint: SketchPoint):
+        super().__init__(sketch)
+        self.startSketchPoint = startSketchPoint
+        self.endSketchPoint = endSketchPoint
+
+    def sketchPoints(self) -> list[SketchPoint]:
+        return [self.startSketchPoint, self.endSketchPoint]
+
+    @property
+    def length(self) -> float:
+        return self.startSketchPoint.geometry.distanceTo(self.endSketchPoint.geometry)
+
+class SketchCircle(SketchCurve):
+    def __init__(self, sketch: 'Sketch', centerSketchPoint: SketchPoint, radius: float):
+        super().__init__(sketch)
+        self.centerSketchPoint = centerSketchPoint
+        self.radius = radius
+
+    def samplePoints(self) -> list[Point3D]:
+        center = self.centerSketchPoint.geometry
+        return [Point3D(center.x + dx * self.radius, center.y + dy * self.radius, 0) for [dx, dy] in [(-1, 0), (1, 0), (0, -1), (0, 1)]]
+
+    @property
+    def length(self) -> float:
+        return 2 * math.pi * self.radius
+
+class SketchArc(SketchCurve):
+    def __init__(self, sketch: 'Sketch', centerSketchPoint: SketchPoint, startSketchPoint: SketchPoint, endSketchPoint: SketchPoint, radius: float):
+        super().__init__(sketch)
+        self.centerSketchPoint = centerSketchPoint
+        self.startSketchPoint = startSketchPoint
+        self.endSketchPoint = endSketchPoint
+        self.radius = radius
+
+    def sketchPoints(self) -> list[SketchPoint]:
+        return [self.startSketchPoint, self.endSketchPoint]
+
+    def samplePoints(self) -> list[Point3D]:
+        # midpoint of the shorter arc between the ends is good enough for bounding boxes
+        center = self.centerSketchPoint.geometry
+        middle = self.startSketchPoint.geometry.asVector()
+        middle.add(self.endSketchPoint.geometry.asVector())
+        middle.scaleBy(0.5)
+        middle.subtract(center.asVector())
+        if middle.length > 0:
+            middle.normalize()
+            middle.scaleBy(self.radius)
+        middle.add(center.asVector())
+        return [self.startSketchPoint.geometry, self.endSketchPoint.geometry, middle.asPoint()]
+
+class SketchCurveView(ObjectCollection):
+    curveType = SketchCurve
+
+    def __init__(self, sketch: 'Sketch'):
+        self.parentSketch = sketch
+
+    @property
+    def _items(self):
+        return [curve for curve in self.parentSketch._curves if isinstance(curve, self.curveType)]
+
+    def sketchPoint(self, point) -> SketchPoint:
+        if isinstance(point, SketchPoint):
+            return point
+        return SketchPoint(self.parentSketch, point)
+
+    def addCurve(self, name: str, curve: SketchCurve):
+        recorder.record('sketchCurves', name)
+        self.parentSketch._curves.append(curve)
+        return curve
+
+class SketchLineList(ObjectCollection):
+    pass
+
+class SketchLines(SketchCurveView):
+    curveType = SketchLine
+
+    def addByTwoPoints(self, startPoint, endPoint) -> SketchLine:
+        return self.addCurve('SketchLines.addByTwoPoints', SketchLine(self.parentSketch, self.sketchPoint(startPoint), self.sketchPoint(endPoint)))
+
+    def addTwoPointRectangle(self, pointOne, pointTwo) -> SketchLineList:
+        recorder.record('sketchCurves', 'SketchLines.addTwoPointRectangle')
+        [x0, y0] = [pointOne.geometry.x, pointOne.geometry.y] if isinstance(pointOne, SketchPoint) else [pointOne.x, pointOne.y]
+        [x1, y1] = [pointTwo.geometry.x, pointTwo.geometry.y] if isinstance(pointTwo, SketchPoint) else [pointTwo.x, pointTwo.y]
+        corners = [SketchPoint(self.parentSketch, Point3D(x, y, 0)) for [x, y] in [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]]
+        lines = [SketchLine(self.parentSketch, corners[i], corners[(i + 1) % 4]) for i in range(4)]
+        self.parentSketch._curves.extend(lines)
+        return SketchLineList(lines)
+
+    def addCenterPointRectangle(self, centerPoint, cornerPoint) -> SketchLineList:
+        center = pointGeometry(centerPoint) if isinstance(centerPoint, SketchPoint) else centerPoint
+        corner = pointGeometry(cornerPoint) if isinstance(cornerPoint, SketchPoint) else cornerPoint
+        return self.addTwoPointRectangle(Point3D(2 * center.x - corner.x, 2 * center.y - corner.y, 0), corner)
+
+class SketchCircles(SketchCurveView):
+    curveType = SketchCircle
+
+    def addByCenterRadius(self, centerPoint, radius: float) -> SketchCircle:
+        return self.addCurve('SketchCircles.addByCenterRadius', SketchCircle(self.parentSketch, self.sketchPoint(centerPoint), radius))
+
+class SketchArcs(SketchCurveView):
+    curveType = SketchArc
+
+    def addByCenterStartSweep(self, centerPoint, startPoint, sweepAngle: float) -> SketchArc:
+        center = self.sketchPoint(centerPoint)
+        start = self.sketchPoint(startPoint)
+        radiusVector = center.geometry.vectorTo(start.geometry)
+        cos = math.cos(sweepAngle)
+        sin = math.sin(sweepAngle)
+        end = Point3D(center.geometry.x + radiusVector.x * cos - radiusVector.y * sin, center.geometry.y + radiusVector.x * sin + radiusVector.y * cos, 0)
+        return self.addCurve('SketchArcs.addByCenterStartSweep', SketchArc(self.parentSketch, center, start, SketchPoint(self.parentSketch, end), radiusVector.length))
+
+    def addFillet(self, firstEntity: SketchLine, firstEntityPoint: Point3D, secondEntity: SketchLine, secondEntityPoint: Point3D, radius: float) -> SketchArc:
+        # trims both lines at the tangent points, the same way Fusion does
+        ends = []
+        for [line, pickPoint] in [(firstEntity, firstEntityPoint), (secondEntity, secondEntityPoint)]:
+            isStart = line.startSketchPoint.geometry.distanceTo(pickPoint) <= line.endSketchPoint.geometry.distanceTo(pickPoint)
+            corner = (line.startSketchPoint if isStart else line.endSketchPoint).geometry
+            other = (line.endSketchPoint if isStart else line.startSketchPoint).geometry
+            direction = corner.vectorTo(other)
+            direction.normalize()
+            ends.append((line, isStart, corner, direction))
+        [[_, _, corner, directionOne], [_, _, _, directionTwo]] = ends
+        angle = math.acos(max(-1.0, min(1.0, directionOne.dotProduct(directionTwo))))
+        if angle < 1e-9 or abs(angle - math.pi) < 1e-9:
+            recorder.record('unmodeled', 'SketchArcs.addFillet.parallel')
+            return self.addCurve('SketchArcs.addFillet', SketchArc(self.parentSketch, SketchPoint(self.parentSketch, corner), SketchPoint(self.parentSketch, corner), SketchPoint(self.parentSketch, corner), radius))
+        tangentDistance = radius / math.tan(angle / 2)
+        tangentPoints = []
+        for [line, isStart, _, direction] in ends:
+            offset = direction.copy()
+            offset.scaleBy(tangentDistance)
+            point = corner.copy()
+            point.translateBy(offset)
+            sketchPoint = SketchPoint(self.parentSketch, point)
+            if isStart:
+                line.startSketchPoint = sketchPoint
+            else:
+                line.endSketchPoint = sketchPoint
+            tangentPoints.append(sketchPoint)
+        bisector = directionOne.copy()
+        bisector.add(directionTwo)
+        bisector.normalize()
+        bisector.scaleBy(radius / math.sin(angle / 2))
+        center = corner.copy()
+        center.translateBy(bisector)
+        return self.addCurve('SketchArcs.addFillet', SketchArc(self.parentSketch, SketchPoint(self.parentSketch, center), tangentPoints[0], tangentPoints[1], radius))
+
+class SketchCurves(SketchCurveView):
+    def __init__(self, sketch: 'Sketch'):
+        super().__init__(sketch)
+        self.sketchLines = SketchLines(sketch)
+        self.sketchCircles = SketchCircles(sketch)
+        self.sketchArcs = SketchArcs(sketch)
+
+class RecordingCollection(Entity):
+    """
+    Constraints and dimensions don't affect the approximated geometry, every add* call is only counted
+    """
+    category = ''
+
+    def __init__(self, sketch: 'Sketch'):
+        super().__init__()
+        self.parentSketch = sketch
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def __getattr__(self, name: str):
+        if not name.startswith('add'):
+            return super().__getattr__(name)
+        def add(*args, **kwargs):
+            recorder.record(self.category, f'{type(self).__name__}.{name}')
+            self._count += 1
+            return SketchRelation(self.parentSketch)
+        return add
+
+class SketchRelation(Entity):
+    def __init__(self, sketch: 'Sketch'):
+        super().__init__()
+        self.parentSketch = sketch
+        self.parameter = ModelParameter(0)
+
+class GeometricConstraints(RecordingCollection):
+    category = 'constraints'
+
+class SketchDimensions(RecordingCollection):
+    category = 'dimensions'
+
+class Profile(Entity):
+    def __init__(self, sketch: 'Sketch', curves: list[SketchCurve]):
+        super().__init__()
+        self.parentSketch = sketch
+        self._curves = curves
+        self._sketchBox = BoundingBox3D.fromPoints([point for curve in curves for point in curve.samplePoints()])
+
+    @property
+    def boundingBox(self) -> BoundingBox3D:
+        return BoundingBox3D.fromPoints([self.parentSketch.sketchToModelSpace(point) for point in self._sketchBox.corners()])
+
+    def areaProperties(self, accuracy=None):
+        area = (self._sketchBox.maxPoint.x - self._sketchBox.minPoint.x) * (self._sketchBox.maxPoint.y - self._sketchBox.minPoint.y)
+        if len(self._curves) == 1 and isinstance(self._curves[0], SketchCircle):
+            area = math.pi * self._curves[0].radius ** 2
+        return AreaProperties(area)
+
+class AreaProperties():
+    def __init__(self, area: float):
+        self.area = area
+
+class Profiles(ObjectCollection):
+    pass
+
+class Sketch(Entity):
+    def __init__(self, component: 'Component', planarEntity):
+        super().__init__()
+        self.parentComponent = component
+        self.referencePlane = planarEntity
+        self.plane = planeOf(planarEntity)
+        self.isComputeDeferred = False
+        self.areProfilesShown = True
+        self.isVisible = True
+        self._curves: list[SketchCurve] = []
+        self.sketchCurves = SketchCurves(self)
+        self.originPoint = SketchPoint(self, Point3D())
+        self.geometricConstraints = GeometricConstraints(self)
+        self.sketchDimensions = SketchDimensions(self)
+        if isinstance(planarEntity, BRepFace):
+            # face edges are projected automatically
+            for edge in planarEntity.edges:
+                self.projectEdge(edge)
+
+    @property
+    def origin(self) -> Point3D:
+        return self.plane.origin.copy()
+
+    @property
+    def xDirection(self) -> Vector3D:
+        return self.plane.uDirection.copy()
+
+    @property
+    def yDirection(self) -> Vector3D:
+        return self.plane.vDirection.copy()
+
+    def modelToSketchSpace(self, point: Point3D) -> Point3D:
+        offset = self.plane.origin.vectorTo(point)
+        return Point3D(offset.dotProduct(self.plane.uDirection), offset.dotProduct(self.plane.vDirection), offset.dotProduct(self.plane.normal))
+
+    def sketchToModelSpace(self, point: Point3D) -> Point3D:
+        result = self.plane.origin.copy()
+        for [value, direction] in [(point.x, self.plane.uDirection), (point.y, self.plane.vDirection), (point.z, self.plane.normal)]:
+            offset = direction.copy()
+            offset.scaleBy(value)
+            result.translateBy(offset)
+        return result
+
+    def projectEdge(self, edge: 'BRepEdge') -> SketchLine:
+        recorder.record('sketchCurves', 'Sketch.project')
+        points = [SketchPoint(self, self.modelToSketchSpace(vertex.geometry)) for vertex in [edge.startVertex, edge.endVertex]]
+        line = SketchLine(self, points[0], points[1])
+        self._curves.append(line)
+        return line
+
+    def project(self, entity) -> ObjectCollection:
+        if isinstance(entity, BRepEdge):
+            return ObjectCollection([self.projectEdge(entity)])
+        if isinstance(entity, (BRepFace, BRepBody)):
+            return ObjectCollection([self.projectEdge(edge) for edge in entity.edges])
+        recorder.record('unmodeled', f'Sketch.project.{type(entity).__name__}')
+        return ObjectCollection()
+
+    def offset(self, curves, directionPoint: Point3D, offset: float) -> ObjectCollection:
+        recorder.record('sketchCurves', 'Sketch.offset')
+        points = [point for curve in asList(curves) for point in curve.samplePoints()]
+        box = BoundingBox3D.fromPoints(points)
+        direction = self.modelToSketchSpace(directionPoint)
+        isOutward = not (box.minPoint.x < direction.x < box.maxPoint.x and box.minPoint.y < direction.y < box.maxPoint.y)
+        distance = abs(offset) if isOutward else -abs(offset)
+        lines = self.sketchCurves.sketchLines.addTwoPointRectangle(
+            Point3D(box.minPoint.x - distance, box.minPoint.y - distance, 0),
+            Point3D(box.maxPoint.x + distance, box.maxPoint.y + distance, 0),
+        )
+        return ObjectCollection(list(lines))
+
+    @property
+    def profiles(self) -> Profiles:
+        recorder.record('profiles', 'Sketch.profiles')
+        return Profiles([Profile(self, curves) for curves in self.closedLoops()])
+
+    def closedLoops(self) -> list[list[SketchCurve]]:
+        def pointKey(point: Point3D):
+            return (round(point.x / POINT_TOLERANCE), round(point.y / POINT_TOLERANCE))
+
+        loops: list[list[SketchCurve]] = []
+        curves = [curve for curve in self._curves if not curve.isConstruction]
+        openCurves = []
+        for curve in curves:
+            if isinstance(curve, SketchCircle):
+                loops.append([curve])
+            else:
+                openCurves.append(curve)
+
+        # connected groups of open curves, closed when every end point is shared by an even number of curves
+        parents = list(range(len(openCurves)))
+        def find(i):
+            while parents[i] != i:
+                parents[i] = parents[parents[i]]
+                i = parents[i]
+            return i
+        endPoints: dict[tuple, list[int]] = {}
+        for i, curve in enumerate(openCurves):
+            for point in curve.sketchPoints():
+                endPoints.setdefault(pointKey(point.geometry), []).append(i)
+        for indices in endPoints.values():
+            for index in indices[1:]:
+                parents[find(index)] = find(indices[0])
+        groups: dict[int, list[int]] = {}
+        for i in range(len(openCurves)):
+            groups.setdefault(find(i), []).append(i)
+        for indices in sorted(groups.values()):
+            keys = [key for key, members in endPoints.items() if members[0] in indices]
+            if all(len(endPoints[key]) % 2 == 0 for key in keys):
+                loops.append([openCurves[i] for i in indices])
+        return loops
+
+class Sketches(Entity):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+        self._items: list[Sketch] = []
+
+    def add(self, planarEntity, occurrenceForCreation=None) -> Sketch:
+        recorder.record('sketches', 'Sketches.add')
+        sketch = Sketch(self._component, planarEntity)
+        self._items.append(sketch)
+        return sketch
+
+    @property
+    def count(self) -> int:
+        return len(self._items)
+
+    def item(self, index: int) -> Sketch:
+        return self._items[index]
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+# boundary representation, every body is approximated by its axis aligned bounding box
+
+class BRepVertex(Entity):
+    def __init__(self, geometry: Point3D):
+        super().__init__()
+        self.geometry = geometry.copy()
+
+class EdgeEvaluator():
+    def __init__(self, edge: 'BRepEdge'):
+        self.edge = edge
+
+    def getEndPoints(self):
+        return (True, self.edge.startVertex.geometry.copy(), self.edge.endVertex.geometry.copy())
+
+class BRepEdge(Entity):
+    def __init__(self, body: 'BRepBody', startVertex: BRepVertex, endVertex: BRepVertex):
+        super().__init__()
+        self.body = body
+        self.startVertex = startVertex
+        self.endVertex = endVertex
+        self._faces: list['BRepFace'] = []
+
+    @property
+    def boundingBox(self) -> BoundingBox3D:
+        return BoundingBox3D.fromPoints([self.startVertex.geometry, self.endVertex.geometry])
+
+    @property
+    def length(self) -> float:
+        return self.startVertex.geometry.distanceTo(self.endVertex.geometry)
+
+    @property
+    def evaluator(self) -> EdgeEvaluator:
+        return EdgeEvaluator(self)
+
+    @property
+    def faces(self) -> 'BRepFaces':
+        recorder.record('topologyQueries', 'BRepEdge.faces')
+        return BRepFaces(self._faces)
+
+    @property
+    def tangentiallyConnectedEdges(self) -> 'BRepEdges':
+        recorder.record('topologyQueries', 'BRepEdge.tangentiallyConnectedEdges')
+        return BRepEdges(self._faces[0]._edges if len(self._faces) > 0 else [self])
+
+class BRepFace(Entity):
+    def __init__(self, body: 'BRepBody', axis: int, side: int, box: BoundingBox3D, edges: list[BRepEdge]):
+        super().__init__()
+        self.body = body
+        self._axis = axis
+        self._side = side
+        self._box = box
+        self._edges = edges
+        for edge in edges:
+            edge._faces.append(self)
+
+    @property
+    def boundingBox(self) -> BoundingBox3D:
+        return self._box.copy()
+
+    @property
+    def area(self) -> float:
+        sizes = [high - low for [low, high] in zip(self._box.minPoint.asArray(), self._box.maxPoint.asArray())]
+        return math.prod([size for i, size in enumerate(sizes) if i != self._axis])
+
+    @property
+    def geometry(self) -> core.Plane:
+        sign = 1 if self._side == 1 else -1
+        frames = {
+            (2, 1): ((1, 0, 0), (0, 1, 0)),
+            (2, -1): ((1, 0, 0), (0, -1, 0)),
+            (0, 1): ((0, 1, 0), (0, 0, 1)),
+            (0, -1): ((0, 1, 0), (0, 0, -1)),
+            (1, 1): ((0, 0, 1), (1, 0, 0)),
+            (1, -1): ((1, 0, 0), (0, 0, 1)),
+        }
+        [u, v] = frames[(self._axis, sign)]
+        origin = [0.0, 0.0, 0.0]
+        origin[self._axis] = self._box.minPoint.asArray()[self._axis]
+        return core.Plane(Point3D(*origin), Vector3D(*u), Vector3D(*v))
+
+    @property
+    def pointOnFace(self) -> Point3D:
+        center = self._box.minPoint.asVector()
+        center.add(self._box.maxPoint.asVector())
+        center.scaleBy(0.5)
+        return center.asPoint()
+
+    @property
+    def edges(self) -> 'BRepEdges':
+        recorder.record('topologyQueries', 'BRepFace.edges')
+        return BRepEdges(self._edges)
+
+    @property
+    def vertices(self) -> ObjectCollection:
+        recorder.record('topologyQueries', 'BRepFace.vertices')
+        return ObjectCollection(list({id(vertex): vertex for edge in self._edges for vertex in [edge.startVertex, edge.endVertex]}.values()))
+
+    @property
+    def tangentiallyConnectedFaces(self) -> 'BRepFaces':
+        recorder.record('topologyQueries', 'BRepFace.tangentiallyConnectedFaces')
+        return BRepFaces([self])
+
+class BRepFaces(ObjectCollection):
+    pass
+
+class BRepEdges(ObjectCollection):
+    pass
+
+class BRepBody(Entity):
+    def __init__(self, box: BoundingBox3D, component: 'Component' = None, isSolid: bool = True, name: str = 'Body'):
+        super().__init__(name)
+        self._box = box.copy()
+        self._revision = 1
+        self._topology = None
+        self.parentComponent = component
+        self.isSolid = isSolid
+        self.isVisible = True
+
+    @property
+    def isTemporary(self) -> bool:
+        return self.parentComponent is None
+
+    @property
+    def boundingBox(self) -> BoundingBox3D:
+        return self._box.copy()
+
+    @property
+    def revisionId(self) -> str:
+        return f'{self.tempId}.{self._revision}'
+
+    @property
+    def volume(self) -> float:
+        return math.prod([high - low for [low, high] in zip(self._box.minPoint.asArray(), self._box.maxPoint.asArray())])
+
+    @property
+    def area(self) -> float:
+        return sum(face.area for face in self.topology()[0])
+
+    def setBox(self, box: BoundingBox3D):
+        self._box = box.copy()
+        self._revision += 1
+        self._topology = None
+
+    def topology(self) -> tuple[list[BRepFace], list[BRepEdge], list[BRepVertex]]:
+        if self._topology is None:
+            bounds = [self._box.minPoint.asArray(), self._box.maxPoint.asArray()]
+            vertices = {
+                sides: BRepVertex(Point3D(*[bounds[side][axis] for axis, side in enumerate(sides)]))
+                for sides in [(i, j, k) for i in (0, 1) for j in (0, 1) for k in (0, 1)]
+            }
+            edges: dict[tuple[int, int, int], BRepEdge] = {}
+            for axis in range(3):
+                for sides in [(i, j, k) for i in (0, 1) for j in (0, 1) for k in (0, 1) if (i, j, k)[axis] == 0]:
+                    endSides = list(sides)
+                    endSides[axis] = 1
+                    edges[(axis,) + tuple(side for i, side in enumerate(sides) if i != axis)] = BRepEdge(self, vertices[sides], vertices[tuple(endSides)])
+            faces = []
+            for axis in range(3):
+                for side in (0, 1):
+                    faceBounds = [list(bounds[0]), list(bounds[1])]
+                    faceBounds[0][axis] = faceBounds[1][axis] = bounds[side][axis]
+                    faceEdges = []
+                    for [edgeKey, edge] in edges.items():
+                        edgeAxis = edgeKey[0]
+                        otherAxes = [i for i in range(3) if i != edgeAxis]
+                        if edgeAxis != axis and edgeKey[1 + otherAxes.index(axis)] == side:
+                            faceEdges.append(edge)
+                    faces.append(BRepFace(self, axis, side, boxFromBounds(faceBounds[0], faceBounds[1]), faceEdges))
+            self._topology = (faces, list(edges.values()), list(vertices.values()))
+        return self._topology
+
+    def face(self, axis: int, side: int) -> BRepFace:
+        return self.topology()[0][axis * 2 + side]
+
+    @property
+    def faces(self) -> BRepFaces:
+        recorder.record('topologyQueries', 'BRepBody.faces')
+        return BRepFaces(self.topology()[0])
+
+    @property
+    def edges(self) -> BRepEdges:
+        recorder.record('topologyQueries', 'BRepBody.edges')
+        return BRepEdges(self.topology()[1])
+
+    @property
+    def vertices(self) -> ObjectCollection:
+        recorder.record('topologyQueries', 'BRepBody.vertices')
+        return ObjectCollection(self.topology()[2])
+
+    def copyToComponent(self, target) -> 'BRepBody':
+        recorder.record('bodies', 'BRepBody.copyToComponent')
+        component = target.component if isinstance(target, Occurrence) else target
+        return component.bRepBodies.addBody(self._box)
+
+    def deleteMe(self):
+        if self.parentComponent is not None:
+            self.parentComponent.bRepBodies.removeBody(self)
+        return super().deleteMe()
+
+class BRepBodies(ObjectCollection):
+    def __init__(self, component: 'Component' = None, items: list[BRepBody] = None):
+        super().__init__(items)
+        self._component = component
+
+    def addBody(self, box: BoundingBox3D, name: str = None, isSolid: bool = True) -> BRepBody:
+        recorder.record('bodies', 'created')
+        if name is None:
+            self._component._bodyCounter += 1
+            name = f'Body{self._component._bodyCounter}'
+        body = BRepBody(box, self._component, isSolid, name)
+        self._items.append(body)
+        return body
+
+    def removeBody(self, body: BRepBody):
+        if body in self._items:
+            self._items.remove(body)
+
+    def add(self, body: BRepBody, baseFeature: 'BaseFeature' = None) -> BRepBody:
+        recorder.record('bodies', 'BRepBodies.add')
+        addedBody = self.addBody(body.boundingBox, isSolid=body.isSolid)
+        if baseFeature is not None:
+            baseFeature._bodies.append(addedBody)
+        return addedBody
+
+    def itemByName(self, name: str) -> BRepBody:
+        return next((body for body in self._items if body.name == name), None)
+
+# features
+
+class Feature(Entity):
+    def __init__(self, component: 'Component', bodies: list[BRepBody] = None):
+        super().__init__()
+        self.parentComponent = component
+        self._bodies = list(bodies) if bodies is not None else []
+        self.healthState = 'FeatureHealthStates.HealthyFeatureHealthState'
+
+    @property
+    def bodies(self) -> BRepBodies:
+        return BRepBodies(self.parentComponent, [body for body in self._bodies if body.isValid])
+
+    @property
+    def faces(self) -> BRepFaces:
+        recorder.record('topologyQueries', f'{type(self).__name__}.faces')
+        return BRepFaces([face for body in self._bodies if body.isValid for face in body.topology()[0]])
+
+class FeatureCollection(Entity):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._component = component
+        self._items: list[Feature] = []
+
+    def addFeature(self, feature: Feature) -> Feature:
+        recorder.record('features', f'{type(self).__name__}.add')
+        self._items.append(feature)
+        return feature
+
+    @property
+    def count(self) -> int:
+        return len(self._items)
+
+    def item(self, index: int) -> Feature:
+        return self._items[index]
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+class FeatureInput(Entity):
+    """
+    Feature inputs accept any property, only the ones the stub understands are used
+    """
+    pass
+
+def bodiesOf(entities) -> list[BRepBody]:
+    bodies = []
+    for entity in asList(entities):
+        if isinstance(entity, BRepBody):
+            bodies.append(entity)
+        elif isinstance(entity, (BRepFace, BRepEdge)):
+            bodies.append(entity.body)
+        elif isinstance(entity, Feature):
+            bodies = bodies + list(entity.bodies)
+    return list({id(body): body for body in bodies}.values())
+
+class DistanceExtentDefinition(Entity):
+    def __init__(self, distance):
+        super().__init__()
+        self.distance = ModelParameter(realValue(distance))
+
+    @staticmethod
+    def create(distance) -> 'DistanceExtentDefinition':
+        return DistanceExtentDefinition(distance)
+
+class ExtrudeFeatureInput(FeatureInput):
+    def __init__(self, profile, operation):
+        super().__init__()
+        self.profile = profile
+        self.operation = operation
+        self.participantBodies = []
+        self.isSolid = True
+        self.extent = (0.0, 0.0)
+        self.endDistance = 0.0
+
+    def setOneSideExtent(self, extent: DistanceExtentDefinition, direction, taperAngle=None):
+        distance = realValue(extent.distance)
+        if str(direction).endswith('NegativeExtentDirection'):
+            distance = -distance
+        self.extent = (min(0.0, distance), max(0.0, distance))
+        self.endDistance = distance
+        return True
+
+    def setTwoSidesExtent(self, sideOneExtent: DistanceExtentDefinition, sideTwoExtent: DistanceExtentDefinition, sideOneTaperAngle=None, sideTwoTaperAngle=None):
+        self.extent = (-realValue(sideTwoExtent.distance), realValue(sideOneExtent.distance))
+        self.endDistance = self.extent[1]
+        return True
+
+    def setDistanceExtent(self, isSymmetric: bool, distance):
+        value = realValue(distance)
+        self.extent = (-value / 2, value / 2) if isSymmetric else (min(0.0, value), max(0.0, value))
+        self.endDistance = self.extent[1] if isSymmetric else value
+        return True
+
+    def setSymmetricExtent(self, distance, isFullLength: bool, taperAngle=None):
+        value = realValue(distance)
+        self.extent = (-value / 2, value / 2) if isFullLength else (-value, value)
+        self.endDistance = self.extent[1]
+        return True
+
+class ExtrudeFeature(Feature):
+    def __init__(self, component: 'Component', bodies: list[BRepBody], axis: int, endSide: int):
+        super().__init__(component, bodies)
+        self._axis = axis
+        self._endSide = endSide
+
+    @property
+    def endFaces(self) -> BRepFaces:
+        recorder.record('topologyQueries', 'ExtrudeFeature.endFaces')
+        return BRepFaces([body.face(self._axis, self._endSide) for body in self._bodies if body.isValid])
+
+    @property
+    def startFaces(self) -> BRepFaces:
+        recorder.record('topologyQueries', 'ExtrudeFeature.startFaces')
+        return BRepFaces([body.face(self._axis, 1 - self._endSide) for body in self._bodies if body.isValid])
+
+    @property
+    def sideFaces(self) -> BRepFaces:
+        recorder.record('topologyQueries', 'ExtrudeFeature.sideFaces')
+        return BRepFaces([face for body in self._bodies if body.isValid for face in body.topology()[0] if face._axis != self._axis])
+
+class ExtrudeFeatures(FeatureCollection):
+    def createInput(self, profile, operation) -> ExtrudeFeatureInput:
+        return ExtrudeFeatureInput(profile, operation)
+
+    def addSimple(self, profile, distance, operation) -> ExtrudeFeature:
+        input = self.createInput(profile, operation)
+        input.setDistanceExtent(False, distance)
+        return self.add(input)
+
+    def add(self, input: ExtrudeFeatureInput) -> ExtrudeFeature:
+        regions = asList(input.profile)
+        if len(regions) == 0 or any(region is None for region in regions):
+            raise RuntimeError('3 : invalid profile for extrude')
+        plane = planeOf(regions[0])
+        region = unionBoxes([item.boundingBox for item in regions])
+        [axis, sign] = dominantAxis(plane.normal)
+        lows = region.minPoint.asArray()
+        highs = region.maxPoint.asArray()
+        base = (lows[axis] + highs[axis]) / 2
+        [lows[axis], highs[axis]] = sorted([base + sign * input.extent[0], base + sign * input.extent[1]])
+        sweptBox = boxFromBounds(lows, highs)
+        endSide = 1 if sign * input.endDistance >= 0 else 0
+        bodies = applyOperation(self._component, input.operation, sweptBox, bodiesOf(input.participantBodies))
+        return self.addFeature(ExtrudeFeature(self._component, bodies, axis, endSide))
+
+def applyOperation(component: 'Component', operation, box: BoundingBox3D, participantBodies: list[BRepBody]) -> list[BRepBody]:
+    operationName = str(operation)
+    targets = participantBodies if len(participantBodies) > 0 else [body for body in component.bRepBodies if body.boundingBox.intersects(box)]
+    if operationName.endswith('NewBodyFeatureOperation') or len(targets) == 0:
+        return [component.bRepBodies.addBody(box)]
+    if operationName.endswith('JoinFeatureOperation'):
+        targets[0].setBox(unionBoxes([targets[0].boundingBox, box]))
+        return [targets[0]]
+    if operationName.endswith('IntersectFeatureOperation'):
+        for target in targets:
+            intersection = intersectBoxes(target.boundingBox, box)
+            if intersection is not None:
+                target.setBox(intersection)
+        return targets
+    for target in targets:
+        target.setBox(target.boundingBox)
+    return targets
+
+class FilletEdgeSetInputs(Entity):
+    def __init__(self, input: 'FeatureInput'):
+        super().__init__()
+        self._input = input
+
+    def addConstantRadiusEdgeSet(self, edges, radius, isTangentChain: bool):
+        self._input._edges = self._input._edges + asList(edges)
+        return Entity()
+
+    def addVariableRadiusEdgeSet(self, edges, startRadius, endRadius, isTangentChain: bool):
+        return self.addConstantRadiusEdgeSet(edges, startRadius, isTangentChain)
+
+class FilletFeatureInput(FeatureInput):
+    def __init__(self):
+        super().__init__()
+        self._edges = []
+        self.edgeSetInputs = FilletEdgeSetInputs(self)
+        self.isRollingBallCorner = True
+        self.isTangentChain = True
+
+class FilletFeatures(FeatureCollection):
+    def createInput(self) -> FilletFeatureInput:
+        return FilletFeatureInput()
+
+    def add(self, input: FilletFeatureInput) -> Feature:
+        if len(input._edges) == 0:
+            raise RuntimeError('3 : no edges selected for fillet')
+        for body in bodiesOf(input._edges):
+            body.setBox(body.boundingBox)
+        return self.addFeature(Feature(self._component, bodiesOf(input._edges)))
+
+class ChamferEdgeSets(Entity):
+    def __init__(self, input: 'FeatureInput'):
+        super().__init__()
+        self._input = input
+
+    def addEqualDistanceChamferEdgeSet(self, edges, distance, isTangentChain: bool):
+        self._input._edges = self._input._edges + asList(edges)
+        return Entity()
+
+    def addTwoDistancesChamferEdgeSet(self, edges, distanceOne, distanceTwo, isFlipped: bool, isTangentChain: bool):
+        return self.addEqualDistanceChamferEdgeSet(edges, distanceOne, isTangentChain)
+
+    def addDistanceAndAngleChamferEdgeSet(self, edges, distance, angle, isFlipped: bool, isTangentChain: bool):
+        return self.addEqualDistanceChamferEdgeSet(edges, distance, isTangentChain)
+
+class ChamferFeatureInput(FeatureInput):
+    def __init__(self, edges=None):
+        super().__init__()
+        self._edges = asList(edges)
+        self.chamferEdgeSets = ChamferEdgeSets(self)
+
+    def setToEqualDistance(self, distance):
+        return True
+
+class ChamferFeatures(FeatureCollection):
+    def createInput(self, edges, isTangentChain: bool) -> ChamferFeatureInput:
+        return ChamferFeatureInput(edges)
+
+    def createInput2(self) -> ChamferFeatureInput:
+        return ChamferFeatureInput()
+
+    def add(self, input: ChamferFeatureInput) -> Feature:
+        if len(input._edges) == 0:
+            raise RuntimeError('3 : no edges selected for chamfer')
+        for body in bodiesOf(input._edges):
+            body.setBox(body.boundingBox)
+        return self.addFeature(Feature(self._component, bodiesOf(input._edges)))
+
+class CombineFeatureInput(FeatureInput):
+    def __init__(self, targetBody: BRepBody, toolBodies):
+        super().__init__()
+        self.targetBody = targetBody
+        self.toolBodies = toolBodies
+        self.operation = 'FeatureOperations.JoinFeatureOperation'
+        self.isKeepToolBodies = False
+        self.isNewComponent = False
+
+class CombineFeatures(FeatureCollection):
+    def createInput(self, targetBody: BRepBody, toolBodies) -> CombineFeatureInput:
+        return CombineFeatureInput(targetBody, toolBodies)
+
+    def add(self, input: CombineFeatureInput) -> Feature:
+        operationName = str(input.operation).split('.')[-1]
+        recorder.record('combine', operationName)
+        tools = bodiesOf(input.toolBodies)
+        target = input.targetBody
+        if len(tools) == 0:
+            raise RuntimeError('3 : no tool bodies for combine')
+        if operationName == 'JoinFeatureOperation':
+            target.setBox(unionBoxes([target.boundingBox] + [tool.boundingBox for tool in tools]))
+        elif operationName == 'IntersectFeatureOperation':
+            intersection = target.boundingBox
+            for tool in tools:
+                intersection = intersectBoxes(intersection, tool.boundingBox) if intersection is not None else None
+            if intersection is None:
+                # curved geometry may still overlap where the boxes don't, keep the target as it is
+                recorder.record('unmodeled', 'CombineFeatures.emptyIntersection')
+                intersection = target.boundingBox
+            target.setBox(intersection)
+        else:
+            target.setBox(target.boundingBox)
+        if not input.isKeepToolBodies:
+            for tool in tools:
+                tool.deleteMe()
+        return self.addFeature(Feature(self._component, [target] + (tools if input.isKeepToolBodies else [])))
+
+class PatternFeatureInput(FeatureInput):
+    def __init__(self, inputEntities, directionOneEntity=None, quantityOne=None, distanceOne=None, patternDistanceType=None):
+        super().__init__()
+        self.inputEntities = inputEntities
+        self.directionOneEntity = directionOneEntity
+        self.quantityOne = quantityOne if quantityOne is not None else ValueInput.createByReal(1)
+        self.distanceOne = distanceOne if distanceOne is not None else ValueInput.createByReal(0)
+        self.directionTwoEntity = None
+        self.quantityTwo = ValueInput.createByReal(1)
+        self.distanceTwo = ValueInput.createByReal(0)
+        self.patternDistanceType = patternDistanceType
+        self.axis = None
+        self.quantity = ValueInput.createByReal(1)
+        self.totalAngle = ValueInput.createByString('360 deg')
+        self.isSymmetric = False
+
+def directionOf(entity, default: Vector3D) -> Vector3D:
+    if isinstance(entity, ConstructionAxis):
+        direction = entity.geometry.direction
+    elif isinstance(entity, BRepEdge):
+        direction = entity.startVertex.geometry.vectorTo(entity.endVertex.geometry)
+    else:
+        return default
+    direction.normalize()
+    return direction
+
+class RectangularPatternFeatures(FeatureCollection):
+    def createInput(self, inputEntities, directionOneEntity, quantityOne, distanceOne, patternDistanceType) -> PatternFeatureInput:
+        return PatternFeatureInput(inputEntities, directionOneEntity, quantityOne, distanceOne, patternDistanceType)
+
+    def add(self, input: PatternFeatureInput) -> Feature:
+        directions = [directionOf(input.directionOneEntity, Vector3D(1, 0, 0)), directionOf(input.directionTwoEntity, Vector3D(0, 1, 0))]
+        quantities = [int(round(realValue(input.quantityOne))), int(round(realValue(input.quantityTwo)))]
+        distances = [realValue(input.distanceOne), realValue(input.distanceTwo)]
+        copies = []
+        for body in bodiesOf(input.inputEntities):
+            for i in range(quantities[0]):
+                for j in range(quantities[1]):
+                    if i == 0 and j == 0:
+                        continue
+                    transform = core.Matrix3D.create()
+                    offset = Vector3D(*[directions[0].asArray()[k] * distances[0] * i + directions[1].asArray()[k] * distances[1] * j for k in range(3)])
+                    transform.translation = offset
+                    copies.append(self._component.bRepBodies.addBody(transformBox(body.boundingBox, transform)))
+        return self.addFeature(Feature(self._component, copies))
+
+class CircularPatternFeatures(FeatureCollection):
+    def createInput(self, inputEntities, axis) -> PatternFeatureInput:
+        input = PatternFeatureInput(inputEntities)
+        input.axis = axis
+        return input
+
+    def add(self, input: PatternFeatureInput) -> Feature:
+        axis = input.axis.geometry if isinstance(input.axis, ConstructionAxis) else AxisGeometry(Point3D(), Vector3D(0, 0, 1))
+        quantity = int(round(realValue(input.quantity)))
+        totalAngle = realValue(input.totalAngle)
+        step = totalAngle / quantity if math.isclose(totalAngle, 2 * math.pi) else totalAngle / max(1, quantity - 1)
+        copies = []
+        for body in bodiesOf(input.inputEntities):
+            for i in range(1, quantity):
+                transform = core.Matrix3D.create()
+                transform.setToRotation(step * i, axis.direction, axis.origin)
+                copies.append(self._component.bRepBodies.addBody(transformBox(body.boundingBox, transform)))
+        return self.addFeature(Feature(self._component, copies))
+
+class MirrorFeatureInput(FeatureInput):
+    def __init__(self, inputEntities, mirrorPlane):
+        super().__init__()
+        self.inputEntities = inputEntities
+        self.mirrorPlane = mirrorPlane
+        self.isCombine = False
+
+class MirrorFeatures(FeatureCollection):
+    def createInput(self, inputEntities, mirrorPlane) -> MirrorFeatureInput:
+        return MirrorFeatureInput(inputEntities, mirrorPlane)
+
+    def add(self, input: MirrorFeatureInput) -> Feature:
+        plane = planeOf(input.mirrorPlane)
+        copies = [self._component.bRepBodies.addBody(mirrorBox(body.boundingBox, plane)) for body in bodiesOf(input.inputEntities)]
+        return self.addFeature(Feature(self._component, copies))
+
+class MoveFeatureInput(FeatureInput):
+    def __init__(self, inputEntities, transform: core.Matrix3D = None):
+        super().__init__()
+        self.inputEntities = inputEntities
+        self.transform = transform.copy() if transform is not None else core.Matrix3D.create()
+
+    def defineAsFreeMove(self, transform: core.Matrix3D):
+        self.transform = transform.copy()
+        return True
+
+    def defineAsTranslateXYZ(self, xDistance, yDistance, zDistance, isDesignSpace: bool):
+        self.transform = core.Matrix3D.create()
+        self.transform.translation = Vector3D(realValue(xDistance), realValue(yDistance), realValue(zDistance))
+        return True
+
+    def defineAsRotate(self, axisEntity, angle):
+        axis = axisEntity.geometry if isinstance(axisEntity, ConstructionAxis) else AxisGeometry(Point3D(), Vector3D(0, 0, 1))
+        self.transform = core.Matrix3D.create()
+        self.transform.setToRotation(realValue(angle), axis.direction, axis.origin)
+        return True
+
+class MoveFeatures(FeatureCollection):
+    def createInput(self, inputEntities, transform: core.Matrix3D) -> MoveFeatureInput:
+        return MoveFeatureInput(inputEntities, transform)
+
+    def createInput2(self, inputEntities) -> MoveFeatureInput:
+        return MoveFeatureInput(inputEntities)
+
+    def add(self, input: MoveFeatureInput) -> Feature:
+        bodies = bodiesOf(input.inputEntities)
+        for body in bodies:
+            body.setBox(transformBox(body.boundingBox, input.transform))
+        return self.addFeature(Feature(self._component, bodies))
+
+class CopyPasteBodies(FeatureCollection):
+    def add(self, sourceBodies) -> Feature:
+        copies = [self._component.bRepBodies.addBody(body.boundingBox) for body in bodiesOf(sourceBodies)]
+        return self.addFeature(Feature(self._component, copies))
+
+class ShellFeatureInput(FeatureInput):
+    def __init__(self, inputEntities, isTangentChain: bool):
+        super().__init__()
+        self.inputEntities = inputEntities
+        self.isTangentChain = isTangentChain
+        self.insideThickness = ValueInput.createByReal(0)
+        self.outsideThickness = ValueInput.createByReal(0)
+
+class ShellFeatures(FeatureCollection):
+    def createInput(self, inputEntities, isTangentChain: bool = True) -> ShellFeatureInput:
+        return ShellFeatureInput(inputEntities, isTangentChain)
+
+    def add(self, input: ShellFeatureInput) -> Feature:
+        bodies = bodiesOf(input.inputEntities)
+        for body in bodies:
+            body.setBox(body.boundingBox)
+        return self.addFeature(Feature(self._component, bodies))
+
+class RemoveFeatures(FeatureCollection):
+    def add(self, itemToRemove) -> Feature:
+        for body in bodiesOf(itemToRemove):
+            body.deleteMe()
+        return self.addFeature(Feature(self._component))
+
+class BaseFeature(Feature):
+    def startEdit(self):
+        return True
+
+    def finishEdit(self):
+        return True
+
+class BaseFeatures(FeatureCollection):
+    def add(self) -> BaseFeature:
+        return self.addFeature(BaseFeature(self._component))
+
+class Features(Entity):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self.extrudeFeatures = ExtrudeFeatures(component)
+        self.filletFeatures = FilletFeatures(component)
+        self.chamferFeatures = ChamferFeatures(component)
+        self.combineFeatures = CombineFeatures(component)
+        self.rectangularPatternFeatures = RectangularPatternFeatures(component)
+        self.circularPatternFeatures = CircularPatternFeatures(component)
+        self.mirrorFeatures = MirrorFeatures(component)
+        self.moveFeatures = MoveFeatures(component)
+        self.copyPasteBodies = CopyPasteBodies(component)
+        self.shellFeatures = ShellFeatures(component)
+        self.removeFeatures = RemoveFeatures(component)
+        self.baseFeatures = BaseFeatures(component)
+
+    def collections(self) -> list[FeatureCollection]:
+        return [value for value in vars(self).values() if isinstance(value, FeatureCollection)]
+
+    @property
+    def count(self) -> int:
+        return sum(collection.count for collection in self.collections())
+
+# components
+
+class Occurrence(Entity):
+    def __init__(self, component: 'Component', transform: core.Matrix3D):
+        super().__init__(component.name)
+        self.component = component
+        self.transform = transform.copy()
+        self.transform2 = transform.copy()
+        self.isGrounded = False
+
+class Occurrences(Entity):
+    def __init__(self, component: 'Component'):
+        super().__init__()
+        self._items: list[Occurrence] = []
+
+    def addNewComponent(self, transform: core.Matrix3D) -> Occurrence:
+        recorder.record('components', 'Occurrences.addNewComponent')
+        occurrence = Occurrence(Component(), transform)
+        self._items.append(occurrence)
+        return occurrence
+
+    def addExistingComponent(self, component: 'Component', transform: core.Matrix3D) -> Occurrence:
+        recorder.record('components', 'Occurrences.addExistingComponent')
+        occurrence = Occurrence(component, transform)
+        self._items.append(occurrence)
+        return occurrence
+
+    @property
+    def count(self) -> int:
+        return len(self._items)
+
+    def item(self, index: int) -> Occurrence:
+        return self._items[index]
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+class Component(Entity):
+    def __init__(self, name: str = 'Component'):
+        super().__init__(name)
+        self._bodyCounter = 0
+        origin = Point3D()
+        self.xYConstructionPlane = ConstructionPlane(core.Plane(origin, Vector3D(1, 0, 0), Vector3D(0, 1, 0)), self)
+        self.xZConstructionPlane = ConstructionPlane(core.Plane(origin, Vector3D(1, 0, 0), Vector3D(0, 0, -1)), self)
+        self.yZConstructionPlane = ConstructionPlane(core.Plane(origin, Vector3D(0, 0, -1), Vector3D(0, 1, 0)), self)
+        self.xConstructionAxis = ConstructionAxis(origin, Vector3D(1, 0, 0))
+        self.yConstructionAxis = ConstructionAxis(origin, Vector3D(0, 1, 0))
+        self.zConstructionAxis = ConstructionAxis(origin, Vector3D(0, 0, 1))
+        self.originConstructionPoint = ConstructionPoint(origin)
+        self.constructionPlanes = ConstructionPlanes(self)
+        self.constructionAxes = ConstructionAxes(self)
+        self.sketches = Sketches(self)
+        self.bRepBodies = BRepBodies(self)
+        self.features = Features(self)
+        self.occurrences = Occurrences(self)
+        self.attributes = Attributes()
+
+class Attribute():
+    def __init__(self, groupName: str, name: str, value: str):
+        self.groupName = groupName
+        self.name = name
+        self.value = value
+
+    def deleteMe(self):
+        return True
+
+class Attributes(ObjectCollection):
+    def add(self, groupName: str, name: str, value: str) -> Attribute:
+        existing = self.itemByName(groupName, name)
+        if existing is not None:
+            existing.value = value
+            return existing
+        attribute = Attribute(groupName, name, value)
+        self._items.append(attribute)
+        return attribute
+
+    def itemByName(self, groupName: str, name: str) -> Attribute:
+        return next((attribute for attribute in self._items if attribute.groupName == groupName and attribute.name == name), None)
+
+class Design(Entity):
+    def __init__(self):
+        super().__init__('Design')
+        self.rootComponent = Component('Root')
+        self.designType = 'DesignTypes.ParametricDesignType'
+
+# temporary bodies
+
+class TemporaryBRepManager(core.Base):
+    _instance: 'TemporaryBRepManager' = None
+
+    @staticmethod
+    def get() -> 'TemporaryBRepManager':
+        if TemporaryBRepManager._instance is None:
+            TemporaryBRepManager._instance = TemporaryBRepManager()
+        return TemporaryBRepManager._instance
+
+    def copy(self, body: BRepBody) -> BRepBody:
+        recorder.record('temporaryBRep', 'copy')
+        return BRepBody(body.boundingBox, None, body.isSolid, body.name)
+
+    def transform(self, body: BRepBody, transform: core.Matrix3D) -> bool:
+        recorder.record('temporaryBRep', 'transform')
+        body.setBox(transformBox(body.boundingBox, transform))
+        return True
+
+    def booleanOperation(self, targetBody: BRepBody, toolBody: BRepBody, booleanType) -> bool:
+        recorder.record('temporaryBRep', 'booleanOperation')
+        if str(booleanType).endswith('UnionBooleanType'):
+            targetBody.setBox(unionBoxes([targetBody.boundingBox, toolBody.boundingBox]))
+        elif str(booleanType).endswith('IntersectionBooleanType'):
+            intersection = intersectBoxes(targetBody.boundingBox, toolBody.boundingBox)
+            if intersection is None:
+                return False
+            targetBody.setBox(intersection)
+        else:
+            targetBody.setBox(targetBody.boundingBox)
+        return True
+
+    def createBox(self, box: core.OrientedBoundingBox3D) -> BRepBody:
+        recorder.record('temporaryBRep', 'createBox')
+        return BRepBody(box.toBoundingBox())
+
+    def createCylinderOrCone(self, pointOne: Point3D, pointOneRadius: float, pointTwo: Point3D, pointTwoRadius: float) -> BRepBody:
+        recorder.record('temporaryBRep', 'createCylinderOrCone')
+        radius = max(pointOneRadius, pointTwoRadius)
+        points = [Point3D(point.x + dx * radius, point.y + dy * radius, point.z) for point in [pointOne, pointTwo] for [dx, dy] in [(-1, -1), (1, 1)]]
+        return BRepBody(BoundingBox3D.fromPoints(points))
+
+    def exportToFile(self, bodies: list[BRepBody], filename: str) -> bool:
+        recorder.record('temporaryBRep', 'exportToFile')
+        with open(filename, 'w') as file:
+            json.dump([[body.boundingBox.minPoint.asArray(), body.boundingBox.maxPoint.asArray()] for body in bodies], file)
+        return True
+
+    def createFromFile(self, filename: str) -> BRepBodies:
+        recorder.record('temporaryBRep', 'createFromFile')
+        with open(filename) as file:
+            boxes = json.load(file)
+        return BRepBodies(None, [BRepBody(BoundingBox3D(Point3D(*low), Point3D(*high))) for [low, high] in boxes])
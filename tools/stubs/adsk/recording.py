@@ -0,0 +1,58 @@
+import collections
+
+class Recorder():
+    """
+    Counts API operations performed through the stub adsk modules, grouped by category
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.counts: dict[str, collections.Counter] = collections.defaultdict(collections.Counter)
+
+    def record(self, category: str, name: str):
+        self.counts[category][name] += 1
+
+    def total(self, category: str) -> int:
+        return sum(self.counts[category].values()) if category in self.counts else 0
+
+    def totals(self) -> dict[str, int]:
+        return {category: sum(names.values()) for category, names in sorted(self.counts.items())}
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        return {category: dict(sorted(names.items())) for category, names in sorted(self.counts.items())}
+
+recorder = Recorder()
+
+class Unmodeled():
+    """
+    Stand-in returned for API members the stub doesn't implement, keeps generator code running
+    and records the access so missing coverage shows up in benchmark reports
+    """
+    def __init__(self, path: str):
+        object.__setattr__(self, '_path', path)
+
+    def __getattr__(self, name: str):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        recorder.record('unmodeled', f'{self._path}.{name}')
+        return Unmodeled(f'{self._path}.{name}')
+
+    def __call__(self, *args, **kwargs):
+        return Unmodeled(f'{self._path}()')
+
+    def __iter__(self):
+        return iter([])
+
+    def __len__(self):
+        return 0
+
+    def __bool__(self):
+        return True
+
+    @property
+    def count(self):
+        return 0
+
+    def item(self, index: int):
+        return Unmodeled(f'{self._path}.item()')